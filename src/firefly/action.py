@@ -1,6 +1,7 @@
 import logging
 import webbrowser
 from collections import ChainMap
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 from typing import Mapping
 
@@ -123,6 +124,65 @@ class WindowAction(Action):
         return window
 
 
+class LazyWindowActions(Mapping[str, WindowAction]):
+    """Window actions for a group of devices, built when first needed.
+
+    Only the device names are known up-front. Each action is created
+    by *factory* the first time it is looked up, so a beamline with
+    many devices does not have to build thousands of actions before
+    the first window appears.
+
+    Parameters
+    ==========
+    names
+      The device names, in the order they should show up in menus.
+    factory
+      Called with a device name to create that device's action.
+
+    """
+
+    def __init__(self, names: Iterable[str], factory: Callable[[str], WindowAction]):
+        self._factories = {name: factory for name in names}
+        self._actions: dict[str, WindowAction] = {}
+
+    def __getitem__(self, name: str) -> WindowAction:
+        if name not in self._actions:
+            self._actions[name] = self._factories[name](name)
+        return self._actions[name]
+
+    def __contains__(self, name) -> bool:
+        # Checking membership shouldn't build the action
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def update(self, other: "LazyWindowActions"):
+        """Add the devices from another group, still unbuilt."""
+        for name in other:
+            self._actions.pop(name, None)
+            self._factories[name] = other._factories[name]
+
+    @property
+    def is_built(self) -> bool:
+        """Whether every action in the group has been created."""
+        return len(self._actions) == len(self._factories)
+
+    def built_actions(self) -> list[WindowAction]:
+        """The actions that have already been created."""
+        return [self._actions[name] for name in self if name in self._actions]
+
+
+def built_actions(actions: Mapping[str, QAction]) -> list[QAction]:
+    """Actions in *actions*, without building any lazy ones."""
+    if isinstance(actions, LazyWindowActions):
+        return actions.built_actions()
+    return list(actions.values())
+
+
 class ActionsRegistry:
     """A common namespace for keeping track of global actions."""
 
@@ -197,6 +257,11 @@ class ActionsRegistry:
 
     @property
     def all_actions(self):
+        """Every action that has been created so far.
+
+        Device actions that haven't been needed yet are left out.
+
+        """
         return [
             self.prefect,
             *self.ptz_cameras,
@@ -210,16 +275,16 @@ class ActionsRegistry:
             self.queue_monitor,
             *self.queue_settings.values(),
             *self.queue_controls.values(),
-            *self.area_detectors.values(),
-            *self.cameras.values(),
-            *self.ion_chambers.values(),
-            *self.kb_mirrors.values(),
-            *self.mirrors.values(),
-            *self.monochromators.values(),
-            *self.motors.values(),
-            *self.robots.values(),
-            *self.slits.values(),
-            *self.tables.values(),
-            *self.undulators.values(),
-            *self.xrf_detectors.values(),
+            *built_actions(self.area_detectors),
+            *built_actions(self.cameras),
+            *built_actions(self.ion_chambers),
+            *built_actions(self.kb_mirrors),
+            *built_actions(self.mirrors),
+            *built_actions(self.monochromators),
+            *built_actions(self.motors),
+            *built_actions(self.robots),
+            *built_actions(self.slits),
+            *built_actions(self.tables),
+            *built_actions(self.undulators),
+            *built_actions(self.xrf_detectors),
         ]
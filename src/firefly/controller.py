@@ -1,8 +1,10 @@
 import dataclasses
 import logging
 import subprocess
+import time
 from collections import OrderedDict
 from collections.abc import Mapping
+from contextlib import contextmanager
 from functools import partial
 from pathlib import Path
 
@@ -19,7 +21,13 @@ from haven import beamline, load_config
 from haven.exceptions import InvalidConfiguration
 from haven.utils import titleize
 
-from .action import Action, ActionsRegistry, BrowserAction, WindowAction
+from .action import (
+    Action,
+    ActionsRegistry,
+    BrowserAction,
+    LazyWindowActions,
+    WindowAction,
+)
 from .display import FireflyDisplay, SampleMetadata
 from .dm_tools.gui.dmStationUi import DmStationUi
 from .main_window import FireflyMainWindow, PlanMainWindow
@@ -53,6 +61,9 @@ class FireflyController(QtCore.QObject):
     # For keeping track of the various device and window actions
     actions: ActionsRegistry
 
+    # How long each phase of starting up took, in seconds
+    startup_times: dict[str, float]
+
     # Signals for running plans on the queueserver
     queue_item_added = Signal(object)
 
@@ -76,6 +87,7 @@ class FireflyController(QtCore.QObject):
         # Initialize needed attributes
         self.actions = ActionsRegistry()
         self.windows = OrderedDict()
+        self.startup_times = {}
         self.queue_re_state_changed.connect(self.enable_queue_controls)
         self.registry = beamline.devices
         # An error message dialog for later use
@@ -95,6 +107,17 @@ class FireflyController(QtCore.QObject):
         setattr(self, action_name, action)
         return action
 
+    @contextmanager
+    def startup_phase(self, name: str):
+        """Time one phase of starting up, and report it in the logs."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.startup_times[name] = duration
+            log.info(f"Startup phase '{name}' took {duration:.3f} s.")
+
     async def setup_instrument(self, load_instrument=True):
         """Set up the application to use a previously loaded instrument.
 
@@ -113,21 +136,27 @@ class FireflyController(QtCore.QObject):
         """
         if load_instrument:
             config = load_config()
-            for device_file in config.device_files:
-                beamline.load(device_file)
-            try:
-                await beamline.connect()
-            except NotConnectedError as exc:
-                log.exception(exc)
-                msg = (
-                    "One or more devices failed to load. See console logs for details."
-                )
-                self.error_message.showMessage(msg)
-            self.registry_changed.emit(beamline.devices)
+            with self.startup_phase("load_devices"):
+                for device_file in config.device_files:
+                    beamline.load(device_file)
+            with self.startup_phase("connect_devices"):
+                try:
+                    await beamline.connect()
+                except NotConnectedError as exc:
+                    log.exception(exc)
+                    msg = (
+                        "One or more devices failed to load."
+                        " See console logs for details."
+                    )
+                    self.error_message.showMessage(msg)
+            with self.startup_phase("update_windows"):
+                self.registry_changed.emit(beamline.devices)
         # Make actions for launching other windows
-        self.setup_window_actions()
+        with self.startup_phase("window_actions"):
+            self.setup_window_actions()
         # Actions for controlling the bluesky run engine
-        self.setup_queue_actions()
+        with self.startup_phase("queue_actions"):
+            self.setup_queue_actions()
         # Inject menu actions into the various windows
         for action in self.actions.all_actions:
             if hasattr(action, "window_created"):
@@ -468,7 +497,9 @@ class FireflyController(QtCore.QObject):
         """Generic routine to be called for individual classes of devices.
 
         Sets up a window action for each instance of this device class
-        (specified by *device_label*).
+        (specified by *device_label*). Only the device names are
+        looked up here; each action is built the first time it is
+        needed (e.g. when its menu is opened).
 
         For example, to set up device window actions for all a Tardis
         (Ophyd devices with the "tardis_ship" label), call:
@@ -503,19 +534,21 @@ class FireflyController(QtCore.QObject):
         )
         if len(devices) == 0:
             log.warning(f"No {device_label} found, menu will be empty.")
-        # Create menu actions for each device
-        actions = {
-            device.name: WindowAction(
-                name=f"show_{device.name}_action",
-                text=titleize(device.name),
+
+        # Create menu actions for each device when needed
+        def make_action(device_name: str) -> WindowAction:
+            action = WindowAction(
+                name=f"show_{device_name}_action",
+                text=titleize(device_name),
                 display_file=display_file,
                 icon=icon,
                 WindowClass=WindowClass,
-                macros={device_key: device.name},
+                macros={device_key: device_name},
             )
-            for device in devices
-        }
-        return actions
+            action.window_created.connect(self.finalize_new_window)
+            return action
+
+        return LazyWindowActions([device.name for device in devices], make_action)
 
     def start_queue_client(self):
         try:
@@ -1,9 +1,14 @@
 import logging
 import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 
 import numpy as np
 import pydm
 import pyqtgraph
+from qtpy.QtCore import QObject, QTimer, Signal
 
 from firefly import display
 from haven import beamline
@@ -17,8 +22,159 @@ log = logging.getLogger(__name__)
 pyqtgraph.setConfigOption("imageAxisOrder", "row-major")
 
 
+@dataclass(frozen=True)
+class ProcessedFrame:
+    """An image ready to be drawn, with its suggested levels and
+    histogram."""
+
+    image: np.ndarray
+    levels: tuple[float, float]
+    histogram: tuple[np.ndarray, np.ndarray]
+
+
+def bin_image(img: np.ndarray, bin_size: int) -> np.ndarray:
+    """Average *bin_size* × *bin_size* blocks of pixels together.
+
+    Leftover rows and columns at the edges are discarded.
+
+    """
+    if bin_size <= 1:
+        return img
+    rows, cols = img.shape[0] // bin_size, img.shape[1] // bin_size
+    img = img[: rows * bin_size, : cols * bin_size]
+    img = img.reshape(rows, bin_size, cols, bin_size, *img.shape[2:])
+    return img.mean(axis=(1, 3))
+
+
+def process_frame(
+    img: np.ndarray, bin_size: int = 1, max_samples: int = 250_000
+) -> ProcessedFrame:
+    """Turn a raw PVA frame into an image ready to draw.
+
+    Levels and histogram are calculated from a strided subset of at
+    most about *max_samples* pixels.
+
+    """
+    # For some reason the image comes out mishapen
+    img = np.reshape(img, img.shape[::-1])
+    img = bin_image(img, bin_size)
+    stride = max(int(np.sqrt(img.shape[0] * img.shape[1] / max_samples)), 1)
+    sample = img[::stride, ::stride]
+    finite = sample[np.isfinite(sample)] if sample.dtype.kind == "f" else sample
+    if finite.size == 0:
+        levels = (0.0, 1.0)
+        histogram = (np.zeros(0), np.zeros(0))
+    else:
+        levels = (float(finite.min()), float(finite.max()))
+        counts, edges = np.histogram(finite, bins=256, range=levels)
+        histogram = (edges[:-1], counts)
+    return ProcessedFrame(image=img, levels=levels, histogram=histogram)
+
+
+class ImagePipeline(QObject):
+    """Prepare detector frames on a worker thread, and hand them to
+    the GUI no faster than it can draw them.
+
+    Only the newest frame is kept: frames that arrive before the
+    previous one has been processed, or that are processed before
+    the previous one has been drawn, are dropped.
+
+    Parameters
+    ==========
+    max_fps
+      Most frames to draw per second.
+    bin_size
+      Number of pixels along each side to average together.
+
+    """
+
+    frame_ready = Signal(object)  # A ProcessedFrame
+    stats_changed = Signal(float, int)  # Rendered FPS, total dropped frames
+
+    def __init__(self, *args, max_fps: float = 20, bin_size: int = 1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_fps = max_fps
+        self.bin_size = bin_size
+        self.frames_received = 0
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self._raw = None
+        self._processed = None
+        self._render_times = deque()
+        self._condition = threading.Condition()
+        self._running = False
+        self._worker = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.render)
+
+    @property
+    def fps(self) -> float:
+        """How many frames were rendered during the last second."""
+        now = time.monotonic()
+        while self._render_times and now - self._render_times[0] > 1.0:
+            self._render_times.popleft()
+        return float(len(self._render_times))
+
+    def start(self):
+        self._running = True
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._worker.start()
+        self.timer.start(int(1000 / self.max_fps))
+
+    def stop(self):
+        self.timer.stop()
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def submit(self, img: np.ndarray):
+        """Queue a new raw frame, replacing any unprocessed one."""
+        with self._condition:
+            self.frames_received += 1
+            if self._raw is not None:
+                self.frames_dropped += 1
+            self._raw = img
+            self._condition.notify()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._running and self._raw is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                img, self._raw = self._raw, None
+            started = time.monotonic()
+            try:
+                frame = process_frame(img, bin_size=self.bin_size)
+            except Exception:
+                log.exception("Could not process area detector frame.")
+                continue
+            with self._condition:
+                if self._processed is not None:
+                    self.frames_dropped += 1
+                self._processed = frame
+            # No sense preparing frames faster than they can be shown
+            time.sleep(max(1 / self.max_fps - (time.monotonic() - started), 0))
+
+    def render(self):
+        """Emit the newest processed frame, if there is one."""
+        with self._condition:
+            frame, self._processed = self._processed, None
+        if frame is None:
+            return
+        self.frames_rendered += 1
+        self._render_times.append(time.monotonic())
+        self.frame_ready.emit(frame)
+        self.stats_changed.emit(self.fps, self.frames_dropped)
+
+
 class AreaDetectorViewerDisplay(display.FireflyDisplay):
     image_is_new: bool = True
+    pipeline: ImagePipeline
 
     def customize_device(self):
         device_name = name = self.macros()["AD"]
@@ -34,6 +190,18 @@ class AreaDetectorViewerDisplay(display.FireflyDisplay):
     def customize_ui(self):
         # Create the pyqtgraph image viewer
         self.image_view = self.ui.image_view
+        # Histograms are computed by the pipeline, not the GUI thread
+        histogram = self.image_view.getHistogramWidget().item
+        self.image_view.getImageItem().sigImageChanged.disconnect(
+            histogram.imageChanged
+        )
+        self.pipeline = ImagePipeline(parent=self)
+        self.pipeline.frame_ready.connect(self.show_frame)
+        self.pipeline.stats_changed.connect(self.update_frame_rate)
+        self.pipeline.start()
+        # The main window deletes itself when closed, without calling
+        # this display's closeEvent()
+        self.destroyed.connect(self.pipeline.stop)
         # Connect signals for showing/hiding controls
         self.ui.settings_button.clicked.connect(self.toggle_controls)
         # Set some text about the camera
@@ -51,16 +219,33 @@ class AreaDetectorViewerDisplay(display.FireflyDisplay):
         controls_frame.setVisible(not controls_frame.isVisible())
 
     def update_image(self, img):
-        # For some reason the image comes out mishapen
-        new_shape = img.shape[::-1]
-        img = np.reshape(img, new_shape)
-        # Show the image data
-        self.image_view.setImage(
-            img, autoRange=self.image_is_new, autoLevels=self.image_is_new
-        )
+        """Hand a new frame to the pipeline, to be shown when the GUI
+        is ready."""
+        self.pipeline.submit(img)
+
+    def show_frame(self, frame: ProcessedFrame):
+        """Draw a frame that has already been prepared."""
+        if self.image_is_new:
+            self.image_view.setImage(
+                frame.image, autoRange=True, autoLevels=False, levels=frame.levels
+            )
+        else:
+            # Keep the levels chosen by the user
+            self.image_view.getImageItem().setImage(frame.image, autoLevels=False)
+        histogram = self.image_view.getHistogramWidget().item
+        histogram.plot.setData(*frame.histogram)
+        if self.image_is_new:
+            histogram.region.setRegion(frame.levels)
         # Update the display to indicate that we don't need to update levels/scale in the future
         self.image_is_new = False
 
+    def update_frame_rate(self, fps: float, dropped: int):
+        self.ui.frame_rate_label.setText(f"{fps:.0f} FPS ({dropped:_} dropped)")
+
+    def closeEvent(self, event):
+        self.pipeline.stop()
+        super().closeEvent(event)
+
     def ui_filename(self):
         return "devices/area_detector_viewer.ui"
 
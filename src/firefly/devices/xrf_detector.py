@@ -84,10 +84,21 @@ class XRFPlotWidget(QWidget):
         plot_item = self.ui.plot_widget.getPlotItem()
         plot_item.addLegend()
         plot_item.hover_coords_changed.connect(self.ui.coords_label.setText)
-
-    def update_spectrum(self, mca_num: int, spectrum: pd.Series):
+        # Only draw as many points as the screen can show
+        plot_item.setDownsampling(auto=True, mode="peak")
+        plot_item.setClipToView(True)
+
+    def update_spectrum(
+        self,
+        mca_num: int,
+        spectrum: pd.Series | np.ndarray,
+        energies: np.ndarray | None = None,
+    ):
         """Plot the spectrum associated with the given MCA index.
 
+        The plot item for each MCA is created once and then updated
+        in place.
+
         Parameters
         ==========
         mca_num
@@ -95,30 +106,36 @@ class XRFPlotWidget(QWidget):
           *mca_num* of ``1``.
         spectrum
           The spectrum to plot.
+        energies
+          The energy of each bin in *spectrum*. If omitted, the index
+          of *spectrum* is used.
         """
-        # Create the plot item itself if necessary
-        log.debug(f"New spectrum ({mca_num}): {repr(spectrum)}")
+        log.debug(f"New spectrum ({mca_num}): {np.shape(spectrum)}")
         show_spectrum = self.target_mca is None or mca_num == self.target_mca
-        row, col = (0, 0)
-        plot_item = self.ui.plot_widget.getPlotItem()
-        # Get rid of the previous plots
-        if (existing_item := self._data_items[mca_num]) is not None:
-            plot_item.removeItem(existing_item)
+        data_item = self._data_items[mca_num]
+        if not show_spectrum:
+            if data_item is not None:
+                data_item.setVisible(False)
+            return
+        if energies is None:
+            energies = getattr(spectrum, "index", None)
+        spectrum = np.atleast_1d(np.asarray(spectrum))
+        if energies is None:
+            energies = np.arange(len(spectrum))
         # Plot the spectrum
-        if show_spectrum:
-            try:
-                length = len(spectrum)
-            except TypeError:
-                # Probably this means the spectrum is really just a scaler
-                length = 1
-                spectrum = np.asarray([spectrum])
-            xdata = spectrum.index
+        plot_item = self.ui.plot_widget.getPlotItem()
+        if data_item is not None and data_item not in plot_item.listDataItems():
+            # The plot was cleared, so start over
+            data_item = None
+        if data_item is None:
             color = self.spectrum_color(mca_num)
             self._data_items[mca_num] = plot_item.plot(
-                xdata, spectrum.values, name=mca_num, pen=color
+                np.asarray(energies), spectrum, name=mca_num, pen=color
             )
-            # Add region markers
-            self.plot_changed.emit()
+        else:
+            data_item.setData(np.asarray(energies), spectrum)
+            data_item.setVisible(True)
+        self.plot_changed.emit()
 
     def spectrum_color(self, mca_num):
         return colors[(mca_num) % len(colors)]
@@ -227,6 +244,10 @@ class XRFDetectorDisplay(display.FireflyDisplay):
 
     _spectrum_channels: Sequence
     _spectra: dict
+    _counts: dict
+    _total: int | float
+    _ev_per_bin: float | None = None
+    _energies: np.ndarray | None = None
     num_header_rows: int = 2
 
     # For styling the detector state attribute
@@ -245,6 +266,8 @@ class XRFDetectorDisplay(display.FireflyDisplay):
 
     def customize_ui(self):
         self._spectra = {}
+        self._counts = {}
+        self._total = 0
         device = self.device
         self.setWindowTitle(device.name)
         self.ui.mca_plot_widget.device_name = self.device.name
@@ -260,37 +283,61 @@ class XRFDetectorDisplay(display.FireflyDisplay):
             value_slot=self.update_state_style,
         )
         self.det_state_channel.connect()
+        # Energy calibration for the spectra
+        self.ev_per_bin_channel = pydm.PyDMChannel(
+            address=f"haven://{device.ev_per_bin.name}",
+            value_slot=self.update_ev_per_bin,
+        )
+        self.ev_per_bin_channel.connect()
         super().customize_ui()
 
     def update_state_style(self, new_state: str):
         new_style = self.state_styles.get(new_state, "")
         self.ui.detector_state_label.setStyleSheet(new_style)
 
+    def update_ev_per_bin(self, ev_per_bin: float):
+        """Use a new energy calibration for the spectra."""
+        if ev_per_bin != self._ev_per_bin:
+            self._ev_per_bin = ev_per_bin
+            self._energies = None
+
+    def energies(self, num_bins: int) -> np.ndarray:
+        """The energy of each bin, cached until the calibration changes."""
+        energies = self._energies
+        if energies is None or len(energies) != num_bins:
+            energies = (np.arange(num_bins) + 0.5) * self._ev_per_bin
+            self._energies = energies
+        return energies
+
     @asyncSlot(object)
     async def handle_new_spectrum(self, new_spectrum, mca_num):
         # Calclulate energies for this spectrum
-        ev_per_bin = await self.device.ev_per_bin.get_value()
-        energies = (np.arange(new_spectrum.shape[0]) + 0.5) * ev_per_bin
-        spectrum = pd.Series(new_spectrum, index=energies)
-        self._spectra[mca_num] = spectrum
+        if self._ev_per_bin is None:
+            self.update_ev_per_bin(await self.device.ev_per_bin.get_value())
+        new_spectrum = np.asarray(new_spectrum)
+        energies = self.energies(new_spectrum.shape[0])
+        # Keep a running total instead of re-summing every spectrum,
+        # as floats if the spectra are (e.g. dead-time corrected)
+        count = np.sum(new_spectrum).item()
+        self._total += count - self._counts.get(mca_num, 0)
+        self._counts[mca_num] = count
+        self._spectra[mca_num] = new_spectrum
         # Update UI widgets
-        self.ui.mca_plot_widget.update_spectrum(mca_num=mca_num, spectrum=spectrum)
-        self.update_spectral_widgets(
-            mca_num=mca_num, spectrum=spectrum, spectra=self._spectra.values()
+        self.ui.mca_plot_widget.update_spectrum(
+            mca_num=mca_num, spectrum=new_spectrum, energies=energies
         )
+        self.update_spectral_widgets(mca_num=mca_num, count=count, total=self._total)
 
     def update_spectral_widgets(
-        self, mca_num: int, spectrum: Sequence, spectra: Sequence[np.ndarray]
+        self, mca_num: int, count: int | float, total: int | float
     ):
-        """Update the values of labels with totals, etc from the spectra."""
+        """Update the labels with the counts for one element, and the
+        total for all elements."""
         row = mca_num + self.num_header_rows
         count_label = self.ui.mcas_layout.itemAtPosition(row, 1).widget()
-        count_label.setText(f"{np.sum(spectrum):_}")
+        count_label.setText(f"{count:_}")
         # Update the sum-total widget
-        total = 0
         total_label = self.ui.mcas_layout.itemAtPosition(1, 1).widget()
-        for spec in spectra:
-            total += np.sum(spec)
         total_label.setText(f"{total:_}")
 
     def customize_device(self):
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+log = logging.getLogger("dm_tools")
+
+
+@dataclass
+class FileDeletionReport:
+    deleted: Dict[str, Any] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+    # Files deleted by an earlier, interrupted run
+    previouslyDeleted: List[str] = field(default_factory=list)
+    completed: bool = False
+
+    @property
+    def numDeleted(self) -> int:
+        return len(self.deleted) + len(self.previouslyDeleted)
+
+
+# Files already deleted, saved so an interrupted deletion can resume
+@dataclass
+class FileDeletionProgress:
+    path: Optional[str] = None
+    deleted: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "FileDeletionProgress":
+        if path is None or not os.path.exists(path):
+            return cls(path=path)
+        with open(path, mode="r") as fp:
+            data = json.load(fp)
+        return cls(path=path, deleted=list(data.get("deleted", [])))
+
+    def save(self, failed: Dict[str, str]) -> None:
+        if self.path is None:
+            return
+        tmpPath = f"{self.path}.tmp"
+        with open(tmpPath, mode="w") as fp:
+            json.dump({"deleted": self.deleted, "failed": failed}, fp)
+        os.replace(tmpPath, self.path)
+
+    def clear(self) -> None:
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Deletes many files in batches, a few at a time.
+#
+# deleteFile is called with each file ID and may raise an exception,
+# which is recorded as that file's failure. After each batch, the
+# deleted files are saved to progressPath (if given), so that running
+# the deleter again skips them.
+@dataclass
+class BatchFileDeleter:
+    deleteFile: Callable[[str], Any]
+    batchSize: int = 200
+    maxWorkers: int = 4
+    progressPath: Optional[str] = None
+
+    def batches(self, fileIds: Iterable[str], skip: Iterable[str]) -> List[List[str]]:
+        # Drop repeated and already deleted files, keeping their order
+        seen = set(skip)
+        pending = []
+        for fileId in fileIds:
+            if fileId not in seen:
+                seen.add(fileId)
+                pending.append(fileId)
+        return [
+            pending[i : i + self.batchSize]
+            for i in range(0, len(pending), self.batchSize)
+        ]
+
+    def _deleteOne(self, fileId: str):
+        try:
+            return fileId, self.deleteFile(fileId), None
+        except Exception as exc:
+            log.warning(f"Could not delete file {fileId}: {exc}")
+            return fileId, None, str(exc) or type(exc).__name__
+
+    def run(
+        self,
+        fileIds: Iterable[str],
+        shouldStop: Callable[[], bool] = lambda: False,
+        onProgress: Optional[Callable[[int, int], None]] = None,
+    ) -> FileDeletionReport:
+        fileIds = list(fileIds)
+        progress = FileDeletionProgress.load(self.progressPath)
+        report = FileDeletionReport()
+        alreadyDeleted = set(progress.deleted)
+        report.previouslyDeleted = [
+            f for f in dict.fromkeys(fileIds) if f in alreadyDeleted
+        ]
+        batches = self.batches(fileIds, skip=alreadyDeleted)
+        total = len(report.previouslyDeleted) + sum(len(b) for b in batches)
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            for batch in batches:
+                if shouldStop():
+                    return report
+                for fileId, metadata, error in executor.map(self._deleteOne, batch):
+                    if error is None:
+                        report.deleted[fileId] = metadata
+                        progress.deleted.append(fileId)
+                    else:
+                        report.failed[fileId] = error
+                progress.save(failed=report.failed)
+                if onProgress is not None:
+                    onProgress(report.numDeleted + len(report.failed), total)
+        report.completed = True
+        if not report.failed:
+            progress.clear()
+        return report
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from dm.common.constants import dmProcessingStatus
 from dm.common.constants.dmExperimentConstants import DM_EXPERIMENT_NAME_KEY
@@ -7,10 +8,24 @@ from dm.common.constants.dmProcessingConstants import DM_DATA_DIRECTORY_KEY
 from dm.common.objects.dmObject import DmObject
 from dm.daq_web_service.api.experimentDaqApi import ExperimentDaqApi
 
+from .transferStateCache import TransferStateCache
+
+# Oldest transfer states (in seconds) to trust before deleting data
+TRANSFER_STATE_MAX_AGE = 1.0
+
 
 @dataclass
 class DataTransferMonitor:
     experimentDaqApi: ExperimentDaqApi
+    # Shared DAQ and upload lists, so checks don't each query the service
+    transferCache: Optional[TransferStateCache] = None
+
+    def __post_init__(self):
+        if self.transferCache is None:
+            self.transferCache = TransferStateCache(
+                listDaqs=self.experimentDaqApi.listDaqs,
+                listUploads=self.experimentDaqApi.listUploads,
+            )
 
     @staticmethod
     def _isMatchingExperimentDataTransferRunningOrPending(
@@ -26,16 +41,29 @@ class DataTransferMonitor:
 
         return result
 
+    # Checks DAQs and uploads from the same snapshot, no more than
+    # *maxAge* seconds old
+    def isTransferActive(
+        self, experimentName: str, maxAge: Optional[float] = None
+    ) -> bool:
+        snapshot = self.transferCache.get(maxAge)
+        return any(
+            self._isMatchingExperimentDataTransferRunningOrPending(
+                experimentName, transferInfo
+            )
+            for transferInfo in snapshot.daqs + snapshot.uploads
+        )
+
     def isDaqActive(self, experimentName: str) -> bool:
         return any(
             self._isMatchingExperimentDataTransferRunningOrPending(
                 experimentName, daqInfo
             )
-            for daqInfo in self.experimentDaqApi.listDaqs()
+            for daqInfo in self.transferCache.daqs()
         )
 
     def stopActiveDaqs(self, experimentName: str) -> None:
-        for daqInfo in self.experimentDaqApi.listDaqs():
+        for daqInfo in self.transferCache.refresh().daqs:
             if self._isMatchingExperimentDataTransferRunningOrPending(
                 experimentName, daqInfo
             ):
@@ -48,11 +76,11 @@ class DataTransferMonitor:
             self._isMatchingExperimentDataTransferRunningOrPending(
                 experimentName, upload
             )
-            for upload in self.experimentDaqApi.listUploads()
+            for upload in self.transferCache.uploads()
         )
 
     def stopActiveUploads(self, experimentName: str) -> None:
-        for uploadInfo in self.experimentDaqApi.listUploads():
+        for uploadInfo in self.transferCache.refresh().uploads:
             if self._isMatchingExperimentDataTransferRunningOrPending(
                 experimentName, uploadInfo
             ):
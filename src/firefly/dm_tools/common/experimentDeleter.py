@@ -7,7 +7,7 @@ from dm.common.objects.collectionMetadata import CollectionMetadata
 from dm.common.objects.experiment import Experiment
 from dm.ds_web_service.api.experimentDsApi import ExperimentDsApi
 
-from .dataTransferMonitor import DataTransferMonitor
+from .dataTransferMonitor import TRANSFER_STATE_MAX_AGE, DataTransferMonitor
 
 
 @dataclass
@@ -18,9 +18,10 @@ class ExperimentDeleter:
     stationName: str
 
     def canDeleteExperiment(self, experimentName: str) -> bool:
-        isDaqActive = self.dataTransferMonitor.isDaqActive(experimentName)
-        isUploadActive = self.dataTransferMonitor.isUploadActive(experimentName)
-        return not (isDaqActive or isUploadActive)
+        # Deleting needs recent transfer states, not the last poll
+        return not self.dataTransferMonitor.isTransferActive(
+            experimentName, maxAge=TRANSFER_STATE_MAX_AGE
+        )
 
     def deleteExperiment(
         self, experimentName: str
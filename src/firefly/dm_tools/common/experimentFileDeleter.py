@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
 
 from dm.cat_web_service.api.fileCatApi import FileCatApi
 from dm.common.constants.dmFileConstants import DM_COMPRESSION_KEY
@@ -6,7 +7,8 @@ from dm.common.constants.dmProcessingConstants import DM_EXPERIMENT_FILE_PATH_KE
 from dm.common.objects.fileMetadata import FileMetadata
 from dm.ds_web_service.api.fileDsApi import FileDsApi
 
-from .dataTransferMonitor import DataTransferMonitor
+from .batchFileDeleter import BatchFileDeleter, FileDeletionReport
+from .dataTransferMonitor import TRANSFER_STATE_MAX_AGE, DataTransferMonitor
 
 
 @dataclass
@@ -17,9 +19,10 @@ class ExperimentFileDeleter:
     stationName: str
 
     def canDeleteExperimentFiles(self, experimentName: str) -> bool:
-        isDaqActive = self.dataTransferMonitor.isDaqActive(experimentName)
-        isUploadActive = self.dataTransferMonitor.isUploadActive(experimentName)
-        return not (isDaqActive or isUploadActive)
+        # Deleting needs recent transfer states, not the last poll
+        return not self.dataTransferMonitor.isTransferActive(
+            experimentName, maxAge=TRANSFER_STATE_MAX_AGE
+        )
 
     def deleteExperimentFileById(
         self, experimentName: str, fileId: str, keepInStorage: bool = False
@@ -27,15 +30,49 @@ class ExperimentFileDeleter:
         fileMetadata = None
 
         if self.canDeleteExperimentFiles(experimentName):
-            fileMetadata = self.fileCatApi.deleteExperimentFileById(
-                experimentName, fileId
+            fileMetadata = self._deleteExperimentFile(
+                experimentName, fileId, keepInStorage
             )
 
-            if not keepInStorage:
-                experimentFilePath = fileMetadata.get(DM_EXPERIMENT_FILE_PATH_KEY)
-                compression = fileMetadata.get(DM_COMPRESSION_KEY)
-                self.fileDsApi.deleteFile(
-                    experimentFilePath, experimentName, self.stationName, compression
-                )
+        return fileMetadata
+
+    def deleteExperimentFiles(
+        self,
+        experimentName: str,
+        fileIds: Iterable[str],
+        keepInStorage: bool = False,
+        maxWorkers: int = 4,
+        batchSize: int = 200,
+        progressPath: Optional[str] = None,
+        shouldStop: Callable[[], bool] = lambda: False,
+        onProgress: Optional[Callable[[int, int], None]] = None,
+    ) -> FileDeletionReport:
+        fileIds = list(fileIds)
+        # Check for active transfers once, rather than for every file
+        if not self.canDeleteExperimentFiles(experimentName):
+            reason = f"Data transfer in progress for {experimentName}"
+            return FileDeletionReport(failed={fileId: reason for fileId in fileIds})
+
+        deleter = BatchFileDeleter(
+            deleteFile=lambda fileId: self._deleteExperimentFile(
+                experimentName, fileId, keepInStorage
+            ),
+            batchSize=batchSize,
+            maxWorkers=maxWorkers,
+            progressPath=progressPath,
+        )
+        return deleter.run(fileIds, shouldStop=shouldStop, onProgress=onProgress)
+
+    def _deleteExperimentFile(
+        self, experimentName: str, fileId: str, keepInStorage: bool
+    ) -> FileMetadata:
+        fileMetadata = self.fileCatApi.deleteExperimentFileById(experimentName, fileId)
+
+        if not keepInStorage:
+            experimentFilePath = fileMetadata.get(DM_EXPERIMENT_FILE_PATH_KEY)
+            compression = fileMetadata.get(DM_COMPRESSION_KEY)
+            self.fileDsApi.deleteFile(
+                experimentFilePath, experimentName, self.stationName, compression
+            )
 
         return fileMetadata
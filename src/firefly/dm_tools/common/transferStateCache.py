@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+log = logging.getLogger("dm_tools")
+
+
+@dataclass(frozen=True)
+class TransferSnapshot:
+    daqs: List[Any] = field(default_factory=list)
+    uploads: List[Any] = field(default_factory=list)
+    # time.monotonic() when the lists were fetched
+    timestamp: float = float("-inf")
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.timestamp
+
+
+# The latest DAQ and upload lists, shared by everything that needs them.
+#
+# A background poller keeps the snapshot up to date. Requests that
+# arrive while a fetch is already running wait for that fetch instead
+# of starting another one, and subscribers are called (from the
+# fetching thread) whenever the lists change.
+class TransferStateCache:
+    def __init__(
+        self,
+        listDaqs: Callable[[], List[Any]],
+        listUploads: Callable[[], List[Any]],
+        pollInterval: float = 10.0,
+    ):
+        self.listDaqs = listDaqs
+        self.listUploads = listUploads
+        self.pollInterval = pollInterval
+        self.lock = threading.Lock()
+        self.snapshot = TransferSnapshot()
+        self.inflight: Optional[Future] = None
+        self.subscribers: List[Callable[[TransferSnapshot], None]] = []
+        self.stopEvent = threading.Event()
+        self.pollThread: Optional[threading.Thread] = None
+
+    # Fetches new lists, or waits for a fetch that is already running
+    def refresh(self) -> TransferSnapshot:
+        with self.lock:
+            isOwner = self.inflight is None
+            if isOwner:
+                self.inflight = Future()
+            future = self.inflight
+        if not isOwner:
+            return future.result()
+        try:
+            snapshot = TransferSnapshot(
+                daqs=list(self.listDaqs()),
+                uploads=list(self.listUploads()),
+                timestamp=time.monotonic(),
+            )
+        except BaseException as exc:
+            with self.lock:
+                self.inflight = None
+            future.set_exception(exc)
+            raise
+        with self.lock:
+            previous = self.snapshot
+            self.snapshot = snapshot
+            self.inflight = None
+            subscribers = list(self.subscribers)
+        future.set_result(snapshot)
+        if snapshot.daqs != previous.daqs or snapshot.uploads != previous.uploads:
+            for callback in subscribers:
+                try:
+                    callback(snapshot)
+                except Exception:
+                    log.exception("Transfer state subscriber failed")
+        return snapshot
+
+    # Returns the cached lists, fetching new ones if they are older
+    # than *maxAge* seconds (by default, the polling interval).
+    def get(self, maxAge: Optional[float] = None) -> TransferSnapshot:
+        if maxAge is None:
+            maxAge = self.pollInterval
+        snapshot = self.snapshot
+        if snapshot.age > maxAge:
+            snapshot = self.refresh()
+        return snapshot
+
+    def daqs(self, maxAge: Optional[float] = None) -> List[Any]:
+        return self.get(maxAge).daqs
+
+    def uploads(self, maxAge: Optional[float] = None) -> List[Any]:
+        return self.get(maxAge).uploads
+
+    # Calls *callback* with each new snapshot. Returns a function that
+    # removes the subscription.
+    def subscribe(
+        self, callback: Callable[[TransferSnapshot], None]
+    ) -> Callable[[], None]:
+        with self.lock:
+            self.subscribers.append(callback)
+
+        def unsubscribe():
+            with self.lock:
+                if callback in self.subscribers:
+                    self.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def start(self) -> None:
+        if self.pollThread is not None and self.pollThread.is_alive():
+            return
+        self.stopEvent.clear()
+        self.pollThread = threading.Thread(
+            target=self._poll, name="TransferStateCache", daemon=True
+        )
+        self.pollThread.start()
+
+    def stop(self) -> None:
+        self.stopEvent.set()
+        if self.pollThread is not None:
+            self.pollThread.join()
+            self.pollThread = None
+
+    def _poll(self) -> None:
+        while not self.stopEvent.is_set():
+            # Skip polls that another consumer's refresh made unnecessary
+            delay = self.pollInterval - self.snapshot.age
+            if delay <= 0:
+                try:
+                    self.refresh()
+                except Exception as exc:
+                    log.warning(f"Could not poll data transfers: {exc}")
+                delay = self.pollInterval
+            self.stopEvent.wait(delay)
@@ -1,14 +1,35 @@
 #!/usr/bin/env python
 
+import threading
+
+from dm.common.exceptions.authorizationError import AuthorizationError
 from dm.common.utility.singleton import Singleton
 
 from haven.iconfig import load_config
 
+from ..common.transferStateCache import TransferStateCache
+from .apiPool import ApiPool, HostLimiter, PooledApi
+
 
+# Hands out API clients that share logged-in sessions.
+#
+# Each service has one pool of clients, shared by every tab and
+# thread, so that logging in only happens when a pool needs another
+# client or a session expires.
 class ApiFactory(Singleton):
+    # Clients kept for each service
+    POOL_SIZE = 4
+    # Requests sent to each host at the same time
+    MAX_REQUESTS_PER_HOST = 4
+    # Seconds between polls of the DAQ and upload lists
+    TRANSFER_POLL_INTERVAL = 10.0
 
     def __init__(self):
         self.__configure()
+        self.poolsLock = threading.Lock()
+        self.pools = {}
+        self.limiter = HostLimiter(self.MAX_REQUESTS_PER_HOST)
+        self.transferCache = None
 
     def __configure(self):
         config = load_config().data_management
@@ -21,56 +42,106 @@ class ApiFactory(Singleton):
         self.procUrl = config.workflow_uri
         self.apsDbUrl = config.scheduling_uri
 
+    # Returns an API that uses the shared pool of clients for *key*
+    def getPooledApi(self, key, createApi, url=None):
+        with self.poolsLock:
+            if key not in self.pools:
+                self.pools[key] = ApiPool(
+                    createApi,
+                    url=url,
+                    size=self.POOL_SIZE,
+                    limiter=self.limiter,
+                    authErrors=(AuthorizationError,),
+                )
+            return PooledApi(self.pools[key])
+
     def getUserDsApi(self):
         from dm.ds_web_service.api.userDsApi import UserDsApi
 
-        api = UserDsApi(self.username, self.password, self.dsUrl)
-        return api
+        return self.getPooledApi(
+            "UserDsApi",
+            lambda: UserDsApi(self.username, self.password, self.dsUrl),
+            self.dsUrl,
+        )
 
     def getEsafApsDbApi(self):
         from dm.aps_db_web_service.api.esafApsDbApi import EsafApsDbApi
 
-        api = EsafApsDbApi(self.username, self.password, self.apsDbUrl)
-        return api
+        return self.getPooledApi(
+            "EsafApsDbApi",
+            lambda: EsafApsDbApi(self.username, self.password, self.apsDbUrl),
+            self.apsDbUrl,
+        )
 
     def getExperimentDsApi(self):
         from dm.ds_web_service.api.experimentDsApi import ExperimentDsApi
 
-        api = ExperimentDsApi(self.username, self.password, self.dsUrl)
-        return api
+        return self.getPooledApi(
+            "ExperimentDsApi",
+            lambda: ExperimentDsApi(self.username, self.password, self.dsUrl),
+            self.dsUrl,
+        )
 
     def getFileDsApi(self):
         from dm.ds_web_service.api.fileDsApi import FileDsApi
 
-        api = FileDsApi(self.username, self.password, self.dsUrl)
-        return api
+        return self.getPooledApi(
+            "FileDsApi",
+            lambda: FileDsApi(self.username, self.password, self.dsUrl),
+            self.dsUrl,
+        )
 
     def getExperimentDaqApi(self):
         from dm.daq_web_service.api.experimentDaqApi import ExperimentDaqApi
 
-        api = ExperimentDaqApi(self.username, self.password, self.daqUrl)
-        return api
+        return self.getPooledApi(
+            "ExperimentDaqApi",
+            lambda: ExperimentDaqApi(self.username, self.password, self.daqUrl),
+            self.daqUrl,
+        )
 
     def getBssApsDbApi(self):
         from dm.aps_db_web_service.api.bssApsDbApi import BssApsDbApi
 
-        api = BssApsDbApi(self.username, self.password, self.apsDbUrl)
-        return api
+        return self.getPooledApi(
+            "BssApsDbApi",
+            lambda: BssApsDbApi(self.username, self.password, self.apsDbUrl),
+            self.apsDbUrl,
+        )
 
     def getApsUserDbApi(self):
         from dm.aps_user_db.api.apsUserDbApi import ApsUserDbApi
 
-        api = ApsUserDbApi()
-        return api
+        return self.getPooledApi("ApsUserDbApi", ApsUserDbApi)
 
     def getFileCatApi(self):
         from dm.cat_web_service.api.fileCatApi import FileCatApi
 
-        api = FileCatApi(self.username, self.password, self.catUrl)
-        return api
+        return self.getPooledApi(
+            "FileCatApi",
+            lambda: FileCatApi(self.username, self.password, self.catUrl),
+            self.catUrl,
+        )
 
     def getWorkflowApi(self):
         from dm.proc_web_service.api.workflowProcApi import WorkflowProcApi
 
-        api = WorkflowProcApi(self.username, self.password, self.procUrl)
-        return api
+        return self.getPooledApi(
+            "WorkflowProcApi",
+            lambda: WorkflowProcApi(self.username, self.password, self.procUrl),
+            self.procUrl,
+        )
+
+    # Returns the DAQ and upload lists shared by every tab, polled in the background
+    def getTransferStateCache(self):
+        # getPooledApi() takes poolsLock too, so call it before locking
+        experimentDaqApi = self.getExperimentDaqApi()
+        with self.poolsLock:
+            if self.transferCache is None:
+                self.transferCache = TransferStateCache(
+                    listDaqs=experimentDaqApi.listDaqs,
+                    listUploads=experimentDaqApi.listUploads,
+                    pollInterval=self.TRANSFER_POLL_INTERVAL,
+                )
+                self.transferCache.start()
+            return self.transferCache
@@ -0,0 +1,122 @@
+import logging
+import threading
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+log = logging.getLogger("dm_tools")
+
+
+# Limits how many requests are sent to each host at once
+class HostLimiter:
+    def __init__(self, maxPerHost):
+        self.maxPerHost = maxPerHost
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def semaphore(self, url):
+        host = urlparse(url).netloc if url else ""
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.maxPerHost)
+            return self.semaphores[host]
+
+
+# Keeps logged-in API clients for one service endpoint, so that each
+# client's session is reused instead of logging in for every request.
+#
+# Each client is only used by one thread at a time. At most *size*
+# clients are created; further threads wait for a client to be
+# returned. If a call fails with one of *authErrors*, the client's
+# session has expired, so the client is replaced by a newly logged-in
+# one and the call is tried once more. If that fails too, the new
+# client is dropped.
+class ApiPool:
+    def __init__(self, createApi, url=None, size=4, limiter=None, authErrors=()):
+        self.createApi = createApi
+        self.url = url
+        self.size = size
+        self.limiter = limiter
+        self.authErrors = tuple(authErrors)
+        self.condition = threading.Condition()
+        # Most recently used client last, so its session is the freshest
+        self.idle = []
+        self.numClients = 0
+
+    def acquire(self):
+        with self.condition:
+            while not self.idle and self.numClients >= self.size:
+                self.condition.wait()
+            if self.idle:
+                return self.idle.pop()
+            self.numClients += 1
+        try:
+            return self.createApi()
+        except BaseException:
+            self.discard(None)
+            raise
+
+    def release(self, api):
+        with self.condition:
+            self.idle.append(api)
+            self.condition.notify()
+
+    # Forgets a client, e.g. because its session is no longer valid
+    def discard(self, api):
+        with self.condition:
+            self.numClients -= 1
+            self.condition.notify()
+
+    def call(self, name, *args, **kwargs):
+        if self.limiter is None:
+            hostLimit = nullcontext()
+        else:
+            hostLimit = self.limiter.semaphore(self.url)
+        with hostLimit:
+            api = self.acquire()
+            try:
+                result = getattr(api, name)(*args, **kwargs)
+            except self.authErrors as exc:
+                log.debug(
+                    "Session for %s expired, logging in again: %s" % (self.url, exc)
+                )
+            except BaseException:
+                self.release(api)
+                raise
+            else:
+                self.release(api)
+                return result
+            # The idle clients may have expired too (e.g. the server
+            # restarted), so log in a new client in this one's place
+            try:
+                api = self.createApi()
+            except BaseException:
+                self.discard(api)
+                raise
+            try:
+                result = getattr(api, name)(*args, **kwargs)
+            except BaseException:
+                self.discard(api)
+                raise
+            self.release(api)
+            return result
+
+
+# Stands in for an API client, sending each method call through a pool
+class PooledApi:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, name):
+        api = self._pool.acquire()
+        try:
+            attr = getattr(api, name)
+        finally:
+            self._pool.release(api)
+        if not callable(attr):
+            return attr
+
+        def pooledCall(*args, **kwargs):
+            return self._pool.call(name, *args, **kwargs)
+
+        pooledCall.__name__ = name
+        return pooledCall
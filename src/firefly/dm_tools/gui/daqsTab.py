@@ -1,24 +1,10 @@
 import logging
 
 from dm.common.constants.dmExperimentConstants import DM_EXPERIMENT_NAME_KEY
-from dm.common.constants.dmObjectLabels import DM_ID_KEY, DM_STATUS_KEY
-from dm.common.constants.dmProcessingConstants import (
-    DM_COUNT_FILES_KEY,
-    DM_DATA_DIRECTORY_KEY,
-    DM_N_PROCESSED_FILES_KEY,
-    DM_N_PROCESSING_ERRORS_KEY,
-    DM_N_WAITING_FILES_KEY,
-    DM_PERCENTAGE_COMPLETE_KEY,
-    DM_PROCESSING_ERRORS_KEY,
-    DM_START_TIMESTAMP_KEY,
-)
-from dm.common.constants.dmProcessingStatus import (
-    DM_ACTIVE_PROCESSING_STATUS_LIST,
-    DM_INACTIVE_PROCESSING_STATUS_LIST,
-    DM_PROCESSING_STATUS_DONE,
-)
+from dm.common.constants.dmObjectLabels import DM_ID_KEY
+from dm.common.constants.dmProcessingConstants import DM_DATA_DIRECTORY_KEY
 from dm.common.exceptions.communicationError import CommunicationError
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QSortFilterProxyModel, Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette
 from PyQt5.QtWidgets import (
     QAbstractItemView,
@@ -28,6 +14,7 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QSizePolicy,
     QSpacerItem,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QWidget,
@@ -35,28 +22,34 @@ from PyQt5.QtWidgets import (
 
 from .apiFactory import ApiFactory
 from .subclasses import customSelectionModel, customStyledDelegate
-from .subclasses.style import (
-    DM_FONT_ARIAL_KEY,
-    DM_GUI_BROWN,
-    DM_GUI_GOLD,
-    DM_GUI_GREEN,
-    DM_GUI_LIGHT_GREY,
-    DM_GUI_RED,
-    DM_GUI_WHITE,
+from .subclasses.style import DM_FONT_ARIAL_KEY, DM_GUI_LIGHT_GREY, DM_GUI_WHITE
+from .subclasses.transferColumns import (
+    STATUS_COLUMN,
+    TRANSFER_COLUMNS,
+    isActive,
+    transferRowColor,
 )
+from .subclasses.transferTableModel import FetchTransfersThread, TransferTableModel
 
 log = logging.getLogger("dm_tools")
 
 
 # Define the DAQs tab content:
 class DaqsTab(QWidget):
+    # Emitted from the transfer poller when DAQs or uploads change
+    transfersChanged = pyqtSignal(object)
+
     def __init__(self, stationName, parent, id=-1):
         super(DaqsTab, self).__init__(parent)
         self.stationName = stationName
         self.parent = parent
         self.showingDetails = 0
+        self.daqList = []
         self.experimentDaqApi = ApiFactory.getInstance().getExperimentDaqApi()
+        self.transferCache = ApiFactory.getInstance().getTransferStateCache()
         self.daqsTabLayout()
+        self.transfersChanged.connect(lambda snapshot: self.setDaqList(snapshot.daqs))
+        self.transferCache.subscribe(self.transfersChanged.emit)
 
     # GUI layout where each block is a row on the grid
     def daqsTabLayout(self):
@@ -84,10 +77,23 @@ class DaqsTab(QWidget):
 
         grid.addItem(QSpacerItem(20, 30, QSizePolicy.Expanding), 2, 0)
 
-        self.daqTable = QTableWidget()
+        self.daqModel = TransferTableModel(
+            TRANSFER_COLUMNS, DM_ID_KEY, rowColor=transferRowColor, parent=self
+        )
+        self.daqProxy = QSortFilterProxyModel(self)
+        self.daqProxy.setSourceModel(self.daqModel)
+        self.fetchThread = None
+        self.refreshPending = False
+
+        self.daqTable = QTableView()
+        self.daqTable.setModel(self.daqProxy)
+        self.daqTable.setSortingEnabled(True)
+        self.daqTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.daqTable.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.daqTable.horizontalHeader().setStretchLastSection(True)
         self.daqTable.clicked.connect(self.checkFail)
         self.daqTable.clicked.connect(self.enableDetails)
-        self.daqTable.cellDoubleClicked.connect(self.toggleDetails)
+        self.daqTable.doubleClicked.connect(self.toggleDetails)
         self.daqTable.setSelectionMode(QAbstractItemView.SingleSelection)
         self.daqTable.setItemDelegate(
             customStyledDelegate.CustomStyledDelegate(self.daqTable, self)
@@ -153,75 +159,52 @@ class DaqsTab(QWidget):
             self.daqTable.hide()
             self.daqDetails()
             self.detailsTable.show()
-        else:
+        # Fetch the daqs in the background, then update changed rows
+        if self.fetchThread is not None and self.fetchThread.isRunning():
+            self.refreshPending = True
+            return
+        self.fetchThread = FetchTransfersThread(
+            lambda: self.transferCache.refresh().daqs, self
+        )
+        self.fetchThread.fetchingComplete.connect(self.setDaqList)
+        self.fetchThread.errorOccurred.connect(self.fetchFailed)
+        self.fetchThread.finished.connect(self.fetchFinished)
+        self.fetchThread.start()
+
+    def setDaqList(self, daqList):
+        self.daqList = daqList
+        self.daqModel.setTransfers(daqList)
+        self.updateButtons()
+
+    def fetchFailed(self, exc):
+        if not isinstance(exc, CommunicationError):
+            raise exc
+        log.error(exc)
+        self.setDaqList([])
+
+    def fetchFinished(self):
+        if self.refreshPending:
+            self.refreshPending = False
+            self.updateList()
+
+    # Returns the source model row of the selected daq, or None
+    def selectedRow(self):
+        index = self.daqTable.currentIndex()
+        if not index.isValid() or not self.daqTable.selectionModel().hasSelection():
+            return None
+        return self.daqProxy.mapToSource(index).row()
+
+    def selectedId(self):
+        return self.daqModel.transferId(self.selectedRow())
+
+    # Keeps the buttons in step with the selection after a refresh
+    def updateButtons(self):
+        if self.selectedRow() is None:
             self.clearBtn.setEnabled(False)
             self.stopBtn.setEnabled(False)
             self.detailBtn.setEnabled(False)
-        self.daqTable.setSortingEnabled(False)
-        self.daqTable.clearSelection()
-        try:
-            self.daqList = self.experimentDaqApi.listDaqs()
-        except CommunicationError as exc:
-            log.error(exc)
-            self.daqList = []
-        self.daqTable.setRowCount(len(self.daqList))
-        self.daqTable.setColumnCount(8)
-        self.daqTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.daqTable.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.daqTable.setHorizontalHeaderLabels(
-            "Name;Status;Start Date;Files;Processed;Waiting;Errors;% Completed;".split(
-                ";"
-            )
-        )
-        self.daqTable.horizontalHeader().setStretchLastSection(True)
-
-        i = 0
-        for daq in self.daqList:
-            rowName = QTableWidgetItem(daq.get(DM_EXPERIMENT_NAME_KEY))
-            rowName.setData(Qt.UserRole, daq.get(DM_ID_KEY))
-            rowStatus = QTableWidgetItem(daq.get(DM_STATUS_KEY))
-            rowSDate = QTableWidgetItem(daq.get(DM_START_TIMESTAMP_KEY)[:10])
-            rowFileNum = QTableWidgetItem(str(daq.get(DM_COUNT_FILES_KEY)))
-            rowCompleted = QTableWidgetItem(str(daq.get(DM_N_PROCESSED_FILES_KEY)))
-            rowWaiting = QTableWidgetItem(str(daq.get(DM_N_WAITING_FILES_KEY)))
-            rowErrors = QTableWidgetItem(str(daq.get(DM_N_PROCESSING_ERRORS_KEY)))
-            rowPerCompleted = QTableWidgetItem(str(daq.get(DM_PERCENTAGE_COMPLETE_KEY)))
-            rowDataDir = str(daq.get(DM_DATA_DIRECTORY_KEY))
-            if len(rowDataDir) > 100:
-                for j in range(len(rowDataDir)):
-                    if j % 50 == 0 and j != 0:
-                        rowDataDir = rowDataDir[:j] + " " + rowDataDir[j:]
-            rowDataDir = QTableWidgetItem(rowDataDir)
-            columns = [
-                rowName,
-                rowStatus,
-                rowSDate,
-                rowFileNum,
-                rowCompleted,
-                rowWaiting,
-                rowErrors,
-                rowPerCompleted,
-            ]
-            for j in range(len(columns)):
-                self.daqTable.setItem(i, j, columns[j])
-
-            errors = daq.get(DM_PROCESSING_ERRORS_KEY)
-            rowColor = DM_GUI_GOLD
-            if rowStatus.text() == DM_PROCESSING_STATUS_DONE:
-                rowColor = DM_GUI_GREEN
-            elif rowStatus.text() in DM_ACTIVE_PROCESSING_STATUS_LIST:
-                if errors:
-                    rowColor = DM_GUI_BROWN
-                else:
-                    rowColor = DM_GUI_GOLD
-            elif rowStatus.text() in DM_INACTIVE_PROCESSING_STATUS_LIST:
-                # already checked for 'done', so other inactive statuses are failures
-                rowColor = DM_GUI_RED
-            for column in columns:
-                column.setBackground(rowColor)
-
-            i += 1
-        self.daqTable.setSortingEnabled(True)
+        elif self.daqTable.isVisible():
+            self.checkFail()
 
     # Expands the targetted row to fit contents when doubleclicked
     def expandRow(self, row, column):
@@ -229,7 +212,7 @@ class DaqsTab(QWidget):
 
     # Stops the daq that is selected
     def stopDaq(self):
-        id = self.daqTable.item(self.daqTable.currentRow(), 0).data(Qt.UserRole)
+        id = self.selectedId()
         allInfo = self.experimentDaqApi.getDaqInfo(id)
         self.experimentDaqApi.stopDaq(
             allInfo[DM_EXPERIMENT_NAME_KEY], allInfo[DM_DATA_DIRECTORY_KEY]
@@ -238,7 +221,7 @@ class DaqsTab(QWidget):
 
     # Clears the history of the daq from the DB and refreshes the table
     def clearDaq(self):
-        id = self.daqTable.item(self.daqTable.currentRow(), 0).data(Qt.UserRole)
+        id = self.selectedId()
         self.experimentDaqApi.clearDaq(id)
         self.parent.refreshTables()
         self.daqTable.clearSelection()
@@ -276,7 +259,7 @@ class DaqsTab(QWidget):
 
     def daqDetails(self):
         self.detailsTable.setSortingEnabled(False)
-        id = self.daqTable.item(self.daqTable.currentRow(), 0).data(Qt.UserRole)
+        id = self.selectedId()
         self.daqTable.clearFocus()
         allInfo = self.experimentDaqApi.getDaqInfo(id)
 
@@ -303,10 +286,11 @@ class DaqsTab(QWidget):
 
     # Disables the stop daq button if the daq has already failed or stopped.
     def checkFail(self):
-        if (
-            self.daqTable.item(self.daqTable.currentRow(), 1).text()
-            in DM_ACTIVE_PROCESSING_STATUS_LIST
-        ):
+        row = self.selectedRow()
+        if row is None:
+            return
+        status = self.daqModel.index(row, STATUS_COLUMN).data()
+        if isActive(status):
             self.stopBtn.setEnabled(True)
             self.clearBtn.setEnabled(False)
         else:
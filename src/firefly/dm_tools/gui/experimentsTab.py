@@ -52,7 +52,8 @@ class ExperimentsTab(QWidget):
         self.userApi = ApiFactory.getInstance().getUserDsApi()
         self.fileCatApi = ApiFactory.getInstance().getFileCatApi()
         self.dataTransferMonitor = DataTransferMonitor(
-            experimentDaqApi=ApiFactory.getInstance().getExperimentDaqApi()
+            experimentDaqApi=ApiFactory.getInstance().getExperimentDaqApi(),
+            transferCache=ApiFactory.getInstance().getTransferStateCache(),
         )
         self.experimentDeleter = ExperimentDeleter(
             dataTransferMonitor=self.dataTransferMonitor,
@@ -28,7 +28,6 @@ from PyQt5.QtWidgets import (
     QLabel,
     QLineEdit,
     QMessageBox,
-    QProgressDialog,
     QPushButton,
     QSizePolicy,
     QSpacerItem,
@@ -39,20 +38,18 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from haven import load_config
+
 from .apiFactory import ApiFactory
 from .objects.userInfo import UserInfo
-from .subclasses import (
-    customSelectionModel,
-    customSortFilterProxyModel,
-    customStyledDelegate,
-    frozenTable,
-)
+from .subclasses import customSelectionModel, customStyledDelegate, frozenTable
 from .subclasses.style import (
     DM_FONT_ARIAL_KEY,
     DM_FONT_TIMES_KEY,
     DM_GUI_LIGHT_GREY,
     DM_GUI_WHITE,
 )
+from .subclasses.userDirectory import UserDirectory, UserDirectoryModel
 
 log = logging.getLogger("dm_tools")
 
@@ -71,7 +68,10 @@ class ManageUsersTab(QWidget):
         self.esafPropApi = ApiFactory.getInstance().getEsafApsDbApi()
         self.userApi = ApiFactory.getInstance().getUserDsApi()
         self.manageUsersTabLayout()
-        self.userLoadThread = GetUsersThread(self.userApi)
+        config = load_config().data_management
+        self.userLoadThread = GetUsersThread(
+            self.userApi, config.user_cache_filepath, config.user_cache_ttl
+        )
         self.userLoadThread.sendUsers.connect(self.sendUsers)
         self.userLoadThread.start()
 
@@ -122,9 +122,8 @@ class ManageUsersTab(QWidget):
         )
         self.availableUserTable.doubleClicked.connect(self.moveToCurrent)
         self.availableUserTable.hide()
-        self.allUserTableModel = QStandardItemModel()
+        self.allUserTableModel = UserDirectoryModel(parent=self)
         self.allUserTable = frozenTable.FreezeTableWidget(self, self.allUserTableModel)
-        # self.allUserTable.setModel(self.allUserTableModel)
         self.allUserTable.doubleClicked.connect(self.moveToCurrent)
         self.allUserTable.setItemDelegate(
             customStyledDelegate.CustomStyledDelegate(self.allUserTable, self)
@@ -493,59 +492,16 @@ class ManageUsersTab(QWidget):
 
     # Permanently setup the allUserTable
     def cacheUsers(self):
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-        objectAllUsers = []
-        count = 0
-        pd = QProgressDialog(
-            "Caching APS Users...", "Cancel", 0, len(self.parent.allUsers)
-        )
-        buttonToHide = QPushButton()
-        pd.setCancelButton(buttonToHide)
-        buttonToHide.hide()
-        pd.setWindowModality(Qt.WindowModal)
-        for x in self.parent.allUsers:
-            uInfo = UserInfo(x)
-            objectAllUsers.append(uInfo)
-        for user in objectAllUsers:
-            rowUsername = QStandardItem(user.getUsername())
-            if rowUsername is None:
-                continue
-            rowFirstName = QStandardItem(user.getFirstName())
-            rowLastName = QStandardItem(user.getLastName())
-            rowEmail = QStandardItem(user.getEmail())
-            if rowEmail is None:
-                rowEmail = QStandardItem("")
-            self.allUserTableModel.appendRow(
-                [rowUsername, rowFirstName, rowLastName, rowEmail]
-            )
-            if count % 2000 == 0:
-                pd.setValue(count)
-            count += 1
-        self.allUserTable.setModel(self.allUserTableModel)
-        self.parent.allUsers = objectAllUsers
-        self.allUserTableModel.setRowCount(len(self.parent.allUsers))
-
-        # QStandardItemModel somehow appends an additional column, so starting with 3 columns results in 4.
-        self.allUserTableModel.setColumnCount(4)
+        if isinstance(self.parent.allUsers, UserDirectory):
+            self.allUserTableModel.setDirectory(self.parent.allUsers)
         self.allUserTable.horizontalHeader().setStretchLastSection(True)
-        # self.allUserTable.horizontalHeader().sortIndicatorChanged.connect(self.sortIndicatorChanged)
         self.allUserTable.setSelectionMode(QAbstractItemView.SingleSelection)
         self.allUserTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.allUserTableModel.setHorizontalHeaderLabels(
-            "Username;First;Last;Email;".split(";")
-        )
-        self.allUserTableModel.takeColumn(4)
-        self.allUserTableModel.insertRow(0)
-
-        # Sets up the proxy for filtering, must be done after model is prebuilt and added to view for speed
-        self.proxy = customSortFilterProxyModel.CustomSortFilterProxyModel()
-        self.proxy.setDynamicSortFilter(True)
-        self.proxy.setSourceModel(self.allUserTableModel)
-        self.allUserTable.setModel(self.proxy)
+        # Filtering and sorting are done by the model itself
+        self.allUserTable.setModel(self.allUserTableModel)
         self.allUserTable.setSelectionModel(
             customSelectionModel.CustomSelectionModel(self, self.allUserTable.model())
         )
-        QApplication.restoreOverrideCursor()
 
     # Moves all selected users in both tables to the other table
     def moveUsers(self, qtVar=-1, selected=True, database=True):
@@ -562,11 +518,10 @@ class ManageUsersTab(QWidget):
                     self.availableUserTable.model().takeRow(index.row())
             else:
                 selectedAvailable = [
-                    self.allUserTableModel.item(
-                        self.allUserTable.model().mapToSource(x).row(), 0
-                    ).text()
+                    self.allUserTableModel.username(x.row())
                     for x in self.allUserTable.selectionModel().selectedIndexes()
                 ]
+                selectedAvailable = [x for x in selectedAvailable if x is not None]
             for username in selectedAvailable:
                 user = self.userApi.getUserByUsername(username)
                 self.parent.currentUsers.append(UserInfo(user))
@@ -580,14 +535,7 @@ class ManageUsersTab(QWidget):
                 for user in self.parent.currentUsers:
                     if user.username == username:
                         self.parent.currentUsers.remove(user)
-                        self.allUserTableModel.appendRow(
-                            [
-                                QStandardItem(user.getUsername()),
-                                QStandardItem(user.getFirstName()),
-                                QStandardItem(user.getLastName()),
-                                QStandardItem(user.getEmail()),
-                            ]
-                        )
+                        self.showUser(user)
         self.updateCurrentUsers()
         self.filterAllUserTable()
         if self.availableUserTable.isVisible():
@@ -607,18 +555,8 @@ class ManageUsersTab(QWidget):
     def addFilter(self, text, column):
         if column in self.filters and text == self.filters[column]:
             return
-        QApplication.setOverrideCursor(Qt.WaitCursor)
         self.filters[column] = text
-        for key in self.filters:
-            if key == 0:
-                self.proxy.setUsernameFilter(str(self.filters[key]).lower())
-            elif key == 1:
-                self.proxy.setFirstFilter(str(self.filters[key]).lower())
-            elif key == 2:
-                self.proxy.setLastFilter(str(self.filters[key]).lower())
-            elif key == 3:
-                self.proxy.setEmailFilter(str(self.filters[key]).lower())
-        QApplication.restoreOverrideCursor()
+        self.allUserTableModel.setFilter(column, text)
 
     # Reverts the changes made in the gui
     def revertChanges(self):
@@ -632,31 +570,24 @@ class ManageUsersTab(QWidget):
     # Adds the users back to the allUser table when switching experiments
     def experimentSwitched(self):
         for user in self.parent.currentUsers:
-            temp = self.allUserTableModel.findItems(
-                user.getUsername(), Qt.MatchExactly, 0
-            )
-            if len(temp) > 1 or user.getUsername() in self.parent.beamlineManagers:
+            if user.getUsername() in self.parent.beamlineManagers:
                 continue
-            elif len(temp) == 0:
-                self.allUserTableModel.appendRow(
-                    [
-                        QStandardItem(user.getUsername()),
-                        QStandardItem(user.getFirstName()),
-                        QStandardItem(user.getLastName()),
-                        QStandardItem(user.getEmail()),
-                    ]
-                )
+            self.showUser(user)
+
+    # Shows a user in the allUser table, adding them if they aren't in the directory
+    def showUser(self, user):
+        self.allUserTableModel.showUser(
+            user.getUsername(),
+            user.getFirstName(),
+            user.getLastName(),
+            user.getEmail(),
+            user.getBadge(),
+        )
 
+    # Hides the current users from the allUser table
     def filterAllUserTable(self):
-        usernames = []
-        for x in self.parent.currentUsers:
-            username = x.getUsername()
-            usernames.append(username)
-
-        for username in usernames:
-            temp = self.allUserTableModel.findItems(username, Qt.MatchExactly, 0)
-            for t in temp:
-                self.allUserTableModel.removeRow(t.row())
+        usernames = [x.getUsername() for x in self.parent.currentUsers]
+        self.allUserTableModel.setHiddenUsernames(usernames)
         self.allUserTable.clearSelection()
         self.allUserTable.clearFocus()
 
@@ -665,16 +596,6 @@ class ManageUsersTab(QWidget):
         self.parent.genParamsTab.fillUser()
         self.parent.genParamsTab.saveUsers()
 
-    # Catches indicator change from freezeTable and makes sure that there is an empty row under the filters
-    def sortCatcher(self, sortOrder):
-        origin = self.allUserTable.verticalHeader().logicalIndex(0)
-        if sortOrder == Qt.AscendingOrder:
-            self.allUserTable.verticalHeader().moveSection(
-                self.allUserTable.verticalHeader().count() - 1, origin
-            )
-        else:
-            self.allUserTable.verticalHeader().moveSection(0, origin)
-
     # Toggle between showing proposals and esafs
     def proposalDBToggle(self):
         QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -696,9 +617,12 @@ class ManageUsersTab(QWidget):
         self.updateRun()
         QApplication.restoreOverrideCursor()
 
-    # Stores the user changes to the parent
+    # Stores the user directory once it has been loaded
     def sendUsers(self, users):
         self.parent.allUsers = users
+        if not self.parent.setupAllTable:
+            # The table was already shown, so fill it in now
+            self.allUserTableModel.setDirectory(users)
 
     # Manually updates the tableView
     def updateView(self, index):
@@ -757,20 +681,42 @@ class ManageUsersTab(QWidget):
         msg.exec_()
 
 
+# Loads the user directory from the disk cache, or from DM if the cache is stale
 class GetUsersThread(QThread):
     sendUsers = pyqtSignal(object, name="sendUsers")
 
-    def __init__(self, userApi):
+    def __init__(self, userApi, cachePath=None, cacheTtl=0):
         QThread.__init__(self)
         self.userApi = userApi
+        self.cachePath = cachePath
+        self.cacheTtl = cacheTtl
 
     def __del__(self):
         self.wait()
 
     def run(self):
-        try:
-            allUsers = self.userApi.getUsers()
-        except CommunicationError as exc:
-            log.error(exc)
-            allUsers = []
-        self.sendUsers.emit(allUsers)
+        directory = None
+        if self.cachePath is not None:
+            directory = UserDirectory.load(self.cachePath, self.cacheTtl)
+        if directory is None:
+            try:
+                allUsers = self.userApi.getUsers()
+            except CommunicationError as exc:
+                log.error(exc)
+                allUsers = []
+            directory = UserDirectory.fromRecords(
+                (
+                    user.getUsername(),
+                    user.getFirstName(),
+                    user.getLastName(),
+                    user.getEmail(),
+                    user.getBadge(),
+                )
+                for user in (UserInfo(x) for x in allUsers)
+            )
+            if allUsers and self.cachePath is not None:
+                try:
+                    directory.save(self.cachePath)
+                except OSError as exc:
+                    log.warning("Could not cache user directory: %s" % exc)
+        self.sendUsers.emit(directory)
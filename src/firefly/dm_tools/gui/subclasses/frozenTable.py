@@ -123,4 +123,3 @@ class FreezeTableWidget(QTableView):
         self.frozenTableView.horizontalHeader().setSortIndicatorShown(True)
         self.sortByColumn(column, sortOrder)
         self.horizontalHeader().setSortIndicator(column, sortOrder)
-        self.parent.sortCatcher(sortOrder)
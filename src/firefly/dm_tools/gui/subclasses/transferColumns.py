@@ -0,0 +1,56 @@
+from dm.common.constants.dmExperimentConstants import DM_EXPERIMENT_NAME_KEY
+from dm.common.constants.dmObjectLabels import DM_STATUS_KEY
+from dm.common.constants.dmProcessingConstants import (
+    DM_COUNT_FILES_KEY,
+    DM_N_PROCESSED_FILES_KEY,
+    DM_N_PROCESSING_ERRORS_KEY,
+    DM_N_WAITING_FILES_KEY,
+    DM_PERCENTAGE_COMPLETE_KEY,
+    DM_PROCESSING_ERRORS_KEY,
+    DM_START_TIMESTAMP_KEY,
+)
+from dm.common.constants.dmProcessingStatus import (
+    DM_ACTIVE_PROCESSING_STATUS_LIST,
+    DM_INACTIVE_PROCESSING_STATUS_LIST,
+    DM_PROCESSING_STATUS_DONE,
+)
+
+from .style import DM_GUI_BROWN, DM_GUI_GOLD, DM_GUI_GREEN, DM_GUI_RED
+
+# Column index of each transfer's status
+STATUS_COLUMN = 1
+
+# Columns shown for DAQs and uploads, as (header, function(transfer))
+TRANSFER_COLUMNS = [
+    ("Name", lambda transfer: transfer.get(DM_EXPERIMENT_NAME_KEY)),
+    ("Status", lambda transfer: transfer.get(DM_STATUS_KEY)),
+    ("Start Date", lambda transfer: transfer.get(DM_START_TIMESTAMP_KEY)[:10]),
+    ("Files", lambda transfer: str(transfer.get(DM_COUNT_FILES_KEY))),
+    ("Processed", lambda transfer: str(transfer.get(DM_N_PROCESSED_FILES_KEY))),
+    ("Waiting", lambda transfer: str(transfer.get(DM_N_WAITING_FILES_KEY))),
+    ("Errors", lambda transfer: str(transfer.get(DM_N_PROCESSING_ERRORS_KEY))),
+    ("% Completed", lambda transfer: str(transfer.get(DM_PERCENTAGE_COMPLETE_KEY))),
+]
+
+
+# Background color for a DAQ or upload, based on its status
+def transferRowColor(transfer):
+    status = transfer.get(DM_STATUS_KEY)
+    errors = transfer.get(DM_PROCESSING_ERRORS_KEY)
+    rowColor = DM_GUI_GOLD
+    if status == DM_PROCESSING_STATUS_DONE:
+        rowColor = DM_GUI_GREEN
+    elif status in DM_ACTIVE_PROCESSING_STATUS_LIST:
+        if errors:
+            rowColor = DM_GUI_BROWN
+        else:
+            rowColor = DM_GUI_GOLD
+    elif status in DM_INACTIVE_PROCESSING_STATUS_LIST:
+        # already checked for 'done', so other inactive statuses are failures
+        rowColor = DM_GUI_RED
+    return rowColor
+
+
+# Returns True if the transfer can still be stopped
+def isActive(status):
+    return status in DM_ACTIVE_PROCESSING_STATUS_LIST
@@ -0,0 +1,152 @@
+import logging
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QThread, pyqtSignal
+
+log = logging.getLogger("dm_tools")
+
+
+# Table of DAQs or uploads that is updated in place.
+#
+# Each refresh is compared with the current rows by transfer ID, so
+# that only rows whose text or color has changed emit dataChanged,
+# and rows are only inserted or removed when transfers appear or
+# disappear. Views keep their selection and scroll position across
+# refreshes.
+class TransferTableModel(QAbstractTableModel):
+    # columns: list of (header, function(transfer) -> str)
+    # idKey: key holding each transfer's unique ID
+    # rowColor: function(transfer) -> QColor for the row background
+    def __init__(self, columns, idKey, rowColor=None, parent=None):
+        super(TransferTableModel, self).__init__(parent)
+        self.columns = list(columns)
+        self.idKey = idKey
+        self.rowColor = rowColor
+        self.transfers = []
+        self.ids = []
+        self.rowTexts = []
+        self.rowColors = []
+        self.rowIndex = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.transfers)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.rowTexts[row][index.column()]
+        elif role == Qt.BackgroundRole:
+            return self.rowColors[row]
+        elif role == Qt.UserRole:
+            return self.ids[row]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super(TransferTableModel, self).headerData(section, orientation, role)
+
+    # Returns the transfer shown in the given (source model) row
+    def transfer(self, row):
+        return self.transfers[row]
+
+    def transferId(self, row):
+        return self.ids[row]
+
+    # Returns the row of the transfer with the given ID, or None
+    def rowForId(self, transferId):
+        return self.rowIndex.get(transferId)
+
+    def _render(self, transfer):
+        texts = tuple(getter(transfer) for _, getter in self.columns)
+        color = self.rowColor(transfer) if self.rowColor is not None else None
+        return texts, color
+
+    # Replaces the table contents with a new list of transfers.
+    # Returns the number of rows that were added, changed and removed.
+    def setTransfers(self, transfers):
+        newTransfers = {}
+        for transfer in transfers:
+            newTransfers[transfer.get(self.idKey)] = transfer
+
+        # Remove transfers that are gone, last rows first
+        removed = [row for row, id in enumerate(self.ids) if id not in newTransfers]
+        for first, last in reversed(self._runs(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.transfers[first : last + 1]
+            del self.ids[first : last + 1]
+            del self.rowTexts[first : last + 1]
+            del self.rowColors[first : last + 1]
+            self.endRemoveRows()
+        if removed:
+            self.rowIndex = {id: row for row, id in enumerate(self.ids)}
+
+        # Update transfers that have changed
+        changed = []
+        for row, id in enumerate(self.ids):
+            transfer = newTransfers[id]
+            texts, color = self._render(transfer)
+            self.transfers[row] = transfer
+            if texts != self.rowTexts[row] or color != self.rowColors[row]:
+                self.rowTexts[row] = texts
+                self.rowColors[row] = color
+                changed.append(row)
+        lastColumn = len(self.columns) - 1
+        for first, last in self._runs(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, lastColumn))
+
+        # Add new transfers at the end
+        added = [
+            transfer for id, transfer in newTransfers.items() if id not in self.rowIndex
+        ]
+        if added:
+            first = len(self.transfers)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for transfer in added:
+                texts, color = self._render(transfer)
+                id = transfer.get(self.idKey)
+                self.rowIndex[id] = len(self.ids)
+                self.transfers.append(transfer)
+                self.ids.append(id)
+                self.rowTexts.append(texts)
+                self.rowColors.append(color)
+            self.endInsertRows()
+        return len(added), len(changed), len(removed)
+
+    # Groups sorted row numbers into (first, last) runs of adjacent rows
+    @staticmethod
+    def _runs(rows):
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return [tuple(run) for run in runs]
+
+
+# Fetches the list of transfers without blocking the GUI
+class FetchTransfersThread(QThread):
+    fetchingComplete = pyqtSignal([list])
+    errorOccurred = pyqtSignal([Exception])
+
+    def __init__(self, fetch, parent=None):
+        super(FetchTransfersThread, self).__init__(parent)
+        self.fetch = fetch
+
+    def run(self):
+        try:
+            transfers = self.fetch()
+        except Exception as ex:
+            log.debug("Could not fetch transfers: %s" % ex)
+            self.errorOccurred.emit(ex)
+            return
+        self.fetchingComplete.emit(list(transfers))
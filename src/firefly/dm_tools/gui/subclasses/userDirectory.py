@@ -0,0 +1,291 @@
+import logging
+import os
+import re
+import time
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+log = logging.getLogger("dm_tools")
+
+# Words used for searching, e.g. "Mary-Jo" -> ["mary", "jo"]
+TOKEN_SPLIT = re.compile(r"[\W_]+")
+# Sorts after any other character, used to find the end of a prefix range
+PREFIX_END = "\U0010ffff"
+
+
+def tokenize(text):
+    return [token for token in TOKEN_SPLIT.split(str(text).lower()) if token]
+
+
+# Directory of all users, stored as one array per column.
+#
+# Each table column has a search index: a sorted array of every word
+# in that column, with a matching array of the rows each word came
+# from. Prefix searches are then two binary searches into the sorted
+# words, instead of a scan over every user.
+class UserDirectory:
+    FIELDS = ("usernames", "firstNames", "lastNames", "emails", "badges")
+    # Which fields are searched for each table column
+    INDEXED_FIELDS = {
+        0: ("usernames", "badges"),
+        1: ("firstNames",),
+        2: ("lastNames",),
+        3: ("emails",),
+    }
+
+    def __init__(
+        self,
+        usernames=(),
+        firstNames=(),
+        lastNames=(),
+        emails=(),
+        badges=(),
+        created=None,
+        indexes=None,
+    ):
+        self.usernames = np.asarray(usernames, dtype=str)
+        self.firstNames = np.asarray(firstNames, dtype=str)
+        self.lastNames = np.asarray(lastNames, dtype=str)
+        self.emails = np.asarray(emails, dtype=str)
+        self.badges = np.asarray(badges, dtype=str)
+        self.created = time.time() if created is None else created
+        if indexes is None:
+            indexes = {
+                column: self.buildIndex(fields)
+                for column, fields in self.INDEXED_FIELDS.items()
+            }
+        self.indexes = indexes
+        self.sortKeys = {}
+        self.usernameRows = None
+
+    # records: iterable of (username, first, last, email, badge)
+    @classmethod
+    def fromRecords(cls, records):
+        records = list(records)
+        if not records:
+            return cls()
+        return cls(*zip(*(["" if x is None else str(x) for x in r] for r in records)))
+
+    def __len__(self):
+        return len(self.usernames)
+
+    def record(self, row):
+        return tuple(str(getattr(self, field)[row]) for field in self.FIELDS)
+
+    def buildIndex(self, fields):
+        tokens = []
+        rows = []
+        for field in fields:
+            for row, value in enumerate(getattr(self, field)):
+                for token in set(tokenize(value)):
+                    tokens.append(token)
+                    rows.append(row)
+        tokens = np.asarray(tokens, dtype=str)
+        rows = np.asarray(rows, dtype=np.int32)
+        order = np.argsort(tokens, kind="stable")
+        return tokens[order], rows[order]
+
+    # Returns the rows with a word starting with *prefix* in *column*
+    def prefixRows(self, prefix, column):
+        tokens, rows = self.indexes[column]
+        first = np.searchsorted(tokens, prefix, side="left")
+        last = np.searchsorted(tokens, prefix + PREFIX_END, side="left")
+        return rows[first:last]
+
+    # Returns the sorted rows where every word in *text* is the start
+    # of a word in *column* (any column if None), or None if *text*
+    # has no words.
+    def search(self, text, column=None):
+        columns = list(self.indexes) if column is None else [column]
+        matches = None
+        for word in tokenize(text):
+            wordRows = np.unique(
+                np.concatenate([self.prefixRows(word, col) for col in columns])
+            )
+            if matches is None:
+                matches = wordRows
+            else:
+                matches = np.intersect1d(matches, wordRows, assume_unique=True)
+        return matches
+
+    def rowForUsername(self, username):
+        if self.usernameRows is None:
+            self.usernameRows = {
+                str(name): row for row, name in enumerate(self.usernames)
+            }
+        return self.usernameRows.get(username)
+
+    # Lower-case values of a column, used for sorting
+    def sortKey(self, column):
+        if column not in self.sortKeys:
+            field = self.FIELDS[column]
+            self.sortKeys[column] = np.char.lower(getattr(self, field))
+        return self.sortKeys[column]
+
+    # Adds a user that was not part of the fetched directory
+    def addUser(self, username, firstName, lastName, email, badge=""):
+        values = (username, firstName, lastName, email, badge)
+        record = ["" if x is None else str(x) for x in values]
+        row = len(self)
+        for field, value in zip(self.FIELDS, record):
+            setattr(self, field, np.append(getattr(self, field), value))
+        for column, fields in self.INDEXED_FIELDS.items():
+            tokens, rows = self.indexes[column]
+            newTokens = sorted(
+                set(
+                    token
+                    for field in fields
+                    for token in tokenize(getattr(self, field)[row])
+                )
+            )
+            positions = np.searchsorted(tokens, newTokens, side="right")
+            self.indexes[column] = (
+                np.insert(tokens, positions, newTokens),
+                np.insert(rows, positions, row),
+            )
+        self.sortKeys = {}
+        if self.usernameRows is not None:
+            self.usernameRows[record[0]] = row
+        return row
+
+    # Saves the directory and its indexes to disk
+    def save(self, path):
+        arrays = {field: getattr(self, field) for field in self.FIELDS}
+        for column, (tokens, rows) in self.indexes.items():
+            arrays["tokens%d" % column] = tokens
+            arrays["rows%d" % column] = rows
+        arrays["created"] = np.asarray(self.created)
+        # The directory has every user's name and email, so keep it
+        # private to the current user
+        os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        tmpPath = "%s.%d.tmp" % (path, os.getpid())
+        fd = os.open(tmpPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as fp:
+            np.savez(fp, **arrays)
+        os.replace(tmpPath, path)
+
+    # Loads a saved directory, or returns None if it is missing, older
+    # than *ttl* seconds, or unreadable.
+    @classmethod
+    def load(cls, path, ttl):
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                created = float(data["created"])
+                if (time.time() - created) >= ttl:
+                    log.debug("User directory cache %s has expired" % path)
+                    return None
+                fields = {field: data[field] for field in cls.FIELDS}
+                indexes = {
+                    column: (data["tokens%d" % column], data["rows%d" % column])
+                    for column in cls.INDEXED_FIELDS
+                }
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as exc:
+            log.warning("Could not read user directory cache %s: %s" % (path, exc))
+            return None
+        return cls(created=created, indexes=indexes, **fields)
+
+
+# Table of the user directory, filtered and sorted without creating
+# an item for each user.
+#
+# The first row is left blank, so it can sit under the filter
+# widgets of a frozen table.
+class UserDirectoryModel(QAbstractTableModel):
+    HEADERS = ("Username", "First", "Last", "Email")
+    BLANK_ROWS = 1
+
+    def __init__(self, directory=None, parent=None):
+        super(UserDirectoryModel, self).__init__(parent)
+        self.directory = UserDirectory() if directory is None else directory
+        self.filters = {}
+        self.hidden = set()
+        self.sortColumn = None
+        self.sortOrder = Qt.AscendingOrder
+        self.rows = np.arange(len(self.directory))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.BLANK_ROWS + len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.directoryRow(index.row())
+        if row is None:
+            return None
+        field = UserDirectory.FIELDS[index.column()]
+        return str(getattr(self.directory, field)[row])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super(UserDirectoryModel, self).headerData(section, orientation, role)
+
+    # Returns the directory row shown in a table row, or None if blank
+    def directoryRow(self, row):
+        if row < self.BLANK_ROWS or row >= self.rowCount():
+            return None
+        return int(self.rows[row - self.BLANK_ROWS])
+
+    def username(self, row):
+        row = self.directoryRow(row)
+        if row is None:
+            return None
+        return str(self.directory.usernames[row])
+
+    def setDirectory(self, directory):
+        self.directory = directory
+        self.refilter()
+
+    # Shows only users with a word in *column* starting with each word in *text*
+    def setFilter(self, column, text):
+        self.filters[column] = text
+        self.refilter()
+
+    # Hides users, e.g. those already in the experiment
+    def setHiddenUsernames(self, usernames):
+        self.hidden = set(usernames)
+        self.refilter()
+
+    # Shows a user, adding them to the directory if needed
+    def showUser(self, username, firstName, lastName, email, badge=""):
+        self.hidden.discard(username)
+        if self.directory.rowForUsername(username) is None:
+            self.directory.addUser(username, firstName, lastName, email, badge)
+        self.refilter()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sortColumn = column
+        self.sortOrder = order
+        self.refilter()
+
+    def refilter(self):
+        rows = None
+        for column, text in self.filters.items():
+            matches = self.directory.search(text, column)
+            if matches is None:
+                continue
+            rows = matches if rows is None else np.intersect1d(rows, matches)
+        if rows is None:
+            rows = np.arange(len(self.directory))
+        hiddenRows = [self.directory.rowForUsername(name) for name in self.hidden]
+        hiddenRows = [row for row in hiddenRows if row is not None]
+        if hiddenRows:
+            rows = np.setdiff1d(rows, hiddenRows, assume_unique=True)
+        if self.sortColumn is not None:
+            keys = self.directory.sortKey(self.sortColumn)[rows]
+            rows = rows[np.argsort(keys, kind="stable")]
+            if self.sortOrder == Qt.DescendingOrder:
+                rows = rows[::-1]
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
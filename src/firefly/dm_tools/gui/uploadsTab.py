@@ -1,24 +1,8 @@
 import logging
 
-from dm.common.constants.dmExperimentConstants import DM_EXPERIMENT_NAME_KEY
-from dm.common.constants.dmObjectLabels import DM_ID_KEY, DM_STATUS_KEY
-from dm.common.constants.dmProcessingConstants import (
-    DM_COUNT_FILES_KEY,
-    DM_DATA_DIRECTORY_KEY,
-    DM_N_PROCESSED_FILES_KEY,
-    DM_N_PROCESSING_ERRORS_KEY,
-    DM_N_WAITING_FILES_KEY,
-    DM_PERCENTAGE_COMPLETE_KEY,
-    DM_PROCESSING_ERRORS_KEY,
-    DM_START_TIMESTAMP_KEY,
-)
-from dm.common.constants.dmProcessingStatus import (
-    DM_ACTIVE_PROCESSING_STATUS_LIST,
-    DM_INACTIVE_PROCESSING_STATUS_LIST,
-    DM_PROCESSING_STATUS_DONE,
-)
+from dm.common.constants.dmObjectLabels import DM_ID_KEY
 from dm.common.exceptions.communicationError import CommunicationError
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QSortFilterProxyModel, Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette
 from PyQt5.QtWidgets import (
     QAbstractItemView,
@@ -28,6 +12,7 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QSizePolicy,
     QSpacerItem,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QWidget,
@@ -35,28 +20,36 @@ from PyQt5.QtWidgets import (
 
 from .apiFactory import ApiFactory
 from .subclasses import customSelectionModel, customStyledDelegate
-from .subclasses.style import (
-    DM_FONT_ARIAL_KEY,
-    DM_GUI_BROWN,
-    DM_GUI_GOLD,
-    DM_GUI_GREEN,
-    DM_GUI_LIGHT_GREY,
-    DM_GUI_RED,
-    DM_GUI_WHITE,
+from .subclasses.style import DM_FONT_ARIAL_KEY, DM_GUI_LIGHT_GREY, DM_GUI_WHITE
+from .subclasses.transferColumns import (
+    STATUS_COLUMN,
+    TRANSFER_COLUMNS,
+    isActive,
+    transferRowColor,
 )
+from .subclasses.transferTableModel import FetchTransfersThread, TransferTableModel
 
 log = logging.getLogger("dm_tools")
 
 
 # Define the experiments tab content:
 class UploadsTab(QWidget):
+    # Emitted from the transfer poller when DAQs or uploads change
+    transfersChanged = pyqtSignal(object)
+
     def __init__(self, stationName, parent, id=-1):
         super(UploadsTab, self).__init__(parent)
         self.stationName = stationName
         self.parent = parent
         self.showingDetails = 0
+        self.uploadList = []
         self.experimentDaqApi = ApiFactory.getInstance().getExperimentDaqApi()
+        self.transferCache = ApiFactory.getInstance().getTransferStateCache()
         self.uploadTabLayout()
+        self.transfersChanged.connect(
+            lambda snapshot: self.setUploadList(snapshot.uploads)
+        )
+        self.transferCache.subscribe(self.transfersChanged.emit)
 
     # GUI layout where each block is a row on the grid
     def uploadTabLayout(self):
@@ -84,10 +77,23 @@ class UploadsTab(QWidget):
 
         grid.addItem(QSpacerItem(20, 30, QSizePolicy.Expanding), 2, 0)
 
-        self.tableWidget = QTableWidget()
+        self.uploadModel = TransferTableModel(
+            TRANSFER_COLUMNS, DM_ID_KEY, rowColor=transferRowColor, parent=self
+        )
+        self.uploadProxy = QSortFilterProxyModel(self)
+        self.uploadProxy.setSourceModel(self.uploadModel)
+        self.fetchThread = None
+        self.refreshPending = False
+
+        self.tableWidget = QTableView()
+        self.tableWidget.setModel(self.uploadProxy)
+        self.tableWidget.setSortingEnabled(True)
+        self.tableWidget.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tableWidget.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tableWidget.horizontalHeader().setStretchLastSection(True)
         self.tableWidget.clicked.connect(self.checkFail)
         self.tableWidget.clicked.connect(self.enableDetails)
-        self.tableWidget.cellDoubleClicked.connect(self.toggleDetails)
+        self.tableWidget.doubleClicked.connect(self.toggleDetails)
         self.tableWidget.setItemDelegate(
             customStyledDelegate.CustomStyledDelegate(self.tableWidget, self)
         )
@@ -151,77 +157,52 @@ class UploadsTab(QWidget):
             self.tableWidget.hide()
             self.uploadDetails()
             self.detailsTable.show()
-        else:
+        # Fetch the uploads in the background, then update changed rows
+        if self.fetchThread is not None and self.fetchThread.isRunning():
+            self.refreshPending = True
+            return
+        self.fetchThread = FetchTransfersThread(
+            lambda: self.transferCache.refresh().uploads, self
+        )
+        self.fetchThread.fetchingComplete.connect(self.setUploadList)
+        self.fetchThread.errorOccurred.connect(self.fetchFailed)
+        self.fetchThread.finished.connect(self.fetchFinished)
+        self.fetchThread.start()
+
+    def setUploadList(self, uploadList):
+        self.uploadList = uploadList
+        self.uploadModel.setTransfers(uploadList)
+        self.updateButtons()
+
+    def fetchFailed(self, exc):
+        if not isinstance(exc, CommunicationError):
+            raise exc
+        log.error(exc)
+        self.setUploadList([])
+
+    def fetchFinished(self):
+        if self.refreshPending:
+            self.refreshPending = False
+            self.updateList()
+
+    # Returns the source model row of the selected upload, or None
+    def selectedRow(self):
+        index = self.tableWidget.currentIndex()
+        if not index.isValid() or not self.tableWidget.selectionModel().hasSelection():
+            return None
+        return self.uploadProxy.mapToSource(index).row()
+
+    def selectedId(self):
+        return self.uploadModel.transferId(self.selectedRow())
+
+    # Keeps the buttons in step with the selection after a refresh
+    def updateButtons(self):
+        if self.selectedRow() is None:
             self.clearBtn.setEnabled(False)
             self.stopBtn.setEnabled(False)
             self.detailBtn.setEnabled(False)
-        self.tableWidget.setSortingEnabled(False)
-        self.tableWidget.clearSelection()
-        try:
-            self.uploadList = self.experimentDaqApi.listUploads()
-        except CommunicationError as exc:
-            log.error(exc)
-            self.uploadList = []
-        self.tableWidget.setRowCount(len(self.uploadList))
-        self.tableWidget.setColumnCount(8)
-        self.tableWidget.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.tableWidget.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.tableWidget.setHorizontalHeaderLabels(
-            "Name;Status;Start Date;Files;Processed;Waiting;Errors;% Completed;".split(
-                ";"
-            )
-        )
-        self.tableWidget.horizontalHeader().setStretchLastSection(True)
-
-        i = 0
-        for upload in self.uploadList:
-            rowName = QTableWidgetItem(upload.get(DM_EXPERIMENT_NAME_KEY))
-            rowName.setData(Qt.UserRole, upload.get(DM_ID_KEY))
-            rowStatus = QTableWidgetItem(upload.get(DM_STATUS_KEY))
-            rowSDate = QTableWidgetItem(upload.get(DM_START_TIMESTAMP_KEY)[:10])
-            rowFileNum = QTableWidgetItem(str(upload.get(DM_COUNT_FILES_KEY)))
-            rowCompleted = QTableWidgetItem(str(upload.get(DM_N_PROCESSED_FILES_KEY)))
-            rowWaiting = QTableWidgetItem(str(upload.get(DM_N_WAITING_FILES_KEY)))
-            rowErrors = QTableWidgetItem(str(upload.get(DM_N_PROCESSING_ERRORS_KEY)))
-            rowPerCompleted = QTableWidgetItem(
-                str(upload.get(DM_PERCENTAGE_COMPLETE_KEY))
-            )
-            rowDataDir = str(upload.get(DM_DATA_DIRECTORY_KEY))
-            if len(rowDataDir) > 100:
-                for j in range(len(rowDataDir)):
-                    if j % 50 == 0 and j != 0:
-                        rowDataDir = rowDataDir[:j] + " " + rowDataDir[j:]
-            rowDataDir = QTableWidgetItem(rowDataDir)
-            columns = [
-                rowName,
-                rowStatus,
-                rowSDate,
-                rowFileNum,
-                rowCompleted,
-                rowWaiting,
-                rowErrors,
-                rowPerCompleted,
-            ]
-            for j in range(len(columns)):
-                self.tableWidget.setItem(i, j, columns[j])
-
-            errors = upload.get(DM_PROCESSING_ERRORS_KEY)
-            rowColor = DM_GUI_GOLD
-            if rowStatus.text() == DM_PROCESSING_STATUS_DONE:
-                rowColor = DM_GUI_GREEN
-            elif rowStatus.text() in DM_ACTIVE_PROCESSING_STATUS_LIST:
-                if errors:
-                    rowColor = DM_GUI_BROWN
-                else:
-                    rowColor = DM_GUI_GOLD
-            elif rowStatus.text() in DM_INACTIVE_PROCESSING_STATUS_LIST:
-                # already checked for 'done', so other inactive statuses are failures
-                rowColor = DM_GUI_RED
-            for column in columns:
-                column.setBackground(rowColor)
-
-            i += 1
-        self.tableWidget.setSortingEnabled(True)
+        elif self.tableWidget.isVisible():
+            self.checkFail()
 
     # Expands the selected row to fit contents
     def expandRow(self, row, column):
@@ -229,13 +210,13 @@ class UploadsTab(QWidget):
 
     # Stops the upload that is currently selected
     def stopUpload(self):
-        id = self.tableWidget.item(self.tableWidget.currentRow(), 0).data(Qt.UserRole)
+        id = self.selectedId()
         self.experimentDaqApi.stopUpload(id)
         self.updateList()
 
     # Clears the history of the upload from the DB and refreshes the table
     def clearUpload(self):
-        id = self.tableWidget.item(self.tableWidget.currentRow(), 0).data(Qt.UserRole)
+        id = self.selectedId()
         self.experimentDaqApi.clearUpload(id)
         self.parent.refreshTables()
         self.tableWidget.clearSelection()
@@ -276,7 +257,7 @@ class UploadsTab(QWidget):
 
     def uploadDetails(self):
         self.detailsTable.setSortingEnabled(False)
-        id = self.tableWidget.item(self.tableWidget.currentRow(), 0).data(Qt.UserRole)
+        id = self.selectedId()
         self.tableWidget.clearFocus()
         allInfo = self.experimentDaqApi.getUploadInfo(id)
 
@@ -304,10 +285,11 @@ class UploadsTab(QWidget):
 
     # Disables the stop upload button if the daq has already failed or stopped.
     def checkFail(self):
-        if (
-            self.tableWidget.item(self.tableWidget.currentRow(), 1).text()
-            in DM_ACTIVE_PROCESSING_STATUS_LIST
-        ):
+        row = self.selectedRow()
+        if row is None:
+            return
+        status = self.uploadModel.index(row, STATUS_COLUMN).data()
+        if isActive(status):
             self.stopBtn.setEnabled(True)
             self.clearBtn.setEnabled(False)
         else:
@@ -181,7 +181,8 @@ def main(default_fullscreen=False, default_display="status"):
             controller.start()
         # Get rid of the splash screen and show the first window
         splash.close()
-        controller.show_default_window()
+        with controller.startup_phase("show_window"):
+            controller.show_default_window()
         # Wait on the application to finish
         await app_close_event.wait()
 
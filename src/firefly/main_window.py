@@ -1,5 +1,4 @@
 import logging
-from itertools import chain
 from pathlib import Path
 from typing import Sequence
 
@@ -8,6 +7,7 @@ from pydm import data_plugins
 from pydm.main_window import PyDMMainWindow
 from qtpy import QtGui, QtWidgets
 
+from firefly.action import LazyWindowActions
 from firefly.queue_client import is_in_use
 from haven import load_config
 
@@ -180,6 +180,33 @@ class FireflyMainWindow(PyDMMainWindow):
         setattr(self, action_name, action)
         return action
 
+    def add_device_actions(self, menu: QtWidgets.QMenu, actions):
+        """Add a group of device actions to a menu.
+
+        Lazy groups are only built, and added to the menu, when
+        *menu* is first opened. They are put where they would have
+        been added.
+
+        """
+        if not isinstance(actions, LazyWindowActions):
+            for action in actions.values():
+                menu.addAction(action)
+            return
+        if len(actions) == 0:
+            return
+        # Hold the actions' place in the menu until they are needed
+        placeholder = QtWidgets.QAction(menu)
+        placeholder.setVisible(False)
+        menu.addAction(placeholder)
+
+        def build_actions():
+            menu.aboutToShow.disconnect(build_actions)
+            menu.insertActions(placeholder, list(actions.values()))
+            menu.removeAction(placeholder)
+            placeholder.deleteLater()
+
+        menu.aboutToShow.connect(build_actions)
+
     def setup_menu_actions(self, actions):
         self._setup_menu_actions(
             logs_window_action=actions.log,
@@ -258,40 +285,29 @@ class FireflyMainWindow(PyDMMainWindow):
         self.ui.positioners_menu.addAction(motors_action)
         motors_action.setIcon(qta.icon("mdi.cog-clockwise"))
         # Add actions to the motors sub-menus
-        for action in motor_actions.values():
-            self.ui.motors_menu.addAction(action)
+        self.add_device_actions(self.ui.motors_menu, motor_actions)
         # Menu to launch the Window to change energy
         self.ui.positioners_menu.addSection("Energy")
         self.ui.positioners_menu.addAction(energy_window_action)
-        energy_actions = chain(
-            [energy_window_action],
-            monochromator_actions.values(),
-            undulator_actions.values(),
-        )
-        for action in energy_actions:
-            self.ui.positioners_menu.addAction(action)
+        self.add_device_actions(self.ui.positioners_menu, monochromator_actions)
+        self.add_device_actions(self.ui.positioners_menu, undulator_actions)
         # Add optical components
-        for action in mirror_actions.values():
-            self.ui.positioners_menu.addAction(action)
+        self.add_device_actions(self.ui.positioners_menu, mirror_actions)
 
         if attenuators_action is not None:
             self.ui.positioners_menu.addAction(attenuators_action)
         if len(slits_actions) > 0:
             self.ui.positioners_menu.addSection("Slits")
-        for action in slits_actions.values():
-            self.ui.positioners_menu.addAction(action)
+        self.add_device_actions(self.ui.positioners_menu, slits_actions)
         if len(mirror_actions) > 0:
             self.ui.positioners_menu.addSection("Mirrors")
-        for action in mirror_actions.values():
-            self.ui.positioners_menu.addAction(action)
+        self.add_device_actions(self.ui.positioners_menu, mirror_actions)
         if len(table_actions) > 0:
             self.ui.positioners_menu.addSection("Tables")
-        for action in table_actions.values():
-            self.ui.positioners_menu.addAction(action)
+        self.add_device_actions(self.ui.positioners_menu, table_actions)
         if len(robot_actions) > 0:
             self.ui.positioners_menu.addSection("Robots")
-        for action in robot_actions.values():
-            self.ui.positioners_menu.addAction(action)
+        self.add_device_actions(self.ui.positioners_menu, robot_actions)
         # Add actions to the individual plans
         for action in plan_actions.values():
             self.ui.plans_menu.addAction(action)
@@ -305,16 +321,14 @@ class FireflyMainWindow(PyDMMainWindow):
             self.ui.ion_chambers_menu.setTitle("&Ion Chambers")
             self.ui.detectors_menu.addAction(self.ui.ion_chambers_menu.menuAction())
             # Add actions for the individual ion chambers
-            for action in ion_chamber_actions.values():
-                self.ui.ion_chambers_menu.addAction(action)
+            self.add_device_actions(self.ui.ion_chambers_menu, ion_chamber_actions)
         # Cameras sub-menu
         self.ui.menuCameras = QtWidgets.QMenu(self.ui.menubar)
         self.ui.menuCameras.setObjectName("menuCameras")
         self.ui.menuCameras.setTitle("Cameras")
         self.ui.detectors_menu.addAction(self.ui.menuCameras.menuAction())
         # Add actions to the cameras sub-menus
-        for action in camera_actions.values():
-            self.ui.menuCameras.addAction(action)
+        self.add_device_actions(self.ui.menuCameras, camera_actions)
         if len(camera_actions) > 0:
             self.ui.menuCameras.addSeparator()
         for action in ptz_camera_actions.values():
@@ -322,13 +336,11 @@ class FireflyMainWindow(PyDMMainWindow):
         # Add area detectors to detectors menu
         if len(area_detector_actions) > 0:
             self.ui.detectors_menu.addSeparator()
-        for action in area_detector_actions.values():
-            self.ui.detectors_menu.addAction(action)
+        self.add_device_actions(self.ui.detectors_menu, area_detector_actions)
         # Add XRF detectors to detectors menu
         if len(xrf_detector_actions) > 0:
             self.ui.detectors_menu.addSeparator()
-        for action in xrf_detector_actions.values():
-            self.ui.detectors_menu.addAction(action)
+        self.add_device_actions(self.ui.detectors_menu, xrf_detector_actions)
         # Add other menu actions
         if status_window_action is not None:
             self.ui.menuView.addAction(status_window_action)
@@ -5,6 +5,7 @@ import operator
 from collections.abc import Sequence
 from dataclasses import dataclass
 from functools import partial, reduce
+from typing import Any
 
 import numpy as np
 from ophyd_async.core import Device
@@ -116,6 +117,7 @@ class GridRegionsManager[WidgetsType](RegionsManager):
             device=device,
             widgets=[widgets.start_spin_box, widgets.stop_spin_box],
             is_relative=self.is_relative,
+            cache=self.device_parameters,
         )
 
     async def update_devices(self, registry=None, *, rows: Sequence[int] | None = None):
@@ -147,15 +149,23 @@ class GridRegionsManager[WidgetsType](RegionsManager):
         """Adjust the target position based on relative/aboslute mode."""
         self.is_relative = bool(is_relative)
         for row in self.row_numbers:
-            widgets = self.row_widgets(row)
-            device = widgets.device_selector.current_component()
-            if device is None:
-                continue
-            await make_relative(
-                device=device,
-                widgets=[widgets.start_spin_box, widgets.stop_spin_box],
-                is_relative=self.is_relative,
-            )
+            await self.make_row_relative(row)
+
+    async def make_row_relative(self, row: int):
+        widgets = self.row_widgets(row)
+        device = widgets.device_selector.current_component()
+        if device is None:
+            return
+        await make_relative(
+            device=device,
+            widgets=[widgets.start_spin_box, widgets.stop_spin_box],
+            is_relative=self.is_relative,
+            cache=self.device_parameters,
+        )
+
+    async def refresh_row(self, row: int, state: dict[str, Any]):
+        await super().refresh_row(row, state)
+        self.update_step_size(row=row)
 
     @Slot()
     def update_step_size(self, row: int):
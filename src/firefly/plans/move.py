@@ -83,6 +83,7 @@ class MotorRegionsManager(RegionsManager):
             device=device,
             widgets=[widgets.position_spin_box],
             is_relative=self.is_relative,
+            cache=self.device_parameters,
         )
 
     @asyncSlot(int)
@@ -90,15 +91,19 @@ class MotorRegionsManager(RegionsManager):
         """Adjust the target position based on relative/aboslute mode."""
         self.is_relative = bool(is_relative)
         for row in self.row_numbers:
-            widgets = self.row_widgets(row)
-            device = widgets.device_selector.current_component()
-            if device is None:
-                continue
-            await make_relative(
-                device=device,
-                widgets=[widgets.position_spin_box],
-                is_relative=self.is_relative,
-            )
+            await self.make_row_relative(row)
+
+    async def make_row_relative(self, row: int):
+        widgets = self.row_widgets(row)
+        device = widgets.device_selector.current_component()
+        if device is None:
+            return
+        await make_relative(
+            device=device,
+            widgets=[widgets.position_spin_box],
+            is_relative=self.is_relative,
+            cache=self.device_parameters,
+        )
 
 
 class MoveMotorDisplay(display.PlanStubDisplay):
@@ -22,7 +22,9 @@ to a `Region` object.
 
 import asyncio
 import logging
+import time
 from collections.abc import Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass, fields
 from functools import partial
 from typing import Any, Generator, cast
@@ -86,6 +88,39 @@ async def device_parameters(device: Device) -> DeviceParameters:
     )
 
 
+class DeviceParametersCache:
+    """Share device parameters between the rows of a regions table.
+
+    Rows that use the same device, or that are updated at the same
+    time, only read the device once. Since the device's position and
+    limits can change, parameters older than *max_age* seconds are
+    read again.
+
+    """
+
+    def __init__(self, max_age: float = 1.0):
+        self.max_age = max_age
+        self._requests: dict[Device, tuple[float, asyncio.Future]] = {}
+
+    async def get(self, device: Device) -> DeviceParameters:
+        now = time.monotonic()
+        timestamp, request = self._requests.get(device, (float("-inf"), None))
+        is_stale = now - timestamp > self.max_age
+        has_failed = (
+            request is not None
+            and request.done()
+            and (request.cancelled() or request.exception() is not None)
+        )
+        if request is None or is_stale or has_failed:
+            request = asyncio.ensure_future(device_parameters(device))
+            self._requests[device] = (now, request)
+        # Other rows may be waiting on the same request
+        return await asyncio.shield(request)
+
+    def clear(self):
+        self._requests.clear()
+
+
 def iter_widgets(
     widgets, include_checkbox: bool = False
 ) -> Generator[QWidget, Any, None]:
@@ -119,10 +154,13 @@ HALF_SPACE = "\u202f"
 
 
 async def update_device_parameters(
-    device: Device, widgets: Sequence[QDoubleSpinBox | QSpinBox], is_relative: bool
+    device: Device,
+    widgets: Sequence[QDoubleSpinBox | QSpinBox],
+    is_relative: bool,
+    cache: DeviceParametersCache | None = None,
 ):
     """Update the *widgets*' properties based on a *device*."""
-    params = await device_parameters(device)
+    params = await (device_parameters(device) if cache is None else cache.get(device))
     set_limits(widgets=widgets, params=params, is_relative=is_relative)
     for widget in widgets:
         widget.setEnabled(params.is_numeric)
@@ -139,10 +177,13 @@ async def update_device_parameters(
 
 
 async def make_relative(
-    device: Device, widgets: Sequence[QDoubleSpinBox | QSpinBox], is_relative: bool
+    device: Device,
+    widgets: Sequence[QDoubleSpinBox | QSpinBox],
+    is_relative: bool,
+    cache: DeviceParametersCache | None = None,
 ):
     """Make *widgets* be relative to the *device* position."""
-    params = await device_parameters(device)
+    params = await (device_parameters(device) if cache is None else cache.get(device))
     # Get last values first to avoid limit crossing
     if is_relative:
         new_positions = [widget.value() - params.current_value for widget in widgets]
@@ -173,11 +214,18 @@ def set_limits(
 
 
 class RegionsManager[WidgetsType](QObject):
-    """Contains variable number of plan parameter regions in a table."""
+    """Contains variable number of plan parameter regions in a table.
+
+    Removed rows are hidden rather than destroyed, and are shown again
+    if the number of regions grows back, so their widgets are only
+    built once.
+
+    """
 
     layout: QGridLayout
     header_rows = 1
     is_relative: bool
+    device_parameters: DeviceParametersCache
     _device_registry = None
 
     # Qt signals
@@ -207,11 +255,58 @@ class RegionsManager[WidgetsType](QObject):
         """Create the widgets that are to go in each row, in order."""
         return []
 
+    async def make_row_relative(self, row: int):
+        """Convert *row* between relative and absolute positions to
+        match ``self.is_relative``.
+
+        """
+        pass
+
+    def row_state(self) -> dict[str, Any]:
+        """Describe the manager-wide settings that each row depends on.
+
+        This gets saved along with a removed row, so that
+        ``refresh_row()`` can catch the row up if it is added back.
+
+        """
+        return {
+            "registry_version": self._registry_version,
+            "is_relative": self.is_relative,
+            "rows_enabled": self._rows_enabled,
+        }
+
+    async def refresh_row(self, row: int, state: dict[str, Any]):
+        """Apply changes made while a re-used *row* was hidden.
+
+        Parameters
+        ==========
+        row
+          The layout row that was just added back.
+        state
+          The output of ``row_state()`` from when the row was removed.
+
+        """
+        # Only look up devices again if they changed while hidden
+        if state["registry_version"] != self._registry_version:
+            await self.update_devices(None, rows=[row])
+        if state["is_relative"] != self.is_relative:
+            await self.make_row_relative(row)
+        if state["rows_enabled"] != self._rows_enabled:
+            _, enabled = self._rows_enabled
+            self.row_widgets(row).active_checkbox.setChecked(enabled)  # type: ignore
+
     # Implementation details below, not meant to be sub-classed
 
     def __init__(self, *args, layout: QGridLayout, is_relative: bool = False, **kwargs):
         self.is_relative = is_relative
         self.layout = layout
+        self.device_parameters = DeviceParametersCache()
+        # Hidden widgets from removed rows, and the ``row_state()``
+        # from when they were removed, keyed by row number
+        self._spare_rows: dict[int, tuple[list[QWidget], dict[str, Any]]] = {}
+        self._registry_version = 0
+        # How many times all rows were enabled/disabled, and which one
+        self._rows_enabled: tuple[int, bool] | None = None
         super().__init__(*args, **kwargs)
 
     def __iter__(self) -> Generator[Region, None, None]:
@@ -238,27 +333,29 @@ class RegionsManager[WidgetsType](QObject):
 
         """
         layout = self.layout
-        ncols = layout.columnCount()
-        nrows = layout.rowCount()
-        row_widgets = {
-            row: [layout.itemAtPosition(row, col) for col in range(ncols)]
-            for row in range(self.header_rows, nrows)
-        }
-        row_has_widgets = {
-            row: any([widget is not None for widget in widgets])
-            for row, widgets in row_widgets.items()
-        }
-        num_regions = sum(row_has_widgets.values())
+        # Look at each item once, since ``itemAtPosition()`` has to
+        # search the whole layout
+        rows = {layout.getItemPosition(idx)[0] for idx in range(layout.count())}
+        num_regions = len([row for row in rows if row >= self.header_rows])
         return num_regions
 
     async def add_row(self):
         """Add a single row to the regions layout.
 
         Each row includes a checkbox, and everything produced by
-        `self.row_widgets()`.
+        `self.row_widgets()`. If this row was removed earlier, its
+        widgets are re-used as they were.
 
         """
         row = len(self) + self.header_rows
+        if row in self._spare_rows:
+            widgets, state = self._spare_rows.pop(row)
+            with self.batch_updates():
+                for column, widget in enumerate(widgets):
+                    self.layout.addWidget(widget, row, column, alignment=Qt.AlignTop)
+                    widget.show()
+            await self.refresh_row(row, state)
+            return row
         # Create a checkbox that will enable/disable the whole region
         checkbox = QCheckBox()
         checkbox.setChecked(True)
@@ -266,8 +363,9 @@ class RegionsManager[WidgetsType](QObject):
         checkbox.stateChanged.connect(self.regions_changed)
         row_widgets = await self.create_row_widgets(row=row)
         widgets = [checkbox, *row_widgets]
-        for column, widget in enumerate(widgets):
-            self.layout.addWidget(widget, row, column, alignment=Qt.AlignTop)
+        with self.batch_updates():
+            for column, widget in enumerate(widgets):
+                self.layout.addWidget(widget, row, column, alignment=Qt.AlignTop)
         await self.update_devices(None, rows=[row])
         return row
 
@@ -277,16 +375,32 @@ class RegionsManager[WidgetsType](QObject):
             registry = self._device_registry
         else:
             self._device_registry = registry
+            self._registry_version += 1
+            self.device_parameters.clear()
         if registry is None:
             log.info("Cannot set device widgets as no registry is available.")
         return registry
 
     def remove_row(self):
-        """Remove the last row of widgets from the layout."""
+        """Remove the last row of widgets from the layout.
+
+        The widgets are kept, hidden, for when the row is added back.
+
+        """
         row = len(self) + self.header_rows - 1
-        for widget in iter_widgets(self.row_widgets(row), include_checkbox=True):
-            self.layout.removeWidget(widget)
-            widget.deleteLater()
+        widgets = list(iter_widgets(self.row_widgets(row), include_checkbox=True))
+        # Hidden widgets need a parent, or showing them again would
+        # open each one in its own window
+        can_reuse = self.layout.parentWidget() is not None
+        with self.batch_updates():
+            for widget in widgets:
+                self.layout.removeWidget(widget)
+                if can_reuse:
+                    widget.hide()
+                else:
+                    widget.deleteLater()
+        if can_reuse:
+            self._spare_rows[row] = (widgets, self.row_state())
 
     def row_widgets(self, row: int) -> WidgetsType:
         layout = self.layout
@@ -304,6 +418,9 @@ class RegionsManager[WidgetsType](QObject):
 
     def enable_all_rows(self, enabled: bool):
         """Enable/disable all rows in the layout."""
+        # Hidden rows catch up when they get added back
+        count = 0 if self._rows_enabled is None else self._rows_enabled[0]
+        self._rows_enabled = (count + 1, bool(enabled))
         for row in self.row_numbers:
             widgets = self.row_widgets(row)
             checkbox = widgets.active_checkbox  # type: ignore
@@ -320,6 +437,29 @@ class RegionsManager[WidgetsType](QObject):
         for widget in iter_widgets(widgets):
             widget.setEnabled(enabled)
 
+    @contextmanager
+    def batch_updates(self):
+        """Hold back repaints and change notifications until the block
+        is done.
+
+        Only meant for synchronous changes to the layout; don't await
+        inside the block, or signals from other rows would be lost.
+        Callers should emit ``regions_changed`` themselves afterwards
+        if needed.
+
+        """
+        parent = self.layout.parentWidget()
+        was_blocked = self.blockSignals(True)
+        was_enabled = parent is not None and parent.updatesEnabled()
+        if was_enabled:
+            parent.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            if was_enabled:
+                parent.setUpdatesEnabled(True)
+            self.blockSignals(was_blocked)
+
     @asyncSlot(int)
     async def set_region_count(self, new_region_num: int):
         """Adjust regions from the scan params layout to reach
@@ -331,7 +471,10 @@ class RegionsManager[WidgetsType](QObject):
         new_regions = [
             (await self.add_row()) for i in range(old_region_num, new_region_num)
         ]
-        old_regions = [self.remove_row() for i in range(new_region_num, old_region_num)]
+        with self.batch_updates():
+            old_regions = [
+                self.remove_row() for i in range(new_region_num, old_region_num)
+            ]
 
         if old_region_num != new_region_num:
             self.regions_changed.emit()
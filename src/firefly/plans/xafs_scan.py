@@ -49,6 +49,8 @@ class XafsRegionsManager(RegionsManager):
     wavenumber_suffix = "Å⁻"
     energy_precision = 1
     wavenumber_precision = 4
+    # The energy offset from ``apply_E0()``, if any
+    applied_E0: float | None = None
 
     @dataclass(frozen=True)
     class WidgetSet:
@@ -91,7 +93,23 @@ class XafsRegionsManager(RegionsManager):
 
     async def add_row(self):
         row = await super().add_row()
-        self.set_domain(Domain.ENERGY, row=row)
+        # Re-used rows keep whichever domain they were in
+        is_k_checked = self.row_widgets(row).k_space_checkbox.isChecked()
+        self.set_domain(Domain.WAVENUMBER if is_k_checked else Domain.ENERGY, row=row)
+        return row
+
+    def row_state(self) -> dict[str, Any]:
+        return {**super().row_state(), "E0": self.applied_E0}
+
+    async def refresh_row(self, row: int, state: dict[str, Any]):
+        await super().refresh_row(row, state)
+        # Catch up with edges that were used while the row was hidden
+        if state["E0"] != self.applied_E0:
+            if state["E0"] is not None:
+                self.unapply_row_E0(state["E0"], row=row)
+            if self.applied_E0 is not None:
+                self.apply_row_E0(self.applied_E0, row=row)
+        self.update_step_size(row=row)
 
     async def create_row_widgets(self, row: int) -> list[QWidget]:
         """Create the widgets that are to go in each row, in order."""
@@ -222,16 +240,20 @@ class XafsRegionsManager(RegionsManager):
         Effectively, converts from absolute to relative regions.
 
         """
+        self.applied_E0 = E0
         for row in self.row_numbers:
-            widgets = self.row_widgets(row=row)
-            widgets.k_space_checkbox.setEnabled(True)
-            # Un-check k-space to convert back to energy from wavenumber
-            widgets.k_space_checkbox.setChecked(False)
-            # Convert between absolute energies and relative energies
-            for line_edit in [widgets.start_spin_box, widgets.stop_spin_box]:
-                old_value = line_edit.value()
-                new_value = old_value - E0
-                line_edit.setValue(new_value)
+            self.apply_row_E0(E0, row=row)
+
+    def apply_row_E0(self, E0: float, *, row: int):
+        widgets = self.row_widgets(row=row)
+        widgets.k_space_checkbox.setEnabled(True)
+        # Un-check k-space to convert back to energy from wavenumber
+        widgets.k_space_checkbox.setChecked(False)
+        # Convert between absolute energies and relative energies
+        for line_edit in [widgets.start_spin_box, widgets.stop_spin_box]:
+            old_value = line_edit.value()
+            new_value = old_value - E0
+            line_edit.setValue(new_value)
 
     def unapply_E0(self, E0: float):
         """Remove an E0 correction.
@@ -239,15 +261,19 @@ class XafsRegionsManager(RegionsManager):
         Effectively, converts from relative to absolute regions.
 
         """
+        self.applied_E0 = None
         for row in self.row_numbers:
-            widgets = self.row_widgets(row=row)
-            # Un-check k-space to convert back to energy from wavenumber
-            widgets.k_space_checkbox.setEnabled(False)
-            # Convert between absolute energies and relative energies
-            for line_edit in [widgets.start_spin_box, widgets.stop_spin_box]:
-                old_value = line_edit.value()
-                new_value = old_value + E0
-                line_edit.setValue(new_value)
+            self.unapply_row_E0(E0, row=row)
+
+    def unapply_row_E0(self, E0: float, *, row: int):
+        widgets = self.row_widgets(row=row)
+        # Un-check k-space to convert back to energy from wavenumber
+        widgets.k_space_checkbox.setEnabled(False)
+        # Convert between absolute energies and relative energies
+        for line_edit in [widgets.start_spin_box, widgets.stop_spin_box]:
+            old_value = line_edit.value()
+            new_value = old_value + E0
+            line_edit.setValue(new_value)
 
     @Slot()
     def update_step_size(self, row: int):
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from typing import Mapping, Optional
@@ -88,10 +89,26 @@ def queue_status(status_mapping: Mapping[str, str] = {}):
 
 
 class QueueClient(QObject):
+    """Keeps track of the queue server's state and controls it.
+
+    Status is polled from the queue server on a timer. Polling starts
+    every *timeout* seconds, and backs off while nothing is changing,
+    up to *max_timeout* seconds. If *subscribe* is true, the queue
+    server's console output is also monitored, and each burst of
+    messages prompts an immediate status update. While the monitor is
+    running, polling only serves as a fallback and backs off further,
+    up to *subscribed_max_timeout*.
+
+    """
+
     api: REManagerAPI
     _last_queue_status: Optional[dict] = None
     last_update: float = -1
     timeout: float = 0.5
+    max_timeout: float = 10.0
+    subscribed_max_timeout: float = 60.0
+    poll_interval: float
+    subscribed: bool = False
     timer: QTimer
     parameter_mapping: Mapping[str, str] = {
         "queue_autostart_enabled": "autostart_changed",
@@ -114,10 +131,13 @@ class QueueClient(QObject):
     re_state_changed = Signal(str)  # New state
     devices_changed = Signal(dict)
 
-    def __init__(self, *args, api, **kwargs):
+    def __init__(self, *args, api, subscribe: bool = True, **kwargs):
         self.api = api
+        self.subscribe = subscribe
         super().__init__(*args, **kwargs)
         self._last_queue_status = {}
+        self._monitor_task = None
+        self.poll_interval = self.timeout
         # Setup timer for updating the queue
         self.timer = QTimer()
         self.timer.timeout.connect(self.update)
@@ -127,7 +147,59 @@ class QueueClient(QObject):
 
     def start(self):
         # Start the time so that it triggers status updates
-        self.timer.start(int(self.timeout * 1000))
+        self.timer.start(int(self.poll_interval * 1000))
+        if self.subscribe:
+            self._monitor_task = asyncio.ensure_future(self.monitor_console())
+
+    def stop(self):
+        self.timer.stop()
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+
+    def _set_poll_interval(self, interval: float):
+        self.poll_interval = interval
+        self.timer.setInterval(int(interval * 1000))
+
+    def _back_off(self, changed: bool):
+        """Poll sooner if the queue server is active, and later if not."""
+        if changed:
+            self._set_poll_interval(self.timeout)
+            return
+        ceiling = self.subscribed_max_timeout if self.subscribed else self.max_timeout
+        self._set_poll_interval(min(self.poll_interval * 2, ceiling))
+
+    async def monitor_console(self):
+        """Update the queue status whenever the queue server has news.
+
+        Messages arriving together are handled with a single status
+        update. If the monitor fails, the client falls back to polling.
+
+        """
+        monitor = self.api.console_monitor
+        monitor.enable()
+        self.subscribed = True
+        try:
+            while True:
+                try:
+                    await monitor.next_msg(timeout=self.subscribed_max_timeout)
+                except comm_base.RequestTimeoutError:
+                    continue
+                # Drain any other messages from the same burst
+                try:
+                    while True:
+                        await monitor.next_msg()
+                except comm_base.RequestTimeoutError:
+                    pass
+                await self.update()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            log.warning(f"Queue server console monitor failed, polling instead: {exc}")
+        finally:
+            self.subscribed = False
+            monitor.disable()
+            self._set_poll_interval(min(self.poll_interval, self.max_timeout))
 
     @asyncSlot(bool)
     async def open_environment(self, to_open):
@@ -248,6 +320,7 @@ class QueueClient(QObject):
         """
         new_status = await self.queue_status()
         signals_changed = self.status.send(new_status)
+        self._back_off(changed="status_changed" in signals_changed)
         # Check individual components of the status if they've changed
         if signals_changed != {}:
             log.debug(f"Emitting changed signals: {signals_changed}")
@@ -1,4 +1,5 @@
 import logging
+from collections import Counter
 from functools import partial
 from typing import Sequence
 
@@ -9,7 +10,7 @@ from pydm.widgets import PyDMChannel, PyDMEnumComboBox, PyDMLabel, PyDMPushButto
 from pydm.widgets.analog_indicator import PyDMAnalogIndicator
 from pydm.widgets.display_format import DisplayFormat
 from qasync import asyncSlot
-from qtpy.QtCore import Qt
+from qtpy.QtCore import QEvent, QObject, Qt, QTimer
 from qtpy.QtWidgets import (
     QCheckBox,
     QHBoxLayout,
@@ -28,6 +29,107 @@ from haven.devices import IonChamber, SplitIonChamberSet
 log = logging.getLogger(__name__)
 
 
+class UpdateScheduler(QObject):
+    """Apply new values to many widgets at most once per frame.
+
+    The voltmeters can update faster than it is useful to repaint
+    their widgets. Registered widgets have their new values collected
+    here instead, and only the latest value for each widget is applied
+    on the next frame tick. Widgets that are not visible are left out
+    of the frame ticks, and their latest value is applied once they
+    are shown again.
+
+    Parameters
+    ==========
+    frame_rate
+      How many times per second to apply pending values.
+
+    Attributes
+    ==========
+    update_counts
+      How many values have been applied to each widget.
+    received_counts
+      How many values have arrived for each widget.
+
+    """
+
+    def __init__(self, *args, frame_rate: float = 30, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.update_counts = Counter()
+        self.received_counts = Counter()
+        self._value_slots = {}
+        self._pending = {}
+        self._hidden = {}
+        self.timer = QTimer(parent=self)
+        self.timer.setInterval(int(1000 / frame_rate))
+        self.timer.timeout.connect(self.apply_updates)
+
+    def register(self, widget):
+        """Send new values for *widget*'s channels through the scheduler."""
+        for channel in widget.channels() or []:
+            # Swap slots while disconnected so the data plugin can
+            # still find the widget's own slot to remove it
+            channel.disconnect()
+            self._value_slots[widget] = channel.value_slot
+            channel.value_slot = partial(self.post, widget)
+            channel.connect()
+        # Watch for the widget being shown to apply held-back values
+        widget.installEventFilter(self)
+
+    def reset(self):
+        """Forget all registered widgets and their pending values."""
+        self.timer.stop()
+        self._value_slots.clear()
+        self._pending.clear()
+        self._hidden.clear()
+        self.update_counts.clear()
+        self.received_counts.clear()
+
+    def post(self, widget, value):
+        """Hold on to a new value until the next frame."""
+        if widget not in self._value_slots:
+            return
+        self.received_counts[widget] += 1
+        try:
+            is_visible = widget.isVisible()
+        except RuntimeError:
+            # The widget has already been deleted
+            return
+        if is_visible:
+            self._pending[widget] = value
+            self._hidden.pop(widget, None)
+            if not self.timer.isActive():
+                self.timer.start()
+        else:
+            # Hold on to it until the widget is shown again
+            self._hidden[widget] = value
+
+    def eventFilter(self, widget, event):
+        """Queue up the held-back value when a hidden widget is shown."""
+        if event.type() == QEvent.Show and widget in self._hidden:
+            self._pending[widget] = self._hidden.pop(widget)
+            if not self.timer.isActive():
+                self.timer.start()
+        return False
+
+    def apply_updates(self):
+        """Send the latest pending value to each visible widget."""
+        for widget, value in list(self._pending.items()):
+            del self._pending[widget]
+            try:
+                is_visible = widget.isVisible()
+            except RuntimeError:
+                # The widget has already been deleted
+                continue
+            if not is_visible:
+                # Hidden since the value arrived, wait to be shown again
+                self._hidden[widget] = value
+                continue
+            self._value_slots[widget](value)
+            self.update_counts[widget] += 1
+        self.timer.stop()
+
+
 class VoltmetersDisplay(display.FireflyDisplay):
     _ion_chamber_rows: Sequence
     _preamps: Sequence[Device] = []
@@ -40,6 +142,8 @@ class VoltmetersDisplay(display.FireflyDisplay):
         # Adjust layouts
         self.ui.voltmeters_layout.setHorizontalSpacing(0)
         self.ui.voltmeters_layout.setVerticalSpacing(0)
+        # Repaint the fast-changing voltmeter widgets once per frame
+        self.update_scheduler = UpdateScheduler(parent=self)
 
     def clear_layout(self, layout):
         if layout is None:
@@ -67,6 +171,7 @@ class VoltmetersDisplay(display.FireflyDisplay):
 
         self.ion_chambers = sorted(ion_chambers, key=beamline_position)
         # Clear the voltmeters grid layout
+        self.update_scheduler.reset()
         self.clear_layout(self.voltmeters_layout)
         # Add embedded displays for all the ion chambers
         self._ion_chamber_rows = []
@@ -76,7 +181,7 @@ class VoltmetersDisplay(display.FireflyDisplay):
                 IonChamber: IonChamberRow,
                 SplitIonChamberSet: SplitIonChamberSetRow,
             }[type(ic)]
-            row = Row(number=row_idx, ion_chamber=ic)
+            row = Row(number=row_idx, ion_chamber=ic, scheduler=self.update_scheduler)
             self._ion_chamber_rows.append(row)
             # Add widgets to the grid layout
             for col_idx, layout in enumerate(row.column_layouts):
@@ -160,10 +265,18 @@ class VoltmetersDisplay(display.FireflyDisplay):
 class SplitIonChamberSetRow:
     """An row in the voltmeters display for a set of split ion chambers."""
 
-    def __init__(self, parent=None, *args, number: int, ion_chamber):
+    def __init__(
+        self,
+        parent=None,
+        *args,
+        number: int,
+        ion_chamber,
+        scheduler: UpdateScheduler | None = None,
+    ):
         self.parent = parent
         self.number = number
         self.device = ion_chamber
+        self.scheduler = scheduler
         self.setup_ui()
 
     def setup_ui(self):
@@ -241,6 +354,9 @@ class SplitIonChamberSetRow:
         ##################
         # Setup Sockets  #
         ##################
+        if self.scheduler is not None:
+            self.scheduler.register(self.current_indicator)
+            self.scheduler.register(self.voltage_label)
         self.range_monitor = PyDMChannel(
             address=f"haven://{device_name}.driver.current_range",
             value_slot=self.update_current_range,
@@ -257,10 +373,18 @@ class SplitIonChamberSetRow:
 class IonChamberRow:
     """An row in the voltmeters display for a single ion chamber's signal."""
 
-    def __init__(self, parent=None, *args, number: int, ion_chamber):
+    def __init__(
+        self,
+        parent=None,
+        *args,
+        number: int,
+        ion_chamber,
+        scheduler: UpdateScheduler | None = None,
+    ):
         self.parent = parent
         self.number = number
         self.device = ion_chamber
+        self.scheduler = scheduler
         self.setup_ui()
 
     def setup_ui(self):
@@ -388,6 +512,14 @@ class IonChamberRow:
         self.details_button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Minimum)
         self.column_layouts[4].addWidget(self.details_button)
         self.column_layouts[4].addItem(VSpacer())
+        # Fast-changing widgets only repaint once per frame
+        if self.scheduler is not None:
+            for widget in [
+                self.voltage_indicator,
+                self.voltage_label,
+                self.current_label,
+            ]:
+                self.scheduler.register(widget)
 
     def update_gain_level_widgets(self, new_level):
         if new_level == 0:
@@ -20,6 +20,7 @@ from ._tiled_writer import TiledWriter, tiled_writer  # noqa: F401
 #  Top-level imports
 from .bss import BssApi  # noqa: F401
 from .constants import edge_energy  # noqa: F401
+from .durations import DurationEstimator  # noqa: F401
 from .energy_ranges import (  # noqa: F401
     ERange,
     KRange,
@@ -38,7 +39,7 @@ from .preprocessors import (  # noqa: F401
     open_shutters_decorator,
     open_shutters_wrapper,
 )
-from .run_engine import run_engine  # noqa: F401
+from .run_engine import RunEngineCommand, run_engine  # noqa: F401
 from .utils import sanitize_name  # noqa: F401
 
 # -----------------------------------------------------------------------------
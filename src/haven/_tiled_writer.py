@@ -1,14 +1,27 @@
+import copy
+import json
 import logging
+import math
+import os
 import re
+import threading
+import time
+from collections.abc import Callable, Mapping
 from pathlib import Path
+from typing import TextIO
 from uuid import uuid4
 
 import httpx
+import numpy as np
 import stamina
-from bluesky_tiled_plugins import TiledWriter
+from bluesky_tiled_plugins import TiledWriter as BlueskyTiledWriter
+from bluesky_tiled_plugins.writing.tiled_writer import RunNormalizer, _RunWriter
+from event_model import DocumentRouter, RunRouter
 from tiled.client import from_profile
+from tiled.structures.core import Spec
 
 from haven import exceptions
+from haven.constants import XAS_PLANS
 from haven.iconfig import TiledConfig
 
 log = logging.getLogger()
@@ -16,18 +29,50 @@ log = logging.getLogger()
 xas_edge_regex = re.compile("^[A-Za-z]+[-_ ][K-Zk-z0-9]+$")
 
 
-__all__ = ["tiled_writer", "TiledWriter"]
+__all__ = [
+    "tiled_writer",
+    "AdaptiveBatching",
+    "md_to_specs",
+    "RunSummarizer",
+    "TiledSpool",
+    "TiledWriter",
+]
 
 
 @stamina.retry(on=httpx.HTTPError, attempts=3)
-def tiled_writer(config: TiledConfig) -> TiledWriter:
-    """Load a tiled writer instance as specified in *config*."""
+def tiled_writer(config: TiledConfig) -> "TiledWriter | TiledSpool":
+    """Load a tiled writer instance as specified in *config*.
+
+    If ``writer_spool_directory`` is set in *config*, the writer is
+    wrapped in a :py:class:`TiledSpool`, which then takes the place
+    of the backup directory.
+
+    """
     profile = config.writer_profile
+    if config.writer_batch_size == "adaptive":
+        min_size, max_size = config.writer_batch_size_bounds
+        writer_kwargs = {
+            "batching": AdaptiveBatching(
+                min_batch_size=min_size,
+                max_batch_size=max_size,
+                flush_interval=config.writer_flush_interval,
+            )
+        }
+    else:
+        writer_kwargs = {"batch_size": config.writer_batch_size}
     try:
         client = from_profile(config.writer_profile, structure_clients="numpy")
     except httpx.ConnectError as exc:
         raise exceptions.TiledNotAvailable(profile) from exc
     client.include_data_sources()
+    # Spooled writers replay failed runs instead of backing them up
+    if config.writer_spool_directory is not None:
+        spool_directory = Path(config.writer_spool_directory)
+        spool_directory.mkdir(parents=True, exist_ok=True)
+        return TiledSpool(
+            lambda: TiledWriter(client, **writer_kwargs),
+            directory=spool_directory,
+        )
     # Make sure the backup directory exists and is writable
     backup_directory = config.writer_backup_directory
     if backup_directory is not None:
@@ -41,39 +86,668 @@ def tiled_writer(config: TiledConfig) -> TiledWriter:
     writer = TiledWriter(
         client,
         backup_directory=backup_directory,
-        batch_size=config.writer_batch_size,
+        **writer_kwargs,
     )
     return writer
 
 
-# def md_to_specs(start_doc: dict) -> Sequence[Spec]:
-#     """Determine which specs apply based on *start_doc*."""
-#     specs = [Spec("BlueskyRun", version="3.0")]
-#     # Check for XAS runs
-#     has_d_spacing = "d_spacing" in start_doc.keys()
-#     has_edge = xas_edge_regex.match(start_doc.get("edge", ""))
-#     if has_d_spacing and has_edge:
-#         specs.insert(0, Spec("XASRun", version="1.0"))
-#     else:
-#         log.info(f"Not adding XASRun spec: {has_d_spacing=}, {has_edge=}")
-#     return specs
-
-
-# class TiledWriter(BlueskyTiledWriter):
-#     def _factory(self, name, doc):
-#         return [_RunWriter(self.client)], []
-
-
-# class _RunWriter(BlueskyRunWriter):
-#     def start(self, doc: RunStart):
-#         doc = copy.copy(doc)
-#         self.access_tags = doc.pop("tiled_access_tags", None)  # type: ignore
-#         self.root_node = self.client.create_container(
-#             key=doc["uid"],
-#             metadata={"start": truncate_json_overflow(dict(doc))},
-#             specs=md_to_specs(doc),
-#             access_tags=self.access_tags,
-#         )
-#         self._streams_node = self.root_node.create_container(
-#             key="streams", access_tags=self.access_tags
-#         )
+def _json_default(obj):
+    """Convert numpy types found in documents to plain python."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _Interrupted(Exception):
+    """The spool was closed before a segment could be finished."""
+
+
+class TiledSpool:
+    """A write-ahead spool between the run engine and a Tiled writer.
+
+    Every document is first appended to a segment file in
+    *directory*, one segment per run, and then handed to the writer
+    by a background thread, so a slow or unavailable Tiled server
+    does not block the run engine. Documents are read back from disk
+    as they are written, so memory use does not grow if the writer
+    falls behind.
+
+    A segment is deleted once its stop document has been written. If
+    the writer fails part-way through a run, the partial run is
+    removed from Tiled and the whole segment is replayed into a new
+    writer once the server is available again. Segments left over
+    from a previous session are replayed the same way when the spool
+    is created.
+
+    Parameters
+    ==========
+    writer_factory
+      Called with no arguments to create a new writer, e.g. a
+      ``TiledWriter``. The writer's ``client`` is used to remove
+      partially written runs.
+    directory
+      Where to keep the segment files.
+    retry_delay
+      How long to wait, in seconds, after the writer fails. The
+      delay doubles for each consecutive failure, up to
+      *max_retry_delay*.
+    fsync
+      If true, force each document to disk before returning
+      control to the run engine.
+
+    """
+
+    suffix = ".jsonl"
+
+    def __init__(
+        self,
+        writer_factory: Callable[[], Callable],
+        directory: Path | str,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+        fsync: bool = False,
+    ):
+        self.writer_factory = writer_factory
+        self.directory = Path(directory)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.fsync = fsync
+        self._writer: Callable | None = None
+        self._condition = threading.Condition()
+        self._closing = threading.Event()
+        # Segments being appended to by the run engine
+        self._open_segments: dict[Path, TextIO] = {}
+        self._run_segments: dict[str, Path] = {}
+        # Maps descriptor/resource UIDs to their run's UID
+        self._parents: dict[str, str] = {}
+        # Runs that may already be partially written to Tiled
+        self._dirty = set(self.segments())
+        if len(self._dirty) > 0:
+            log.warning(f"Replaying {len(self._dirty)} unwritten runs from {directory}")
+        self._next_index = max(
+            (int(seg.name.split("-", 1)[0]) + 1 for seg in self._dirty), default=0
+        )
+        self._thread = threading.Thread(
+            target=self._drain, daemon=True, name="tiled_spool"
+        )
+        self._thread.start()
+
+    def segments(self) -> list[Path]:
+        """Segment files that have not been fully written, oldest first."""
+        return sorted(self.directory.glob(f"*{self.suffix}"))
+
+    def _run_uid(self, name: str, doc: dict) -> str:
+        """Determine which run *doc* belongs to."""
+        if name == "start":
+            return doc["uid"]
+        if "run_start" in doc:
+            run_uid = doc["run_start"]
+        else:
+            parent_key = {
+                "event": "descriptor",
+                "event_page": "descriptor",
+                "datum": "resource",
+                "datum_page": "resource",
+                "stream_datum": "stream_resource",
+            }[name]
+            run_uid = self._parents[doc[parent_key]]
+        # Remember documents that others will refer to
+        if name in ["descriptor", "resource", "stream_resource"]:
+            self._parents[doc["uid"]] = run_uid
+        return run_uid
+
+    def __call__(self, name: str, doc: dict):
+        with self._condition:
+            run_uid = self._run_uid(name, doc)
+            if name == "start":
+                segment = self.directory / (
+                    f"{self._next_index:08d}-{run_uid}{self.suffix}"
+                )
+                self._next_index += 1
+                self._open_segments[segment] = segment.open(mode="a")
+                self._run_segments[run_uid] = segment
+            segment = self._run_segments[run_uid]
+            fd = self._open_segments[segment]
+            fd.write(json.dumps([name, doc], default=_json_default) + "\n")
+            fd.flush()
+            if self.fsync:
+                os.fsync(fd.fileno())
+            if name == "stop":
+                fd.close()
+                del self._open_segments[segment]
+                del self._run_segments[run_uid]
+                self._parents = {
+                    uid: run for uid, run in self._parents.items() if run != run_uid
+                }
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all finished runs have been written.
+
+        Returns
+        =======
+        flushed
+          False if *timeout* expired before everything was written.
+
+        """
+
+        def is_flushed():
+            return set(self.segments()) <= set(self._open_segments)
+
+        with self._condition:
+            return self._condition.wait_for(is_flushed, timeout=timeout)
+
+    def close(self, timeout: float | None = None):
+        """Write any finished runs, then stop the background thread.
+
+        Segments that are not written by the time *timeout* expires
+        are kept, and will be replayed the next time a spool is
+        created in the same directory.
+
+        """
+        self.flush(timeout=timeout)
+        self._closing.set()
+        with self._condition:
+            self._condition.notify_all()
+        self._thread.join()
+        for fd in self._open_segments.values():
+            fd.close()
+
+    def _read_documents(self, segment: Path):
+        """Read documents from *segment*, waiting for new documents
+        until its run has finished."""
+        with open(segment) as fd:
+            partial = ""
+            while True:
+                with self._condition:
+                    finished = segment not in self._open_segments
+                line = fd.readline()
+                if line.endswith("\n"):
+                    yield json.loads(partial + line)
+                    partial = ""
+                    continue
+                partial += line
+                if finished:
+                    if partial != "":
+                        log.warning(f"Ignoring incomplete document in {segment}.")
+                    return
+                if self._closing.is_set():
+                    raise _Interrupted()
+                with self._condition:
+                    self._condition.wait(timeout=0.5)
+
+    def _discard_partial_run(self, writer, run_uid: str):
+        """Remove any previous attempt at writing this run from Tiled."""
+        client = writer.client
+        if run_uid in client:
+            log.warning(f"Removing partially written run {run_uid} from Tiled.")
+            client.delete_contents(run_uid, recursive=True, external_only=False)
+
+    def _write_segment(self, segment: Path):
+        run_uid = segment.stem.split("-", 1)[1]
+        if self._writer is None:
+            self._writer = self.writer_factory()
+        writer = self._writer
+        if segment in self._dirty:
+            self._discard_partial_run(writer, run_uid)
+        # Mark dirty until finished in case we fail part-way through
+        self._dirty.add(segment)
+        for name, doc in self._read_documents(segment):
+            writer(name, doc)
+        self._dirty.discard(segment)
+
+    def _drain(self):
+        delay = self.retry_delay
+        while True:
+            with self._condition:
+                segments = self.segments()
+                if len(segments) == 0:
+                    if self._closing.is_set():
+                        return
+                    self._condition.wait(timeout=0.5)
+                    continue
+            segment = segments[0]
+            try:
+                self._write_segment(segment)
+            except _Interrupted:
+                return
+            except Exception:
+                log.exception(f"Could not write {segment.name}, will try again.")
+                # Start over with a fresh writer once the server is back
+                self._writer = None
+                if self._closing.wait(timeout=delay):
+                    return
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.retry_delay
+            # The run is safely in Tiled, so acknowledge it
+            with self._condition:
+                segment.unlink()
+                self._condition.notify_all()
+
+
+FLY_PLANS = ["fly_scan", "grid_fly_scan"]
+
+
+def md_to_specs(start_doc: Mapping) -> list[Spec]:
+    """Determine which specs apply based on *start_doc*.
+
+    The ``BlueskyRun`` spec is not included since it is always added
+    by the writer.
+
+    """
+    specs = []
+    plan_name = start_doc.get("plan_name", "")
+    # Check for XAS runs
+    has_d_spacing = "d_spacing" in start_doc.keys()
+    has_edge = xas_edge_regex.match(start_doc.get("edge", "")) is not None
+    if plan_name in XAS_PLANS or (has_d_spacing and has_edge):
+        specs.append(Spec("XASRun", version="1.0"))
+    else:
+        log.debug(
+            f"Not adding XASRun spec: {plan_name=}, {has_d_spacing=}, {has_edge=}"
+        )
+    if plan_name in FLY_PLANS:
+        specs.append(Spec("FlyScan", version="1.0"))
+    return specs
+
+
+class RunSummarizer(DocumentRouter):
+    """Collect a compact, searchable summary of a single run.
+
+    The summary includes the plan name, absorption edge and E0, the
+    number of points in the primary stream, and the range covered by
+    any energy axes in the primary stream. When the run stops,
+    *callback* is called with the run's UID and the summary.
+
+    """
+
+    def __init__(self, callback: Callable[[str, dict], None]):
+        super().__init__()
+        self.callback = callback
+        self.summary: dict = {}
+        self._run_uid = None
+        self._primary_uid = None
+        self._energy_fields: list[str] = []
+
+    def start(self, doc):
+        self._run_uid = doc["uid"]
+        plan_name = doc.get("plan_name")
+        self.summary = {
+            "plan_name": plan_name,
+            "edge": doc.get("edge"),
+            "E0": doc.get("E0"),
+        }
+        # Find the axes that are scanning energy
+        dimensions = doc.get("hints", {}).get("dimensions", [])
+        fields = [
+            field
+            for dim_fields, stream in dimensions
+            if stream == "primary"
+            for field in dim_fields
+        ]
+        self._energy_fields = [field for field in fields if "energy" in field]
+        if len(self._energy_fields) == 0 and plan_name in XAS_PLANS:
+            self._energy_fields = fields
+
+    def descriptor(self, doc):
+        if doc.get("name") == "primary":
+            self._primary_uid = doc["uid"]
+
+    def event_page(self, doc):
+        if doc["descriptor"] != self._primary_uid:
+            return
+        for field in self._energy_fields:
+            energies = np.asarray(doc["data"].get(field, []), dtype=float)
+            if energies.size == 0:
+                continue
+            low, high = float(np.min(energies)), float(np.max(energies))
+            self.summary["energy_min"] = min(self.summary.get("energy_min", low), low)
+            self.summary["energy_max"] = max(self.summary.get("energy_max", high), high)
+
+    def stop(self, doc):
+        self.summary["num_points"] = doc.get("num_events", {}).get("primary", 0)
+        summary = {key: val for key, val in self.summary.items() if val is not None}
+        self.callback(self._run_uid, summary)
+
+
+class AdaptiveBatching:
+    """Choose the tiled writer's batch size from the incoming event rate.
+
+    Events are batched so that each write covers roughly
+    *flush_interval* seconds of data. Fast streams are batched
+    heavily, and slow streams are written as they arrive. If the
+    server is slow to respond, the flush interval is stretched so
+    that no more than *latency_fraction* of the time is spent
+    waiting on writes.
+
+    Each run gets its own copy of this policy, and the decisions made
+    are available from :py:attr:`metrics`.
+
+    Parameters
+    ==========
+    min_batch_size
+      The smallest batch of events that will be written at once.
+    max_batch_size
+      The largest batch of events that will be written at once.
+    flush_interval
+      Target time, in seconds, between writes to the server.
+    max_flush_interval
+      Writes will not be delayed longer than this, no matter how
+      slow the server is.
+    latency_fraction
+      How much of the time is allowed to be spent waiting for writes.
+    smoothing
+      Weight given to each new measurement in the moving averages of
+      the event period and write latency.
+
+    """
+
+    def __init__(
+        self,
+        min_batch_size: int = 1,
+        max_batch_size: int = 10000,
+        flush_interval: float = 0.5,
+        max_flush_interval: float = 5.0,
+        latency_fraction: float = 0.25,
+        smoothing: float = 0.2,
+    ):
+        if not 1 <= min_batch_size <= max_batch_size:
+            raise ValueError(
+                f"Invalid batch size bounds: ({min_batch_size}, {max_batch_size})"
+            )
+        if not 0 < flush_interval <= max_flush_interval:
+            raise ValueError(
+                f"Invalid flush intervals: ({flush_interval}, {max_flush_interval})"
+            )
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.target_flush_interval = flush_interval
+        self.max_flush_interval = max_flush_interval
+        self.latency_fraction = latency_fraction
+        self.smoothing = smoothing
+        self._last_event_time: float | None = None
+        self._event_period: float | None = None
+        self._write_latency: float | None = None
+        self.writes = 0
+        self.rows_written = 0
+
+    def _average(self, old: float | None, new: float) -> float:
+        if old is None:
+            return new
+        return old + self.smoothing * (new - old)
+
+    def observe_event(self, timestamp: float):
+        """Record the arrival of an event at *timestamp* (in seconds)."""
+        if self._last_event_time is not None:
+            period = timestamp - self._last_event_time
+            if period >= 0:
+                self._event_period = self._average(self._event_period, period)
+        self._last_event_time = timestamp
+
+    def observe_write(self, rows: int, duration: float):
+        """Record that writing *rows* events took *duration* seconds."""
+        self._write_latency = self._average(self._write_latency, duration)
+        self.writes += 1
+        self.rows_written += rows
+
+    @property
+    def event_rate(self) -> float | None:
+        """Events per second, or ``None`` if not yet known."""
+        if self._event_period is None:
+            return None
+        if self._event_period == 0:
+            return math.inf
+        return 1 / self._event_period
+
+    @property
+    def flush_interval(self) -> float:
+        """Longest time to hold events before writing them."""
+        interval = self.target_flush_interval
+        if self._write_latency is not None:
+            interval = max(interval, self._write_latency / self.latency_fraction)
+        return min(interval, self.max_flush_interval)
+
+    @property
+    def batch_size(self) -> int:
+        """Number of events to collect before writing them."""
+        rate = self.event_rate
+        if rate is None:
+            return self.min_batch_size
+        size = rate * self.flush_interval
+        if math.isinf(size):
+            return self.max_batch_size
+        return max(self.min_batch_size, min(math.ceil(size), self.max_batch_size))
+
+    @property
+    def metrics(self) -> dict[str, float | int | None]:
+        """The current measurements and batching decisions."""
+        return {
+            "event_rate": self.event_rate,
+            "write_latency": self._write_latency,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "writes": self.writes,
+            "rows_written": self.rows_written,
+        }
+
+
+# Parts of the upstream run writer that adaptive batching relies on
+_RUN_WRITER_INTERNALS = [
+    "_batch_size",
+    "_desc_nodes",
+    "_internal_data_cache",
+    "_write_internal_data",
+]
+
+
+class _AdaptiveRunWriter(_RunWriter):
+    """Write a single run, with batches sized by an
+    :py:class:`AdaptiveBatching` policy.
+
+    Cached events are written once they have waited for the policy's
+    flush interval, either when the next event arrives or, if the
+    stream has gone quiet, from a timer. They are also written before
+    each new descriptor, and when the run stops.
+
+    """
+
+    def __init__(self, *args, batching: AdaptiveBatching, **kwargs):
+        super().__init__(*args, batch_size=batching.batch_size, **kwargs)
+        self.batching = batching
+        # The timer thread writes too, so only one thread at a time
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+        self._flush_error: Exception | None = None
+
+    def __call__(self, name, doc):
+        with self._lock:
+            # Let the upstream backups know the timer failed to write
+            if self._flush_error is not None:
+                raise self._flush_error
+            return super().__call__(name, doc)
+
+    def flush(self):
+        """Write all cached events to Tiled."""
+        with self._lock:
+            for desc_name, data_cache in self._internal_data_cache.items():
+                if len(data_cache) > 0:
+                    desc_node = self._desc_nodes[desc_name]
+                    self._write_internal_data(data_cache, desc_node=desc_node)
+                    data_cache.clear()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            if self._timer is threading.current_thread():
+                self._timer = None
+            if self._flush_error is not None:
+                return
+            try:
+                self.flush()
+            except Exception as exc:
+                log.exception("Could not write cached events to Tiled.")
+                self._flush_error = exc
+
+    def _start_timer(self):
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(
+            self.batching.flush_interval, self._flush_on_timer
+        )
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def descriptor(self, doc):
+        self.flush()
+        super().descriptor(doc)
+
+    def event(self, doc):
+        self.batching.observe_event(doc["time"])
+        self._batch_size = self.batching.batch_size
+        super().event(doc)
+        # Slow streams still get written on time
+        desc_node = self._desc_nodes[doc["descriptor"]]
+        data_cache = self._internal_data_cache[desc_node.item["id"]]
+        if len(data_cache) > 0:
+            waiting = doc["time"] - data_cache[0]["time"]
+            if waiting >= self.batching.flush_interval:
+                self._write_internal_data(data_cache, desc_node=desc_node)
+                data_cache.clear()
+        # Quiet streams too
+        if len(data_cache) > 0:
+            self._start_timer()
+        else:
+            self._cancel_timer()
+
+    def _write_internal_data(self, data_cache, desc_node):
+        t0 = time.monotonic()
+        super()._write_internal_data(data_cache, desc_node=desc_node)
+        self.batching.observe_write(len(data_cache), time.monotonic() - t0)
+        log.debug(f"Adaptive tiled writer batching: {self.batching.metrics}")
+
+    def stop(self, doc):
+        self._cancel_timer()
+        super().stop(doc)
+        metrics = self.batching.metrics
+        log.info(f"Finished writing run {doc['run_start']}: {metrics}")
+        self.root_node.update_metadata(
+            metadata={"writer_metrics": metrics}, drop_revision=True
+        )
+
+
+class _AdaptiveRun:
+    """The first callback for a run written with adaptive batching.
+
+    The upstream writer subscribes its own run writer to this
+    callback, which is ignored since documents already go to an
+    :py:class:`_AdaptiveRunWriter`.
+
+    """
+
+    def __init__(self, callback: Callable):
+        self.callback = callback
+
+    def __call__(self, name, doc):
+        return self.callback(name, doc)
+
+    def subscribe(self, func, name="all"):
+        pass
+
+
+def _supports_adaptive_batching(client) -> bool:
+    """Check that the upstream run writer has the parts needed for
+    adaptive batching."""
+    run_writer = _RunWriter(client)
+    missing = [attr for attr in _RUN_WRITER_INTERNALS if not hasattr(run_writer, attr)]
+    if len(missing) > 0:
+        log.warning(
+            "Adaptive batching is not supported by this version of "
+            f"bluesky-tiled-plugins (missing {missing}), using fixed batches."
+        )
+    return len(missing) == 0
+
+
+class TiledWriter(BlueskyTiledWriter):
+    """Write runs into Tiled, with extra specs and a run summary.
+
+    Specs from :py:func:`md_to_specs` are added to each run's
+    container, and a summary from :py:class:`RunSummarizer` is saved
+    in the run's ``"summary"`` metadata when the run stops. Runs can
+    then be found without opening them, e.g.:
+
+    .. code:: python
+
+        from tiled.queries import Key
+
+        runs = client.search(Key("summary.edge") == "Ni-K")
+        runs = runs.search(Key("summary.energy_min") < 8333)
+
+    If *batching* is given, it takes the place of *batch_size* and
+    each run's batches are sized by a copy of this policy. The
+    decisions made are saved in the run's ``"writer_metrics"``
+    metadata.
+
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        batching: AdaptiveBatching | None = None,
+        normalizer=RunNormalizer,
+        **kwargs,
+    ):
+        if batching is not None and not _supports_adaptive_batching(client):
+            batching = None
+        self.batching = batching
+        self._run_normalizer = normalizer
+        self._run_writer_kwargs = {
+            key: kwargs[key]
+            for key in ["max_array_size", "validate"]
+            if kwargs.get(key) is not None
+        }
+        # The normalizer is the upstream writer's hook into each run
+        if batching is not None:
+            normalizer = self._adaptive_run
+        super().__init__(client, normalizer=normalizer, **kwargs)
+        self._summary_router = RunRouter([self._summary_factory])
+
+    def _adaptive_run(self, **normalizer_kwargs) -> _AdaptiveRun:
+        """Create the callbacks for writing one run with adaptive batching."""
+        cb = run_writer = _AdaptiveRunWriter(
+            self.client,
+            batching=copy.deepcopy(self.batching),
+            ignore_errors=self.ignore_errors,
+            **self._run_writer_kwargs,
+        )
+        if self._run_normalizer is not None:
+            cb = self._run_normalizer(**normalizer_kwargs)
+            cb.subscribe(run_writer)
+        return _AdaptiveRun(cb)
+
+    def _summary_factory(self, name, doc):
+        return [RunSummarizer(callback=self.write_summary)], []
+
+    def write_summary(self, run_uid: str, summary: dict):
+        """Save *summary* as searchable metadata on a run."""
+        try:
+            self.client[run_uid].update_metadata(metadata={"summary": summary})
+        except Exception:
+            log.exception(f"Could not save summary for run {run_uid}.")
+
+    def __call__(self, name, doc):
+        if name == "start":
+            specs = [
+                {"name": spec.name, "version": spec.version}
+                for spec in md_to_specs(doc)
+            ]
+            doc = {**doc, "tiled_specs": [*specs, *doc.get("tiled_specs", [])]}
+        super().__call__(name, doc)
+        self._summary_router(name, doc)
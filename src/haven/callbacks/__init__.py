@@ -1 +1,4 @@
 from .collector import Collector as Collector
+from .xafs import XAFSNormalizer as XAFSNormalizer
+from .xrf_roi import XRFRegion as XRFRegion
+from .xrf_roi import XRFROIStream as XRFROIStream
@@ -0,0 +1,317 @@
+"""Live normalization of X-ray absorption spectra."""
+
+import logging
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+
+import numpy as np
+from event_model import DocumentRouter, compose_descriptor
+
+from haven.constants import XAS_PLANS
+
+__all__ = ["XAFSNormalizer"]
+
+log = logging.getLogger(__name__)
+
+
+class _RunningPolyFit:
+    """Least-squares polynomial fits over any contiguous slice of
+    points.
+
+    Points are appended in increasing *x* order, and cumulative sums
+    are kept so that the normal equations for a slice can be built
+    without revisiting its points.
+
+    """
+
+    def __init__(self, degree: int):
+        self.degree = degree
+        self.x: list[float] = []
+        # Cumulative sums of x^k (k <= 2*degree) and x^k*y (k <= degree)
+        self._sum_x = [np.zeros(2 * degree + 1)]
+        self._sum_xy = [np.zeros(degree + 1)]
+
+    def append(self, x: float, y: float):
+        powers = x ** np.arange(2 * self.degree + 1)
+        self.x.append(x)
+        self._sum_x.append(self._sum_x[-1] + powers)
+        self._sum_xy.append(self._sum_xy[-1] + powers[: self.degree + 1] * y)
+
+    def fit(self, x_min: float, x_max: float) -> np.ndarray | None:
+        """Polynomial coefficients (lowest order first) for points with
+        ``x_min <= x < x_max``, or ``None`` if there are too few."""
+        start, stop = bisect_left(self.x, x_min), bisect_left(self.x, x_max)
+        if stop - start <= self.degree:
+            return None
+        sum_x = self._sum_x[stop] - self._sum_x[start]
+        sum_xy = self._sum_xy[stop] - self._sum_xy[start]
+        size = self.degree + 1
+        idx = np.arange(size)
+        matrix = sum_x[idx[:, None] + idx[None, :]]
+        try:
+            return np.linalg.solve(matrix, sum_xy)
+        except np.linalg.LinAlgError:
+            return None
+
+
+class _EdgeEstimator:
+    """Track E0, the pre-/post-edge lines and the edge step of one
+    spectrum as points arrive."""
+
+    def __init__(
+        self,
+        pre_edge: tuple[float, float],
+        post_edge: tuple[float, float],
+        post_edge_degree: int,
+    ):
+        self.pre_edge = pre_edge
+        self.post_edge = post_edge
+        self.energies: list[float] = []
+        self.mu: list[float] = []
+        self.E0: float = math.nan
+        self._max_slope = -math.inf
+        self._pre_fit = _RunningPolyFit(degree=1)
+        self._post_fit = _RunningPolyFit(degree=post_edge_degree)
+        self._origin: float | None = None
+
+    def add_point(self, energy: float, mu: float) -> dict[str, float]:
+        if not math.isfinite(mu) or (self.energies and energy <= self.energies[-1]):
+            # Only monotonic scans with good data can be fit
+            return {"E0": self.E0, "edge_step": math.nan, "norm": math.nan}
+        if self._origin is None:
+            self._origin = energy
+        self.energies.append(energy)
+        self.mu.append(mu)
+        x = energy - self._origin
+        self._pre_fit.append(x, mu)
+        self._post_fit.append(x, mu)
+        # Steepest point so far is the edge, using a 3-point derivative
+        if len(self.energies) >= 3:
+            slope = (self.mu[-1] - self.mu[-3]) / (
+                self.energies[-1] - self.energies[-3]
+            )
+            if slope > self._max_slope:
+                self._max_slope = slope
+                self.E0 = self.energies[-2]
+        # Evaluate the fits around the current edge
+        step, pre_line = math.nan, None
+        if math.isfinite(self.E0):
+            e0 = self.E0 - self._origin
+            pre_line = self._pre_fit.fit(e0 + self.pre_edge[0], e0 + self.pre_edge[1])
+            post_line = self._post_fit.fit(
+                e0 + self.post_edge[0], e0 + self.post_edge[1]
+            )
+            if pre_line is not None and post_line is not None:
+                step = float(
+                    np.polynomial.polynomial.polyval(e0, post_line)
+                    - np.polynomial.polynomial.polyval(e0, pre_line)
+                )
+        norm = math.nan
+        if pre_line is not None and step != 0 and math.isfinite(step):
+            norm = (mu - np.polynomial.polynomial.polyval(x, pre_line)) / step
+        return {"E0": self.E0, "edge_step": step, "norm": float(norm)}
+
+
+class XAFSNormalizer(DocumentRouter):
+    """Normalize X-ray absorption spectra while an XAFS scan runs.
+
+    For each event in the primary stream of an ``xafs_scan`` or
+    ``energy_scan`` run, the absorption coefficient μ(E) is calculated
+    in transmission (``ln(I0/It)``) and fluorescence (``If/I0``) from
+    whichever ion chambers are present. E0 is taken as the steepest
+    point of μ(E) seen so far, and the edge step comes from a line
+    fit to the pre-edge region and a polynomial fit to the post-edge
+    region. Each point costs constant time, apart from a binary search
+    to find the fit regions.
+
+    The results are emitted to *callback* as the descriptor and
+    events of a new stream (*stream_name*) in the same run. Points
+    are normalized using the fits available when they arrive, so
+    early points may be normalized differently than they would be
+    after the scan finishes.
+
+    Dark currents are subtracted from the ion chamber signals. They
+    are read from the ``"dark_currents"`` entry in the start
+    document, a mapping of data key to dark signal, unless given
+    explicitly as *dark_currents*.
+    :py:class:`~haven.preprocessors.DarkCurrentRecorder` writes this
+    entry from its latest dark current run, with only the raw
+    signals, since others (e.g. ``I0-net_count_rate``) are already
+    dark-corrected.
+
+    Parameters
+    ==========
+    callback
+      Receives the (name, doc) pairs for the normalized stream.
+    I0
+      Data key for the incident intensity.
+    It
+      Data key for the transmitted intensity, if any.
+    If
+      Data key for the fluorescence intensity, if any.
+    energy
+      Data key for the X-ray energy. If omitted, the first primary
+      dimension in the start document's hints is used.
+    dark_currents
+      Dark signal to subtract from each data key.
+    pre_edge
+      Energy range, relative to E0, of the pre-edge line.
+    post_edge
+      Energy range, relative to E0, of the post-edge polynomial.
+    post_edge_degree
+      Degree of the post-edge polynomial.
+    stream_name
+      Name of the stream with normalized data.
+
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, dict], None],
+        *,
+        I0: str = "I0-net_count_rate",
+        It: str | None = "It-net_count_rate",
+        If: str | None = None,
+        energy: str | None = None,
+        dark_currents: Mapping[str, float] | None = None,
+        pre_edge: tuple[float, float] = (-150, -30),
+        post_edge: tuple[float, float] = (50, math.inf),
+        post_edge_degree: int = 2,
+        stream_name: str = "xafs_normalized",
+    ):
+        super().__init__()
+        self.callback = callback
+        self.I0 = I0
+        self.It = It
+        self.If = If
+        self.energy = energy
+        self.dark_currents = dark_currents
+        self.pre_edge = pre_edge
+        self.post_edge = post_edge
+        self.post_edge_degree = post_edge_degree
+        self.stream_name = stream_name
+        self._start_doc = None
+        self._primary_uid = None
+        self._bundle = None
+
+    def _estimator(self):
+        return _EdgeEstimator(
+            pre_edge=self.pre_edge,
+            post_edge=self.post_edge,
+            post_edge_degree=self.post_edge_degree,
+        )
+
+    def start(self, doc):
+        self._start_doc = None
+        self._primary_uid = None
+        self._bundle = None
+        if doc.get("plan_name") not in XAS_PLANS:
+            return
+        self._start_doc = doc
+        self._energy_key = self.energy
+        if self._energy_key is None:
+            dimensions = doc.get("hints", {}).get("dimensions", [])
+            fields = [fields[0] for fields, stream in dimensions if stream == "primary"]
+            self._energy_key = fields[0] if len(fields) > 0 else None
+        self._darks = dict(
+            doc.get("dark_currents", {})
+            if self.dark_currents is None
+            else self.dark_currents
+        )
+        self._modes: dict[str, _EdgeEstimator] = {}
+
+    def descriptor(self, doc):
+        if self._start_doc is None or doc.get("name") != "primary":
+            return
+        keys = doc["data_keys"]
+        missing = [key for key in [self._energy_key, self.I0] if key not in keys]
+        if missing:
+            log.warning(f"Cannot normalize XAFS data, missing data keys: {missing}")
+            return
+        self._primary_uid = doc["uid"]
+        if self.It in keys:
+            self._modes["trans"] = self._estimator()
+        if self.If in keys:
+            self._modes["fluor"] = self._estimator()
+        number = {"dtype": "number", "shape": [], "source": "derived"}
+        data_keys = {"energy": {**number, "units": "eV"}}
+        for mode in self._modes:
+            data_keys.update(
+                {
+                    f"mu_{mode}": number,
+                    f"norm_{mode}": number,
+                    f"E0_{mode}": {**number, "units": "eV"},
+                    f"edge_step_{mode}": number,
+                }
+            )
+        self._bundle = compose_descriptor(
+            start=self._start_doc,
+            streams={},
+            event_counters={},
+            name=self.stream_name,
+            data_keys=data_keys,
+            hints={"xafs": {"fields": [f"norm_{mode}" for mode in self._modes]}},
+        )
+        self.callback("descriptor", self._bundle.descriptor_doc)
+
+    def _signal(self, data: Mapping, key: str) -> float:
+        return float(data[key]) - self._darks.get(key, 0.0)
+
+    def event(self, doc):
+        if self._bundle is None or doc["descriptor"] != self._primary_uid:
+            return
+        data = doc["data"]
+        energy = float(data[self._energy_key])
+        I0 = self._signal(data, self.I0)
+        mu = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if "trans" in self._modes:
+                It = self._signal(data, self.It)
+                ratio = np.float64(I0) / It
+                mu["trans"] = float(np.log(ratio)) if ratio > 0 else math.nan
+            if "fluor" in self._modes:
+                mu["fluor"] = float(np.float64(self._signal(data, self.If)) / I0)
+        results = {"energy": energy}
+        for mode, estimator in self._modes.items():
+            estimate = estimator.add_point(energy, mu[mode])
+            results.update(
+                {
+                    f"mu_{mode}": mu[mode],
+                    f"norm_{mode}": estimate["norm"],
+                    f"E0_{mode}": estimate["E0"],
+                    f"edge_step_{mode}": estimate["edge_step"],
+                }
+            )
+        event = self._bundle.compose_event(
+            data=results,
+            timestamps={key: doc["time"] for key in results},
+            time=doc["time"],
+        )
+        self.callback("event", event)
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
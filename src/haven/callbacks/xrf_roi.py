@@ -0,0 +1,298 @@
+"""Live region-of-interest sums for fluorescence detectors."""
+
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+import xraydb
+from event_model import DocumentRouter, compose_descriptor
+
+__all__ = ["XRFRegion", "ROIReducer", "XRFROIStream"]
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class XRFRegion:
+    """A range of spectrum bins to sum together.
+
+    Parameters
+    ==========
+    name
+      Name used for the ROI's data keys.
+    low
+      The first bin in the region.
+    high
+      One past the last bin in the region.
+
+    """
+
+    name: str
+    low: int
+    high: int
+
+    @classmethod
+    def from_line(
+        cls,
+        element: str,
+        line: str = "Ka1",
+        *,
+        ev_per_bin: float = 10.0,
+        width: float = 300.0,
+        name: str | None = None,
+    ) -> "XRFRegion":
+        """Create a region centered on an emission line.
+
+        Parameters
+        ==========
+        element
+          Element symbol, e.g. "Fe".
+        line
+          Siegbahn name of the emission line, e.g. "Ka1".
+        ev_per_bin
+          Energy width of each bin in the detector's spectrum.
+        width
+          Total width of the region, in eV.
+        name
+          Name of the region, defaults to e.g. "Fe-Ka1".
+
+        """
+        lines = xraydb.xray_lines(element)
+        if line not in lines:
+            raise ValueError(
+                f"Unknown emission line {line!r} for {element}. "
+                f"Options are: {sorted(lines)}"
+            )
+        energy = lines[line].energy
+        low = int(round((energy - width / 2) / ev_per_bin))
+        high = int(round((energy + width / 2) / ev_per_bin))
+        return cls(name=name or f"{element}-{line}", low=max(low, 0), high=max(high, 1))
+
+
+class ROIReducer:
+    """Sum regions of interest from many spectra at once.
+
+    The regions are stored as a (bins × regions) matrix of weights,
+    so that one matrix product sums every region of every element of
+    every frame.
+
+    Parameters
+    ==========
+    regions
+      The regions to sum.
+    num_bins
+      Number of bins in each spectrum.
+
+    """
+
+    def __init__(self, regions: Sequence[XRFRegion], num_bins: int):
+        names = [region.name for region in regions]
+        if len(set(names)) != len(names):
+            raise ValueError(f"ROI names must be unique: {names}")
+        self.regions = list(regions)
+        self.num_bins = num_bins
+        self.weights = np.zeros((num_bins, len(self.regions)))
+        for idx, region in enumerate(self.regions):
+            if not 0 <= region.low < region.high <= num_bins:
+                raise ValueError(
+                    f"ROI {region.name} ({region.low}, {region.high}) is"
+                    f" outside of the spectrum (0, {num_bins})."
+                )
+            self.weights[region.low : region.high, idx] = 1
+
+    def reduce(self, spectra: np.ndarray) -> np.ndarray:
+        """Sum the regions of interest in *spectra*.
+
+        Parameters
+        ==========
+        spectra
+          Array whose last axis is the spectrum, e.g. with shape
+          (frames, elements, bins).
+
+        Returns
+        =======
+        sums
+          Array with the same leading axes as *spectra*, and the last
+          axis replaced by one entry per region.
+
+        """
+        spectra = np.asarray(spectra)
+        if spectra.shape[-1] != self.num_bins:
+            raise ValueError(
+                f"Expected spectra with {self.num_bins} bins, got {spectra.shape}"
+            )
+        return spectra @ self.weights
+
+
+def _read_hdf(stream_resource: dict, start: int, stop: int) -> np.ndarray:
+    """Read frames *start* to *stop* from the HDF5 file of a stream resource."""
+    import h5py
+
+    path = Path(urlparse(stream_resource["uri"]).path)
+    dataset = stream_resource["parameters"]["dataset"]
+    with h5py.File(path, mode="r", swmr=True) as fp:
+        return fp[dataset][start:stop]
+
+
+class XRFROIStream(DocumentRouter):
+    """Publish ROI sums from a fluorescence detector as a derived stream.
+
+    Spectra are taken from the *data_key* of each event, or, for
+    detectors that write to file (e.g.
+    :py:class:`~haven.devices.detectors.xspress.Xspress3Detector`),
+    from the frames referenced by each stream datum. Each spectrum is
+    expected to have shape (elements, bins).
+
+    For every stream with spectra, *callback* receives the descriptor
+    and event pages of a new stream named ``"{stream}_rois"`` in the
+    same run. For each region, the new stream has the sum over all
+    elements (``"{data_key}-{region}"``), and the per-element sums
+    (``"{data_key}-{region}-elements"``).
+
+    Parameters
+    ==========
+    callback
+      Receives the (name, doc) pairs for the derived streams.
+    regions
+      The regions of interest to sum.
+    data_key
+      The data key holding the detector's spectra.
+    read_frames
+      Loads frames from a stream resource document, given the start
+      and stop indices. By default, they are read from the HDF5 file.
+
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, dict], None],
+        regions: Sequence[XRFRegion],
+        data_key: str,
+        read_frames: Callable[[dict, int, int], np.ndarray] = _read_hdf,
+    ):
+        super().__init__()
+        self.callback = callback
+        self.regions = list(regions)
+        self.data_key = data_key
+        self.read_frames = read_frames
+        self._start_doc = None
+        self._reducers: dict[str, ROIReducer] = {}
+        self._bundles: dict = {}
+        self._stream_resources: dict[str, dict] = {}
+
+    def start(self, doc):
+        self._start_doc = doc
+        self._reducers = {}
+        self._bundles = {}
+        self._stream_resources = {}
+
+    def descriptor(self, doc):
+        data_key = doc["data_keys"].get(self.data_key)
+        if data_key is None:
+            return
+        shape = data_key["shape"]
+        num_elements = int(np.prod(shape[:-1]))
+        self._reducers[doc["uid"]] = ROIReducer(self.regions, num_bins=shape[-1])
+        total = {"dtype": "number", "shape": [], "source": "derived"}
+        per_element = {"dtype": "array", "shape": [num_elements], "source": "derived"}
+        data_keys = {}
+        for region in self.regions:
+            key = f"{self.data_key}-{region.name}"
+            data_keys[key] = total
+            data_keys[f"{key}-elements"] = per_element
+        bundle = compose_descriptor(
+            start=self._start_doc,
+            streams={},
+            event_counters={},
+            name=f"{doc['name']}_rois",
+            data_keys=data_keys,
+            hints={
+                self.data_key: {
+                    "fields": [f"{self.data_key}-{r.name}" for r in self.regions]
+                }
+            },
+        )
+        self._bundles[doc["uid"]] = bundle
+        self.callback("descriptor", bundle.descriptor_doc)
+
+    def _publish(self, descriptor_uid: str, spectra: np.ndarray, seq_nums):
+        reducer = self._reducers[descriptor_uid]
+        spectra = np.asarray(spectra)
+        num_frames = len(seq_nums)
+        # Flatten any extra axes, so shape is (frames, elements, bins)
+        spectra = spectra.reshape(num_frames, -1, reducer.num_bins)
+        sums = reducer.reduce(spectra)
+        data = {}
+        for idx, region in enumerate(self.regions):
+            key = f"{self.data_key}-{region.name}"
+            data[key] = sums[..., idx].sum(axis=-1)
+            data[f"{key}-elements"] = sums[..., idx]
+        now = time.time()
+        page = self._bundles[descriptor_uid].compose_event_page(
+            data=data,
+            timestamps={key: [now] * num_frames for key in data},
+            seq_num=list(seq_nums),
+            time=[now] * num_frames,
+            validate=False,
+        )
+        self.callback("event_page", page)
+
+    def event_page(self, doc):
+        if doc["descriptor"] not in self._reducers:
+            return
+        spectra = doc["data"].get(self.data_key)
+        if spectra is None:
+            return
+        self._publish(doc["descriptor"], spectra, seq_nums=doc["seq_num"])
+
+    def stream_resource(self, doc):
+        if doc["data_key"] == self.data_key:
+            self._stream_resources[doc["uid"]] = doc
+
+    def stream_datum(self, doc):
+        stream_resource = self._stream_resources.get(doc["stream_resource"])
+        if stream_resource is None or doc["descriptor"] not in self._reducers:
+            return
+        indices, seq_nums = doc["indices"], doc["seq_nums"]
+        try:
+            spectra = self.read_frames(
+                stream_resource, indices["start"], indices["stop"]
+            )
+        except OSError:
+            log.exception(f"Could not read spectra for {self.data_key}.")
+            return
+        self._publish(
+            doc["descriptor"],
+            spectra,
+            seq_nums=range(seq_nums["start"], seq_nums["stop"]),
+        )
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
@@ -2,6 +2,9 @@ import re
 
 import xraydb
 
+# Plans that measure X-ray absorption spectra
+XAS_PLANS = ["xafs_scan", "energy_scan"]
+
 
 def edge_energy(edge_name):
     element, shell = re.split(r"[-_]", edge_name)
@@ -212,12 +212,14 @@ class CounterDriverIO(EpicsDevice):
         mcs_prefix: str,
         channels: Sequence[MCAChannel],
         name: str = "",
+        counts_pv: str | None = None,
     ):
         # These devices do not necessarily have Dale's offset correction support
         self.scaler = Scaler(
             prefix=f"{prefix}scaler1",
             channels=[ch["number"] for ch in channels],
             use_offset_correction=False,
+            counts_pv=counts_pv,
         )
         self.mcs = self.MCS(prefix=mcs_prefix, channels=channels)
         dark_signals = [sig.name for sig in self.mcs.mcas.values()]
@@ -284,15 +286,17 @@ class CounterDataProvider(PageableDataProvider):
         :param collections_per_event: how many collections make up one event
         """
         mcas = self.driver.mcs.mcas.values()
+        clock_mca = self.driver.mcs.clock
         coros = [
             self.driver.scaler.clock_frequency.get_value(),
-            self.driver.mcs.clock.count.get_value(),
-            self.driver.mcs.clock.read(),
+            clock_mca.read(),
             *(mca.read() for mca in mcas),
         ]
-        freq, clock, *mca_readings = await asyncio.gather(*coros)
+        # One concurrent batch of requests, the clock is only read once
+        freq, clock_reading, *mca_readings = await asyncio.gather(*coros)
+        clock = clock_reading[clock_mca.count.name]["value"]
         # Calculate timestamps,
-        readings = mca_readings
+        readings = [clock_reading, *mca_readings]
         reverse = slice(None, None, -1)
         time_deltas = np.cumsum(-clock[reverse])[reverse] / freq
         # The delta for a point is really the delta for the point
@@ -400,12 +404,14 @@ class Counter(StandardDetector):
         config_sigs: Sequence[SignalR] = (),
         name: str = "",
         driver: CounterDriverIO | None = None,
+        counts_pv: str | None = None,
     ) -> None:
         self.driver = driver or self.Driver(
             prefix,
             channels=channels,
             mcs_prefix=mcs_prefix or f"{prefix}MCS:",
             scaler_prefix=scaler_prefix or f"{prefix}scaler1:",
+            counts_pv=counts_pv,
         )
         if plugins is not None:
             for plugin_name, plugin in plugins.items():
@@ -0,0 +1,507 @@
+"""Continuous streaming acquisition from a LabJack waveform digitizer.
+
+``WaveformDigitizer.trigger()`` captures a single waveform and
+waits for it to finish. For fly scans, the digitizer can instead be
+left running with auto-restart enabled, so that each completed
+waveform is followed immediately by the next one. The
+:py:class:`WaveformStreamer` copies each completed block into a
+:py:class:`WaveformRingBuffer`, and the
+:py:class:`LabJackStreamingDetector` emits the buffered samples as
+gap-free event pages.
+
+.. code:: python
+
+    labjack = LabJackStreamingDetector(
+        "25idc:LJT7_1:", model="T7", analog_inputs=[0, 1], name="labjack"
+    )
+
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from bluesky.protocols import Reading
+from event_model import DataKey
+from event_model.documents import PartialEventPage
+from numpy.typing import ArrayLike, NDArray
+from ophyd_async.core import (
+    DEFAULT_TIMEOUT,
+    AsyncStatus,
+    DetectorAcquireLogic,
+    DetectorDataLogic,
+    DetectorTriggerLogic,
+    StandardDetector,
+    soft_signal_r_and_setter,
+    wait_for_value,
+)
+
+try:
+    from ophyd_async.core import PageableDataProvider
+except ImportError:
+    # Remove when released https://github.com/bluesky/ophyd-async/pull/1367
+    PageableDataProvider = object
+
+from ...exceptions import BufferOverrun, StreamGap
+from ..labjack import (
+    LabJackBase,
+    LabJackT4,
+    LabJackT7,
+    LabJackT7Pro,
+    LabJackT8,
+    WaveformDigitizer,
+)
+
+__all__ = [
+    "LabJackStreamingDetector",
+    "WaveformRingBuffer",
+    "WaveformStreamer",
+]
+
+
+class WaveformRingBuffer:
+    """A fixed-size buffer of the most recent digitizer samples.
+
+    Samples are addressed by their absolute index in the stream,
+    starting from 0 when the buffer is cleared. Once *capacity*
+    samples have been added, the oldest samples are overwritten.
+
+    Parameters
+    ==========
+    channels
+      The analog input numbers that will be stored.
+    capacity
+      How many samples to keep for each channel.
+
+    """
+
+    def __init__(self, channels: Sequence[int], capacity: int = 2**20):
+        self.channels = list(channels)
+        self.capacity = capacity
+        self._timestamps = np.empty(capacity, dtype=float)
+        self._values = np.empty((len(self.channels), capacity), dtype=float)
+        self.samples_written = 0
+
+    def __len__(self) -> int:
+        return min(self.samples_written, self.capacity)
+
+    @property
+    def first_available(self) -> int:
+        """Absolute index of the oldest sample still in the buffer."""
+        return max(0, self.samples_written - self.capacity)
+
+    def clear(self):
+        """Forget all previously recorded samples."""
+        self.samples_written = 0
+
+    def append(self, timestamps: ArrayLike, values: Mapping[int, ArrayLike]):
+        """Add a block of samples to the end of the buffer.
+
+        Parameters
+        ==========
+        timestamps
+          The time of each sample in the block.
+        values
+          The sample values, keyed by analog input number.
+
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        num_samples = len(timestamps)
+        if num_samples > self.capacity:
+            raise BufferOverrun(
+                f"Block of {num_samples} samples does not fit in buffer "
+                f"of {self.capacity}."
+            )
+        indices = (self.samples_written + np.arange(num_samples)) % self.capacity
+        self._timestamps[indices] = timestamps
+        for row, channel in enumerate(self.channels):
+            self._values[row, indices] = np.asarray(values[channel])[:num_samples]
+        self.samples_written += num_samples
+
+    def read(self, start: int, stop: int) -> tuple[NDArray, dict[int, NDArray]]:
+        """Retrieve the samples with absolute indices ``start`` to
+        ``stop - 1``.
+
+        Returns
+        =======
+        timestamps
+          The time of each sample.
+        values
+          The sample values, keyed by analog input number.
+
+        """
+        if start < self.first_available:
+            raise BufferOverrun(
+                f"Samples {start}–{self.first_available - 1} were overwritten "
+                "before they could be read."
+            )
+        if stop > self.samples_written:
+            raise ValueError(
+                f"Cannot read up to sample {stop}, "
+                f"only {self.samples_written} samples written."
+            )
+        indices = np.arange(start, stop) % self.capacity
+        values = {
+            channel: self._values[row, indices]
+            for row, channel in enumerate(self.channels)
+        }
+        return self._timestamps[indices], values
+
+
+class WaveformStreamer:
+    """Copy each completed digitizer waveform into a ring buffer.
+
+    The digitizer is set to restart automatically, so it keeps
+    acquiring until :py:meth:`stop` is called. Once every channel's
+    waveform has updated, the published waveforms are added to the
+    buffer as one block. If a channel updates twice before the
+    others have updated once, a block was lost and
+    :py:exc:`~haven.exceptions.StreamGap` is raised from
+    :py:meth:`stop`.
+
+    Sample timestamps are back-calculated from the time the block
+    was published and the actual dwell time. They are kept
+    contiguous with the previous block so that the timeline has no
+    overlaps.
+
+    Parameters
+    ==========
+    digitizer
+      The LabJack waveform digitizer to stream from.
+    channels
+      The analog input numbers to record.
+    capacity
+      How many samples the ring buffer can hold.
+
+    """
+
+    def __init__(
+        self,
+        digitizer: WaveformDigitizer,
+        channels: Sequence[int],
+        capacity: int = 2**20,
+    ):
+        self.digitizer = digitizer
+        self.buffer = WaveformRingBuffer(channels=channels, capacity=capacity)
+        self.samples_written, self._set_samples_written = soft_signal_r_and_setter(
+            int, initial_value=0
+        )
+        self._task: asyncio.Task | None = None
+        self._run_status: AsyncStatus | None = None
+        self._last_timestamp = -np.inf
+
+    @property
+    def streaming(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Clear the buffer and start the digitizer running."""
+        await self.stop()
+        self.buffer.clear()
+        self._last_timestamp = -np.inf
+        self._set_samples_written(0)
+        await self.digitizer.auto_restart.trigger()
+        subscribed = asyncio.Event()
+        self._task = asyncio.create_task(self._stream(subscribed))
+        await subscribed.wait()
+        # Don't wait, the put-callback only finishes when the digitizer stops
+        self._run_status = self.digitizer.run.set(True)
+        await wait_for_value(self.digitizer.run, True, timeout=DEFAULT_TIMEOUT)
+
+    async def stop(self):
+        """Stop the digitizer and stop recording blocks."""
+        if self._task is None:
+            return
+        await self.digitizer.run.set(False)
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._run_status is not None:
+                await self._run_status
+                self._run_status = None
+
+    async def _stream(self, subscribed: asyncio.Event):
+        channels = self.buffer.channels
+        waveforms = {ch: self.digitizer.waveforms[ch] for ch in channels}
+        dwell = await self.digitizer.dwell_actual.get_value()
+        # Queue the readings themselves, since the waveforms may
+        # update again before we get a chance to read them
+        readings: asyncio.Queue[tuple[int, Reading]] = asyncio.Queue()
+        callbacks = {}
+        for ch, waveform in waveforms.items():
+
+            def queue_reading(reading, ch=ch, name=waveform.name):
+                readings.put_nowait((ch, reading[name]))
+
+            callbacks[ch] = queue_reading
+            waveform.subscribe_reading(queue_reading)
+        try:
+            # The first readings are stale waveforms from before we started
+            for _ in channels:
+                await readings.get()
+            subscribed.set()
+            block: dict[int, Reading] = {}
+            while True:
+                ch, reading = await readings.get()
+                if ch in block:
+                    raise StreamGap(
+                        f"Waveform {ch} updated twice before the others "
+                        f"updated once, {sorted(set(channels) - set(block))} "
+                        "missed a block."
+                    )
+                block[ch] = reading
+                if len(block) == len(channels):
+                    self.add_block(block, dwell=dwell)
+                    block = {}
+        finally:
+            for ch, callback in callbacks.items():
+                waveforms[ch].clear_sub(callback)
+
+    def add_block(self, readings: Mapping[int, Reading], dwell: float):
+        """Add one completed waveform from each channel to the buffer.
+
+        Parameters
+        ==========
+        readings
+          The waveform reading for each analog input number.
+        dwell
+          The actual time between samples, in seconds.
+
+        """
+        blocks = {ch: reading["value"] for ch, reading in readings.items()}
+        lengths = {len(block) for block in blocks.values()}
+        if len(lengths) > 1:
+            raise StreamGap(f"Waveforms have different lengths: {lengths}")
+        num_samples = lengths.pop()
+        if num_samples == 0:
+            return
+        # The block finished when its last waveform was published
+        arrival = max(reading["timestamp"] for reading in readings.values())
+        start = max(arrival - (num_samples - 1) * dwell, self._last_timestamp + dwell)
+        timestamps = start + dwell * np.arange(num_samples)
+        self.buffer.append(timestamps, blocks)
+        self._last_timestamp = timestamps[-1]
+        self._set_samples_written(self.buffer.samples_written)
+
+
+class LabJackStreamDataProvider(PageableDataProvider):
+    """Emit streamed samples that have not yet been emitted.
+
+    Each page starts where the previous one finished, so no samples
+    are skipped or repeated as long as the ring buffer does not
+    overrun.
+
+    """
+
+    streamer: WaveformStreamer
+
+    def __init__(self, streamer: WaveformStreamer):
+        self.streamer = streamer
+        self.collections_written_signal = streamer.samples_written
+        self._next_sample = 0
+        super().__init__()
+
+    def _keys(self) -> dict[int, str]:
+        waveforms = self.streamer.digitizer.waveforms
+        return {ch: waveforms[ch].name for ch in self.streamer.buffer.channels}
+
+    async def make_datakeys(self, collections_per_event: int) -> dict[str, DataKey]:
+        """Return a DataKey for each analog input being streamed.
+
+        :param collections_per_event: this should appear in the shape of each DataKey
+        """
+        waveforms = self.streamer.digitizer.waveforms
+        shape = [collections_per_event] if collections_per_event > 1 else []
+        return {
+            key: DataKey(
+                source=waveforms[ch].source,
+                shape=shape,
+                dtype="number",
+                dtype_numpy="<f8",
+            )
+            for ch, key in self._keys().items()
+        }
+
+    async def make_pages(
+        self, collections_written: int, collections_per_event: int
+    ) -> AsyncGenerator[PartialEventPage, None]:
+        """Emit an event page for samples streamed since the last call.
+
+        :param collections_written: how many collections have been written so far
+        :param collections_per_event: how many collections make up one event
+        """
+        start = self._next_sample
+        stop = start + (collections_written - start) // collections_per_event * (
+            collections_per_event
+        )
+        if stop <= start:
+            return
+        timestamps, values = self.streamer.buffer.read(start, stop)
+        self._next_sample = stop
+        keys = self._keys()
+        num_events = (stop - start) // collections_per_event
+        if collections_per_event > 1:
+            values = {
+                ch: vals.reshape(num_events, collections_per_event)
+                for ch, vals in values.items()
+            }
+        # Each event is stamped with the time of its last sample
+        event_times = timestamps[collections_per_event - 1 :: collections_per_event]
+        yield {
+            "time": event_times.tolist(),
+            "data": {keys[ch]: vals for ch, vals in values.items()},
+            "timestamps": {key: event_times for key in keys.values()},
+        }
+
+
+@dataclass
+class LabJackStreamDataLogic(DetectorDataLogic):
+    streamer: WaveformStreamer
+
+    async def prepare_bounded(
+        self, datakey_name: str, num_collections: int, period: float
+    ) -> PageableDataProvider:
+        return LabJackStreamDataProvider(streamer=self.streamer)
+
+
+@dataclass
+class LabJackStreamTriggerLogic(DetectorTriggerLogic):
+    streamer: WaveformStreamer
+
+    async def prepare_internal(self, num: int, livetime: float, deadtime: float):
+        """Prepare the digitizer to stream internally clocked samples.
+
+        Parameters
+        ==========
+        num
+          the number of samples to take, ignored since the digitizer
+          streams until stopped
+        livetime
+          the dwell time for each sample, 0 means what is currently set
+        deadtime
+          how long between samples, ignored since the digitizer has
+          no dead time between samples
+        """
+        digitizer = self.streamer.digitizer
+        coros = [
+            digitizer.ext_trigger.set(digitizer.TriggerSource.INTERNAL),
+            digitizer.ext_clock.set(digitizer.TriggerSource.INTERNAL),
+        ]
+        if livetime > 0:
+            coros.append(digitizer.dwell_time.set(livetime))
+        await asyncio.gather(*coros)
+
+
+@dataclass
+class LabJackStreamAcquireLogic(DetectorAcquireLogic):
+    streamer: WaveformStreamer
+
+    async def start_acquiring(self):
+        await self.streamer.start()
+
+    async def wait_for_idle(self):
+        await self.streamer.stop()
+
+    async def ensure_stopped(self):
+        await self.streamer.stop()
+
+
+class LabJackStreamingDetector(StandardDetector):
+    """A LabJack waveform digitizer that acquires continuously.
+
+    Parameters
+    ==========
+    prefix
+      The PV prefix for the LabJack IOC.
+    analog_inputs
+      Which analog inputs to stream.
+    model
+      Which LabJack T-series model is in use. One of "T4", "T7",
+      "T7-Pro", or "T8".
+    buffer_size
+      How many samples per channel to keep in the ring buffer. Must
+      be large enough to hold all the samples acquired between
+      successive calls to ``collect_pages()``.
+    driver
+      A LabJack device to use instead of creating a new one.
+
+    """
+
+    models: Mapping[str, type[LabJackBase]] = {
+        "T4": LabJackT4,
+        "T7": LabJackT7,
+        "T7-Pro": LabJackT7Pro,
+        "T7Pro": LabJackT7Pro,
+        "T8": LabJackT8,
+    }
+
+    def __init__(
+        self,
+        prefix: str = "",
+        analog_inputs: Sequence[int] = (0,),
+        model: str = "T7",
+        buffer_size: int = 2**20,
+        name: str = "",
+        driver: LabJackBase | None = None,
+    ):
+        if driver is None:
+            try:
+                Driver = self.models[model]
+            except KeyError:
+                raise ValueError(
+                    f"Unknown LabJack model {model!r}. "
+                    f"Options are {list(self.models)}."
+                )
+            driver = Driver(prefix, analog_inputs=analog_inputs)
+        self.driver = driver
+        self.streamer = WaveformStreamer(
+            self.driver.waveform_digitizer,
+            channels=analog_inputs,
+            capacity=buffer_size,
+        )
+        # Add as a child so it gets connected along with the detector
+        self.samples_written = self.streamer.samples_written
+        self.add_detector_logics(
+            LabJackStreamTriggerLogic(streamer=self.streamer),
+            LabJackStreamAcquireLogic(streamer=self.streamer),
+            LabJackStreamDataLogic(streamer=self.streamer),
+        )
+        digitizer = self.driver.waveform_digitizer
+        self.add_config_signals(
+            digitizer.dwell_time,
+            digitizer.resolution,
+            digitizer.settling_time,
+            digitizer.num_points,
+        )
+        super().__init__(name=name)
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2026, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
@@ -8,7 +8,8 @@ from itertools import repeat
 from typing import Any, Literal, NotRequired, TypedDict
 
 import numpy as np
-from bluesky.protocols import Triggerable
+from bluesky.protocols import Reading, Triggerable
+from event_model import DataKey
 from ophyd_async.core import (
     DEFAULT_TIMEOUT,
     AsyncStatus,
@@ -44,6 +45,7 @@ class CounterInfo(TypedDict):
     prefix: str
     mcs_prefix: NotRequired[str]
     scaler_prefix: NotRequired[str]
+    counts_pv: NotRequired[str]
     flavor: Literal["CTR08", "SIS3820"]
 
 
@@ -60,6 +62,7 @@ class IonChamberInfo(TypedDict):
     labjack_channel: int
     preamp_prefix: str
     hertz_per_volt: int | float
+    settle_mode: NotRequired[Literal["fixed", "adaptive"]]
 
 
 def load_ion_chambers(
@@ -81,6 +84,12 @@ def load_ion_chambers(
     - `"CTR08"` for the Measurement Computer USB CTR08 counter
     - `"SIS3820"` for the Struck SIS3820 VME scaler
 
+    Entries in *ion_chamber* may also give a *settle_mode* for the
+    pre-amp (see :py:class:`~haven.devices.SRS570PreAmplifier`), and
+    entries in *counter* may give a *counts_pv* to read all the
+    scaler's raw counts at once (see
+    :py:class:`~haven.devices.scaler.Scaler`).
+
     Returns
     =======
     devices
@@ -89,7 +98,11 @@ def load_ion_chambers(
     """
     # Pre-amps are just separate, isolated devices
     _preamps = [
-        SRS570PreAmplifier(name=f"{cfg['name']}_preamp", prefix=cfg["preamp_prefix"])
+        SRS570PreAmplifier(
+            name=f"{cfg['name']}_preamp",
+            prefix=cfg["preamp_prefix"],
+            settle_mode=cfg.get("settle_mode", "fixed"),
+        )
         for cfg in ion_chamber
     ]
     # Build labjack devices with only the analog inputs we need for the ion chambers
@@ -110,6 +123,10 @@ def load_ion_chambers(
         labjack = _labjacks[ic["labjack"]]
         labjack_channel = ic["labjack_channel"]
         labjack.analog_inputs[labjack_channel].set_name(f"{ic['name']}_voltmeter")
+    # Let the pre-amps watch their voltmeters to decide when they've settled
+    for preamp, ic in zip(_preamps, ion_chamber):
+        voltmeter = _labjacks[ic["labjack"]].analog_inputs[ic["labjack_channel"]]
+        preamp.monitor_settling(voltmeter.final_value)
     # Finally, create the scaler objects now that we have the preamps, labjacks, etc
     _counters = {}
     for cfg in counter:
@@ -128,7 +145,7 @@ def load_ion_chambers(
                 "hertz_per_volt": ic_cfg["hertz_per_volt"],
             }
             for ic_cfg in ion_chamber
-            if ic_cfg["scaler"] == cfg["name"]
+            if ic_cfg["counter"] == cfg["name"]
         ]
         Counter = counter_classes[cfg["flavor"]]
         # kwargs = {key: val for key, val in cfg.items() if key != "flavor"}
@@ -136,6 +153,7 @@ def load_ion_chambers(
             prefix=cfg["prefix"],
             mcs_prefix=cfg.get("mcs_prefix", ""),
             scaler_prefix=cfg.get("scaler_prefix", ""),
+            counts_pv=cfg.get("counts_pv"),
             channels=channels,
             name=cfg["name"],
         )
@@ -151,6 +169,15 @@ class IonChamber(StandardReadable, Triggerable):
       If true, or None when no name was provided, the name for
       this motor will be set based on the motor's *description*
       field.
+    settle_mode
+      How the pre-amp waits to settle after changing gain, either
+      "fixed" or "adaptive" (see
+      :py:class:`~haven.devices.SRS570PreAmplifier`).
+    counts_pv
+      An array PV with the raw counts of all the scaler's
+      channels. If given, the clock and data channel counts are read
+      together with one request (see
+      :py:class:`~haven.devices.scaler.Scaler`).
 
 
     Sub-Devices
@@ -180,6 +207,8 @@ class IonChamber(StandardReadable, Triggerable):
         counts_per_volt_second: float,
         name="",
         auto_name: bool | None = None,
+        settle_mode: Literal["fixed", "adaptive"] = "fixed",
+        counts_pv: str | None = None,
     ):
         self.scaler_prefix = scaler_prefix
         self._scaler_channel = scaler_channel
@@ -191,7 +220,7 @@ class IonChamber(StandardReadable, Triggerable):
             )
         # Add the SRS570 pre-amplifier signals
         with self.add_children_as_readables():
-            self.preamp = SRS570PreAmplifier(preamp_prefix)
+            self.preamp = SRS570PreAmplifier(preamp_prefix, settle_mode=settle_mode)
         # Add the labjack voltmeter device
         self.voltmeter = LabJackT7(
             prefix=voltmeter_prefix,
@@ -201,6 +230,7 @@ class IonChamber(StandardReadable, Triggerable):
             digital_words=[],
         )
         self.add_readables([self.voltmeter_channel.final_value])
+        self.preamp.monitor_settling(self.voltmeter_channel.final_value)
         self.add_readables(
             [
                 self.voltmeter.analog_in_resolution_all,
@@ -231,17 +261,18 @@ class IonChamber(StandardReadable, Triggerable):
         )
         # Add scaler channel
         self.mcs = MultiChannelScaler(
-            prefix=scaler_prefix, channels=[0, scaler_channel]
+            prefix=scaler_prefix, channels=[0, scaler_channel], counts_pv=counts_pv
         )
         self.add_readables(
-            [
-                self.mcs.scaler.channels[0].net_count,
-                self.mcs.scaler.channels[0].raw_count,
-                self.scaler_channel.raw_count,
-                self.mcs.scaler.elapsed_time,
-            ],
+            [self.mcs.scaler.channels[0].net_count, self.mcs.scaler.elapsed_time],
             StandardReadableFormat.UNCACHED_SIGNAL,
         )
+        if counts_pv is None:
+            # Batched raw counts get added in ``read()`` instead
+            self.add_readables(
+                [self.mcs.scaler.channels[0].raw_count, self.scaler_channel.raw_count],
+                StandardReadableFormat.UNCACHED_SIGNAL,
+            )
         self.add_readables(
             [
                 self.mcs.acquire_mode,
@@ -355,6 +386,26 @@ class IonChamber(StandardReadable, Triggerable):
         except ZeroDivisionError:
             return float("nan")
 
+    async def describe(self) -> dict[str, DataKey]:
+        description = await super().describe()
+        if self.mcs.scaler.counts is not None:
+            raw_counts = [
+                self.mcs.scaler.channels[0].raw_count,
+                self.scaler_channel.raw_count,
+            ]
+            for desc in await asyncio.gather(*(sig.describe() for sig in raw_counts)):
+                description.update(desc)
+        return description
+
+    async def read(self) -> dict[str, Reading]:
+        if self.mcs.scaler.counts is None:
+            return await super().read()
+        reading, raw_counts = await asyncio.gather(
+            super().read(), self.mcs.scaler.read_raw_counts()
+        )
+        reading.update(raw_counts)
+        return reading
+
     def __repr__(self):
         return (
             f"<{type(self).__name__}: '{self.name}' "
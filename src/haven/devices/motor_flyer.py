@@ -1,14 +1,15 @@
 import logging
 import warnings
 from collections import OrderedDict
-from typing import Dict, Generator
+from typing import Dict, Generator, List
 
 import numpy as np
 from ophyd import Component as Cpt
 from ophyd import Device, Kind, Signal, get_cl
 from ophyd.flyers import FlyerInterface
 from ophyd.status import Status
-from scipy.interpolate import CubicSpline
+
+from .trajectory import TrajectoryRecorder
 
 log = logging.getLogger()
 
@@ -37,7 +38,7 @@ class MotorFlyer(FlyerInterface, Device):
         super().__init__(*args, **kwargs)
         self._kickoff_thread = None
         self._complete_thread = None
-        self._fly_model = None
+        self._fly_data = TrajectoryRecorder()
         self.cl = get_cl()
         # Set up auto-calculations for the flyer
         self.motor_egu.subscribe(self._update_fly_params)
@@ -103,8 +104,7 @@ class MotorFlyer(FlyerInterface, Device):
         def complete_thread():
             try:
                 # Record real motor positions for later evaluation
-                self._fly_data = []
-                self._fly_model = None
+                self._fly_data.clear()
                 cid = self.user_readback.subscribe(self.record_datum, run=False)
                 self.move(self.flyer_taxi_end.get())
                 self.user_readback.unsubscribe(cid)
@@ -134,7 +134,7 @@ class MotorFlyer(FlyerInterface, Device):
 
     def record_datum(self, *, old_value, value, timestamp, **kwargs):
         """Record a fly-scan data point so we can report it later."""
-        self._fly_data.append((timestamp, value))
+        self._fly_data.append(timestamp, value)
 
     def collect(self) -> Generator[Dict, None, None]:
         """Retrieve data from the flyer as proto-events
@@ -146,7 +146,9 @@ class MotorFlyer(FlyerInterface, Device):
 
         """
         # Create the data objects
-        for time, position in self._fly_data:
+        times = self._fly_data.times.tolist()
+        positions = self._fly_data.positions.tolist()
+        for time, position in zip(times, positions):
             yield {
                 "time": time,
                 "timestamps": {
@@ -175,28 +177,50 @@ class MotorFlyer(FlyerInterface, Device):
           the ``collect()`` method.
 
         """
-        # Prepare an interpolation model for fly scan data
-        if self._fly_model is None:
-            times, positions = np.asarray(self._fly_data).transpose()
-            self._fly_model = CubicSpline(times, positions, bc_type="clamped")
-        model = self._fly_model
-        # Interpolate the data value based on timestamp
-        position = float(model(timestamp))
-        setpoint = self.pixel_positions[
-            np.argmin(np.abs(self.pixel_positions - position))
+        return self.predict_many([timestamp])[0]
+
+    def predict_many(self, timestamps) -> List[Dict]:
+        """Predict where the motor was at each of *timestamps* during
+        the most recent fly scan.
+
+        The interpolation model is only built once, and setpoints are
+        assigned to all *timestamps* in a single vectorized search of
+        the pixel positions.
+
+        Parameters
+        ==========
+        timestamps
+          The unix timestamps to use for interpolating the measured
+          data.
+
+        Returns
+        =======
+        data
+          A data event for each timestamp similar to those provided
+          by the ``collect()`` method.
+
+        """
+        positions, setpoints = self._fly_data.assign_pixels(
+            timestamps, self.pixel_positions
+        )
+        readback_name = self.user_readback.name
+        setpoint_name = self.user_setpoint.name
+        return [
+            {
+                "time": timestamp,
+                "timestamps": {
+                    readback_name: timestamp,
+                    setpoint_name: timestamp,
+                },
+                "data": {
+                    readback_name: position,
+                    setpoint_name: setpoint,
+                },
+            }
+            for timestamp, position, setpoint in zip(
+                timestamps, positions.tolist(), setpoints.tolist()
+            )
         ]
-        datum = {
-            "time": timestamp,
-            "timestamps": {
-                self.user_readback.name: timestamp,
-                self.user_setpoint.name: timestamp,
-            },
-            "data": {
-                self.user_readback.name: position,
-                self.user_setpoint.name: setpoint,
-            },
-        }
-        return datum
 
     def describe_collect(self):
         """Describe details for the collect() method"""
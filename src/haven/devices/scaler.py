@@ -1,6 +1,9 @@
+import asyncio
 from collections.abc import Sequence
 
 import numpy as np
+from bluesky.protocols import Reading
+from event_model import DataKey
 from ophyd_async.core import (
     Array1D,
     DeviceVector,
@@ -22,7 +25,22 @@ def num_to_char(num):
 
 
 class ScalerChannel(StandardReadable):
-    def __init__(self, prefix, channel_num, name="", use_offset_correction=True):
+    """A single channel of a scaler.
+
+    If *batched* is true, the raw count is not included in this
+    channel's readings, since the parent scaler will read it along
+    with the other channels' counts.
+
+    """
+
+    def __init__(
+        self,
+        prefix,
+        channel_num,
+        name="",
+        use_offset_correction=True,
+        batched=False,
+    ):
         epics_ch_num = channel_num + 1  # EPICS is 1-indexed
         # Hinted signals
         with self.add_children_as_readables(StandardReadableFormat.HINTED_SIGNAL):
@@ -33,8 +51,11 @@ class ScalerChannel(StandardReadable):
                 )
                 self.net_count = epics_signal_r(float, f"{prefix}{net_suffix}")
         # Regular readable signals
-        with self.add_children_as_readables():
+        if batched:
             self.raw_count = epics_signal_r(float, f"{prefix}.S{epics_ch_num}")
+        else:
+            with self.add_children_as_readables():
+                self.raw_count = epics_signal_r(float, f"{prefix}.S{epics_ch_num}")
         # Configuration signals
         with self.add_children_as_readables(StandardReadableFormat.CONFIG_SIGNAL):
             self.description = epics_signal_rw(str, f"{prefix}.NM{epics_ch_num}")
@@ -121,7 +142,9 @@ class MultiChannelScaler(StandardReadable):
         MODE_5 = "Mode 5"
         MODE_6 = "Mode 6"
 
-    def __init__(self, prefix, channels: Sequence[int], name=""):
+    def __init__(
+        self, prefix, channels: Sequence[int], name="", counts_pv: str | None = None
+    ):
         # Controls
         self.start_all = epics_triggerable_command(f"{prefix}StartAll")
         self.stop_all = epics_triggerable_command(f"{prefix}StopAll")
@@ -173,7 +196,9 @@ class MultiChannelScaler(StandardReadable):
         # Child-devices
         with self.add_children_as_readables():
             self.mcas = DeviceVector({i: MCA(f"{prefix}mca{i+1}") for i in channels})
-            self.scaler = Scaler(f"{prefix}scaler1", channels=channels)
+            self.scaler = Scaler(
+                f"{prefix}scaler1", channels=channels, counts_pv=counts_pv
+            )
             self.elapsed_time = epics_signal_r(float, f"{prefix}ElapsedReal")
             self.current_channel = epics_signal_r(int, f"{prefix}CurrentChannel")
         super().__init__(name=name)
@@ -193,6 +218,11 @@ class Scaler(StandardReadable):
     use_offset_correction
       Whether the IOC has Dale's dark current offset support built
       in. Deprecated, will be removed in a future release
+    counts_pv
+      An array PV holding the raw counts for all channels, indexed
+      by channel number. If given, all raw counts are read with a
+      single request and unpacked into the per-channel readings,
+      instead of one request per channel.
 
     """
 
@@ -200,9 +230,17 @@ class Scaler(StandardReadable):
         ONE_SHOT = "OneShot"
         AUTO_COUNT = "AutoCount"
 
+    counts = None
+
     def __init__(
-        self, prefix, channels: Sequence[int], name="", use_offset_correction=True
+        self,
+        prefix,
+        channels: Sequence[int],
+        name="",
+        use_offset_correction=True,
+        counts_pv: str | None = None,
     ):
+        batched = counts_pv is not None
         # Add invidiaul scaler channels
         with self.add_children_as_readables():
             # Add individual channels
@@ -212,6 +250,7 @@ class Scaler(StandardReadable):
                         f"{prefix}",
                         channel_num=ch_num,
                         use_offset_correction=use_offset_correction,
+                        batched=batched,
                     )
                     for ch_num in channels
                 }
@@ -233,8 +272,46 @@ class Scaler(StandardReadable):
                 f"{prefix}_offset_start.PROC"
             )
             self.dark_current_time = epics_signal_rw(float, f"{prefix}_offset_time.VAL")
+        if batched:
+            self.counts = epics_signal_r(Array1D[np.float64], counts_pv)
         super().__init__(name=name)
 
+    async def describe(self) -> dict[str, DataKey]:
+        description = await super().describe()
+        if self.counts is not None:
+            raw_counts = await asyncio.gather(
+                *(ch.raw_count.describe() for ch in self.channels.values())
+            )
+            for desc in raw_counts:
+                description.update(desc)
+        return description
+
+    async def read(self) -> dict[str, Reading]:
+        if self.counts is None:
+            return await super().read()
+        reading, raw_counts = await asyncio.gather(
+            super().read(), self.read_raw_counts()
+        )
+        reading.update(raw_counts)
+        return reading
+
+    async def read_raw_counts(self) -> dict[str, Reading]:
+        """Read all the channels' raw counts with a single request.
+
+        Requires *counts_pv* to have been given. Readings are keyed
+        by each channel's ``raw_count`` signal name.
+
+        """
+        counts = await self.counts.read(cached=False)
+        counts = counts[self.counts.name]
+        return {
+            channel.raw_count.name: {
+                **counts,
+                "value": float(counts["value"][ch_num]),
+            }
+            for ch_num, channel in self.channels.items()
+        }
+
 
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
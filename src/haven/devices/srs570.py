@@ -15,18 +15,24 @@ https://htmlpreview.github.io/?https://raw.githubusercontent.com/epics-modules/i
 import asyncio
 import logging
 import math
+import time
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass
 from typing import Optional, Type, TypeVar
 
 from ophyd_async.core import (
     CALCULATE_TIMEOUT,
     AsyncStatus,
     CalculatableTimeout,
+    SignalR,
     SignalRW,
     StandardReadable,
     StandardReadableFormat,
     StrictEnum,
     derived_signal_r,
     derived_signal_rw,
+    observe_signals_value,
 )
 from ophyd_async.epics.core import epics_signal_rw, epics_triggerable_command
 from ophyd_async.epics.core._signal import _epics_signal_backend
@@ -42,6 +48,13 @@ T = TypeVar("T")
 gain_units = ["pA/V", "nA/V", "uA/V", "mA/V"]
 gain_values = ["1", "2", "5", "10", "20", "50", "100", "200", "500"]
 gain_modes = ["LOW NOISE", "HIGH BW"]
+# Multipliers to convert the current part of a sensitivity unit to amps
+unit_multipliers = {
+    "pA": 1e-12,
+    "nA": 1e-9,
+    "uA": 1e-6,
+    "mA": 1e-3,
+}
 
 
 class Sign(StrictEnum):
@@ -136,6 +149,123 @@ def calculate_settle_time(gain_value: int, gain_unit: int, gain_mode: str):
     return settling_times.get((str(gain_value), str(gain_unit), gain_mode))
 
 
+def sensitivity_from_gain_level(gain_level: int) -> float:
+    """Determine the pre-amp sensitivity (A/V) for a given gain level.
+
+    Gain levels follow the same ladder as
+    :py:meth:`SRS570PreAmplifier._from_gain_level`: level 0 is
+    1 mA/V and level 27 is 1 pA/V.
+
+    """
+    sens_level = 27 - int(gain_level)
+    if not 0 <= sens_level <= 27:
+        raise exceptions.GainOverflow(f"Gain level {gain_level} outside range (0, 27).")
+    value = gain_values[sens_level % len(gain_values)]
+    unit = gain_units[sens_level // len(gain_values)]
+    return float(value) * unit_multipliers[unit.split("/")[0]]
+
+
+@dataclass(frozen=True)
+class SettleRecord:
+    """The outcome of waiting for a pre-amp to settle after a gain change."""
+
+    signal_name: str
+    max_time: float
+    settle_time: float
+    stable: bool
+
+
+class SettleMonitor:
+    """Watch a signal after a gain change to decide when it has settled.
+
+    The signal is considered stable once *num_points* consecutive
+    updates are all within *tolerance* of each other. The first value
+    reported is skipped, since it may pre-date the gain change.
+
+    Each time the monitor waits, a :py:class:`SettleRecord` is added
+    to ``history`` so that the settle times can be tuned.
+
+    Parameters
+    ==========
+    signal
+      The signal to watch, usually the voltmeter attached to the
+      pre-amp's output.
+    tolerance
+      How much the signal can vary (in the signal's units) and still
+      be considered stable.
+    num_points
+      How many consecutive updates must be within *tolerance*.
+    history_length
+      How many settle records to keep.
+
+    """
+
+    def __init__(
+        self,
+        signal: SignalR,
+        tolerance: float = 0.01,
+        num_points: int = 3,
+        history_length: int = 1000,
+    ):
+        self.signal = signal
+        self.tolerance = tolerance
+        self.num_points = num_points
+        self.history: deque[SettleRecord] = deque(maxlen=history_length)
+        self._values: deque[float] = deque(maxlen=num_points)
+
+    def reset(self):
+        """Forget any values from previous gain changes."""
+        self._values.clear()
+
+    def _is_stable(self, values: deque[float]) -> bool:
+        if len(values) < self.num_points:
+            return False
+        return max(values) - min(values) <= self.tolerance
+
+    def update(self, value: float) -> bool:
+        """Add a new value and decide whether the signal is stable."""
+        self._values.append(value)
+        return self._is_stable(self._values)
+
+    async def wait(self, max_time: float, name: str = "") -> SettleRecord:
+        """Wait until the signal is stable, or until *max_time* has passed.
+
+        Several gain signals may wait on the same monitor at once, so
+        each wait keeps its own values.
+
+        """
+        values: deque[float] = deque(maxlen=self.num_points)
+        stable = False
+        start = time.monotonic()
+        # Close the generator when done, so the subscription is dropped
+        # (``observe_value`` wraps another generator that would only be
+        # closed once garbage-collected)
+        async with aclosing(observe_signals_value(self.signal)) as updates:
+            try:
+                async with asyncio.timeout(max_time):
+                    # The first value may be from before the gain changed
+                    await anext(updates)
+                    async for _, value in updates:
+                        values.append(value)
+                        if self._is_stable(values):
+                            stable = True
+                            break
+            except TimeoutError:
+                pass
+        record = SettleRecord(
+            signal_name=name,
+            max_time=max_time,
+            settle_time=time.monotonic() - start,
+            stable=stable,
+        )
+        self.history.append(record)
+        logger.debug(
+            f"{name} settled={stable} after {record.settle_time:.3f} s "
+            f"(max {max_time} s)."
+        )
+        return record
+
+
 class GainSignal(SignalRW):
     async def calculate_settle_time(self, value):
         signals = [
@@ -165,7 +295,13 @@ class GainSignal(SignalRW):
         aw = super().set(value=value, timeout=timeout)
         await aw
         settle_time = await self.calculate_settle_time(value)
-        await asyncio.sleep(settle_time)
+        monitor = getattr(self.parent, "settle_monitor", None)
+        use_monitor = getattr(self.parent, "settle_mode", "fixed") == "adaptive"
+        if use_monitor and monitor is not None and settle_time is not None:
+            # Stop waiting once the output stops changing
+            await monitor.wait(max_time=settle_time, name=self.name)
+        else:
+            await asyncio.sleep(settle_time)
 
 
 def gain_signal(
@@ -197,7 +333,18 @@ def gain_signal(
 
 
 class SRS570PreAmplifier(StandardReadable):
-    """Ophyd-async support for Stanford Research Systems 570 preamp."""
+    """Ophyd-async support for Stanford Research Systems 570 preamp.
+
+    Parameters
+    ==========
+    settle_mode
+      How to wait for the pre-amp to settle after changing gain. If
+      "fixed", wait for the time listed in ``settling_times``. If
+      "adaptive", watch the signal given to
+      :py:meth:`monitor_settling` and stop waiting once it is stable,
+      up to the time listed in ``settling_times``.
+
+    """
 
     _ophyd_labels_ = {"preamps"}
 
@@ -271,10 +418,18 @@ class SRS570PreAmplifier(StandardReadable):
         MICROAMP = "uA"
         MILLIAMP = "mA"
 
-    def __init__(self, prefix: str, name: str = ""):
+    settle_modes = ["fixed", "adaptive"]
+    settle_monitor: SettleMonitor | None = None
+
+    def __init__(self, prefix: str, name: str = "", settle_mode: str = "fixed"):
         """
         Update the gain when the sensitivity changes.
         """
+        if settle_mode not in self.settle_modes:
+            raise ValueError(
+                f"Invalid settle_mode {settle_mode!r}. Choices are {self.settle_modes}."
+            )
+        self.settle_mode = settle_mode
         self.set_all = epics_triggerable_command(f"{prefix}init.PROC")
         self.filter_reset = epics_triggerable_command(f"{prefix}filter_reset.PROC")
 
@@ -332,6 +487,17 @@ class SRS570PreAmplifier(StandardReadable):
             )
         super().__init__(name=name)
 
+    def monitor_settling(self, signal: SignalR, **kwargs) -> SettleMonitor:
+        """Use *signal* to decide when the pre-amp has settled after a
+        gain change.
+
+        Only used if ``settle_mode`` is "adaptive". Extra keyword
+        arguments are passed to :py:class:`SettleMonitor`.
+
+        """
+        self.settle_monitor = SettleMonitor(signal, **kwargs)
+        return self.settle_monitor
+
     def _gain_from_sensitivity(
         self, sens_value: SensValue, sens_unit: SensUnit
     ) -> float:
@@ -341,13 +507,7 @@ class SRS570PreAmplifier(StandardReadable):
         # Convert the sensitivity to a proper number
         val = float(sens_value)
         # Determine multiplier based on the gain unit
-        amps = {
-            "pA": 1e-12,
-            "nA": 1e-9,
-            "uA": 1e-6,
-            "mA": 1e-3,
-        }
-        multiplier = amps[sens_unit.split("/")[0]]
+        multiplier = unit_multipliers[sens_unit.split("/")[0]]
         inverse_gain = val * multiplier
         return 1 / inverse_gain
 
@@ -0,0 +1,169 @@
+"""Tools for reconstructing a motor's trajectory from its readback
+values during a fly scan.
+
+"""
+
+import logging
+import threading
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy.interpolate import CubicSpline
+
+__all__ = ["TrajectoryRecorder", "nearest_indices"]
+
+log = logging.getLogger(__name__)
+
+
+def nearest_indices(values: ArrayLike, grid: ArrayLike) -> NDArray:
+    """Find the index of the closest *grid* point for each of *values*.
+
+    Equivalent to calling ``np.argmin(np.abs(grid - value))`` for each
+    value, but uses a single binary search over all *values*. *grid*
+    must be sorted, either ascending or descending. Ties resolve to
+    the lower index, the same as ``np.argmin``.
+
+    """
+    values = np.asarray(values, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    num_points = len(grid)
+    if num_points < 2:
+        return np.zeros(values.shape, dtype=int)
+    descending = grid[0] > grid[-1]
+    sorted_grid = grid[::-1] if descending else grid
+    # Candidates on either side of each value
+    right = np.clip(np.searchsorted(sorted_grid, values), 1, num_points - 1)
+    left = right - 1
+    if descending:
+        lower, upper = num_points - 1 - right, num_points - 1 - left
+    else:
+        lower, upper = left, right
+    lower_distance = np.abs(values - grid[lower])
+    upper_distance = np.abs(values - grid[upper])
+    return np.where(upper_distance < lower_distance, upper, lower)
+
+
+class TrajectoryRecorder:
+    """Record (timestamp, position) pairs for a motor and interpolate
+    them afterwards.
+
+    Readings are stored in pre-allocated arrays that act as a ring
+    buffer: once *capacity* readings have been recorded, the oldest
+    readings are overwritten. The interpolation model is only fit
+    once after the most recent reading, and re-used for all
+    subsequent predictions.
+
+    Parameters
+    ==========
+    capacity
+      How many readings to keep.
+
+    """
+
+    def __init__(self, capacity: int = 2**18):
+        self.capacity = capacity
+        self._times = np.empty(capacity, dtype=float)
+        self._positions = np.empty(capacity, dtype=float)
+        self._count = 0
+        self._model: CubicSpline | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def clear(self):
+        """Forget all previously recorded readings."""
+        with self._lock:
+            self._count = 0
+            self._model = None
+
+    def append(self, timestamp: float, position: float):
+        """Add a new reading to the buffer."""
+        with self._lock:
+            idx = self._count % self.capacity
+            self._times[idx] = timestamp
+            self._positions[idx] = position
+            self._count += 1
+            self._model = None
+        if self._count == self.capacity + 1:
+            log.warning(
+                f"Trajectory buffer full ({self.capacity}), discarding old readings."
+            )
+
+    def _ordered(self, array: NDArray) -> NDArray:
+        if self._count <= self.capacity:
+            return array[: self._count]
+        start = self._count % self.capacity
+        return np.concatenate([array[start:], array[:start]])
+
+    @property
+    def times(self) -> NDArray:
+        """Timestamps of the recorded readings, oldest first."""
+        with self._lock:
+            return self._ordered(self._times)
+
+    @property
+    def positions(self) -> NDArray:
+        """Positions of the recorded readings, oldest first."""
+        with self._lock:
+            return self._ordered(self._positions)
+
+    @property
+    def model(self) -> CubicSpline:
+        """A spline model of position versus time for the recorded readings."""
+        if self._model is None:
+            with self._lock:
+                times = self._ordered(self._times)
+                positions = self._ordered(self._positions)
+            self._model = CubicSpline(times, positions, bc_type="clamped")
+        return self._model
+
+    def predict(self, timestamps: ArrayLike) -> NDArray:
+        """Interpolate the motor position at each of *timestamps*."""
+        return self.model(np.asarray(timestamps, dtype=float))
+
+    def assign_pixels(
+        self, timestamps: ArrayLike, pixel_positions: ArrayLike
+    ) -> tuple[NDArray, NDArray]:
+        """Determine the motor position and nearest pixel for each of
+        *timestamps*.
+
+        Returns
+        =======
+        positions
+          The interpolated motor position at each timestamp.
+        setpoints
+          The nearest position in *pixel_positions* to each of
+          *positions*.
+
+        """
+        pixel_positions = np.asarray(pixel_positions)
+        positions = self.predict(timestamps)
+        setpoints = pixel_positions[nearest_indices(positions, pixel_positions)]
+        return positions, setpoints
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2024, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
@@ -0,0 +1,439 @@
+"""Predict how long plans, and the queue as a whole, will take.
+
+Each registered plan has a model that turns the plan's arguments into
+detector live time, motor move time and a number of points, using
+known motor velocities and detector overheads. The remaining
+overhead (settling, readout, run start/stop, etc.) is then calibrated
+separately for each plan from the durations of completed runs, such
+as the queue server's history.
+
+"""
+
+import asyncio
+import logging
+import math
+import operator
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import replace
+from functools import reduce
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel, computed_field
+from scanspec.core import Axis, Path
+from scanspec.specs import Fly, Line, Spec, Zip
+
+__all__ = ["Duration", "DurationEstimator", "duration_from_spec"]
+
+log = logging.getLogger(__name__)
+
+
+class Duration(BaseModel):
+    livetime: float
+    """The time during which the detectors are live."""
+
+    movetime: float
+    """The time during which the motors are moving from one point to
+    another."""
+
+    @computed_field
+    def scantime(self) -> float:
+        return self.livetime + self.movetime
+
+    @computed_field
+    def efficiency(self) -> float:
+        """What portion of the total scan time is actual detector live time."""
+        return self.livetime / self.scantime if self.scantime != 0 else float("nan")
+
+
+def duration_from_spec(spec: Spec, velocities: Mapping[Axis, float]) -> Duration:
+    """Calculate the duration a scan will take given it's scanspec."""
+    slc = Path(spec.calculate()).consume()
+    # Livetime is just the sum of all durations
+    live_time = sum(slc.duration)
+    # Movetime is how long it takes motors to move between points
+    distances = {
+        ax: slc.lower[ax][1:] - slc.upper[ax][:-1] for ax in slc.midpoints.keys()
+    }
+    move_times = {
+        ax: abs(distances[ax]) / velocities.get(ax, float("inf"))
+        for ax in distances.keys()
+    }
+    move_time: float = np.sum(np.max(np.asarray([*move_times.values()]), axis=0))
+    return Duration(
+        livetime=live_time,
+        movetime=move_time,
+    )
+
+
+PlanModel = Callable[..., tuple[Duration, int]]
+"""Turns a plan's arguments into its duration and number of points.
+
+Called as ``model(estimator, *args, **kwargs)`` with the same
+arguments as the plan itself.
+
+"""
+
+
+def _chunks(args: Sequence, size: int) -> list[Sequence]:
+    if len(args) % size != 0:
+        raise ValueError(f"Expected groups of {size} arguments, got {len(args)}.")
+    return [args[idx : idx + size] for idx in range(0, len(args), size)]
+
+
+def _is_snaked(axis, snake_axes) -> bool:
+    if isinstance(snake_axes, Iterable):
+        return axis in snake_axes
+    return bool(snake_axes)
+
+
+def _from_spec(estimator, spec: Spec) -> tuple[Duration, int]:
+    num_points = len(Path(spec.calculate()).consume())
+    return duration_from_spec(spec, estimator.velocities), num_points
+
+
+def _count_model(
+    estimator,
+    detectors,
+    num=1,
+    delay=0.0,
+    *,
+    livetime=0.0,
+    collections_per_event=1,
+    **kwargs,
+):
+    if num is None:
+        raise ValueError("Cannot predict the duration of an endless count.")
+    exposure = estimator.exposure(livetime) * collections_per_event
+    if isinstance(delay, Iterable):
+        delay = sum(list(delay)[: num - 1])
+    else:
+        delay = delay * (num - 1)
+    return Duration(livetime=num * exposure, movetime=delay), num
+
+
+def _scan_model(
+    estimator,
+    detectors,
+    *args,
+    num=None,
+    livetime=0.0,
+    collections_per_event=1,
+    **kwargs,
+):
+    lines = [Line(motor, start, stop, num) for motor, start, stop in _chunks(args, 3)]
+    exposure = estimator.exposure(livetime) * collections_per_event
+    return _from_spec(estimator, exposure @ reduce(Zip, lines))
+
+
+def _grid_scan_model(
+    estimator,
+    detectors,
+    *args,
+    snake_axes=None,
+    livetime=0.0,
+    collections_per_event=1,
+    **kwargs,
+):
+    lines = [
+        Line(motor, start, stop, num) for motor, start, stop, num in _chunks(args, 4)
+    ]
+    # The slowest axis is never snaked
+    lines = [
+        lines[0],
+        *[
+            ~line if _is_snaked(line.axes()[0], snake_axes) else line
+            for line in lines[1:]
+        ],
+    ]
+    exposure = estimator.exposure(livetime) * collections_per_event
+    lines[-1] = exposure @ lines[-1]
+    return _from_spec(estimator, reduce(operator.mul, lines))
+
+
+def _xafs_scan_model(estimator, detectors, *energy_ranges, E0, **kwargs):
+    from .plans._energy_scan import resolve_E0
+    from .plans._xafs_scan import XAFSRegion, regions_to_scanspec
+
+    regions = []
+    for region in energy_ranges:
+        if isinstance(region, Mapping):
+            region = XAFSRegion(**region)
+        elif not isinstance(region, XAFSRegion):
+            region = XAFSRegion(*region)
+        if region.exposure is None:
+            # Don't change the caller's region
+            region = replace(region, exposure=estimator.exposure(0))
+        regions.append(region)
+    E0, _ = resolve_E0(E0)
+    spec = regions_to_scanspec(regions, E0=E0, axes=["energy"])
+    return _from_spec(estimator, spec)
+
+
+def _fly_scan_model(estimator, detectors, *args, num, dwell_time, **kwargs):
+    lines = [Line(motor, start, stop, num) for motor, start, stop in _chunks(args, 3)]
+    return _from_spec(estimator, Fly(dwell_time @ reduce(Zip, lines)))
+
+
+def _grid_fly_scan_model(
+    estimator, detectors, *args, dwell_time, snake_axes=False, **kwargs
+):
+    from .plans._fly import _grid_scan_spec
+
+    spec = _grid_scan_spec(*args, snake_axes=snake_axes, dwell_time=dwell_time)
+    return _from_spec(estimator, spec)
+
+
+plan_models: dict[str, PlanModel] = {
+    "count": _count_model,
+    "scan": _scan_model,
+    "rel_scan": _scan_model,
+    "grid_scan": _grid_scan_model,
+    "rel_grid_scan": _grid_scan_model,
+    "xafs_scan": _xafs_scan_model,
+    "fly_scan": _fly_scan_model,
+    "grid_fly_scan": _grid_fly_scan_model,
+}
+
+
+class _Calibration:
+    """Least-squares overheads for one plan, pulled towards a prior.
+
+    Observed durations are modeled as a weighted sum of the features
+    (live time, move time, dead time, 1). With no history, the prior
+    weights are used as they are. Each point in the history counts the
+    same as *prior_weight* runs agreeing with the prior.
+
+    """
+
+    prior = np.array([1.0, 1.0, 1.0, 0.0])
+
+    def __init__(self, history_size: int, prior_weight: float):
+        self.prior_weight = prior_weight
+        self.history: deque[tuple[np.ndarray, float]] = deque(maxlen=history_size)
+        self._weights: np.ndarray | None = self.prior
+
+    def observe(self, features: np.ndarray, duration: float):
+        self.history.append((features, duration))
+        self._weights = None
+
+    @property
+    def weights(self) -> np.ndarray:
+        if self._weights is None:
+            X = np.asarray([features for features, _ in self.history])
+            y = np.asarray([duration for _, duration in self.history])
+            # Scale the penalty to each feature's typical size
+            scale = np.mean(np.abs(X), axis=0)
+            scale[scale == 0] = 1.0
+            penalty = self.prior_weight * np.diag(scale**2)
+            self._weights = np.linalg.solve(
+                X.T @ X + penalty, X.T @ y + penalty @ self.prior
+            )
+        return self._weights
+
+    def predict(self, features: np.ndarray) -> float:
+        return max(float(features @ self.weights), 0.0)
+
+
+class DurationEstimator:
+    """Predict how long queue items will take to run.
+
+    Items are plans in the form used by the queue server,
+    e.g. ``{"name": "scan", "args": [...], "kwargs": {...}}``, or
+    :py:class:`bluesky_queueserver_api.BPlan` objects. Motors and
+    detectors are referred to by name.
+
+    Each plan in :py:data:`plan_models` gets a first estimate from the
+    motor *velocities* and *detector_overheads*, which is then
+    calibrated against the durations of completed runs given to
+    :py:meth:`observe` or :py:meth:`observe_history`. Plans without a
+    model are predicted from the average of their completed runs.
+
+    .. code-block:: python
+
+        estimator = DurationEstimator(velocities={"sim_motor_2": 2.0})
+        estimator.observe_history(api.history_get()["items"])
+        remaining = estimator.queue_duration(
+            api.queue_get()["items"], running_item=..., elapsed=...
+        )
+
+    Parameters
+    ==========
+    velocities
+      Speed of each motor, by name, in motor units per second. Moves
+      of other motors are assumed to take no time.
+    detector_overheads
+      Extra time, in seconds, spent by each detector (by name or
+      label) at every point, e.g. reading out.
+    point_overhead
+      Time, in seconds, spent at every point by detectors without an
+      entry in *detector_overheads*.
+    default_exposure
+      Exposure time, in seconds, to assume when a plan leaves it as
+      "whatever is currently set".
+    history_size
+      How many completed runs to remember for each plan.
+    prior_weight
+      How many runs' worth of confidence to give the uncalibrated
+      model.
+
+    """
+
+    def __init__(
+        self,
+        velocities: Mapping[str, float] = {},
+        detector_overheads: Mapping[str, float] = {},
+        *,
+        point_overhead: float = 0.05,
+        default_exposure: float = 1.0,
+        history_size: int = 50,
+        prior_weight: float = 1.0,
+    ):
+        self.velocities = dict(velocities)
+        self.detector_overheads = dict(detector_overheads)
+        self.point_overhead = point_overhead
+        self.default_exposure = default_exposure
+        self.history_size = history_size
+        self.prior_weight = prior_weight
+        self.models = dict(plan_models)
+        self._calibrations: dict[str, _Calibration] = {}
+        self._durations: dict[str, deque[float]] = {}
+
+    async def load_velocities(self, devices: Sequence):
+        """Read the current velocity of each device that has one."""
+        movers = [device for device in devices if hasattr(device, "velocity")]
+        velocities = await asyncio.gather(
+            *(mover.velocity.get_value() for mover in movers)
+        )
+        self.velocities.update(
+            {mover.name: velocity for mover, velocity in zip(movers, velocities)}
+        )
+
+    def exposure(self, livetime: float) -> float:
+        """The exposure to expect for a plan's *livetime* argument."""
+        return livetime if livetime > 0 else self.default_exposure
+
+    def _deadtime(self, detectors) -> float:
+        if isinstance(detectors, str):
+            detectors = [detectors]
+        overheads = [
+            self.detector_overheads.get(str(det), self.point_overhead)
+            for det in detectors
+        ]
+        return max(overheads, default=self.point_overhead)
+
+    @staticmethod
+    def _unpack(item) -> tuple[str, list, dict]:
+        if hasattr(item, "to_dict"):
+            item = item.to_dict()
+        return item["name"], list(item.get("args", [])), dict(item.get("kwargs", {}))
+
+    def features(self, item) -> np.ndarray | None:
+        """Live time, move time, dead time, and a constant, predicted
+        from an item's arguments, or ``None`` if there is no model."""
+        name, args, kwargs = self._unpack(item)
+        model = self.models.get(name)
+        if model is None:
+            return None
+        try:
+            duration, num_points = model(self, *args, **kwargs)
+        except Exception as exc:
+            log.debug(f"Cannot model duration of {name}: {exc}")
+            return None
+        detectors = args[0] if len(args) > 0 else kwargs.get("detectors", [])
+        deadtime = num_points * self._deadtime(detectors)
+        return np.array([duration.livetime, duration.movetime, deadtime, 1.0])
+
+    def _calibration(self, name: str) -> _Calibration:
+        if name not in self._calibrations:
+            self._calibrations[name] = _Calibration(
+                history_size=self.history_size, prior_weight=self.prior_weight
+            )
+        return self._calibrations[name]
+
+    def estimate(self, item) -> float:
+        """Predicted duration of *item*, in seconds, or NaN if it cannot
+        be predicted."""
+        if hasattr(item, "to_dict"):
+            item = item.to_dict()
+        if item.get("item_type", "plan") != "plan":
+            return 0.0
+        features = self.features(item)
+        if features is not None:
+            return self._calibration(item["name"]).predict(features)
+        durations = self._durations.get(item["name"])
+        return float(np.median(durations)) if durations else math.nan
+
+    def observe(self, item, duration: float):
+        """Calibrate the predictions using an item's real *duration*."""
+        name, _, _ = self._unpack(item)
+        self._durations.setdefault(name, deque(maxlen=self.history_size)).append(
+            duration
+        )
+        features = self.features(item)
+        if features is not None:
+            self._calibration(name).observe(features, duration)
+
+    def observe_history(self, history: Iterable[Mapping[str, Any]]):
+        """Calibrate from queue server history items that completed."""
+        for item in history:
+            result = item.get("result", {})
+            if item.get("item_type", "plan") != "plan":
+                continue
+            if result.get("exit_status") != "completed":
+                continue
+            try:
+                duration = result["time_stop"] - result["time_start"]
+            except (KeyError, TypeError):
+                continue
+            self.observe(item, duration)
+
+    def queue_duration(
+        self,
+        items: Iterable,
+        running_item=None,
+        elapsed: float = 0.0,
+    ) -> float:
+        """Predicted time, in seconds, until the queue is finished.
+
+        Parameters
+        ==========
+        items
+          The items waiting in the queue.
+        running_item
+          The item currently being run, if any.
+        elapsed
+          How long, in seconds, *running_item* has been running.
+
+        """
+        total = sum(self.estimate(item) for item in items)
+        if running_item:
+            total += max(self.estimate(running_item) - elapsed, 0.0)
+        return total
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
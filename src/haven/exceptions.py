@@ -128,6 +128,18 @@ class ExpiredFeatureFlag(FutureWarning):
     ...
 
 
+class BufferOverrun(RuntimeError):
+    """Data in a ring buffer were overwritten before they could be read."""
+
+    ...
+
+
+class StreamGap(RuntimeError):
+    """Data were lost while streaming from a detector."""
+
+    ...
+
+
 class TiledNotAvailable(RuntimeError):
     """The Tiled server was not available for connecting."""
 
@@ -13,9 +13,17 @@ import logging
 import os
 from collections.abc import Mapping, Sequence
 from pathlib import Path
+from typing import Literal
 
 import tomli
-from pydantic import BaseModel, ConfigDict, Field, PositiveInt, SecretStr
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PositiveFloat,
+    PositiveInt,
+    SecretStr,
+)
 
 log = logging.getLogger(__name__)
 
@@ -40,6 +48,12 @@ class FeatureFlagConfig(ConfigModel):
     # ] = False
 
 
+def user_cache_dir() -> Path:
+    """Per-user cache directory, following the XDG convention."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "haven"
+
+
 class DataManagementConfig(ConfigModel):
     # API URI's taken from the data management environmental variables
     scheduling_uri: str  # DM_APS_DB_WEB_SERVICE_URL
@@ -53,6 +67,11 @@ class DataManagementConfig(ConfigModel):
     password: SecretStr | None = None
     admin_account: str | None = None
     beamline_managers: Sequence[str] = []  # DM_BEAMLINE_MANAGERS
+    # Where to keep the directory of all users, and for how long (seconds)
+    user_cache_filepath: str = Field(
+        default_factory=lambda: str(user_cache_dir() / "user_directory.npz")
+    )
+    user_cache_ttl: PositiveFloat = 86400
 
 
 class RunEngineMetadata(ConfigModel):
@@ -65,7 +84,12 @@ class TiledConfig(ConfigModel):
     writer_profile: str
     cache_filepath: str = "/tmp/tiled/http_response_cache.db"
     writer_backup_directory: str | None = None
-    writer_batch_size: PositiveInt = 10
+    writer_batch_size: PositiveInt | Literal["adaptive"] = 10
+    # Limits used when ``writer_batch_size = "adaptive"``
+    writer_batch_size_bounds: tuple[PositiveInt, PositiveInt] = (1, 10000)
+    writer_flush_interval: PositiveFloat = 0.5
+    # Spool documents to disk before writing them to Tiled
+    writer_spool_directory: str | None = None
 
 
 class QueueserverConfig(ConfigModel):
@@ -78,6 +102,8 @@ class RunEngineConfig(ConfigModel):
     default_metadata: RunEngineMetadata = Field(
         default=RunEngineMetadata(), serialization_alias="DEFAULT_METADATA"
     )
+    # Extra RunEngine commands, as "module:attribute" import paths
+    commands: Sequence[str] = []
 
 
 class FormatterConfig(ConfigModel):
@@ -3,12 +3,14 @@ from queue import Queue
 import numpy as np
 import pandas as pd
 from bluesky import plan_stubs as bps
+from bluesky import preprocessors as bpp
 from bluesky_adaptive.per_event import adaptive_plan, recommender_factory
 from bluesky_adaptive.recommendations import NoRecommendation
 
+from ..devices.srs570 import sensitivity_from_gain_level
 from ..instrument import beamline
 
-__all__ = ["GainRecommender", "auto_gain"]
+__all__ = ["GainPredictor", "GainRecommender", "auto_gain"]
 
 
 class GainRecommender:
@@ -111,6 +113,100 @@ class GainRecommender:
         return best.gain
 
 
+class GainPredictor:
+    """A model-based engine for choosing the best ion chamber gain.
+
+    Instead of stepping through the gain levels, the measured voltage
+    is converted back to a pre-amp input current using the known
+    sensitivity of the current gain level. The output voltage for
+    every other gain level is then predicted, and the level that
+    lands closest to *target_volts* while staying between *volts_min*
+    and *volts_max* is selected.
+
+    Voltages at or above *volts_saturated*, or at or below
+    *volts_floor*, do not carry enough information to predict the
+    current, so the gain is changed by *big_step* levels instead.
+
+    """
+
+    volts_min: float
+    volts_max: float
+    target_volts: float
+    volts_saturated: float
+    volts_floor: float
+    gain_min: int = 0
+    gain_max: int = 27
+    big_step: int = 6
+
+    def __init__(
+        self,
+        volts_min: float = 0.5,
+        volts_max: float = 4.5,
+        target_volts: float = 2.5,
+        volts_saturated: float = 9.5,
+        volts_floor: float = 0.01,
+    ):
+        self.volts_min = volts_min
+        self.volts_max = volts_max
+        self.target_volts = target_volts
+        self.volts_saturated = volts_saturated
+        self.volts_floor = volts_floor
+        self._levels = np.arange(self.gain_min, self.gain_max + 1)
+        self._sensitivities = np.asarray(
+            [sensitivity_from_gain_level(level) for level in self._levels]
+        )
+
+    def predict_volts(self, gain: int, volts: float) -> np.typing.NDArray:
+        """Predict the pre-amp output at every gain level.
+
+        Parameters
+        ==========
+        gain
+          The gain level at which *volts* was measured.
+        volts
+          The measured voltage.
+
+        Returns
+        =======
+        predicted
+          The expected voltage for each gain level from *gain_min* to
+          *gain_max*.
+
+        """
+        current = volts * sensitivity_from_gain_level(gain)
+        return current / self._sensitivities
+
+    def next_gain(self, gain: int, volts: float) -> int:
+        """Determine the best gain level for this preamp from one
+        measurement.
+
+        Parameters
+        ==========
+        gain
+          The gain level at which *volts* was measured.
+        volts
+          The measured voltage.
+
+        """
+        gain = int(gain)
+        # Saturated or empty signals can only tell us the direction
+        if volts >= self.volts_saturated:
+            return max(gain - self.big_step, self.gain_min)
+        if volts <= self.volts_floor:
+            return min(gain + self.big_step, self.gain_max)
+        predicted = self.predict_volts(gain, volts)
+        in_range = (predicted >= self.volts_min) & (predicted <= self.volts_max)
+        distance = np.abs(predicted - self.target_volts)
+        if np.any(in_range):
+            # Prefer gain levels that end up inside the allowed window
+            distance = np.where(in_range, distance, np.inf)
+        return int(self._levels[np.argmin(distance)])
+
+    def suggest(self, gains, volts) -> list[int]:
+        """Determine the next gain level for every preamp at once."""
+        return [self.next_gain(gain, volt) for gain, volt in zip(gains, volts)]
+
+
 def auto_gain(
     ion_chambers="ion_chambers",
     volts_min: float = 0.5,
@@ -118,6 +214,7 @@ def auto_gain(
     prefer: str = "middle",
     max_count: int = 28,
     queue: Queue | None = None,
+    mode: str = "adaptive",
 ):
     """An adaptive Bluesky plan for optimizing ion chamber
     pre-amp gains.
@@ -145,6 +242,12 @@ def auto_gain(
     queue
       [Testing] A Queue object for passing recommendations between the
       plan and the recommendation engine.
+    mode
+      How to search for the best gain. "adaptive" (default) steps
+      through gain levels until the best one is bracketed. "predictive"
+      uses the measured voltage and the known SRS570 gain ladder to
+      jump straight to the best gain for every pre-amp in a single
+      move, followed by a verification count.
 
     """
     # Resolve the detector list into voltmeter AI's
@@ -161,6 +264,18 @@ def auto_gain(
         raise ValueError(
             f"Invalid value for *prefer* {prefer}. Choices are 'lower', 'middle', or 'upper'."
         )
+    if mode == "predictive":
+        predictor = GainPredictor(
+            volts_min=volts_min, volts_max=volts_max, target_volts=target
+        )
+        yield from _predictive_auto_gain(
+            ion_chambers, predictor=predictor, max_count=max_count
+        )
+        return
+    elif mode != "adaptive":
+        raise ValueError(
+            f"Invalid value for *mode* {mode}. Choices are 'adaptive' or 'predictive'."
+        )
     recommender = GainRecommender(
         volts_min=volts_min, volts_max=volts_max, target_volts=target
     )
@@ -190,6 +305,49 @@ def auto_gain(
     )
 
 
+def _predictive_auto_gain(ion_chambers, predictor: GainPredictor, max_count: int):
+    """Set all pre-amp gains from predictions based on measured voltages.
+
+    Each iteration takes one reading of all the ion chambers, predicts
+    the best gain for every pre-amp, and then moves all pre-amps
+    together. The plan ends once a verification reading agrees with
+    the current gains, or after *max_count* readings.
+
+    """
+    preamp_gains = [det.preamp.gain_level for det in ion_chambers]
+    voltmeters = [det.voltmeter_channel for det in ion_chambers]
+    dep_keys = [voltmeter.final_value.name for voltmeter in voltmeters]
+    md = {"plan_name": "auto_gain", "auto_gain_mode": "predictive"}
+
+    @bpp.run_decorator(md=md)
+    def inner():
+        # Start from the current gain settings
+        gains = []
+        for gain_signal in preamp_gains:
+            gain = yield from bps.rd(gain_signal, default_value=13)
+            gains.append(gain)
+        for count in range(max_count):
+            reading = yield from bps.trigger_and_read(voltmeters + preamp_gains)
+            if reading is None:
+                # No readings available (e.g. plan is not being run)
+                break
+            volts = [reading[key]["value"] for key in dep_keys]
+            new_gains = predictor.suggest(gains, volts)
+            if new_gains == [int(gain) for gain in gains]:
+                # Verified that we're already at the best gains
+                break
+            # Move all the pre-amps at once
+            args = [
+                arg
+                for signal, new_gain in zip(preamp_gains, new_gains)
+                for arg in (signal, new_gain)
+            ]
+            yield from bps.mv(*args)
+            gains = new_gains
+
+    return (yield from inner())
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
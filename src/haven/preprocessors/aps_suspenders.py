@@ -1,18 +1,24 @@
-from collections.abc import Generator, Sequence
+import logging
+import time
+from collections.abc import Callable, Generator, Sequence
+from dataclasses import dataclass, field
 from functools import partial
 from typing import Any
 
 from bluesky import Msg
 from bluesky import plan_stubs as bps
 from bluesky import preprocessors as bpp
+from bluesky.suspenders import SuspenderBase
 from bluesky.suspenders import SuspendFloor as BlueskySuspendFloor
 from bluesky.suspenders import SuspendWhenChanged as BlueskySuspendWhenChanged
 from bluesky.utils import make_decorator
-from ophyd_async.core import Device
+from ophyd_async.core import Device, SignalR
 
 from haven.devices import ApsMachine
 from haven.plans._shutters import open_shutters
 
+log = logging.getLogger(__name__)
+
 RESUME_TIME = 120
 
 
@@ -74,20 +80,282 @@ class SuspendFloor(NewSuspenderShim, BlueskySuspendFloor):
         return ": ".join(s for s in (just, self._tripped_message) if s)
 
 
+class _MergedSignals:
+    """Deliver readings from several signals to one callback.
+
+    Stands in for the single signal that bluesky suspenders expect.
+
+    """
+
+    def __init__(self, signals: Sequence[SignalR]):
+        self.signals = list(dict.fromkeys(signals))
+        self.name = ", ".join(sig.name for sig in self.signals)
+
+    def subscribe_reading(self, callback):
+        for sig in self.signals:
+            sig.subscribe_reading(callback)
+
+    def clear_sub(self, callback):
+        for sig in self.signals:
+            sig.clear_sub(callback)
+
+
+@dataclass
+class BeamRule:
+    """A condition that the beam must meet for data collection.
+
+    Parameters
+    ==========
+    cause
+      Describes what is wrong when the rule is broken.
+    signal
+      The signal to watch.
+    should_suspend
+      Receives the signal's value, returns true if the beam is bad.
+    should_resume
+      Receives the signal's value, returns true if the beam is good
+      again. Defaults to ``not should_suspend(value)``. Using a
+      different condition gives hysteresis.
+    min_duration
+      The rule must be broken (or satisfied again) for this many
+      seconds before it counts, so brief glitches are ignored.
+
+    """
+
+    cause: str
+    signal: SignalR
+    should_suspend: Callable[[Any], bool]
+    should_resume: Callable[[Any], bool] | None = None
+    min_duration: float = 0
+    broken: bool = False
+    value: Any = None
+    _pending_since: float | None = field(default=None, repr=False)
+
+    @classmethod
+    def floor(
+        cls,
+        signal: SignalR,
+        suspend_thresh: float,
+        resume_thresh: float | None = None,
+        *,
+        min_duration: float = 0,
+        cause: str = "",
+    ) -> "BeamRule":
+        """Broken while *signal* is below *suspend_thresh*, until it
+        rises back to *resume_thresh*."""
+        resume_thresh = suspend_thresh if resume_thresh is None else resume_thresh
+        if resume_thresh < suspend_thresh:
+            raise ValueError(
+                f"Resume threshold {resume_thresh} is below the suspend"
+                f" threshold {suspend_thresh}."
+            )
+        return cls(
+            cause=cause or f"{signal.name} below {suspend_thresh}",
+            signal=signal,
+            should_suspend=lambda value: value < suspend_thresh,
+            should_resume=lambda value: value >= resume_thresh,
+            min_duration=min_duration,
+        )
+
+    @classmethod
+    def expected(
+        cls,
+        signal: SignalR,
+        expected_value: Any,
+        *,
+        min_duration: float = 0,
+        cause: str = "",
+    ) -> "BeamRule":
+        """Broken while *signal* is not *expected_value*."""
+        return cls(
+            cause=cause or f"{signal.name} is not {expected_value!r}",
+            signal=signal,
+            should_suspend=lambda value: value != expected_value,
+            min_duration=min_duration,
+        )
+
+    def update(self, value: Any, timestamp: float):
+        """Record a new *value* for the rule's signal."""
+        self.value = value
+        if self.broken:
+            resume = self.should_resume or (lambda val: not self.should_suspend(val))
+            flipping = resume(value)
+        else:
+            flipping = self.should_suspend(value)
+        if not flipping:
+            self._pending_since = None
+        elif self._pending_since is None:
+            self._pending_since = timestamp
+        self.check(timestamp)
+
+    def check(self, now: float):
+        """Flip the rule if a pending change has lasted long enough."""
+        if self._pending_since is None:
+            return
+        if now - self._pending_since >= self.min_duration:
+            self.broken = not self.broken
+            self._pending_since = None
+
+    @property
+    def pending_deadline(self) -> float | None:
+        if self._pending_since is None:
+            return None
+        return self._pending_since + self.min_duration
+
+
+@dataclass
+class SuspensionEvent:
+    """A record of one suspension by a :py:class:`BeamConditionMonitor`."""
+
+    causes: list[str]
+    values: dict[str, Any]
+    started: float
+    ended: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.ended is None:
+            return None
+        return self.ended - self.started
+
+
+class BeamConditionMonitor(NewSuspenderShim, SuspenderBase):
+    """Suspend the run engine whenever any beam rule is broken.
+
+    All the *rules* are evaluated together from one merged
+    subscription to their signals, so one suspender covers every
+    condition. Rules only count as broken (or fixed) after their
+    *min_duration*, and the run engine resumes *sleep* seconds after
+    every rule is satisfied again.
+
+    Each suspension is recorded in :py:attr:`events` with its
+    causes, the offending values, and its duration.
+
+    Parameters
+    ==========
+    rules
+      The conditions that the beam must meet.
+    sleep
+      Seconds to wait after the beam recovers before resuming.
+    clock
+      Gives the current time, for rules that are waiting out their
+      *min_duration* when no new readings arrive.
+
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[BeamRule],
+        *,
+        clock: Callable[[], float] = time.time,
+        **kwargs,
+    ):
+        self.rules = list(rules)
+        self.clock = clock
+        self.events: list[SuspensionEvent] = []
+        self._recheck_at: float | None = None
+        signals = _MergedSignals([rule.signal for rule in self.rules])
+        super().__init__(signals, **kwargs)
+
+    @property
+    def broken_rules(self) -> list[BeamRule]:
+        return [rule for rule in self.rules if rule.broken]
+
+    def __call__(self, reading=None, **kwargs):
+        """Update rules from a new signal *reading*, or re-check the
+        rules against the clock if *reading* is ``None``."""
+        if reading is None:
+            now = self.clock()
+        else:
+            now = max(entry["timestamp"] for entry in reading.values())
+        for rule in self.rules:
+            if reading is not None and rule.signal.name in reading:
+                rule.update(reading[rule.signal.name]["value"], timestamp=now)
+            else:
+                rule.check(now)
+        self._log_transition(now)
+        super().__call__(reading, **kwargs)
+        self._schedule_recheck(now)
+
+    def _log_transition(self, now: float):
+        broken = self.broken_rules
+        ongoing = len(self.events) > 0 and self.events[-1].ended is None
+        if broken and not ongoing:
+            event = SuspensionEvent(
+                causes=[rule.cause for rule in broken],
+                values={rule.signal.name: rule.value for rule in broken},
+                started=now,
+            )
+            self.events.append(event)
+            log.warning(f"Beam conditions lost: {event.causes}")
+        elif broken and ongoing:
+            # Add any new causes to the current suspension
+            event = self.events[-1]
+            for rule in broken:
+                if rule.cause not in event.causes:
+                    event.causes.append(rule.cause)
+                    event.values[rule.signal.name] = rule.value
+        elif not broken and ongoing:
+            event = self.events[-1]
+            event.ended = now
+            log.info(f"Beam conditions restored after {event.duration:.1f} s.")
+
+    def _schedule_recheck(self, now: float):
+        """Make sure pending rules are checked even if their signals
+        stop updating."""
+        deadlines = [
+            deadline
+            for rule in self.rules
+            if (deadline := rule.pending_deadline) is not None
+        ]
+        if len(deadlines) == 0 or self.RE is None:
+            return
+        deadline = min(deadlines)
+        if self._recheck_at is not None and self._recheck_at <= deadline:
+            # Already scheduled
+            return
+        self._recheck_at = deadline
+        loop = self.RE._loop
+        loop.call_soon_threadsafe(
+            loop.call_later, max(deadline - now, 0), self._recheck
+        )
+
+    def _recheck(self):
+        self._recheck_at = None
+        self()
+
+    def _should_suspend(self, value):
+        return len(self.broken_rules) > 0
+
+    def _should_resume(self, value):
+        return len(self.broken_rules) == 0
+
+    def _get_justification(self):
+        if not self.tripped:
+            return ""
+        causes = "; ".join(rule.cause for rule in self.broken_rules)
+        just = f"Beam conditions not met: {causes}"
+        return ": ".join(s for s in (just, self._tripped_message) if s)
+
+
 def aps_suspenders_wrapper(
     plan: Generator[Msg, Any, Any],
     aps: ApsMachine,
     minimum_current: int | float = 30,
     sleep: int | float = 120,
     shutters: Sequence[Device] = (),
+    resume_current: int | float | None = None,
+    min_duration: float = 1.0,
 ) -> Generator[Msg, Any, Any]:
-    """Before the plan starts, install suspenders for the APS storage ring.
+    """Before the plan starts, install a suspender for the APS storage ring.
 
     If the current falls below *minimum_current*, or the shutter
     permit is revoked, the run engine will suspend, and resume *sleep*
-    seconds after the storage ring becomes usable again.
+    seconds after the storage ring becomes usable again. The current
+    must recover to *resume_current*, if given. Changes shorter than
+    *min_duration* seconds are ignored.
 
-    Suspenders are removed at the end of the plan.
+    The suspender is removed at the end of the plan.
 
     """
     suspenders = []  # Needs to be here so we can clean up after the plan
@@ -100,22 +368,23 @@ def aps_suspenders_wrapper(
             "MAINTENANCE",
         ]
         if in_user_operations:
-            suspenders.extend(
-                [
-                    SuspendWhenChanged(
-                        signal=aps.shutter_status,
-                        expected_value=True,
-                        allow_resume=True,
-                        sleep=sleep,
-                        tripped_message="Shutter permit revoked.",
-                        post_plan=open_these_shutters,
-                    ),
-                    SuspendFloor(
-                        signal=aps.current,
-                        suspend_thresh=minimum_current,
-                        sleep=sleep,
-                    ),
-                ]
+            rules = [
+                BeamRule.expected(
+                    aps.shutter_status,
+                    expected_value=True,
+                    min_duration=min_duration,
+                    cause="Shutter permit revoked.",
+                ),
+                BeamRule.floor(
+                    aps.current,
+                    suspend_thresh=minimum_current,
+                    resume_thresh=resume_current,
+                    min_duration=min_duration,
+                    cause=f"Storage ring current below {minimum_current}.",
+                ),
+            ]
+            suspenders.append(
+                BeamConditionMonitor(rules, sleep=sleep, post_plan=open_these_shutters)
             )
             for suspender in suspenders:
                 yield from bps.install_suspender(suspender)
@@ -1,31 +1,311 @@
+import asyncio
 import logging
+import time
 from typing import Sequence, Union  # , Iterable
 
+from bluesky import plan_stubs as bps
+from bluesky.bundlers import maybe_await
 from bluesky.preprocessors import baseline_wrapper as bluesky_baseline_wrapper
+from bluesky.protocols import Reading, Triggerable
 from bluesky.utils import make_decorator
+from event_model import DataKey
+from ophyd_async.core import Device, SignalR, walk_devices
 
 from haven.instrument import beamline
 
 log = logging.getLogger()
 
 
+DEFAULT_LABELS = [
+    "motors",
+    "power_supplies",
+    "xray_sources",
+    "APS",
+    "vacuum",
+    "baseline",
+    "slits",
+]
+
+
+class CachedReadable:
+    """Stands in for a device, answering reads from monitored values.
+
+    Call :py:meth:`monitor` to start watching the device's read and
+    configuration signals. :py:meth:`read` and
+    :py:meth:`read_configuration` then return the latest values without
+    talking to the hardware. Monitored values stay fresh for as long
+    as their subscriptions are live, however long ago they last
+    changed; :py:meth:`heartbeat` checks that they still are. Values
+    that are not monitored, or whose last heartbeat failed, are read
+    directly once they are more than *max_age* seconds old, or if they
+    have not arrived yet.
+
+    Parameters
+    ==========
+    device
+      The ophyd-async device to cache.
+    max_age
+      Oldest (in seconds) that a value without a live monitor may
+      be. If ``None``, cached values never go stale.
+    clock
+      Monotonic clock used for staleness.
+
+    """
+
+    parent = None
+
+    def __init__(
+        self,
+        device: Device,
+        *,
+        max_age: float | None = None,
+        clock=time.monotonic,
+    ):
+        self.device = device
+        self.max_age = max_age
+        self.clock = clock
+        self.direct_reads = 0
+        self._description: dict[str, DataKey] | None = None
+        self._configuration: dict[str, DataKey] | None = None
+        self._readings: dict[str, Reading] = {}
+        self._refreshed: dict[str, float] = {}
+        self._signals: dict[str, SignalR] = {}
+        # Keys whose monitors are known to be working
+        self._live: set[str] = set()
+
+    @property
+    def name(self) -> str:
+        return self.device.name
+
+    @property
+    def hints(self):
+        return getattr(self.device, "hints", {})
+
+    async def monitor(self):
+        """Subscribe to every signal that the device reads."""
+        description = await self.describe()
+        configuration = await self.describe_configuration()
+        if isinstance(self.device, SignalR):
+            candidates = [self.device]
+        else:
+            candidates = walk_devices(self.device).values()
+        keys = {**description, **configuration}
+        signals = {
+            sig.name: sig
+            for sig in candidates
+            if isinstance(sig, SignalR) and sig.name in keys
+        }
+        missing = set(keys) - set(signals)
+        if missing:
+            log.info(f"Cannot monitor {self.name}, no signals for {missing}.")
+            return
+        self._signals = signals
+        for sig in self._signals.values():
+            sig.subscribe_reading(self._monitor_update)
+
+    def stop(self):
+        for sig in self._signals.values():
+            sig.clear_sub(self._monitor_update)
+        self._signals = {}
+        self._readings = {}
+        self._refreshed = {}
+        self._live = set()
+
+    def _update(self, reading: dict[str, Reading]):
+        now = self.clock()
+        self._readings.update(reading)
+        self._refreshed.update({key: now for key in reading})
+
+    def _monitor_update(self, reading: dict[str, Reading]):
+        self._update(reading)
+        self._live.update(reading)
+
+    async def heartbeat(self):
+        """Check that the monitored signals are still connected.
+
+        Monitors only report changes, so a quiet monitor could mean
+        either an idle signal or a lost connection. If the signals
+        cannot be read, their cached values are treated like
+        unmonitored ones until the monitors post a new value.
+
+        """
+        if not self._signals:
+            return
+        try:
+            readings = await asyncio.gather(
+                *(sig.read(cached=False) for sig in self._signals.values())
+            )
+        except Exception as exc:
+            log.warning(f"Baseline monitors for {self.name} are not responding: {exc}")
+            self._live.clear()
+        else:
+            for reading in readings:
+                self._monitor_update(reading)
+
+    def is_fresh(self, keys) -> bool:
+        """Whether cached values for all of *keys* are recent enough."""
+        if not set(keys) <= set(self._readings):
+            return False
+        unmonitored = [key for key in keys if key not in self._live]
+        if self.max_age is None or len(unmonitored) == 0:
+            return True
+        oldest = min(self._refreshed[key] for key in unmonitored)
+        return self.clock() - oldest <= self.max_age
+
+    async def _read(self, keys, read_device) -> dict[str, Reading]:
+        if self.is_fresh(keys):
+            return {key: self._readings[key] for key in keys}
+        self.direct_reads += 1
+        if self._signals:
+            # Bypass the signals' own monitor caches
+            readings = await asyncio.gather(
+                *(self._signals[key].read(cached=False) for key in keys)
+            )
+            reading = {k: v for reading in readings for k, v in reading.items()}
+        else:
+            reading = await maybe_await(read_device())
+        self._update(reading)
+        return reading
+
+    async def describe(self) -> dict[str, DataKey]:
+        if self._description is None:
+            self._description = await maybe_await(self.device.describe())
+        return self._description
+
+    async def read(self) -> dict[str, Reading]:
+        return await self._read(await self.describe(), self.device.read)
+
+    async def describe_configuration(self) -> dict[str, DataKey]:
+        if self._configuration is None:
+            self._configuration = await maybe_await(
+                self.device.describe_configuration()
+            )
+        return self._configuration
+
+    async def read_configuration(self) -> dict[str, Reading]:
+        return await self._read(
+            await self.describe_configuration(), self.device.read_configuration
+        )
+
+
+class BaselineService:
+    """Keeps baseline values current, so runs can record them for free.
+
+    Device labels are resolved once, and afterwards the devices'
+    signals are monitored. At the start and end of each run, the
+    baseline is emitted from the cached values instead of reading
+    every device. Every *max_age* seconds, the monitored signals are
+    read in the background to check that their monitors still work.
+    Devices that cannot be monitored (e.g. triggerable or ophyd
+    devices) are read directly as usual, as are cached values older
+    than *max_age* whose monitors have stopped responding.
+
+    .. code-block:: python
+
+        baseline = BaselineService(devices=["motors", "baseline"], max_age=600)
+        RE(baseline_wrapper(bp.count([det]), service=baseline))
+
+    Parameters
+    ==========
+    devices
+      Device labels or names, as for :py:func:`baseline_wrapper`.
+    max_age
+      Seconds between checks of the monitors, and the oldest that a
+      value without a working monitor may be before it is read
+      directly instead.
+
+    """
+
+    def __init__(
+        self,
+        devices: Union[Sequence, str] = DEFAULT_LABELS,
+        *,
+        max_age: float | None = 300,
+    ):
+        self.labels = devices
+        self.max_age = max_age
+        self.started = False
+        self._devices: list | None = None
+        self._readables: list = []
+        self._heartbeat_task: asyncio.Task | None = None
+
+    @property
+    def devices(self) -> list:
+        """The resolved baseline devices, looked up only once."""
+        if self._devices is None:
+            self._devices = beamline.devices.findall(self.labels, allow_none=True)
+        return self._devices
+
+    def refresh(self):
+        """Forget resolved devices and cached values, e.g. after the
+        beamline's devices have changed."""
+        self.stop()
+        self._devices = None
+
+    def _cacheable(self, device) -> bool:
+        return isinstance(device, Device) and not isinstance(device, Triggerable)
+
+    async def start(self):
+        """Start monitoring the baseline devices."""
+        self._readables = [
+            (
+                CachedReadable(device, max_age=self.max_age)
+                if self._cacheable(device)
+                else device
+            )
+            for device in self.devices
+        ]
+        for readable in self._readables:
+            if isinstance(readable, CachedReadable):
+                await readable.monitor()
+        if self.max_age is not None:
+            self._heartbeat_task = asyncio.ensure_future(self._heartbeat())
+        self.started = True
+
+    async def _heartbeat(self):
+        cached = [r for r in self._readables if isinstance(r, CachedReadable)]
+        while True:
+            await asyncio.sleep(self.max_age)
+            await asyncio.gather(*(readable.heartbeat() for readable in cached))
+
+    def stop(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for readable in self._readables:
+            if isinstance(readable, CachedReadable):
+                readable.stop()
+        self._readables = []
+        self.started = False
+
+    @property
+    def readables(self) -> list:
+        """Objects to read for the baseline, in place of the devices."""
+        return list(self._readables)
+
+    def wrapper(self, plan, name: str = "baseline"):
+        if not self.started:
+            yield from bps.wait_for([self.start])
+        return (
+            yield from bluesky_baseline_wrapper(
+                plan=plan, devices=self.readables, name=name
+            )
+        )
+
+
 def baseline_wrapper(
     plan,
-    devices: Union[Sequence, str] = [
-        "motors",
-        "power_supplies",
-        "xray_sources",
-        "APS",
-        "vacuum",
-        "baseline",
-        "slits",
-    ],
+    devices: Union[Sequence, str] = DEFAULT_LABELS,
     name: str = "baseline",
+    service: BaselineService | None = None,
 ):
     bluesky_baseline_wrapper.__doc__
+    if service is not None:
+        # Cached, monitored devices
+        return (yield from service.wrapper(plan, name=name))
     # Resolve devices
     devices = beamline.devices.findall(devices, allow_none=True)
-    yield from bluesky_baseline_wrapper(plan=plan, devices=devices, name=name)
+    return (yield from bluesky_baseline_wrapper(plan=plan, devices=devices, name=name))
 
 
 baseline_decorator = make_decorator(baseline_wrapper)
@@ -36,9 +36,11 @@ class DarkCurrentRecorder:
     This preprocessor will inject messages to record the dark current
     when either of the following are true.
 
-    If will also add metadata ("dark_current_uid") into the start
-    document of each run with the UID of the last dark current
-    measurement.
+    If will also add metadata into the start document of each run:
+    "dark_current_uid" with the UID of the last dark current
+    measurement, and "dark_currents" with the raw (not
+    dark-corrected) readings from that measurement, keyed by data
+    key.
 
     1. It has been longer than *time_to_live* seconds ago since the
        last time the dark current was measured.
@@ -66,6 +68,7 @@ class DarkCurrentRecorder:
     _last_measured: int | float | None = None
     _preamp_readings: dict = field(default_factory=dict)
     _scan_uid: str | None = None
+    _dark_currents: dict = field(default_factory=dict)
     _pending: dict = field(default_factory=dict)
     _is_subscribed: bool = False
 
@@ -111,7 +114,11 @@ class DarkCurrentRecorder:
         if msg.kwargs.get("plan_name") == "record_dark_current":
             return msg
         # Valid open-run message, so add in the metadata
-        new_kwargs = {"dark_current_uid": self._scan_uid, **msg.kwargs}
+        new_kwargs = {
+            "dark_current_uid": self._scan_uid,
+            "dark_currents": self._dark_currents,
+            **msg.kwargs,
+        }
         new_msg = Msg(
             command=msg.command,
             obj=msg.obj,
@@ -137,12 +144,23 @@ class DarkCurrentRecorder:
         # run engine
         self._is_subscribed = True
         if name == "start" and doc.get("plan_name") == "record_dark_current":
-            self._pending = {"start_uid": doc["uid"]}
+            self._pending = {"start_uid": doc["uid"], "dark_currents": {}}
+            return
+        if name == "event" and doc["descriptor"] == self._pending.get("descriptor_uid"):
+            # Net signals are already corrected by the scaler
+            self._pending["dark_currents"].update(
+                {
+                    key: value
+                    for key, value in doc["data"].items()
+                    if "raw" in key and isinstance(value, (int, float))
+                }
+            )
             return
         if doc.get("run_start") != self._pending.get("start_uid"):
             # We only care about docs that are part of the record_dark_current plan
             return
         if name == "descriptor":
+            self._pending["descriptor_uid"] = doc["uid"]
             # Store preamp readings so we can tell when they've been changed
             self._pending["preamp_readings"] = {}
             for preamp in self.preamps:
@@ -167,6 +185,7 @@ class DarkCurrentRecorder:
                 )
                 return
             self._scan_uid = self._pending["start_uid"]
+            self._dark_currents = self._pending["dark_currents"]
             self._preamp_readings = self._pending["preamp_readings"]
             self._last_measured = time.monotonic()
         if is_stop_doc and exit_status != "success":
@@ -1,4 +1,10 @@
+import inspect
 import logging
+import pkgutil
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import get_protocol_members
 
 import IPython
 from apsbits.core.run_engine_init import init_RE
@@ -9,12 +15,90 @@ from bluesky.callbacks.tiled_writer import TiledWriter
 from bluesky.utils import register_transform
 
 from haven import load_config
+from haven.exceptions import InvalidConfiguration
 from haven.iconfig import HavenConfig
+from haven.protocols import Calibratable
 
 log = logging.getLogger(__name__)
 
 
-__all__ = ["run_engine"]
+__all__ = ["run_engine", "RunEngineCommand"]
+
+
+ENTRY_POINT_GROUP = "haven.run_engine_commands"
+
+
+def _satisfies(obj, protocol: type) -> bool:
+    """Check *obj* against *protocol*.
+
+    Protocol members are looked up with ``hasattr`` rather than
+    ``isinstance``, which only finds statically defined attributes.
+
+    """
+    if getattr(protocol, "_is_protocol", False):
+        return all(hasattr(obj, attr) for attr in get_protocol_members(protocol))
+    return isinstance(obj, protocol)
+
+
+@dataclass(frozen=True)
+class RunEngineCommand:
+    """A custom message that can be handled by the run engine.
+
+    Commands are registered when the run engine is created by
+    :py:func:`run_engine`. Beyond haven's own commands, they are
+    discovered from the ``"haven.run_engine_commands"`` entry point
+    group, and from the ``run_engine.commands`` list of import paths
+    in the iconfig file, e.g.:
+
+    .. code-block:: toml
+
+        [run_engine]
+        commands = ["my_beamline.commands:tune_command"]
+
+    Parameters
+    ==========
+    name
+      The command in the message, e.g. ``Msg(name, obj, ...)``.
+    handler
+      Coroutine function that receives the message.
+    protocols
+      Types that the message's object must satisfy, e.g.
+      runtime-checkable protocols.
+
+    """
+
+    name: str
+    handler: Callable[[Msg], Awaitable]
+    protocols: Sequence[type] = ()
+
+    def validate(self):
+        if not isinstance(self.name, str) or self.name == "":
+            raise InvalidConfiguration(
+                f"Invalid run engine command name: {self.name!r}"
+            )
+        if not inspect.iscoroutinefunction(self.handler):
+            raise InvalidConfiguration(
+                f"Handler for run engine command {self.name!r} is not a coroutine"
+                f" function: {self.handler!r}"
+            )
+        for protocol in self.protocols:
+            is_protocol = getattr(protocol, "_is_protocol", False)
+            if not isinstance(protocol, type) or (
+                is_protocol and not getattr(protocol, "_is_runtime_protocol", False)
+            ):
+                raise InvalidConfiguration(
+                    f"Run engine command {self.name!r} requires {protocol!r},"
+                    " which cannot be checked at run time."
+                )
+
+    async def __call__(self, msg: Msg):
+        for protocol in self.protocols:
+            if not _satisfies(msg.obj, protocol):
+                raise TypeError(
+                    f"Cannot {self.name!r} {msg.obj!r}: does not satisfy"
+                    f" {protocol.__name__}."
+                )
+        return await self.handler(msg)
 
 
 async def _calibrate(msg: Msg):
@@ -30,10 +114,63 @@ async def _calibrate(msg: Msg):
     await maybe_await(msg.obj.calibrate(*msg.args, **msg.kwargs))
 
 
+builtin_commands = [
+    RunEngineCommand("calibrate", _calibrate, protocols=[Calibratable]),
+]
+
+
+def _load_command(obj, source: str) -> RunEngineCommand:
+    if not isinstance(obj, RunEngineCommand):
+        raise InvalidConfiguration(f"{source} is not a RunEngineCommand: {obj!r}")
+    return obj
+
+
+def discover_commands(import_paths: Iterable[str] = ()) -> list[RunEngineCommand]:
+    """Find extra run engine commands from entry points and import paths."""
+    commands = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        commands.append(
+            _load_command(entry_point.load(), source=f"Entry point {entry_point.name}")
+        )
+    for path in import_paths:
+        try:
+            obj = pkgutil.resolve_name(path)
+        except (ImportError, AttributeError, ValueError) as exc:
+            raise InvalidConfiguration(
+                f"Could not import run engine command {path!r}: {exc}"
+            ) from exc
+        commands.append(_load_command(obj, source=path))
+    return commands
+
+
+def register_commands(RE: BlueskyRunEngine, commands: Iterable[RunEngineCommand]):
+    """Validate *commands* and add them to the run engine *RE*.
+
+    Raises
+    ======
+    InvalidConfiguration
+      A command is malformed, or its name is already taken.
+
+    """
+    commands = list(commands)
+    taken = set(RE.commands)
+    for command in commands:
+        command.validate()
+        if command.name in taken:
+            raise InvalidConfiguration(
+                f"Run engine command {command.name!r} is already registered."
+            )
+        taken.add(command.name)
+    # Only register once all commands are known to be valid
+    for command in commands:
+        RE.register_command(command.name, command)
+
+
 def run_engine(
     *,
     tiled_writer: TiledWriter | None = None,
     config: HavenConfig | None = None,
+    commands: Sequence[RunEngineCommand] = (),
     **kwargs,
 ) -> BlueskyRunEngine:
     """Build a bluesky RunEngine() for Haven.
@@ -46,6 +183,9 @@ def run_engine(
     config
       An instrument configuration to use. If omitted, the default for
       this environment will be used.
+    commands
+      Extra custom messages to handle, in addition to those found by
+      :py:func:`discover_commands`.
 
     """
     if config is None:
@@ -54,7 +194,14 @@ def run_engine(
     # Create the run engine
     RE, *_ = init_RE(config_, **kwargs)
     # Add custom verbs
-    RE.register_command("calibrate", _calibrate)
+    register_commands(
+        RE,
+        [
+            *builtin_commands,
+            *discover_commands(config.run_engine.commands),
+            *commands,
+        ],
+    )
     # Add a shortcut for using the run engine more efficiently
     if (ip := IPython.get_ipython()) is not None:
         register_transform("RE", prefix="<", ip=ip)
@@ -1,14 +1,22 @@
+import threading
+import time
+from unittest import mock
+
 import numpy as np
 import pydm
 import pyqtgraph
 import pytest
+from qtpy.QtCore import QEvent
+from qtpy.QtWidgets import QApplication
 
-from firefly.devices.area_detector_viewer import AreaDetectorViewerDisplay
+from firefly.devices.area_detector_viewer import (
+    AreaDetectorViewerDisplay,
+    ImagePipeline,
+    bin_image,
+    process_frame,
+)
 
 
-@pytest.skip(
-    reason="Will be re-written to support ophyd-async", allow_module_level=True
-)
 @pytest.fixture()
 def display(qtbot, sim_camera):
     display = AreaDetectorViewerDisplay(macros={"AD": sim_camera.name})
@@ -16,6 +24,68 @@ def display(qtbot, sim_camera):
     return display
 
 
+@pytest.fixture()
+def pipeline():
+    pipeline = ImagePipeline(max_fps=20)
+    pipeline.start()
+    yield pipeline
+    pipeline.stop()
+
+
+def test_process_frame():
+    source_img = np.arange(54 * 64).reshape(54, 64)
+    # For some reason, PyDMConnection mis-shapes the data
+    reshape_img = np.reshape(source_img, source_img.shape[::-1])
+    frame = process_frame(reshape_img)
+    np.testing.assert_equal(frame.image, source_img)
+    assert frame.levels == (0, 54 * 64 - 1)
+    assert frame.histogram[1].sum() == 54 * 64
+    # Binned frames
+    frame = process_frame(reshape_img, bin_size=4)
+    assert frame.image.shape == (13, 16)
+    assert frame.image[0, 0] == np.mean(source_img[:4, :4])
+
+
+def test_bin_rgb_image():
+    img = np.ones((54, 64, 3))
+    assert bin_image(img, 2).shape == (27, 32, 3)
+
+
+def test_pipeline_drops_frames(qtbot, pipeline):
+    """A 4 Mpx detector at 500 Hz should not swamp the GUI."""
+    rng = np.random.default_rng(seed=0)
+    frames = rng.integers(0, 4096, size=(4, 2048, 2048), dtype=np.uint16)
+    shown = []
+    pipeline.frame_ready.connect(shown.append)
+    num_frames = 500
+
+    def detector():
+        start = time.monotonic()
+        for idx in range(num_frames):
+            frame = frames[idx % len(frames)].copy()
+            frame[0, 0] = idx
+            pipeline.submit(frame)
+            time.sleep(max(start + (idx + 1) / 500 - time.monotonic(), 0))
+
+    thread = threading.Thread(target=detector)
+    thread.start()
+    while thread.is_alive():
+        qtbot.wait(50)
+    thread.join()
+    # Wait for the last frame to be rendered
+    qtbot.waitUntil(
+        lambda: len(shown) > 0 and shown[-1].image[0, 0] == num_frames - 1,
+        timeout=1000,
+    )
+    # Rendering is capped, and everything else was dropped
+    assert pipeline.frames_received == num_frames
+    assert 0 < pipeline.frames_rendered <= 2 * 20 + 5
+    assert pipeline.frames_rendered + pipeline.frames_dropped == num_frames
+    assert pipeline.frames_rendered == len(shown)
+    assert pipeline.fps <= 21
+
+
+@pytest.mark.skip(reason="Will be re-written to support ophyd-async")
 def test_image_plotting(display):
     assert isinstance(display.image_view, pyqtgraph.ImageView)
     assert isinstance(display.image_channel, pydm.PyDMChannel)
@@ -40,6 +110,25 @@ def test_image_plotting(display):
     display.image_channel.disconnect()
 
 
+def test_pipeline_stops_with_display(qtbot, monkeypatch):
+    """The main window deletes displays without closing them."""
+    device = mock.MagicMock(description=None)
+    device.name = "sim_camera"
+    device.cam.name = "sim_camera_cam"
+    monkeypatch.setattr(
+        AreaDetectorViewerDisplay,
+        "customize_device",
+        lambda self: setattr(self, "device", device),
+    )
+    display = AreaDetectorViewerDisplay(macros={"AD": device.name})
+    pipeline = display.pipeline
+    worker = pipeline._worker
+    assert pipeline.timer.parent() is pipeline
+    display.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    qtbot.waitUntil(lambda: not worker.is_alive(), timeout=2000)
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
@@ -299,6 +299,27 @@ async def test_relative_positioning(display, motors):
     assert widgets.stop_spin_box.minimum() == -10
 
 
+async def test_relative_positioning_hidden_rows(display, motors):
+    """Do rows that were hidden while switching modes catch up?"""
+    await display.regions.set_region_count(2)
+    await display.regions.set_relative_position(False)
+    motor = motors[0]
+    set_mock_value(motor.user_readback, 7.5)
+    widgets = display.regions.row_widgets(2)
+    widgets.device_selector.current_component = mock.MagicMock(return_value=motor)
+    widgets.start_spin_box.setValue(5.0)
+    widgets.stop_spin_box.setValue(10.0)
+    # Switch to relative mode while the row is hidden
+    await display.regions.set_region_count(1)
+    await display.regions.set_relative_position(True)
+    await display.regions.set_region_count(2)
+    assert display.regions.row_widgets(2) == widgets
+    assert widgets.start_spin_box.value() == -2.5
+    assert widgets.stop_spin_box.value() == 2.5
+    assert widgets.stop_spin_box.maximum() == 2.5
+    assert widgets.stop_spin_box.minimum() == -17.5
+
+
 async def test_update_devices(display, sim_registry):
     await display.regions.set_region_count(1)
     device_selector = display.regions.row_widgets(1).device_selector
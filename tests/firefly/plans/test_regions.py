@@ -1,9 +1,12 @@
+import asyncio
+import time
 from dataclasses import dataclass
+from unittest import mock
 
 import pytest
 from qtpy.QtWidgets import QCheckBox, QGridLayout, QLineEdit, QWidget
 
-from firefly.plans.regions import RegionsManager
+from firefly.plans.regions import DeviceParametersCache, RegionsManager
 
 
 class MockManager[WidgetsType](RegionsManager):
@@ -93,3 +96,85 @@ async def test_disable_region_widgets(manager):
     region_checkbox.setChecked(False)
     assert not region_checkbox.isChecked()
     assert not line_edit.isEnabled()
+
+
+async def test_removed_rows_are_reused(manager):
+    await manager.set_region_count(2)
+    widgets = manager.row_widgets(2)
+    await manager.set_region_count(1)
+    assert manager.layout.indexOf(widgets.name) == -1
+    assert widgets.name.isHidden()
+    # Adding the row back shows the same widgets again
+    await manager.set_region_count(2)
+    assert manager.row_widgets(2) == widgets
+    assert not widgets.name.isHidden()
+
+
+async def test_reused_rows_follow_enable_all(manager):
+    await manager.set_region_count(2)
+    checkbox = manager.row_widgets(2).active_checkbox
+    await manager.set_region_count(1)
+    manager.enable_all_rows(False)
+    await manager.set_region_count(2)
+    assert not checkbox.isChecked()
+    assert not manager.row_widgets(2).name.isEnabled()
+
+
+async def test_signals_during_row_lookup(manager):
+    """Changes from other rows aren't lost while a new row is set up."""
+    changes = []
+    manager.regions_changed.connect(lambda: changes.append(True))
+    await manager.set_region_count(1)
+    changes.clear()
+
+    async def update_devices(registry=None, *, rows=None):
+        # Another row changes while the new row looks up its devices
+        await asyncio.sleep(0)
+        manager.row_widgets(1).active_checkbox.setChecked(False)
+
+    manager.update_devices = update_devices
+    await manager.set_region_count(2)
+    # One from the checkbox, one for the new region
+    assert len(changes) == 2
+
+
+async def test_region_count_benchmark(manager):
+    """Going from 1 to 100 regions and back only builds each row once."""
+    manager.layout.parentWidget().show()
+    create_row_widgets = mock.AsyncMock(wraps=manager.create_row_widgets)
+    manager.create_row_widgets = create_row_widgets
+    changes = []
+    manager.regions_changed.connect(lambda: changes.append(True))
+    await manager.set_region_count(1)
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        await manager.set_region_count(100)
+        assert len(manager) == 100
+        await manager.set_region_count(1)
+        assert len(manager) == 1
+        durations.append(time.perf_counter() - start)
+    assert create_row_widgets.await_count == 100
+    # One notification for each change in the region count
+    assert len(changes) == 7
+    # Generous, so the test isn't flaky on slow machines
+    assert max(durations) < 1.0
+
+
+async def test_device_parameters_cache():
+    device = object()
+    cache = DeviceParametersCache()
+    with mock.patch(
+        "firefly.plans.regions.device_parameters", new_callable=mock.AsyncMock
+    ) as device_parameters:
+        results = await asyncio.gather(*[cache.get(device) for _ in range(10)])
+        # Only read the device once for all the rows
+        assert device_parameters.await_count == 1
+        assert all(result is results[0] for result in results)
+        await cache.get(device)
+        assert device_parameters.await_count == 1
+        # Old parameters get read again
+        cache.max_age = 0
+        await asyncio.sleep(0.001)
+        await cache.get(device)
+        assert device_parameters.await_count == 2
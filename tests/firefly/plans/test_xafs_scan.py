@@ -98,6 +98,28 @@ async def test_E0_checkbox(display):
     assert widgets.stop_spin_box.value() == 50
 
 
+async def test_E0_hidden_rows(display):
+    """Do rows that were hidden while applying E0 catch up?"""
+    await display.regions.set_region_count(2)
+    display.edge_combo_box.setCurrentIndex(2)
+    display.ui.use_edge_checkbox.setChecked(False)
+    widgets = display.regions.row_widgets(2)
+    widgets.start_spin_box.setValue(4766)
+    widgets.stop_spin_box.setValue(5016)
+    await display.regions.set_region_count(1)
+    display.ui.use_edge_checkbox.setChecked(True)
+    await display.regions.set_region_count(2)
+    assert display.regions.row_widgets(2) == widgets
+    assert widgets.start_spin_box.value() == -200
+    assert widgets.stop_spin_box.value() == 50
+    # And back to absolute energies
+    await display.regions.set_region_count(1)
+    display.ui.use_edge_checkbox.setChecked(False)
+    await display.regions.set_region_count(2)
+    assert widgets.start_spin_box.value() == 4766
+    assert not widgets.k_space_checkbox.isEnabled()
+
+
 async def test_plan_energies(display):
     """Does a plan actually get emitted when queued?"""
     await display.regions.set_region_count(3)
@@ -1,7 +1,7 @@
 from pathlib import Path
 from unittest.mock import MagicMock
 
-from firefly.action import WindowAction
+from firefly.action import ActionsRegistry, LazyWindowActions, WindowAction
 
 
 def test_create_window(qtbot):
@@ -13,3 +13,46 @@ def test_create_window(qtbot):
     )
     with qtbot.waitSignal(action.window_created):
         action.create_window()
+
+
+def make_action(name):
+    return WindowAction(
+        name=f"show_{name}_action",
+        text=name,
+        display_file=Path(),
+        WindowClass=MagicMock,
+    )
+
+
+def test_lazy_window_actions(qtbot):
+    factory = MagicMock(side_effect=make_action)
+    actions = LazyWindowActions(["It", "I0"], factory)
+    # Names are available without building any actions
+    assert list(actions) == ["It", "I0"]
+    assert len(actions) == 2
+    assert "I0" in actions
+    assert "Iref" not in actions
+    assert not factory.called
+    # Actions are built once, when first looked up
+    action = actions["I0"]
+    assert isinstance(action, WindowAction)
+    assert actions["I0"] is action
+    assert factory.call_count == 1
+    assert actions.built_actions() == [action]
+    assert not actions.is_built
+    list(actions.values())
+    assert actions.is_built
+
+
+def test_lazy_window_actions_update(qtbot):
+    actions = LazyWindowActions(["mirror"], make_action)
+    actions.update(LazyWindowActions(["kb_mirror"], make_action))
+    assert list(actions) == ["mirror", "kb_mirror"]
+    assert actions["kb_mirror"].objectName() == "show_kb_mirror_action"
+
+
+def test_all_actions_skips_unbuilt(qtbot):
+    registry = ActionsRegistry()
+    registry.motors = LazyWindowActions([f"m{i}" for i in range(2000)], make_action)
+    assert registry.motors["m5"] in registry.all_actions
+    assert len([a for a in registry.all_actions if a in registry.motors.values()]) == 1
@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+
+import pytest
+
+from firefly.dm_tools.common.batchFileDeleter import BatchFileDeleter
+
+
+class FakeFileService:
+    """Stands in for the DM catalog and storage services."""
+
+    def __init__(self, num_files, broken=()):
+        self.files = {
+            f"file-{idx:05}": f"data/scan_{idx:05}.h5" for idx in range(num_files)
+        }
+        self.broken = set(broken)
+        self.deletions = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def delete_file(self, file_id):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.0002)
+            if file_id in self.broken:
+                raise PermissionError(f"Cannot delete {self.files[file_id]}")
+            with self.lock:
+                path = self.files.pop(file_id)
+                self.deletions.append(file_id)
+            return {"experimentFilePath": path}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture()
+def service():
+    return FakeFileService(10000, broken=["file-00042", "file-09999"])
+
+
+def test_delete_many_files(service):
+    deleter = BatchFileDeleter(service.delete_file, batchSize=500, maxWorkers=8)
+    progress = []
+    report = deleter.run(
+        list(service.files),
+        onProgress=lambda done, total: progress.append((done, total)),
+    )
+    assert report.completed
+    assert report.numDeleted == 9998
+    assert report.deleted["file-00001"] == {"experimentFilePath": "data/scan_00001.h5"}
+    # Failures are reported for each file
+    assert set(report.failed) == {"file-00042", "file-09999"}
+    assert "scan_00042.h5" in report.failed["file-00042"]
+    assert list(service.files) == ["file-00042", "file-09999"]
+    # Parallel, but bounded
+    assert 1 < service.max_active <= 8
+    assert progress[-1] == (10000, 10000)
+    assert len(progress) == 20
+
+
+def test_resume_deletion(service, tmp_path):
+    progress_path = tmp_path / "deletion.json"
+    file_ids = list(service.files)
+    deleter = BatchFileDeleter(
+        service.delete_file, batchSize=1000, progressPath=str(progress_path)
+    )
+    batches = []
+    report = deleter.run(
+        file_ids,
+        shouldStop=lambda: len(batches) >= 3,
+        onProgress=lambda *a: batches.append(a),
+    )
+    assert not report.completed
+    assert report.numDeleted == 2999
+    saved = json.loads(progress_path.read_text())
+    assert len(saved["deleted"]) == 2999
+    assert list(saved["failed"]) == ["file-00042"]
+    # Start again, and the finished files are skipped
+    report = deleter.run(file_ids)
+    assert report.completed
+    assert len(report.previouslyDeleted) == 2999
+    assert len(report.deleted) == 6999
+    assert len(service.deletions) == len(set(service.deletions)) == 9998
+    # The failed files are kept for the next attempt
+    assert progress_path.exists()
+    service.broken.clear()
+    report = deleter.run(file_ids)
+    assert list(report.deleted) == ["file-00042", "file-09999"]
+    assert not progress_path.exists()
+
+
+def test_repeated_files_deleted_once(service):
+    deleter = BatchFileDeleter(service.delete_file, batchSize=3)
+    report = deleter.run(["file-00001", "file-00002", "file-00001"])
+    assert list(report.deleted) == ["file-00001", "file-00002"]
+    assert not report.failed
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
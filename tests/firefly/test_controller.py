@@ -101,6 +101,22 @@ def test_prepare_generic_device_windows(controller, tardis, mocker):
     assert isinstance(actions["my_tardis"], WindowAction)
 
 
+async def test_device_actions_are_lazy(qapp, sim_registry):
+    """Window actions for many devices should not slow down start-up."""
+    Motor = make_fake_device(Device)
+    for idx in range(2000):
+        sim_registry.register(Motor(name=f"lazy_motor{idx}", labels={"extra_motors"}))
+    controller = FireflyController()
+    await controller.setup_instrument(load_instrument=False)
+    assert len(controller.actions.motors) == 2000
+    assert not controller.actions.motors.built_actions()
+    assert controller.startup_times["window_actions"] < 1.0
+    # Actions are still built when needed
+    action = controller.actions.motors["lazy_motor7"]
+    assert isinstance(action, WindowAction)
+    assert controller.actions.motors.built_actions() == [action]
+
+
 action_targets = {
     "bss": FireflyMainWindow,
     "energy": PlanMainWindow,
@@ -0,0 +1,291 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from firefly.dm_tools.gui.apiPool import ApiPool, HostLimiter, PooledApi
+
+
+class FakeDMServer(ThreadingHTTPServer):
+    """A local stand-in for a DM web service.
+
+    Counts logins, TCP connections, and how many requests are handled
+    at the same time.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeDMHandler)
+        self.lock = threading.Lock()
+        self.sessions = set()
+        self.logins = 0
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def expire_sessions(self):
+        with self.lock:
+            self.sessions.clear()
+
+
+class FakeDMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status, body=b"", headers={}):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.logins += 1
+            session = f"session{self.server.logins}"
+            self.server.sessions.add(session)
+        self.send(200, headers={"Set-Cookie": session})
+
+    def do_GET(self):
+        with self.server.lock:
+            valid = self.headers.get("Cookie") in self.server.sessions
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            if not valid:
+                self.send(401)
+                return
+            time.sleep(0.005)
+            self.send(200, json.dumps([{"id": 1, "status": "running"}]).encode())
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+
+class AuthorizationError(Exception):
+    pass
+
+
+class FakeDaqApi:
+    """Behaves like a DM API client: logs in once and keeps the cookie."""
+
+    def __init__(self, url):
+        host, port = url.removeprefix("http://").split(":")
+        self.connection = http.client.HTTPConnection(host, int(port))
+        self.cookie = None
+
+    def request(self, method, path, headers={}):
+        self.connection.request(method, path, body=b"", headers=headers)
+        response = self.connection.getresponse()
+        return response, response.read()
+
+    def listDaqs(self):
+        if self.cookie is None:
+            response, _ = self.request("POST", "/login")
+            self.cookie = response.getheader("Set-Cookie")
+        response, body = self.request("GET", "/daqs", {"Cookie": self.cookie})
+        if response.status == 401:
+            raise AuthorizationError("Session expired")
+        return json.loads(body)
+
+
+@pytest.fixture()
+def server():
+    server = FakeDMServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_pool(server, size=3, limiter=None):
+    return ApiPool(
+        lambda: FakeDaqApi(server.url),
+        url=server.url,
+        size=size,
+        limiter=limiter,
+        authErrors=(AuthorizationError,),
+    )
+
+
+def test_sessions_are_reused(server):
+    api = PooledApi(make_pool(server, size=3))
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(lambda _: api.listDaqs(), range(60)))
+    assert all(result == [{"id": 1, "status": "running"}] for result in results)
+    # One login and one connection for each client in the pool
+    assert 1 <= server.logins <= 3
+    assert server.connections == server.logins
+    assert server.max_active <= 3
+
+
+def test_expired_sessions_log_in_again(server):
+    api = PooledApi(make_pool(server, size=1))
+    api.listDaqs()
+    api.listDaqs()
+    assert server.logins == 1
+    server.expire_sessions()
+    assert api.listDaqs() == [{"id": 1, "status": "running"}]
+    assert server.logins == 2
+    api.listDaqs()
+    assert server.logins == 2
+
+
+def test_all_sessions_expired(server):
+    """Stale idle clients are not used to retry a call."""
+    pool = make_pool(server, size=2)
+    api = PooledApi(pool)
+    # Log in two clients
+    clients = [pool.acquire(), pool.acquire()]
+    for client in clients:
+        client.listDaqs()
+        pool.release(client)
+    assert server.logins == 2
+    server.expire_sessions()
+    assert api.listDaqs() == [{"id": 1, "status": "running"}]
+    assert server.logins == 3
+    assert pool.numClients == 2
+
+
+class ExpiredDaqApi(FakeDaqApi):
+    def listDaqs(self):
+        raise AuthorizationError("Session expired")
+
+
+def test_failed_retry_drops_the_client(server):
+    pool = ApiPool(
+        lambda: ExpiredDaqApi(server.url),
+        url=server.url,
+        size=2,
+        authErrors=(AuthorizationError,),
+    )
+    with pytest.raises(AuthorizationError):
+        PooledApi(pool).listDaqs()
+    assert pool.idle == []
+    assert pool.numClients == 0
+
+
+def test_requests_limited_per_host(server):
+    limiter = HostLimiter(maxPerHost=2)
+    daqApi = PooledApi(make_pool(server, size=4, limiter=limiter))
+    uploadApi = PooledApi(make_pool(server, size=4, limiter=limiter))
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [
+            executor.submit(api.listDaqs)
+            for _ in range(20)
+            for api in [daqApi, uploadApi]
+        ]
+        [future.result() for future in futures]
+    assert server.max_active <= 2
+
+
+def test_failed_login_frees_the_slot(server):
+    calls = []
+
+    def create_api():
+        calls.append(True)
+        if len(calls) == 1:
+            raise ConnectionError("DM is down")
+        return FakeDaqApi(server.url)
+
+    api = PooledApi(ApiPool(create_api, url=server.url, size=1))
+    with pytest.raises(ConnectionError):
+        api.listDaqs()
+    assert api.listDaqs() == [{"id": 1, "status": "running"}]
+
+
+class FakeExperimentDaqApi(FakeDaqApi):
+    def __init__(self, username, password, url):
+        super().__init__(url)
+
+    def listUploads(self):
+        return []
+
+
+def test_transfer_state_cache(server, monkeypatch):
+    pytest.importorskip("dm")
+    from dm.daq_web_service.api import experimentDaqApi
+
+    from firefly.dm_tools.gui import apiFactory
+    from haven.iconfig import HavenConfig
+
+    config = HavenConfig(
+        data_management={
+            "scheduling_uri": server.url,
+            "data_transfer_uri": server.url,
+            "workflow_uri": server.url,
+            "data_storage_uri": server.url,
+            "catalog_uri": server.url,
+            "beamline": "255-ID-Z",
+            "station_name": "255IDZ",
+        }
+    )
+    monkeypatch.setattr(apiFactory, "load_config", lambda: config)
+    monkeypatch.setattr(experimentDaqApi, "ExperimentDaqApi", FakeExperimentDaqApi)
+    factory = apiFactory.ApiFactory()
+    factory.daqUrl = server.url
+    factory.pools = {}
+    factory.transferCache = None
+    # Build the cache in a thread, so a deadlock fails instead of hanging
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(factory.getTransferStateCache()),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    cache = results[0]
+    try:
+        assert factory.getTransferStateCache() is cache
+        assert cache.daqs(maxAge=0) == [{"id": 1, "status": "running"}]
+        assert cache.uploads() == []
+    finally:
+        cache.stop()
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
@@ -1,6 +1,7 @@
 import pytest
 from qtpy.QtWidgets import QAction
 
+from firefly.action import LazyWindowActions
 from firefly.controller import ActionsRegistry
 from firefly.main_window import FireflyMainWindow, PlanMainWindow
 
@@ -76,6 +77,20 @@ def test_motor_menu(qapp, qtbot, actions):
     assert window.ui.motors_menu.actions() == list(actions.motors.values())
 
 
+def test_lazy_motor_menu(qapp, qtbot, actions):
+    actions.motors = LazyWindowActions(["A", "B", "C"], lambda name: QAction(name))
+    window = FireflyMainWindow(actions=actions)
+    qtbot.addWidget(window)
+    # No actions are built until the menu is opened
+    assert not actions.motors.built_actions()
+    window.ui.motors_menu.aboutToShow.emit()
+    assert actions.motors.is_built
+    assert window.ui.motors_menu.actions() == list(actions.motors.values())
+    # Opening the menu again does not add more actions
+    window.ui.motors_menu.aboutToShow.emit()
+    assert len(window.ui.motors_menu.actions()) == 3
+
+
 def test_plans_menu(qapp, qtbot, actions):
     actions.plans = {
         "start": QAction(),
@@ -439,6 +439,140 @@ async def test_update(client, monkeypatch):
     assert api.status.called
 
 
+class FakeConsoleMonitor:
+    """Stands in for the queue server's ZMQ console monitor."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    async def next_msg(self, timeout=None):
+        try:
+            if timeout:
+                return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            return self.queue.get_nowait()
+        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+            raise queue_client.comm_base.RequestTimeoutError("No message", request={})
+
+
+class FakeQueueServer:
+    """A queue server API that counts requests."""
+
+    def __init__(self):
+        self.status_ = dict(qs_status)
+        self.requests = 0
+        self.console_monitor = FakeConsoleMonitor()
+
+    async def status(self):
+        self.requests += 1
+        return dict(self.status_)
+
+    async def devices_allowed(self):
+        self.requests += 1
+        return devices_allowed
+
+    def publish(self, **changes):
+        """Change the status and announce it on the console."""
+        self.status_.update(changes)
+        for key, val in changes.items():
+            self.console_monitor.queue.put_nowait({"time": 0, "msg": f"{key}={val}"})
+
+
+async def idle_requests(client, duration: float) -> int:
+    """Count status requests made by polling over *duration* seconds of
+    simulated time."""
+    api = client.api
+    api.requests = 0
+    now = 0
+    while now < duration:
+        now += client.poll_interval
+        await client.update()
+    return api.requests
+
+
+@pytest.mark.asyncio
+async def test_polling_backs_off(qtbot):
+    api = FakeQueueServer()
+    client = queue_client.QueueClient(api=api, subscribe=False)
+    await client.update()
+    assert client.poll_interval == client.timeout
+    # Nothing changes, so poll less often
+    await client.update()
+    assert client.poll_interval == 2 * client.timeout
+    for _ in range(10):
+        await client.update()
+    assert client.poll_interval == client.max_timeout
+    # Something changed, so poll quickly again
+    api.status_["items_in_queue"] = 1
+    await client.update()
+    assert client.poll_interval == client.timeout
+    assert client.timer.interval() == int(client.timeout * 1000)
+
+
+@pytest.mark.asyncio
+async def test_idle_hour_requests(qtbot):
+    api = FakeQueueServer()
+    # Previously, polling every 0.5 s
+    polled = queue_client.QueueClient(api=api, subscribe=False)
+    requests = await idle_requests(polled, duration=3600)
+    assert requests < 400  # vs. 7200 at a fixed 0.5 s
+    # Subscribed clients only poll as a fallback
+    subscribed = queue_client.QueueClient(api=api, subscribe=False)
+    subscribed.subscribed = True
+    requests = await idle_requests(subscribed, duration=3600)
+    assert requests < 80
+
+
+@pytest.mark.asyncio
+async def test_console_subscription(qtbot):
+    api = FakeQueueServer()
+    client = queue_client.QueueClient(api=api)
+    changes = []
+    client.length_changed.connect(changes.append)
+    client.status_changed.connect(changes.append)
+    client.start()
+    try:
+        await asyncio.sleep(0.01)
+        assert api.console_monitor.enabled
+        assert client.subscribed
+        await client.update()
+        # A burst of console messages gives one status update
+        api.requests = 0
+        api.publish(items_in_queue=3, manager_state="executing_queue")
+        await asyncio.sleep(0.05)
+        assert api.requests == 1
+        assert changes[-1]["items_in_queue"] == 3
+        assert client.poll_interval == client.timeout
+    finally:
+        client.stop()
+    await asyncio.sleep(0.01)
+    assert not api.console_monitor.enabled
+    assert not client.subscribed
+
+
+@pytest.mark.asyncio
+async def test_console_failure_falls_back(qtbot):
+    api = FakeQueueServer()
+
+    async def broken(timeout=None):
+        raise ConnectionError("ZMQ socket closed")
+
+    api.console_monitor.next_msg = broken
+    client = queue_client.QueueClient(api=api)
+    client.poll_interval = client.subscribed_max_timeout
+    client.start()
+    await asyncio.sleep(0.01)
+    assert not client.subscribed
+    assert client.poll_interval == client.max_timeout
+    client.stop()
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+
+from firefly.dm_tools.common.transferStateCache import TransferStateCache
+
+
+class FakeDaqService:
+    """Stands in for the DM DAQ service, counting list requests."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.requests = {"listDaqs": 0, "listUploads": 0}
+        self.lock = threading.Lock()
+        self.daqs = [{"id": "daq1", "experimentName": "exp1", "status": "running"}]
+        self.uploads = [{"id": "up1", "experimentName": "exp2", "status": "done"}]
+
+    def _list(self, name, items):
+        with self.lock:
+            self.requests[name] += 1
+        time.sleep(self.delay)
+        return [dict(item) for item in items]
+
+    def listDaqs(self):
+        return self._list("listDaqs", self.daqs)
+
+    def listUploads(self):
+        return self._list("listUploads", self.uploads)
+
+
+@pytest.fixture()
+def service():
+    return FakeDaqService()
+
+
+@pytest.fixture()
+def cache(service):
+    cache = TransferStateCache(service.listDaqs, service.listUploads, pollInterval=60)
+    yield cache
+    cache.stop()
+
+
+def test_concurrent_consumers_share_requests(cache, service):
+    barrier = threading.Barrier(5)
+    results = []
+
+    def consumer():
+        barrier.wait()
+        results.append(cache.daqs())
+
+    threads = [threading.Thread(target=consumer) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [service.daqs] * 5
+    assert service.requests == {"listDaqs": 1, "listUploads": 1}
+    # Later requests are answered from the cache
+    assert cache.uploads() == service.uploads
+    assert service.requests == {"listDaqs": 1, "listUploads": 1}
+    # Unless they need fresher states
+    cache.uploads(maxAge=0)
+    assert service.requests == {"listDaqs": 2, "listUploads": 2}
+
+
+def test_failed_fetch_is_shared(cache, service):
+    def broken():
+        time.sleep(0.05)
+        raise ConnectionError("DM is down")
+
+    cache.listDaqs = broken
+    errors = []
+
+    def consumer():
+        try:
+            cache.refresh()
+        except ConnectionError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=consumer) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 5
+    # The next request tries again
+    cache.listDaqs = service.listDaqs
+    assert cache.daqs() == service.daqs
+
+
+def test_subscribers_notified_on_change(cache, service):
+    snapshots = []
+    unsubscribe = cache.subscribe(snapshots.append)
+    cache.refresh()
+    cache.refresh()
+    assert len(snapshots) == 1
+    service.daqs[0]["status"] = "done"
+    cache.refresh()
+    assert len(snapshots) == 2
+    assert snapshots[-1].daqs[0]["status"] == "done"
+    unsubscribe()
+    service.uploads.clear()
+    cache.refresh()
+    assert len(snapshots) == 2
+
+
+def test_background_polling(service):
+    service.delay = 0
+    cache = TransferStateCache(service.listDaqs, service.listUploads, pollInterval=0.05)
+    changed = threading.Event()
+    cache.subscribe(lambda snapshot: changed.set())
+    cache.start()
+    try:
+        assert changed.wait(timeout=2)
+        changed.clear()
+        service.daqs.append(
+            {"id": "daq2", "experimentName": "exp1", "status": "pending"}
+        )
+        assert changed.wait(timeout=2)
+        assert len(cache.daqs()) == 2
+    finally:
+        cache.stop()
+    num_requests = service.requests["listDaqs"]
+    time.sleep(0.15)
+    assert service.requests["listDaqs"] == num_requests
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+import random
+
+import pytest
+from qtpy.QtCore import QSortFilterProxyModel, Qt
+from qtpy.QtWidgets import QTableView
+
+from firefly.dm_tools.gui.subclasses.transferTableModel import (
+    FetchTransfersThread,
+    TransferTableModel,
+)
+
+COLUMNS = [
+    ("Name", lambda transfer: transfer["name"]),
+    ("Status", lambda transfer: transfer["status"]),
+    ("Processed", lambda transfer: str(transfer["processed"])),
+]
+
+
+class FakeDMService:
+    """Stands in for the DM experiment DAQ API with many transfers."""
+
+    statuses = ["pending", "running", "done", "failed"]
+
+    def __init__(self, num_transfers=5000):
+        self.rng = random.Random(42)
+        self.transfers = {
+            f"id-{idx}": {
+                "id": f"id-{idx}",
+                "name": f"experiment-{idx % 17}",
+                "status": "running",
+                "processed": 0,
+            }
+            for idx in range(num_transfers)
+        }
+
+    def advance(self, num_changes):
+        """Change the status of some transfers, and return their IDs."""
+        ids = self.rng.sample(sorted(self.transfers), num_changes)
+        for id_ in ids:
+            transfer = self.transfers[id_]
+            self.transfers[id_] = {
+                **transfer,
+                "status": self.rng.choice(self.statuses),
+                "processed": transfer["processed"] + 1,
+            }
+        return ids
+
+    def listDaqs(self):
+        return [dict(transfer) for transfer in self.transfers.values()]
+
+
+@pytest.fixture()
+def service():
+    return FakeDMService()
+
+
+@pytest.fixture()
+def model(service):
+    model = TransferTableModel(COLUMNS, "id")
+    model.setTransfers(service.listDaqs())
+    return model
+
+
+def test_initial_load(model):
+    assert model.rowCount() == 5000
+    assert model.columnCount() == 3
+    assert model.headerData(1, Qt.Horizontal) == "Status"
+    assert model.index(3, 0).data() == "experiment-3"
+    assert model.index(3, 0).data(Qt.UserRole) == "id-3"
+
+
+def test_only_changed_rows_update(model, service):
+    changed_ids = service.advance(num_changes=25)
+    updated_rows = set()
+    model.dataChanged.connect(
+        lambda first, last: updated_rows.update(range(first.row(), last.row() + 1))
+    )
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.setTransfers(service.listDaqs())
+    expected_rows = {model.rowForId(id_) for id_ in changed_ids}
+    assert updated_rows == expected_rows
+    assert not resets
+    # An unchanged refresh doesn't update anything
+    updated_rows.clear()
+    assert model.setTransfers(service.listDaqs()) == (0, 0, 0)
+    assert not updated_rows
+
+
+def test_add_and_remove_rows(model, service):
+    del service.transfers["id-10"]
+    del service.transfers["id-11"]
+    del service.transfers["id-4000"]
+    service.transfers["id-new"] = {
+        "id": "id-new",
+        "name": "experiment-new",
+        "status": "pending",
+        "processed": 0,
+    }
+    assert model.setTransfers(service.listDaqs()) == (1, 0, 3)
+    assert model.rowCount() == 4998
+    assert model.rowForId("id-10") is None
+    assert model.rowForId("id-12") == 10
+    assert model.transferId(model.rowForId("id-new")) == "id-new"
+    assert model.index(model.rowCount() - 1, 0).data() == "experiment-new"
+
+
+def test_selection_survives_refresh(qtbot, model, service):
+    proxy = QSortFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = QTableView()
+    qtbot.addWidget(view)
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.sortByColumn(0, Qt.AscendingOrder)
+    view.selectRow(1234)
+    selected_id = proxy.index(1234, 0).data(Qt.UserRole)
+    # Change the selected transfer and remove some rows before it
+    service.transfers[selected_id]["status"] = "failed"
+    for id_ in ["id-0", "id-1", "id-2"]:
+        if id_ != selected_id:
+            del service.transfers[id_]
+    model.setTransfers(service.listDaqs())
+    current = view.currentIndex()
+    assert current.data(Qt.UserRole) == selected_id
+    assert view.selectionModel().isRowSelected(current.row(), current.parent())
+    source_row = proxy.mapToSource(current).row()
+    assert model.index(source_row, 1).data() == "failed"
+
+
+def test_fetch_thread(qtbot, service):
+    thread = FetchTransfersThread(service.listDaqs)
+    with qtbot.waitSignal(thread.fetchingComplete, timeout=5000) as blocker:
+        thread.start()
+    assert len(blocker.args[0]) == 5000
+    thread.wait()
+
+
+def test_fetch_thread_error(qtbot):
+    def fetch():
+        raise RuntimeError("DM is down")
+
+    thread = FetchTransfersThread(fetch)
+    with qtbot.waitSignal(thread.errorOccurred, timeout=5000) as blocker:
+        thread.start()
+    assert isinstance(blocker.args[0], RuntimeError)
+    thread.wait()
@@ -0,0 +1,158 @@
+import random
+import re
+import stat
+import time
+
+import numpy as np
+import pytest
+from qtpy.QtCore import Qt
+
+from firefly.dm_tools.gui.subclasses.userDirectory import (
+    UserDirectory,
+    UserDirectoryModel,
+)
+
+FIRST_NAMES = ["Mary", "John", "Wei", "Ana", "Mary-Jo", "Olu", "Priya", "Sven"]
+LAST_NAMES = ["Smith", "Garcia", "O'Brien", "Zhang", "Nakamura", "Smithers", "Kowal"]
+
+
+def synthetic_users(num_users, seed=1):
+    rng = random.Random(seed)
+    for idx in range(num_users):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        badge = str(100000 + idx)
+        email = f"{first}.{last}{idx}@example.org".lower()
+        yield (f"d{badge}", first, last, email, badge)
+
+
+@pytest.fixture(scope="module")
+def directory():
+    return UserDirectory.fromRecords(synthetic_users(60000))
+
+
+def brute_force(directory, text, column):
+    """Find matching rows by checking every user."""
+    fields = UserDirectory.INDEXED_FIELDS[column]
+    words = re.split(r"[\W_]+", text.lower())
+    rows = []
+    for row in range(len(directory)):
+        values = " ".join(str(getattr(directory, f)[row]) for f in fields)
+        tokens = re.split(r"[\W_]+", values.lower())
+        if all(any(t.startswith(word) for t in tokens) for word in words if word):
+            rows.append(row)
+    return np.array(rows)
+
+
+@pytest.mark.parametrize(
+    "text,column",
+    [("smi", 2), ("mary", 1), ("jo", 1), ("o'b", 2), ("10012", 0), ("zhang", 3)],
+)
+def test_search_matches_brute_force(directory, text, column):
+    rows = directory.search(text, column)
+    np.testing.assert_array_equal(rows, brute_force(directory, text, column))
+
+
+def test_search_all_columns(directory):
+    rows = directory.search("mary smith")
+    assert len(rows) > 0
+    for row in rows:
+        username, first, last, email, badge = directory.record(row)
+        assert first.startswith("Mary") and last.startswith("Smith")
+    assert directory.search("  ") is None
+
+
+def test_add_user():
+    directory = UserDirectory.fromRecords(synthetic_users(100))
+    row = directory.addUser("jdoe", "Jane", "Doe", None)
+    assert directory.record(row) == ("jdoe", "Jane", "Doe", "", "")
+    assert directory.rowForUsername("jdoe") == row
+    np.testing.assert_array_equal(directory.search("doe", 2), [row])
+    np.testing.assert_array_equal(directory.search("jdo", 0), [row])
+
+
+def test_disk_cache(tmp_path, directory):
+    path = tmp_path / "users" / "user_directory.npz"
+    assert UserDirectory.load(path, ttl=3600) is None
+    directory.save(path)
+    # Other users can't read the cache
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+    loaded = UserDirectory.load(path, ttl=3600)
+    assert len(loaded) == len(directory)
+    assert loaded.record(1234) == directory.record(1234)
+    np.testing.assert_array_equal(loaded.search("garc", 2), directory.search("garc", 2))
+    # Stale caches are ignored
+    assert UserDirectory.load(path, ttl=0) is None
+    # So are broken ones
+    path.write_bytes(b"not a cache")
+    assert UserDirectory.load(path, ttl=3600) is None
+
+
+def test_model_filter_and_sort(qtbot, directory):
+    model = UserDirectoryModel(directory)
+    # One blank row sits under the filter widgets
+    assert model.rowCount() == 60001
+    assert model.index(0, 0).data() is None
+    assert model.headerData(3, Qt.Horizontal) == "Email"
+    model.setFilter(1, "wei")
+    model.setFilter(2, "zhang")
+    assert model.rowCount() > 1
+    for row in range(1, model.rowCount()):
+        assert model.index(row, 1).data() == "Wei"
+        assert model.index(row, 2).data() == "Zhang"
+    # Sorting keeps the blank row at the top
+    model.sort(0, Qt.DescendingOrder)
+    assert model.index(0, 0).data() is None
+    usernames = [model.username(row) for row in range(1, model.rowCount())]
+    assert usernames == sorted(usernames, reverse=True)
+    # Hide the current users, then show one again
+    hidden = usernames[0]
+    model.setHiddenUsernames([hidden, "not-a-user"])
+    assert hidden not in [model.username(row) for row in range(model.rowCount())]
+    model.showUser(hidden, "Wei", "Zhang", "")
+    assert model.username(1) == hidden
+    # Clearing the filters shows everyone again
+    model.setFilter(1, "")
+    model.setFilter(2, "")
+    assert model.rowCount() == 60001
+
+
+def test_directory_performance(directory):
+    """Searching 60k users should be quick enough to do while typing."""
+    start = time.perf_counter()
+    for prefix in ["s", "sm", "smi", "smit", "smith"]:
+        directory.search(prefix, 2)
+    elapsed = (time.perf_counter() - start) / 5
+    assert elapsed < 0.02
+    model = UserDirectoryModel(directory)
+    start = time.perf_counter()
+    model.sort(2, Qt.AscendingOrder)
+    model.setFilter(1, "ma")
+    assert time.perf_counter() - start < 0.5
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
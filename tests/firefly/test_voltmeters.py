@@ -3,10 +3,11 @@ import asyncio
 import pytest
 import pytest_asyncio
 from bluesky_queueserver_api import BPlan
-from ophyd_async.core import Device
+from ophyd_async.core import Device, set_mock_value
 from pydm import widgets as PyDMWidgets
 from pydm.widgets.analog_indicator import PyDMAnalogIndicator
 from qtpy import QtWidgets
+from qtpy.QtCore import QTimer
 
 from firefly.voltmeters import SplitIonChamberSetRow, VoltmetersDisplay
 from haven.devices import IonChamber, SplitIonChamberSet, SRS570PreAmplifier
@@ -298,6 +299,108 @@ async def test_read_dark_current_plan_with_shutters(voltmeters_display, qtbot):
     }
 
 
+@pytest.fixture()
+async def busy_voltmeters(sim_registry, qtbot, request):
+    """A voltmeters display with a dozen ion chambers updating at 50 Hz."""
+    ion_chambers = []
+    for idx in range(12):
+        ion_chamber = IonChamber(
+            scaler_prefix="255idcVME:3820:",
+            scaler_channel=idx,
+            preamp_prefix=f"255idc:SR{idx:02d}",
+            voltmeter_prefix="255idc:LJT7_Voltmeter0:",
+            voltmeter_channel=idx,
+            counts_per_volt_second=10e6,
+            # Unique names so we don't share connections with other tests
+            name=f"{request.node.name}_ic{idx}",
+        )
+        await ion_chamber.connect(mock=True)
+        sim_registry.register(ion_chamber)
+        ion_chambers.append(ion_chamber)
+    vms_display = VoltmetersDisplay()
+    qtbot.addWidget(vms_display)
+    await vms_display.update_devices(sim_registry)
+    vms_display.show()
+    # Update all the voltmeters at 50 Hz
+    values = iter(range(1, 100000))
+
+    def update():
+        value = next(values) / 1000
+        for ic in ion_chambers:
+            set_mock_value(ic.voltmeter_channel.final_value, value)
+
+    timer = QTimer()
+    timer.timeout.connect(update)
+    timer.start(20)
+    yield vms_display, timer
+    timer.stop()
+
+
+async def test_updates_are_batched(busy_voltmeters, qtbot):
+    display, updates = busy_voltmeters
+    scheduler = display.update_scheduler
+    assert len(display._ion_chamber_rows) == 12
+    qtbot.wait(1000)
+    for row in display._ion_chamber_rows:
+        received = scheduler.received_counts[row.voltage_label]
+        applied = scheduler.update_counts[row.voltage_label]
+        # ~50 values arrived, but were only repainted once per frame
+        assert received > 25
+        assert 0 < applied <= 35
+        assert scheduler.update_counts[row.voltage_indicator] > 0
+    # The newest value is shown once the updates stop
+    updates.stop()
+    row = display._ion_chamber_rows[-1]
+    expected = await row.device.voltmeter_channel.final_value.get_value()
+    qtbot.waitUntil(
+        lambda: row.voltage_indicator.value == pytest.approx(expected), timeout=1000
+    )
+
+
+async def test_hidden_rows_skip_updates(busy_voltmeters, qtbot):
+    display, updates = busy_voltmeters
+    scheduler = display.update_scheduler
+    hidden_row, shown_row = display._ion_chamber_rows[:2]
+    hidden_row.voltage_label.hide()
+    qtbot.wait(100)
+    applied = scheduler.update_counts[hidden_row.voltage_label]
+    shown_applied = scheduler.update_counts[shown_row.voltage_label]
+    received = scheduler.received_counts[hidden_row.voltage_label]
+    qtbot.wait(500)
+    assert scheduler.received_counts[hidden_row.voltage_label] > received
+    assert scheduler.update_counts[hidden_row.voltage_label] == applied
+    assert scheduler.update_counts[shown_row.voltage_label] > shown_applied
+    # Showing the row again catches it up with the latest value
+    hidden_row.voltage_label.show()
+    qtbot.waitUntil(
+        lambda: scheduler.update_counts[hidden_row.voltage_label] > applied,
+        timeout=1000,
+    )
+
+
+async def test_hidden_display_stops_ticking(busy_voltmeters, qtbot):
+    display, updates = busy_voltmeters
+    scheduler = display.update_scheduler
+    row = display._ion_chamber_rows[0]
+    display.hide()
+    qtbot.wait(100)
+    applied = scheduler.update_counts[row.voltage_label]
+    received = scheduler.received_counts[row.voltage_label]
+    qtbot.wait(200)
+    # Values keep coming in, but nothing is waiting on the frame timer
+    assert scheduler.received_counts[row.voltage_label] > received
+    assert not scheduler.timer.isActive()
+    assert scheduler.update_counts[row.voltage_label] == applied
+    # The latest value is applied once the display is shown again
+    updates.stop()
+    expected = await row.device.voltmeter_channel.final_value.get_value()
+    display.show()
+    qtbot.waitUntil(
+        lambda: row.voltage_indicator.value == pytest.approx(expected), timeout=1000
+    )
+    qtbot.waitUntil(lambda: not scheduler.timer.isActive(), timeout=1000)
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
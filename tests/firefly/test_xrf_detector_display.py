@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import numpy as np
 import pandas as pd
@@ -6,6 +7,7 @@ import pytest
 from pyqtgraph import PlotItem
 
 from firefly.devices.xrf_detector import XRFDetectorDisplay
+from haven.devices import Xspress3Detector
 
 # detectors = ["dxp", "xspress"]
 detectors = ["xspress"]
@@ -96,21 +98,77 @@ def test_mca_hovering(xrf_display):
 
 @pytest.mark.parametrize("xrf_display", detectors, indirect=True)
 def test_update_spectral_widgets(xrf_display):
-    spectrum = np.ones(shape=(100,), dtype=int) * 10
-    xrf_display.update_spectral_widgets(mca_num=0, spectrum=spectrum, spectra=[])
+    xrf_display.update_spectral_widgets(mca_num=0, count=1000, total=1000)
     mcas_layout = xrf_display.ui.mcas_layout
     elem0_label = mcas_layout.itemAtPosition(2, 1).widget()
     assert elem0_label.text() == "1_000"
     total_label = mcas_layout.itemAtPosition(1, 1).widget()
-    assert total_label.text() == "0"
-    # Add a second spectrum for a separate element
-    xrf_display.update_spectral_widgets(
-        mca_num=1, spectrum=spectrum * 2, spectra=[spectrum, spectrum * 2]
-    )
-    elem1_label = mcas_layout.itemAtPosition(3, 1).widget()
-    assert elem1_label.text() == "2_000"
-    total_label = mcas_layout.itemAtPosition(1, 1).widget()
+    assert total_label.text() == "1_000"
+
+
+@pytest.mark.parametrize("xrf_display", detectors, indirect=True)
+async def test_running_total(xrf_display, qtbot):
+    spectrum = np.ones(shape=(100,), dtype=int) * 10
+    mca_plot_widget = xrf_display.ui.mca_plot_widget
+    with qtbot.waitSignal(mca_plot_widget.plot_changed):
+        xrf_display._spectrum_channels[0].value_slot(spectrum)
+        await asyncio.sleep(0.01)
+    with qtbot.waitSignal(mca_plot_widget.plot_changed):
+        xrf_display._spectrum_channels[1].value_slot(spectrum * 2)
+        await asyncio.sleep(0.01)
+    total_label = xrf_display.ui.mcas_layout.itemAtPosition(1, 1).widget()
     assert total_label.text() == "3_000"
+    # Replace the first spectrum, so it's old counts are removed
+    with qtbot.waitSignal(mca_plot_widget.plot_changed):
+        xrf_display._spectrum_channels[0].value_slot(spectrum * 3)
+        await asyncio.sleep(0.01)
+    assert total_label.text() == "5_000"
+    assert xrf_display._count_labels[0].text() == "3_000"
+
+
+@pytest.mark.parametrize("xrf_display", detectors, indirect=True)
+async def test_running_total_float_spectra(xrf_display, qtbot):
+    """Dead-time corrected spectra are floats, so don't truncate them."""
+    spectrum = np.full(shape=(100,), fill_value=1.25)
+    mca_plot_widget = xrf_display.ui.mca_plot_widget
+    with qtbot.waitSignal(mca_plot_widget.plot_changed):
+        xrf_display._spectrum_channels[0].value_slot(spectrum)
+        await asyncio.sleep(0.01)
+    with qtbot.waitSignal(mca_plot_widget.plot_changed):
+        xrf_display._spectrum_channels[1].value_slot(spectrum * 2)
+        await asyncio.sleep(0.01)
+    assert xrf_display._count_labels[0].text() == "125.0"
+    total_label = xrf_display.ui.mcas_layout.itemAtPosition(1, 1).widget()
+    assert total_label.text() == "375.0"
+
+
+@pytest.mark.parametrize("xrf_display", detectors, indirect=True)
+def test_plot_items_reused(xrf_display):
+    plot_widget = xrf_display.mca_plot_widget
+    plot_item = plot_widget.ui.plot_widget.getPlotItem()
+    data_item = plot_widget._data_items[0]
+    xrf_display.update_ev_per_bin(10)
+    energies = xrf_display.energies(4096)
+    plot_widget.update_spectrum(0, np.arange(4096), energies=energies)
+    assert plot_widget._data_items[0] is data_item
+    assert len(plot_item.listDataItems()) == 4
+    np.testing.assert_equal(data_item.yData, np.arange(4096))
+    # Hidden spectra keep their plot items
+    plot_widget.target_mca = 1
+    plot_widget.update_spectrum(0, np.arange(4096), energies=energies)
+    assert not data_item.isVisible()
+    assert plot_widget._data_items[0] is data_item
+
+
+@pytest.mark.parametrize("xrf_display", detectors, indirect=True)
+def test_energies_cached(xrf_display):
+    xrf_display.update_ev_per_bin(10)
+    energies = xrf_display.energies(1024)
+    assert xrf_display.energies(1024) is energies
+    np.testing.assert_equal(energies, np.linspace(5, 10235, num=1024))
+    # New calibration, new energies
+    xrf_display.update_ev_per_bin(5)
+    np.testing.assert_equal(xrf_display.energies(1024)[:2], [2.5, 7.5])
 
 
 @pytest.mark.parametrize("xrf_display", detectors, indirect=True)
@@ -126,6 +184,50 @@ def test_detector_state_style(xrf_display):
     assert "bold" in lbl.styleSheet()
 
 
+@pytest.fixture()
+async def vortex_me7(sim_registry):
+    vortex = Xspress3Detector(
+        name="vortex_me7",
+        prefix="255id_vortex:",
+        elements=7,
+        sensor_material="Si",
+        sensor_thickness_mm=1,
+    )
+    await vortex.connect(mock=True)
+    sim_registry.register(vortex)
+    return vortex
+
+
+@pytest.mark.slow
+async def test_render_benchmark(vortex_me7, qtbot):
+    """Seven elements of 4096 bins at 20 Hz fit in the 50 ms frame budget."""
+    display = XRFDetectorDisplay(macros={"DEV": vortex_me7.name})
+    qtbot.addWidget(display)
+    display.update_ev_per_bin(10)
+    display.show()
+    qtbot.waitExposed(display)
+    plot_widget = display.mca_plot_widget.ui.plot_widget
+    rng = np.random.default_rng(seed=0)
+    # Dead-time corrected, so floats
+    frames = rng.random(size=(20, 7, 4096)) * 65536
+    durations = []
+    for spectra in frames:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                display.handle_new_spectrum(spectrum, mca_num=mca_num)
+                for mca_num, spectrum in enumerate(spectra)
+            )
+        )
+        plot_widget.repaint()
+        durations.append(time.perf_counter() - start)
+    # Every spectrum was plotted
+    data_items = plot_widget.getPlotItem().listDataItems()
+    assert len(data_items) == 7
+    np.testing.assert_equal(data_items[6].yData, frames[-1, 6])
+    assert max(durations) < 0.05
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
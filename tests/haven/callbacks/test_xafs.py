@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from bluesky import RunEngine
+from bluesky import plans as bp
+from bluesky.run_engine import call_in_bluesky_event_loop
+from event_model import compose_run
+from ophyd_async.core import set_mock_value, soft_signal_rw
+
+from haven.callbacks import XAFSNormalizer
+from haven.devices import SRS570PreAmplifier
+from haven.preprocessors import DarkCurrentRecorder
+
+DATA_PATH = Path(__file__).parent.parent / "plans" / "data" / "test_adaptive_xanes"
+
+
+def reference_spectrum():
+    """Pt L3 spectrum with parameters from Athena's analysis."""
+    path = DATA_PATH / "10Feb_PtL3_024_026C.xmu"
+    data = np.loadtxt(path, comments="#")
+    energy, unique = np.unique(data[:, 0], return_index=True)
+    return {
+        "energy": energy,
+        "mu": data[unique, 1],
+        "i0": data[unique, 7],
+        "E0": 11564.429,
+        "edge_step": 0.1520370,
+    }
+
+
+def run_documents(energies, data, plan_name="xafs_scan", **md):
+    run = compose_run(
+        metadata={
+            "plan_name": plan_name,
+            "hints": {"dimensions": [(["energy"], "primary")]},
+            **md,
+        }
+    )
+    yield "start", run.start_doc
+    number = {"dtype": "number", "shape": [], "source": "sim"}
+    stream = run.compose_descriptor(
+        name="primary", data_keys={key: number for key in ["energy", *data]}
+    )
+    yield "descriptor", stream.descriptor_doc
+    for idx, energy in enumerate(energies):
+        row = {"energy": energy, **{key: val[idx] for key, val in data.items()}}
+        yield "event", stream.compose_event(
+            data=row, timestamps={key: 0 for key in row}
+        )
+    yield "stop", run.compose_stop()
+
+
+def normalize(normalizer, documents):
+    output = []
+    normalizer.callback = lambda name, doc: output.append((name, doc))
+    for name, doc in documents:
+        normalizer(name, doc)
+    events = [doc for name, doc in output if name == "event"]
+    return output, {
+        key: np.asarray([ev["data"][key] for ev in events]) for key in events[0]["data"]
+    }
+
+
+def test_transmission_reference():
+    ref = reference_spectrum()
+    dark = 1000.0
+    I0 = ref["i0"]
+    It = I0 * np.exp(-ref["mu"])
+    docs = list(
+        run_documents(
+            ref["energy"],
+            {"I0-raw_count_rate": I0 + dark, "It-raw_count_rate": It},
+            dark_currents={"I0-raw_count_rate": dark},
+        )
+    )
+    normalizer = XAFSNormalizer(
+        callback=None, I0="I0-raw_count_rate", It="It-raw_count_rate"
+    )
+    output, results = normalize(normalizer, docs)
+    # A new stream is published in the same run
+    name, descriptor = output[0]
+    assert name == "descriptor"
+    assert descriptor["name"] == "xafs_normalized"
+    assert descriptor["run_start"] == docs[0][1]["uid"]
+    assert len(output) == len(ref["energy"]) + 1
+    np.testing.assert_allclose(results["mu_trans"], ref["mu"], rtol=1e-6)
+    # Final estimates match Athena
+    assert results["E0_trans"][-1] == pytest.approx(ref["E0"], abs=3)
+    assert results["edge_step_trans"][-1] == pytest.approx(ref["edge_step"], rel=0.05)
+    # Post-edge oscillates around 1 once the fits are ready
+    post_edge = ref["energy"] > ref["E0"] + 150
+    assert np.mean(results["norm_trans"][post_edge]) == pytest.approx(1, abs=0.1)
+
+
+def test_fluorescence_reference():
+    ref = reference_spectrum()
+    I0 = ref["i0"]
+    docs = run_documents(
+        ref["energy"],
+        {"I0-net_count_rate": I0, "If-net_count_rate": I0 * ref["mu"]},
+        plan_name="energy_scan",
+    )
+    normalizer = XAFSNormalizer(callback=None, It=None, If="If-net_count_rate")
+    output, results = normalize(normalizer, docs)
+    assert "mu_trans" not in results
+    np.testing.assert_allclose(results["mu_fluor"], ref["mu"], rtol=1e-6)
+    assert results["E0_fluor"][-1] == pytest.approx(ref["E0"], abs=3)
+    assert results["edge_step_fluor"][-1] == pytest.approx(ref["edge_step"], rel=0.05)
+    # No edge step until the post-edge region is reached
+    assert np.all(np.isnan(results["edge_step_fluor"][ref["energy"] < ref["E0"]]))
+
+
+def test_ignores_other_plans():
+    ref = reference_spectrum()
+    docs = run_documents(
+        ref["energy"],
+        {"I0-net_count_rate": ref["i0"], "It-net_count_rate": ref["i0"]},
+        plan_name="grid_scan",
+    )
+    output = []
+    normalizer = XAFSNormalizer(callback=lambda *args: output.append(args))
+    for name, doc in docs:
+        normalizer(name, doc)
+    assert output == []
+
+
+def test_dark_currents_from_recorder():
+    """Dark currents measured by the preprocessor get subtracted."""
+    RE = RunEngine({})
+    I0 = soft_signal_rw(float, name="I0-raw_count_rate")
+    It = soft_signal_rw(float, name="It-raw_count_rate")
+    energy = soft_signal_rw(float, name="energy")
+    preamp = SRS570PreAmplifier("", name="preamp")
+
+    async def connect():
+        for device in [I0, It, energy, preamp]:
+            await device.connect(mock=True)
+
+    call_in_bluesky_event_loop(connect())
+    # The preamp is read as part of the ion chambers in real life
+    recorder = DarkCurrentRecorder(detectors=[I0, It, preamp], preamps=[preamp])
+    RE.subscribe(recorder.stash_dark_current)
+    # Record the dark current with the shutters (pretend) closed
+    set_mock_value(I0, 100.0)
+    set_mock_value(It, 50.0)
+    RE(recorder(bp.count([I0, It])))
+    # Now measure a spectrum with some light
+    set_mock_value(I0, 1100.0)
+    set_mock_value(It, 300.0)
+    output = []
+    normalizer = XAFSNormalizer(
+        callback=lambda name, doc: output.append((name, doc)),
+        I0="I0-raw_count_rate",
+        It="It-raw_count_rate",
+        energy="energy",
+    )
+    RE(
+        recorder(
+            bp.list_scan([I0, It], energy, [8300, 8310], md={"plan_name": "xafs_scan"})
+        ),
+        normalizer,
+    )
+    events = [doc for name, doc in output if name == "event"]
+    assert len(events) == 2
+    # ln((1100 - 100) / (300 - 50))
+    assert events[0]["data"]["mu_trans"] == pytest.approx(np.log(4))
@@ -0,0 +1,156 @@
+import time
+
+import h5py
+import numpy as np
+import pytest
+from event_model import compose_run
+
+from haven.callbacks import XRFRegion, XRFROIStream
+from haven.callbacks.xrf_roi import ROIReducer
+
+NUM_BINS = 4096
+NUM_ELEMENTS = 7
+EV_PER_BIN = 10.0
+
+
+def synthetic_spectra(num_frames: int, fe: float, cu: float):
+    """Spectra with a Fe Kα peak of height *fe* and Cu Kα of *cu* in
+    frame *i* scaled by (i+1)."""
+    bins = np.arange(NUM_BINS) * EV_PER_BIN
+    peak = lambda energy: np.exp(-((bins - energy) ** 2) / (2 * 50**2))  # noqa: E731
+    spectrum = fe * peak(6405.2) + cu * peak(8046.3)
+    scale = np.arange(1, num_frames + 1)[:, None, None]
+    elements = np.arange(1, NUM_ELEMENTS + 1)[None, :, None]
+    return scale * elements * spectrum[None, None, :]
+
+
+@pytest.fixture()
+def regions():
+    return [
+        XRFRegion.from_line("Fe", "Ka1", ev_per_bin=EV_PER_BIN, width=400),
+        XRFRegion.from_line("Cu", "Ka1", ev_per_bin=EV_PER_BIN, width=400),
+    ]
+
+
+def test_region_from_line():
+    region = XRFRegion.from_line("Fe", "Ka1", ev_per_bin=10.0, width=300)
+    assert region.name == "Fe-Ka1"
+    assert (region.low, region.high) == (626, 656)
+    with pytest.raises(ValueError):
+        XRFRegion.from_line("Fe", "Lz9")
+
+
+def test_reducer(regions):
+    reducer = ROIReducer(regions, num_bins=NUM_BINS)
+    spectra = synthetic_spectra(3, fe=100, cu=10)
+    sums = reducer.reduce(spectra)
+    assert sums.shape == (3, NUM_ELEMENTS, 2)
+    expected = np.stack(
+        [spectra[..., r.low : r.high].sum(axis=-1) for r in regions], axis=-1
+    )
+    np.testing.assert_allclose(sums, expected)
+    # Fe and Cu peaks are well separated
+    assert sums[0, 0, 0] / sums[0, 0, 1] == pytest.approx(10, rel=1e-3)
+    with pytest.raises(ValueError):
+        reducer.reduce(np.zeros((3, 100)))
+    with pytest.raises(ValueError):
+        ROIReducer([XRFRegion("bad", 10, NUM_BINS + 1)], num_bins=NUM_BINS)
+
+
+def run_documents(spectra, external=None):
+    run = compose_run()
+    yield "start", run.start_doc
+    data_key = {
+        "dtype": "array",
+        "shape": [NUM_ELEMENTS, NUM_BINS],
+        "source": "sim",
+    }
+    if external is not None:
+        data_key["external"] = "STREAM:"
+    stream = run.compose_descriptor(name="primary", data_keys={"xspress": data_key})
+    yield "descriptor", stream.descriptor_doc
+    if external is None:
+        for frame in spectra:
+            yield "event", stream.compose_event(
+                data={"xspress": frame}, timestamps={"xspress": 0}, validate=False
+            )
+    else:
+        resource = run.compose_stream_resource(
+            mimetype="application/x-hdf5",
+            uri=f"file://localhost{external}",
+            data_key="xspress",
+            parameters={"dataset": "/entry/data/data"},
+        )
+        yield "stream_resource", resource.stream_resource_doc
+        for start in range(0, len(spectra), 2):
+            stop = min(start + 2, len(spectra))
+            yield "stream_datum", resource.compose_stream_datum(
+                indices={"start": start, "stop": stop}
+            ) | {
+                "descriptor": stream.descriptor_doc["uid"],
+                "seq_nums": {"start": start + 1, "stop": stop + 1},
+            }
+    yield "stop", run.compose_stop()
+
+
+def collect(router, documents):
+    output = []
+    router.callback = lambda name, doc: output.append((name, doc))
+    for name, doc in documents:
+        router(name, doc)
+    return output
+
+
+def test_roi_stream_from_events(regions):
+    spectra = synthetic_spectra(5, fe=100, cu=10)
+    router = XRFROIStream(callback=None, regions=regions, data_key="xspress")
+    output = collect(router, run_documents(spectra))
+    (_, descriptor), *pages = output
+    assert descriptor["name"] == "primary_rois"
+    assert set(descriptor["data_keys"]) == {
+        "xspress-Fe-Ka1",
+        "xspress-Fe-Ka1-elements",
+        "xspress-Cu-Ka1",
+        "xspress-Cu-Ka1-elements",
+    }
+    assert [name for name, doc in pages] == ["event_page"] * 5
+    fe = np.concatenate([doc["data"]["xspress-Fe-Ka1"] for _, doc in pages])
+    fe_elements = np.concatenate(
+        [doc["data"]["xspress-Fe-Ka1-elements"] for _, doc in pages]
+    )
+    region = regions[0]
+    expected = spectra[..., region.low : region.high].sum(axis=-1)
+    np.testing.assert_allclose(fe_elements, expected)
+    np.testing.assert_allclose(fe, expected.sum(axis=-1))
+    assert [doc["seq_num"] for _, doc in pages] == [[1], [2], [3], [4], [5]]
+
+
+def test_roi_stream_from_hdf5(regions, tmp_path):
+    spectra = synthetic_spectra(5, fe=100, cu=10)
+    h5_path = tmp_path / "xspress.h5"
+    with h5py.File(h5_path, mode="w") as fp:
+        fp["/entry/data/data"] = spectra
+    router = XRFROIStream(callback=None, regions=regions, data_key="xspress")
+    output = collect(router, run_documents(spectra, external=str(h5_path)))
+    pages = [doc for name, doc in output if name == "event_page"]
+    assert [page["seq_num"] for page in pages] == [[1, 2], [3, 4], [5]]
+    cu = np.concatenate([page["data"]["xspress-Cu-Ka1"] for page in pages])
+    region = regions[1]
+    np.testing.assert_allclose(
+        cu, spectra[..., region.low : region.high].sum(axis=(-2, -1))
+    )
+
+
+def test_reducer_throughput():
+    """1 s of 7-element, 4096-bin frames at 1 kHz should reduce in
+    well under 1 s."""
+    regions = [
+        XRFRegion(f"roi{idx}", 300 + 50 * idx, 330 + 50 * idx) for idx in range(10)
+    ]
+    reducer = ROIReducer(regions, num_bins=NUM_BINS)
+    rng = np.random.default_rng(seed=0)
+    spectra = rng.poisson(5, size=(1000, NUM_ELEMENTS, NUM_BINS)).astype(np.uint32)
+    t0 = time.perf_counter()
+    sums = reducer.reduce(spectra)
+    assert time.perf_counter() - t0 < 1
+    assert sums.shape == (1000, NUM_ELEMENTS, 10)
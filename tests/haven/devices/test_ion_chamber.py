@@ -93,6 +93,28 @@ def test_load_preamps():
     assert device_names == {"IpreKB_preamp", "I0_preamp", "It_preamp", "Iref_preamp"}
 
 
+def test_load_preamp_settle_mode():
+    devices = load_ion_chambers(
+        counter=[],
+        labjack=[{"name": "voltmeters", "prefix": "25idc:LJT7Voltmeter_0:"}],
+        ion_chamber=[
+            {
+                "name": "I0",
+                "counter": "scaler",
+                "counter_channel": 2,
+                "labjack": "voltmeters",
+                "labjack_channel": 1,
+                "preamp_prefix": "25idc:SR03:",
+                "hertz_per_volt": 1e7,
+                "settle_mode": "adaptive",
+            }
+        ],
+    )
+    (preamp,) = [device for device in devices if isinstance(device, SRS570PreAmplifier)]
+    assert preamp.settle_mode == "adaptive"
+    assert preamp.settle_monitor is not None
+
+
 def test_load_labjacks():
     devices = load_ion_chambers(**ion_chamber_kwargs)
     labjacks = [device for device in devices if isinstance(device, LabJackBase)]
@@ -140,11 +162,29 @@ def ion_chamber(sim_registry):
     return ion_chamber
 
 
+def test_settle_mode(ion_chamber):
+    assert ion_chamber.preamp.settle_mode == "fixed"
+    ion_chamber = IonChamber(
+        scaler_prefix="255idcVME:3820:",
+        scaler_channel=2,
+        preamp_prefix="255idc:SR03:",
+        voltmeter_prefix="255idc:LabjackT7_1:",
+        voltmeter_channel=1,
+        counts_per_volt_second=1e6,
+        name="I0",
+        settle_mode="adaptive",
+    )
+    assert ion_chamber.preamp.settle_mode == "adaptive"
+
+
 def test_ion_chamber_devices(ion_chamber):
     """Check that the ion chamber has the right sub-devices."""
     assert list(ion_chamber.mcs.scaler.channels.keys()) == [0, 2]
     assert hasattr(ion_chamber, "preamp")
     assert list(ion_chamber.voltmeter.analog_inputs.keys()) == [1]
+    # The pre-amp should watch its voltmeter to see when it has settled
+    voltmeter_signal = ion_chamber.voltmeter_channel.final_value
+    assert ion_chamber.preamp.settle_monitor.signal is voltmeter_signal
 
 
 async def test_readables(ion_chamber):
@@ -256,6 +296,60 @@ async def test_readables(ion_chamber):
 
 
 @pytest.mark.asyncio
+async def test_batched_counts(ion_chamber):
+    """Raw counts come from the scaler's counts array if it's available."""
+    batched = IonChamber(
+        scaler_prefix="255idcVME:3820:",
+        scaler_channel=2,
+        preamp_prefix="255idc:SR03:",
+        voltmeter_prefix="255idc:LabjackT7_1:",
+        voltmeter_channel=1,
+        counts_per_volt_second=1e6,
+        counts_pv="255idcVME:3820:scaler1_cts",
+        name="I0",
+    )
+    await asyncio.gather(ion_chamber.connect(mock=True), batched.connect(mock=True))
+    assert batched.mcs.scaler.counts.source == "mock+ca://255idcVME:3820:scaler1_cts"
+    set_mock_value(batched.mcs.scaler.counts, np.array([1e7, 0, 4000.0, 0]))
+    # Per-channel values, which should not be used
+    set_mock_value(batched.mcs.scaler.channels[0].raw_count, -1)
+    set_mock_value(batched.scaler_channel.raw_count, -1)
+    reading = await batched.read()
+    assert reading["I0-mcs-scaler-channels-0-raw_count"]["value"] == 1e7
+    assert reading["I0-mcs-scaler-channels-2-raw_count"]["value"] == 4000
+    # Same data keys either way
+    described = await batched.describe()
+    assert described.keys() == (await ion_chamber.describe()).keys()
+    assert reading.keys() == described.keys()
+
+
+def test_load_counts_pv():
+    devices = load_ion_chambers(
+        counter=[
+            {
+                "name": "scaler",
+                "prefix": "25idcVME:3820:",
+                "counts_pv": "25idcVME:3820:scaler1_cts",
+                "flavor": "SIS3820",
+            }
+        ],
+        labjack=[{"name": "voltmeters", "prefix": "25idc:LJT7Voltmeter_0:"}],
+        ion_chamber=[
+            {
+                "name": "I0",
+                "counter": "scaler",
+                "counter_channel": 2,
+                "labjack": "voltmeters",
+                "labjack_channel": 1,
+                "preamp_prefix": "25idc:SR03:",
+                "hertz_per_volt": 1e7,
+            }
+        ],
+    )
+    (counter,) = [device for device in devices if isinstance(device, Counter)]
+    assert counter.driver.scaler.counts.source == "ca://25idcVME:3820:scaler1_cts"
+
+
 async def test_trigger(ion_chamber):
     await ion_chamber.connect(mock=True)
     set_mock_value(ion_chamber.mcs.scaler.clock_frequency, 50e6)
@@ -0,0 +1,191 @@
+import asyncio
+
+import numpy as np
+import pytest
+from ophyd_async.core import set_mock_value
+
+from haven.devices.detectors.labjack_stream import (
+    LabJackStreamDataProvider,
+    LabJackStreamingDetector,
+    WaveformRingBuffer,
+    WaveformStreamer,
+)
+from haven.devices.labjack import LabJackT7
+from haven.exceptions import BufferOverrun, StreamGap
+
+PV_PREFIX = "255idc:LJ_T7:"
+CHANNELS = [0, 3]
+BLOCK_SIZE = 50
+DWELL = 0.001
+
+
+def synthetic_block(block_num: int, channel: int):
+    """Synthetic waveform whose values encode the absolute sample index."""
+    start = block_num * BLOCK_SIZE
+    return np.arange(start, start + BLOCK_SIZE, dtype=float) + 1e6 * channel
+
+
+@pytest.fixture()
+async def labjack():
+    lj = LabJackT7(PV_PREFIX, name="labjack", analog_inputs=CHANNELS)
+    await lj.connect(mock=True)
+    set_mock_value(lj.waveform_digitizer.dwell_actual, DWELL)
+    return lj
+
+
+async def publish_block(streamer: WaveformStreamer, block_num: int):
+    """Simulate the IOC finishing one waveform, then wait for the
+    streamer to record it."""
+    expected = (block_num + 1) * BLOCK_SIZE
+    for ch in CHANNELS:
+        waveform = streamer.digitizer.waveforms[ch]
+        set_mock_value(waveform, synthetic_block(block_num, ch))
+    async with asyncio.timeout(1):
+        while await streamer.samples_written.get_value() < expected:
+            await asyncio.sleep(0.001)
+
+
+def test_ring_buffer_wraps():
+    buff = WaveformRingBuffer(channels=[1], capacity=8)
+    for block in range(3):
+        samples = np.arange(block * 5, block * 5 + 5)
+        buff.append(samples * 0.1, {1: samples})
+    assert buff.samples_written == 15
+    assert len(buff) == 8
+    assert buff.first_available == 7
+    timestamps, values = buff.read(7, 15)
+    np.testing.assert_array_equal(values[1], np.arange(7, 15))
+    np.testing.assert_allclose(timestamps, np.arange(7, 15) * 0.1)
+
+
+def test_ring_buffer_overrun():
+    buff = WaveformRingBuffer(channels=[1], capacity=8)
+    buff.append(np.arange(10)[:8], {1: np.arange(8)})
+    buff.append(np.arange(4), {1: np.arange(4)})
+    with pytest.raises(BufferOverrun):
+        buff.read(0, 12)
+    with pytest.raises(ValueError):
+        buff.read(10, 13)
+    with pytest.raises(BufferOverrun):
+        buff.append(np.arange(9), {1: np.arange(9)})
+
+
+async def test_streamer_starts_digitizer(labjack):
+    digitizer = labjack.waveform_digitizer
+    streamer = WaveformStreamer(digitizer, channels=CHANNELS)
+    await streamer.start()
+    assert streamer.streaming
+    assert await digitizer.run.get_value()
+    await streamer.stop()
+    assert not streamer.streaming
+    assert not await digitizer.run.get_value()
+
+
+async def test_gap_free_pages(labjack):
+    """Pages emitted while streaming should cover every sample exactly once."""
+    streamer = WaveformStreamer(
+        labjack.waveform_digitizer, channels=CHANNELS, capacity=4 * BLOCK_SIZE
+    )
+    provider = LabJackStreamDataProvider(streamer)
+    await streamer.start()
+    pages = []
+    # Uneven paging: sometimes several blocks between pages
+    for block_num, emit_page in enumerate([True, False, True, False, False, True]):
+        await publish_block(streamer, block_num)
+        if emit_page:
+            written = await streamer.samples_written.get_value()
+            pages.extend([page async for page in provider.make_pages(written, 1)])
+    await streamer.stop()
+    # No new data, so no new page
+    written = await streamer.samples_written.get_value()
+    assert [page async for page in provider.make_pages(written, 1)] == []
+    # Check that data are contiguous
+    num_samples = 6 * BLOCK_SIZE
+    for ch in CHANNELS:
+        key = labjack.waveform_digitizer.waveforms[ch].name
+        data = np.concatenate([page["data"][key] for page in pages])
+        np.testing.assert_array_equal(data, np.arange(num_samples) + 1e6 * ch)
+    # Check that timestamps are monotonic and evenly spaced within blocks
+    times = np.concatenate([page["time"] for page in pages])
+    assert len(times) == num_samples
+    steps = np.diff(times)
+    assert np.all(steps > 0)
+    np.testing.assert_allclose(np.diff(times[:BLOCK_SIZE]), DWELL, rtol=1e-3)
+
+
+async def test_back_to_back_blocks(labjack):
+    """Blocks published before the streamer can run are all kept."""
+    streamer = WaveformStreamer(labjack.waveform_digitizer, channels=CHANNELS)
+    provider = LabJackStreamDataProvider(streamer)
+    await streamer.start()
+    # No awaiting in between, so both blocks are published at once
+    for block_num in range(2):
+        for ch in CHANNELS:
+            waveform = streamer.digitizer.waveforms[ch]
+            set_mock_value(waveform, synthetic_block(block_num, ch))
+    await publish_block(streamer, 2)
+    pages = [page async for page in provider.make_pages(3 * BLOCK_SIZE, 1)]
+    await streamer.stop()
+    for ch in CHANNELS:
+        key = labjack.waveform_digitizer.waveforms[ch].name
+        data = np.concatenate([page["data"][key] for page in pages])
+        np.testing.assert_array_equal(data, np.arange(3 * BLOCK_SIZE) + 1e6 * ch)
+
+
+async def test_missed_block(labjack):
+    streamer = WaveformStreamer(labjack.waveform_digitizer, channels=CHANNELS)
+    await streamer.start()
+    waveforms = streamer.digitizer.waveforms
+    # The second channel misses the first block
+    set_mock_value(waveforms[0], synthetic_block(0, 0))
+    set_mock_value(waveforms[0], synthetic_block(1, 0))
+    set_mock_value(waveforms[3], synthetic_block(1, 3))
+    await asyncio.sleep(0.01)
+    with pytest.raises(StreamGap):
+        await streamer.stop()
+    assert not streamer.streaming
+    assert await streamer.samples_written.get_value() == 0
+
+
+async def test_pages_per_event(labjack):
+    streamer = WaveformStreamer(labjack.waveform_digitizer, channels=CHANNELS)
+    provider = LabJackStreamDataProvider(streamer)
+    await streamer.start()
+    await publish_block(streamer, 0)
+    # 50 samples in events of 20, so 10 samples held over
+    pages = [page async for page in provider.make_pages(BLOCK_SIZE, 20)]
+    await publish_block(streamer, 1)
+    pages.extend([page async for page in provider.make_pages(2 * BLOCK_SIZE, 20)])
+    await streamer.stop()
+    key = labjack.waveform_digitizer.waveforms[0].name
+    assert [page["data"][key].shape for page in pages] == [(2, 20), (3, 20)]
+    data = np.concatenate([page["data"][key] for page in pages])
+    np.testing.assert_array_equal(data.flatten(), np.arange(100))
+
+
+async def test_datakeys(labjack):
+    streamer = WaveformStreamer(labjack.waveform_digitizer, channels=CHANNELS)
+    provider = LabJackStreamDataProvider(streamer)
+    datakeys = await provider.make_datakeys(1)
+    assert set(datakeys.keys()) == {
+        "labjack-waveform_digitizer-waveforms-0",
+        "labjack-waveform_digitizer-waveforms-3",
+    }
+    assert datakeys["labjack-waveform_digitizer-waveforms-0"]["shape"] == []
+    datakeys = await provider.make_datakeys(5)
+    assert datakeys["labjack-waveform_digitizer-waveforms-0"]["shape"] == [5]
+
+
+@pytest.mark.parametrize("model", ["T4", "T7", "T7-Pro", "T8"])
+async def test_detector_models(model):
+    detector = LabJackStreamingDetector(
+        PV_PREFIX, analog_inputs=[0, 1], model=model, name="labjack"
+    )
+    await detector.connect(mock=True)
+    assert detector.streamer.buffer.channels == [0, 1]
+    assert list(detector.driver.waveform_digitizer.waveforms.keys()) == [0, 1]
+
+
+def test_detector_bad_model():
+    with pytest.raises(ValueError):
+        LabJackStreamingDetector(PV_PREFIX, model="U3")
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
+from ophyd_async.core import MockSignalBackend, set_mock_value
 
-from haven.devices.scaler import MultiChannelScaler
+from haven.devices.scaler import MultiChannelScaler, Scaler
 
 
 @pytest.fixture()
@@ -129,3 +131,60 @@ def test_scaler_channel_signals(mcs):
     assert channel.raw_count.source == "ca://255idcVME:3820:scaler1.S16"
     assert channel.net_count.source == "ca://255idcVME:3820:scaler1_netB.D"
     assert channel.offset_rate.source == "ca://255idcVME:3820:scaler1_offset3.D"
+
+
+class ReadCounter:
+    """Count how many signal reads reach the (mock) control system."""
+
+    def __init__(self, monkeypatch):
+        self.count = 0
+        get_reading = MockSignalBackend.get_reading
+
+        async def counted_get_reading(backend):
+            self.count += 1
+            return await get_reading(backend)
+
+        monkeypatch.setattr(MockSignalBackend, "get_reading", counted_get_reading)
+
+
+@pytest.mark.asyncio
+async def test_batched_scaler_reading(monkeypatch):
+    """Check that batched reads match one-at-a-time reads, with fewer
+    requests."""
+    channels = range(32)
+    counts = np.arange(32, dtype=float) * 1000
+    # Scaler that reads each channel individually
+    scaler = Scaler(
+        "255idcVME:3820:scaler1", channels=channels, use_offset_correction=False
+    )
+    scaler.set_name("scaler")
+    await scaler.connect(mock=True)
+    for ch_num, channel in scaler.channels.items():
+        set_mock_value(channel.raw_count, counts[ch_num])
+    # Scaler that reads all channels at once
+    batched = Scaler(
+        "255idcVME:3820:scaler1",
+        channels=channels,
+        use_offset_correction=False,
+        counts_pv="255idcVME:3820:scaler1_cts",
+    )
+    batched.set_name("scaler")
+    await batched.connect(mock=True)
+    set_mock_value(batched.counts, counts)
+    assert batched.counts.source == "mock+ca://255idcVME:3820:scaler1_cts"
+    # Compare data keys
+    assert await batched.describe() == await scaler.describe()
+    # Compare readings
+    reads = ReadCounter(monkeypatch)
+    reading = await scaler.read()
+    per_channel_reads = reads.count
+    reads.count = 0
+    batched_reading = await batched.read()
+    batched_reads = reads.count
+    assert batched_reading.keys() == reading.keys()
+    for key, value in reading.items():
+        assert batched_reading[key]["value"] == value["value"]
+    assert batched_reading["scaler-channels-5-raw_count"]["value"] == 5000
+    # Round-trips per point: one for each channel, plus elapsed time
+    assert per_channel_reads == 33
+    assert batched_reads == 2
@@ -1,10 +1,17 @@
 import asyncio
 from unittest import mock
 
+import numpy as np
 import pytest
-from ophyd_async.core import get_mock_put
+from ophyd_async.core import get_mock_put, soft_signal_rw
 
-from haven.devices.srs570 import GainSignal, SRS570PreAmplifier
+from haven import exceptions
+from haven.devices.srs570 import (
+    GainSignal,
+    SettleMonitor,
+    SRS570PreAmplifier,
+    sensitivity_from_gain_level,
+)
 
 
 @pytest.fixture()
@@ -244,3 +251,135 @@ async def test_put_gain_level(preamp):
     # Check that the preamp sensitivity offsets are moved
     assert await preamp.offset_value.get_value() == "1"
     assert await preamp.offset_unit.get_value() == "nA"
+
+
+@pytest.mark.parametrize(
+    "gain_level,sensitivity",
+    [(27, 1e-12), (26, 2e-12), (25, 5e-12), (18, 1e-9), (1, 500e-6), (0, 1e-3)],
+)
+def test_sensitivity_from_gain_level(gain_level, sensitivity):
+    assert sensitivity_from_gain_level(gain_level) == pytest.approx(sensitivity)
+
+
+def test_sensitivity_from_bad_gain_level():
+    with pytest.raises(exceptions.GainOverflow):
+        sensitivity_from_gain_level(28)
+
+
+@pytest.mark.parametrize("tau", [0.02, 0.05, 0.1])
+def test_settle_monitor_exponential(tau):
+    """Check that simulated RC relaxation is only stable once it's
+    close to its final value."""
+    monitor = SettleMonitor(signal=None, tolerance=0.01, num_points=10)
+    times = np.arange(0, 2, 0.01)
+    volts = 2.5 + 3.0 * np.exp(-times / tau)
+    settled = [monitor.update(v) for v in volts]
+    first_settled = settled.index(True)
+    # Settled well before the trace ends
+    assert times[first_settled] < 1.0
+    # ...but not before the voltage is close to its final value
+    assert abs(volts[first_settled] - 2.5) < 0.02
+
+
+def test_settle_monitor_noisy():
+    """Noise larger than the tolerance should never be stable."""
+    monitor = SettleMonitor(signal=None, tolerance=0.01, num_points=5)
+    rng = np.random.default_rng(seed=0)
+    volts = 2.5 + rng.normal(scale=0.5, size=200)
+    assert not any(monitor.update(v) for v in volts)
+
+
+async def test_adaptive_settling():
+    preamp = SRS570PreAmplifier(
+        "255idcVEM:SR02:", name="preamp", settle_mode="adaptive"
+    )
+    await preamp.connect(mock=True)
+    voltage = soft_signal_rw(float, initial_value=5.0, name="voltage")
+    await voltage.connect()
+    monitor = preamp.monitor_settling(voltage, tolerance=0.01, num_points=3)
+    await preamp.sensitivity_unit.set("nA/V")
+    monitor.history.clear()
+
+    async def relax():
+        # Simulate an exponential relaxation to 2.5 V
+        for step in range(1, 50):
+            await asyncio.sleep(0.005)
+            await voltage.set(2.5 + 2.5 * np.exp(-step / 4))
+
+    task = asyncio.create_task(relax())
+    await preamp.sensitivity_value.set("10")
+    # Did we finish before the voltage stopped changing?
+    assert not task.done()
+    task.cancel()
+    (record,) = monitor.history
+    assert record.stable
+    assert record.max_time == 0.5
+    assert record.signal_name == "preamp-sensitivity_value"
+
+
+async def test_adaptive_settling_timeout():
+    """If the voltage never stabilizes, wait the full settle time."""
+    preamp = SRS570PreAmplifier(
+        "255idcVEM:SR02:", name="preamp", settle_mode="adaptive"
+    )
+    await preamp.connect(mock=True)
+    voltage = soft_signal_rw(float, initial_value=5.0, name="voltage")
+    await voltage.connect()
+    monitor = preamp.monitor_settling(voltage)
+    await preamp.sensitivity_unit.set("nA/V")
+    monitor.history.clear()
+    await preamp.sensitivity_value.set("10")
+    (record,) = monitor.history
+    assert not record.stable
+    # Loose bound, since timers can fire a little early
+    assert record.settle_time >= 0.45
+
+
+async def test_adaptive_gain_level():
+    """Gain signals set together each need their own stable points."""
+    preamp = SRS570PreAmplifier(
+        "255idcVEM:SR02:", name="preamp", settle_mode="adaptive"
+    )
+    await preamp.connect(mock=True)
+    await preamp.gain_level.connect(mock=False)
+    voltage = soft_signal_rw(float, initial_value=5.0, name="voltage")
+    await voltage.connect()
+    # Any three values are stable
+    monitor = preamp.monitor_settling(voltage, tolerance=10, num_points=3)
+    num_updates = 0
+
+    async def update():
+        nonlocal num_updates
+        while True:
+            await asyncio.sleep(0.005)
+            num_updates += 1
+            await voltage.set(2.5)
+
+    task = asyncio.create_task(update())
+    await preamp.gain_level.set(15)
+    task.cancel()
+    assert len(monitor.history) == 2
+    assert all(record.stable for record in monitor.history)
+    assert num_updates >= 3
+
+
+async def test_settle_monitor_unsubscribes():
+    voltage = soft_signal_rw(float, initial_value=5.0, name="voltage")
+    await voltage.connect()
+    monitor = SettleMonitor(voltage, num_points=1)
+
+    async def change():
+        await asyncio.sleep(0.01)
+        await voltage.set(2.5)
+
+    task = asyncio.create_task(change())
+    record = await monitor.wait(max_time=5)
+    await task
+    assert record.stable
+    # The monitor's subscription has been removed
+    assert voltage._cache is None
+
+
+def test_invalid_settle_mode():
+    with pytest.raises(ValueError):
+        SRS570PreAmplifier("255idcVEM:SR02:", name="preamp", settle_mode="psychic")
@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+import pytest
+from scipy.interpolate import CubicSpline
+
+from haven.devices.trajectory import TrajectoryRecorder, nearest_indices
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_nearest_indices(descending):
+    grid = np.linspace(0, 10, num=11)
+    if descending:
+        grid = grid[::-1]
+    values = np.asarray([-3.0, 0.0, 0.4, 0.5, 0.6, 4.5, 9.9, 12.0])
+    expected = [np.argmin(np.abs(grid - value)) for value in values]
+    np.testing.assert_equal(nearest_indices(values, grid), expected)
+
+
+def test_nearest_indices_single_point():
+    np.testing.assert_equal(nearest_indices([1.5, -2.0], [3.0]), [0, 0])
+
+
+def test_recorder_ring_buffer():
+    recorder = TrajectoryRecorder(capacity=4)
+    for idx in range(6):
+        recorder.append(float(idx), 10.0 * idx)
+    assert len(recorder) == 4
+    np.testing.assert_equal(recorder.times, [2, 3, 4, 5])
+    np.testing.assert_equal(recorder.positions, [20, 30, 40, 50])
+    recorder.clear()
+    assert len(recorder) == 0
+
+
+def test_recorder_caches_model():
+    recorder = TrajectoryRecorder(capacity=16)
+    for idx in range(5):
+        recorder.append(float(idx), 2.0 * idx)
+    model = recorder.model
+    assert recorder.model is model
+    # New data should force a new fit
+    recorder.append(5.0, 10.0)
+    assert recorder.model is not model
+
+
+def legacy_predict(fly_data, pixel_positions, timestamps):
+    """The original per-pixel implementation from ``MotorFlyer.predict()``."""
+    times, positions = np.asarray(fly_data).transpose()
+    model = CubicSpline(times, positions, bc_type="clamped")
+    results = []
+    for timestamp in timestamps:
+        position = float(model(timestamp))
+        setpoint = pixel_positions[np.argmin(np.abs(pixel_positions - position))]
+        results.append((position, setpoint))
+    return np.asarray(results)
+
+
+def make_recorder(direction: int):
+    """A recorder full of readbacks from a jittery constant-speed move,
+    plus pixel positions and timestamps to assign."""
+    rng = np.random.default_rng(seed=42)
+    num_readbacks = 100_000
+    num_pixels = 10_000
+    # Simulate a motor moving at constant speed with some jitter
+    times = np.linspace(1000.0, 1100.0, num=num_readbacks)
+    positions = direction * (np.linspace(-1, 101, num=num_readbacks))
+    positions += rng.normal(scale=1e-4, size=num_readbacks)
+    pixel_positions = direction * np.linspace(0, 100, num=num_pixels)
+    timestamps = np.linspace(1001.0, 1099.0, num=num_pixels)
+    recorder = TrajectoryRecorder(capacity=num_readbacks)
+    for timestamp, position in zip(times, positions):
+        recorder.append(timestamp, position)
+    return recorder, pixel_positions, timestamps
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+def test_assign_pixels_matches_legacy(direction):
+    recorder, pixel_positions, timestamps = make_recorder(direction)
+    fly_data = list(zip(recorder.times, recorder.positions))
+    # Compare the vectorized version to the old version
+    new_positions, new_setpoints = recorder.assign_pixels(timestamps, pixel_positions)
+    expected = legacy_predict(fly_data, pixel_positions, timestamps)
+    np.testing.assert_allclose(new_positions, expected[:, 0])
+    np.testing.assert_equal(new_setpoints, expected[:, 1])
+
+
+@pytest.mark.slow
+def test_assign_pixels_benchmark():
+    recorder, pixel_positions, timestamps = make_recorder(1)
+    fly_data = list(zip(recorder.times, recorder.positions))
+    start = time.perf_counter()
+    recorder.assign_pixels(timestamps, pixel_positions)
+    new_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    legacy_predict(fly_data, pixel_positions, timestamps)
+    legacy_duration = time.perf_counter() - start
+    assert new_duration < legacy_duration
@@ -10,6 +10,7 @@ from ophyd_async.core import init_devices
 from ophyd_async.epics.motor import Motor
 
 from haven.devices import ApsMachine
+from haven.devices.srs570 import sensitivity_from_gain_level
 from haven.plans import _auto_gain, auto_gain
 
 
@@ -245,6 +246,119 @@ def test_recommender_no_change(recommender):
         recommender.suggest(1)
 
 
+def simulated_volts(current: float, gain_level: int) -> float:
+    """Simulate an SR570 feeding a voltmeter that saturates at 10 V."""
+    return min(current / sensitivity_from_gain_level(gain_level), 10.0)
+
+
+def test_predictor_jumps_to_target():
+    predictor = _auto_gain.GainPredictor()
+    # 0.1 V at 1 nA/V is 0.1 nA, so 50 pA/V gives 2 V
+    assert predictor.next_gain(18, 0.1) == 22
+    # 4.8 V at 1 nA/V is 4.8 nA, so 2 nA/V gives 2.4 V
+    assert predictor.next_gain(18, 4.8) == 17
+
+
+def test_predictor_no_change():
+    predictor = _auto_gain.GainPredictor()
+    assert predictor.next_gain(22, 2.0) == 22
+
+
+def test_predictor_saturated():
+    """Saturated voltages can't predict the current, so take a big step."""
+    predictor = _auto_gain.GainPredictor()
+    assert predictor.next_gain(18, 10.0) == 12
+    assert predictor.next_gain(18, 0.0) == 24
+
+
+def test_predictor_gain_range():
+    predictor = _auto_gain.GainPredictor()
+    assert predictor.next_gain(27, 1e-3) == 27
+    assert predictor.next_gain(25, 0.0) == 27
+    assert predictor.next_gain(1, 10.0) == 0
+
+
+def count_adaptive_iterations(current: float, gain: int) -> tuple[int, int]:
+    recommender = _auto_gain.GainRecommender()
+    for count in range(1, 29):
+        recommender.ingest([gain], [simulated_volts(current, gain)])
+        try:
+            (gain,) = recommender.suggest(1)
+        except NoRecommendation:
+            return count, gain
+    raise RuntimeError("Recommender did not converge")
+
+
+def count_predictive_iterations(current: float, gain: int) -> tuple[int, int]:
+    predictor = _auto_gain.GainPredictor()
+    for count in range(1, 29):
+        new_gain = predictor.next_gain(gain, simulated_volts(current, gain))
+        if new_gain == gain:
+            return count, gain
+        gain = new_gain
+    raise RuntimeError("Predictor did not converge")
+
+
+def best_gain(current: float) -> int:
+    """Find the gain level whose output is closest to 2.5 V."""
+    return min(range(28), key=lambda gain: abs(simulated_volts(current, gain) - 2.5))
+
+
+@pytest.mark.parametrize("current", [3e-12, 7.7e-11, 4.2e-9, 1.3e-7, 6e-6, 2e-4])
+@pytest.mark.parametrize("start_gain", [0, 13, 27])
+def test_predictive_convergence(current, start_gain):
+    """Does the predictive engine find the best gain in fewer counts?"""
+    adaptive_count, adaptive_gain = count_adaptive_iterations(current, start_gain)
+    predictive_count, predictive_gain = count_predictive_iterations(current, start_gain)
+    assert predictive_gain == best_gain(current)
+    assert predictive_count <= adaptive_count
+
+
+def test_predictive_iterations_saved():
+    currents = np.logspace(-12, -3.5, num=40)
+    adaptive = [count_adaptive_iterations(i, 13)[0] for i in currents]
+    predictive = [count_predictive_iterations(i, 13)[0] for i in currents]
+    # Predictions need at most a couple of big steps, then one to verify
+    assert max(predictive) <= 4
+    assert sum(predictive) < sum(adaptive) / 2
+
+
+def test_predictive_plan(ion_chamber):
+    """Check that the plan moves all pre-amps at once and verifies."""
+    gain_signal = ion_chamber.preamp.gain_level
+    volts_key = ion_chamber.voltmeter_channel.final_value.name
+    current = 4.2e-9
+    gain = 13
+    plan = auto_gain(ion_chambers=[ion_chamber], mode="predictive")
+    msgs = []
+    response = None
+    # Simulate the pre-amp responding to the gain changes
+    while True:
+        try:
+            msg = plan.send(response)
+        except StopIteration:
+            break
+        msgs.append(msg)
+        response = None
+        if msg.command == "set" and msg.obj is gain_signal:
+            gain = msg.args[0]
+        elif msg.command == "read" and msg.obj is ion_chamber.voltmeter_channel:
+            response = {volts_key: {"value": simulated_volts(current, gain)}}
+        elif msg.command == "read" and msg.obj is gain_signal:
+            response = {gain_signal.name: {"value": gain}}
+    set_msgs = [msg for msg in msgs if msg.command == "set"]
+    assert [msg.args[0] for msg in set_msgs] == [17]
+    # One reading to predict, one reading to verify
+    save_msgs = [msg for msg in msgs if msg.command == "save"]
+    assert len(save_msgs) == 2
+    assert 0.5 < simulated_volts(current, gain) < 4.5
+
+
+def test_invalid_mode(ion_chamber):
+    with pytest.raises(ValueError):
+        list(auto_gain(ion_chambers=[ion_chamber], mode="psychic"))
+
+
 @pytest.mark.slow
 def test_plan_in_run_engine(ion_chamber):
     RE = RunEngine()
@@ -1,10 +1,17 @@
+import asyncio
+
 import pytest
 from bluesky import RunEngine
 from bluesky import plan_stubs as bps
 from ophyd_async.core import soft_signal_rw
 
 from haven.preprocessors import aps_suspenders_wrapper
-from haven.preprocessors.aps_suspenders import SuspendFloor, SuspendWhenChanged
+from haven.preprocessors.aps_suspenders import (
+    BeamConditionMonitor,
+    BeamRule,
+    SuspendFloor,
+    SuspendWhenChanged,
+)
 
 
 def test_storage_ring_current_suspender(aps):
@@ -15,10 +22,9 @@ def test_storage_ring_current_suspender(aps):
     assert msgs[0].obj is aps.machine_status
     # Get the rest of the messages
     assert msgs[1].command == "install_suspender"
-    assert msgs[2].command == "install_suspender"
-    assert msgs[3].command == "null"
-    assert msgs[4].command == "remove_suspender"
-    assert msgs[5].command == "remove_suspender"
+    assert isinstance(msgs[1].args[0], BeamConditionMonitor)
+    assert msgs[2].command == "null"
+    assert msgs[3].command == "remove_suspender"
 
 
 def test_not_user_mode(aps):
@@ -123,6 +129,140 @@ async def test_suspend_floor_call():
         suspender.remove()
 
 
+@pytest.fixture()
+async def beam_signals():
+    current = soft_signal_rw(float, name="current", initial_value=100)
+    permit = soft_signal_rw(bool, name="permit", initial_value=True)
+    await current.connect(mock=True)
+    await permit.connect(mock=True)
+    return current, permit
+
+
+def play(monitor, trace, signal_name="current", t0=0):
+    """Feed a scripted (time, value) trace into *monitor*, and report
+    whether it was tripped after each point."""
+    tripped = []
+    for t, value in trace:
+        monitor({signal_name: {"value": value, "timestamp": t0 + t}})
+        tripped.append(bool(monitor.broken_rules))
+    return tripped
+
+
+def test_beam_rule_hysteresis(beam_signals):
+    current, _ = beam_signals
+    rule = BeamRule.floor(current, suspend_thresh=30, resume_thresh=50)
+    rule.update(20, timestamp=0)
+    assert rule.broken
+    # Above the suspend threshold, but not yet enough to resume
+    rule.update(40, timestamp=1)
+    assert rule.broken
+    rule.update(60, timestamp=2)
+    assert not rule.broken
+    with pytest.raises(ValueError):
+        BeamRule.floor(current, suspend_thresh=30, resume_thresh=20)
+
+
+def test_brief_dropout_ignored(beam_signals):
+    current, permit = beam_signals
+    monitor = BeamConditionMonitor(
+        [BeamRule.floor(current, suspend_thresh=30, min_duration=5)], sleep=0
+    )
+    # A 2-second dropout, then a real 20-second beam dump
+    trace = [(0, 100), (1, 0), (3, 100), (10, 0), (12, 0), (16, 0), (30, 100)]
+    tripped = play(monitor, trace)
+    assert tripped == [False, False, False, False, False, True, True]
+    # Recovers once the current stays up for the minimum duration
+    assert play(monitor, [(36, 101)]) == [False]
+    assert len(monitor.events) == 1
+    event = monitor.events[0]
+    assert event.causes == ["current below 30"]
+    assert event.values == {"current": 0}
+    assert event.started == 16
+    assert event.duration == 36 - 16
+
+
+def test_top_up_spike_does_not_resume(beam_signals):
+    current, permit = beam_signals
+    monitor = BeamConditionMonitor(
+        [BeamRule.floor(current, suspend_thresh=30, min_duration=5)], sleep=0
+    )
+    # A top-up shot briefly spikes the reading while the beam is down
+    trace = [(0, 0), (5, 0), (10, 0), (11, 105), (12, 0), (30, 0)]
+    assert play(monitor, trace) == [False, True, True, True, True, True]
+    assert len(monitor.events) == 1
+    assert monitor.events[0].ended is None
+
+
+def test_merged_rules(beam_signals):
+    current, permit = beam_signals
+    monitor = BeamConditionMonitor(
+        [
+            BeamRule.floor(current, suspend_thresh=30),
+            BeamRule.expected(permit, True, cause="Shutter permit revoked."),
+        ],
+        sleep=0,
+    )
+    play(monitor, [(0, False)], signal_name="permit")
+    play(monitor, [(1, 10)])
+    play(monitor, [(2, True)], signal_name="permit")
+    assert [rule.cause for rule in monitor.broken_rules] == ["current below 30"]
+    play(monitor, [(3, 100)])
+    assert monitor.broken_rules == []
+    # Both causes recorded in one suspension
+    (event,) = monitor.events
+    assert event.causes == ["Shutter permit revoked.", "current below 30"]
+    assert event.duration == 3
+
+
+@pytest.mark.asyncio
+async def test_monitor_suspends_run_engine(beam_signals):
+    current, permit = beam_signals
+    RE = RunEngine({})
+    monitor = BeamConditionMonitor(
+        [
+            BeamRule.floor(current, suspend_thresh=30),
+            BeamRule.expected(permit, True),
+        ],
+        sleep=0,
+    )
+    monitor.install(RE)
+    try:
+        assert not monitor.tripped
+        # One subscription callback sees both signals
+        await current.set(10)
+        await asyncio.sleep(0.01)
+        assert monitor.tripped
+        assert "current below 30" in monitor._get_justification()
+        await current.set(100)
+        await asyncio.sleep(0.01)
+        assert not monitor.tripped
+    finally:
+        monitor.remove()
+    # No more updates after removal
+    await current.set(0)
+    await asyncio.sleep(0.01)
+    assert not monitor.tripped
+
+
+@pytest.mark.asyncio
+async def test_monitor_rechecks_without_updates(beam_signals):
+    current, permit = beam_signals
+    RE = RunEngine({})
+    monitor = BeamConditionMonitor(
+        [BeamRule.floor(current, suspend_thresh=30, min_duration=0.05)], sleep=0
+    )
+    monitor.install(RE)
+    try:
+        await current.set(10)
+        await asyncio.sleep(0.01)
+        assert not monitor.tripped
+        # No new readings, but the dropout has lasted long enough
+        await asyncio.sleep(0.2)
+        assert monitor.tripped
+    finally:
+        monitor.remove()
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
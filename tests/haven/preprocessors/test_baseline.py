@@ -0,0 +1,177 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from bluesky import RunEngine
+from bluesky import plans as bp
+from bluesky.run_engine import call_in_bluesky_event_loop
+from ophyd.sim import SynAxis, det
+from ophyd_async.core import (
+    MockSignalBackend,
+    StandardReadable,
+    StandardReadableFormat,
+    set_mock_value,
+    soft_signal_rw,
+)
+
+from haven import baseline_wrapper
+from haven.preprocessors.baseline import BaselineService, CachedReadable
+
+
+class Stage(StandardReadable):
+    _ophyd_labels_ = {"baseline"}
+
+    def __init__(self, name=""):
+        with self.add_children_as_readables():
+            self.x = soft_signal_rw(float, initial_value=1.0)
+            self.y = soft_signal_rw(float, initial_value=2.0)
+        with self.add_children_as_readables(StandardReadableFormat.CONFIG_SIGNAL):
+            self.units = soft_signal_rw(str, initial_value="mm")
+        super().__init__(name=name)
+
+
+class ReadCounter:
+    """Count how many signal reads reach the (mock) control system."""
+
+    def __init__(self, monkeypatch):
+        self.count = 0
+        get_reading = MockSignalBackend.get_reading
+
+        async def counted_get_reading(backend):
+            self.count += 1
+            return await get_reading(backend)
+
+        monkeypatch.setattr(MockSignalBackend, "get_reading", counted_get_reading)
+
+
+@pytest.fixture()
+def RE():
+    return RunEngine({})
+
+
+@pytest.fixture()
+def stages(sim_registry, RE):
+    stages = [Stage(name=f"stage{idx}") for idx in range(200)]
+
+    async def connect():
+        await asyncio.gather(*(stage.connect(mock=True) for stage in stages))
+
+    call_in_bluesky_event_loop(connect())
+    for stage in stages:
+        sim_registry.register(stage)
+    return stages
+
+
+def baseline_events(docs):
+    descriptor = next(
+        doc for name, doc in docs if name == "descriptor" and doc["name"] == "baseline"
+    )
+    return [
+        doc
+        for name, doc in docs
+        if name == "event" and doc["descriptor"] == descriptor["uid"]
+    ]
+
+
+def test_cached_baseline(RE, sim_registry, stages, monkeypatch, mocker):
+    service = BaselineService(devices="baseline")
+    findall = mocker.spy(sim_registry, "findall")
+    docs = []
+    RE(baseline_wrapper(bp.count([det]), service=service), lambda *d: docs.append(d))
+    # Values now come from monitors, not reads
+    reads = ReadCounter(monkeypatch)
+    set_mock_value(stages[3].x, 5.0)
+    docs = []
+    RE(baseline_wrapper(bp.count([det]), service=service), lambda *d: docs.append(d))
+    assert reads.count == 0
+    assert findall.call_count == 1
+    start, end = baseline_events(docs)
+    assert start["data"]["stage3-x"] == 5.0
+    assert start["data"]["stage3-y"] == 2.0
+    assert len(start["data"]) == 400
+
+
+def test_monitored_values_stay_fresh(stages, monkeypatch):
+    clock = [0.0]
+    stage = stages[0]
+    cached = CachedReadable(stage, max_age=60, clock=lambda: clock[0])
+    call_in_bluesky_event_loop(cached.monitor())
+    reads = ReadCounter(monkeypatch)
+    reading = call_in_bluesky_event_loop(cached.read())
+    assert reading["stage0-x"]["value"] == 1.0
+    # Idle values are still fresh while their monitors are live
+    clock[0] = 1000
+    call_in_bluesky_event_loop(cached.read())
+    assert reads.count == 0
+    assert cached.direct_reads == 0
+    # The heartbeat checks every monitored signal (x, y, and units)
+    call_in_bluesky_event_loop(cached.heartbeat())
+    assert reads.count == 3
+    cached.stop()
+
+
+def test_stale_values_fall_back(stages, monkeypatch):
+    clock = [0.0]
+    stage = stages[0]
+    cached = CachedReadable(stage, max_age=60, clock=lambda: clock[0])
+    call_in_bluesky_event_loop(cached.monitor())
+    # The monitors stop responding
+    with monkeypatch.context() as m:
+        m.setattr(
+            MockSignalBackend, "get_reading", mock.AsyncMock(side_effect=TimeoutError)
+        )
+        call_in_bluesky_event_loop(cached.heartbeat())
+    reads = ReadCounter(monkeypatch)
+    call_in_bluesky_event_loop(cached.read())
+    assert reads.count == 0
+    # Without a working monitor, old values go stale
+    clock[0] = 61
+    call_in_bluesky_event_loop(cached.read())
+    assert reads.count == 2
+    assert cached.direct_reads == 1
+    # The direct read refreshes the cache
+    call_in_bluesky_event_loop(cached.read())
+    assert reads.count == 2
+    # New values from monitors are live again
+    clock[0] = 200
+    set_mock_value(stage.x, 3.0)
+    set_mock_value(stage.y, 4.0)
+    reading = call_in_bluesky_event_loop(cached.read())
+    assert reads.count == 2
+    assert reading["stage0-y"]["value"] == 4.0
+    cached.stop()
+
+
+def test_unmonitored_values_go_stale(stages, monkeypatch):
+    clock = [0.0]
+    cached = CachedReadable(stages[0], max_age=60, clock=lambda: clock[0])
+    reads = ReadCounter(monkeypatch)
+    call_in_bluesky_event_loop(cached.read())
+    call_in_bluesky_event_loop(cached.read())
+    assert cached.direct_reads == 1
+    clock[0] = 61
+    call_in_bluesky_event_loop(cached.read())
+    assert cached.direct_reads == 2
+
+
+def test_service_heartbeat(sim_registry, stages, mocker):
+    service = BaselineService(devices="baseline", max_age=0.01)
+    heartbeat = mocker.spy(CachedReadable, "heartbeat")
+    call_in_bluesky_event_loop(service.start())
+    call_in_bluesky_event_loop(asyncio.sleep(0.05))
+    assert heartbeat.call_count >= len(stages)
+    service.stop()
+    count = heartbeat.call_count
+    call_in_bluesky_event_loop(asyncio.sleep(0.05))
+    assert heartbeat.call_count == count
+
+
+def test_uncacheable_devices(RE, sim_registry, stages):
+    motor = SynAxis(name="baseline_motor", labels={"baseline"})
+    sim_registry.register(motor)
+    service = BaselineService(devices="baseline")
+    docs = []
+    RE(baseline_wrapper(bp.count([det]), service=service), lambda *d: docs.append(d))
+    assert motor in service.readables
+    start, end = baseline_events(docs)
+    assert "baseline_motor" in start["data"]
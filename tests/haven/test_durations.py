@@ -0,0 +1,147 @@
+import math
+
+import numpy as np
+import pytest
+from bluesky_queueserver_api import BPlan
+
+from haven.durations import DurationEstimator
+from haven.plans._xafs_scan import XAFSRegion
+
+
+def scan_item(num, livetime, distance):
+    return {
+        "item_type": "plan",
+        "name": "scan",
+        "args": [["I0", "It"], "m1", 0, distance],
+        "kwargs": {"num": num, "livetime": livetime},
+    }
+
+
+def history_item(item, duration, exit_status="completed"):
+    return {
+        **item,
+        "result": {
+            "exit_status": exit_status,
+            "time_start": 1000.0,
+            "time_stop": 1000.0 + duration,
+        },
+    }
+
+
+def true_duration(num, livetime, distance):
+    """The duration of a synthetic scan on a slow beamline."""
+    movetime = distance / 2.0
+    return livetime * num + 1.5 * movetime + 0.3 * num + 4.0
+
+
+def test_scan_from_device_parameters():
+    estimator = DurationEstimator(velocities={"m1": 2.0}, point_overhead=0.05)
+    duration = estimator.estimate(scan_item(num=11, livetime=0.5, distance=10))
+    assert duration == pytest.approx(11 * 0.5 + 10 / 2.0 + 11 * 0.05)
+    # Detector overheads are taken from the slowest detector
+    estimator.detector_overheads = {"I0": 0.01, "It": 0.2}
+    duration = estimator.estimate(scan_item(num=11, livetime=0.5, distance=10))
+    assert duration == pytest.approx(11 * 0.5 + 10 / 2.0 + 11 * 0.2)
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        BPlan("count", ["I0"], num=5, livetime=2),
+        BPlan("grid_scan", ["I0"], "m1", 0, 4, 3, "m2", 0, 10, 11, snake_axes=True),
+        BPlan("xafs_scan", ["I0"], ("E", -50, 50, 101, 1.0), ("k", 3, 10, 71), E0=8333),
+        BPlan("fly_scan", ["I0"], "m1", 0, 10, num=101, dwell_time=0.1),
+        BPlan("grid_fly_scan", ["I0"], "m2", 0, 4, 3, "m1", 0, 10, 101, dwell_time=0.1),
+    ],
+)
+def test_registered_plans(item):
+    estimator = DurationEstimator(velocities={"m1": 2.0, "m2": 1.0})
+    duration = estimator.estimate(item)
+    assert math.isfinite(duration)
+    assert duration > 0
+
+
+def test_xafs_regions_unchanged():
+    """Estimating a plan should not change its arguments."""
+    region = XAFSRegion("E", -50, 50, 101)
+    item = {
+        "item_type": "plan",
+        "name": "xafs_scan",
+        "args": [["I0"], region],
+        "kwargs": {"E0": 8333},
+    }
+    DurationEstimator().estimate(item)
+    assert region.exposure is None
+
+
+def test_calibrate_from_history():
+    rng = np.random.default_rng(seed=42)
+    estimator = DurationEstimator(velocities={"m1": 2.0})
+    history = []
+    for _ in range(30):
+        num, livetime, distance = (
+            int(rng.integers(5, 200)),
+            float(rng.uniform(0.1, 2)),
+            float(rng.uniform(1, 50)),
+        )
+        item = scan_item(num, livetime, distance)
+        history.append(history_item(item, true_duration(num, livetime, distance)))
+    # Failed runs should not be used
+    history.append(history_item(scan_item(100, 1, 10), 3.0, exit_status="aborted"))
+    test_item = scan_item(num=150, livetime=0.7, distance=30)
+    expected = true_duration(150, 0.7, 30)
+    uncalibrated = estimator.estimate(test_item)
+    estimator.observe_history(history)
+    calibrated = estimator.estimate(test_item)
+    assert abs(uncalibrated - expected) / expected > 0.2
+    assert calibrated == pytest.approx(expected, rel=0.02)
+
+
+def test_unmodeled_plan():
+    estimator = DurationEstimator()
+    item = {"item_type": "plan", "name": "align_slits", "args": [], "kwargs": {}}
+    assert math.isnan(estimator.estimate(item))
+    for duration in [30, 40, 35]:
+        estimator.observe(item, duration)
+    assert estimator.estimate(item) == 35
+
+
+def test_queue_duration():
+    estimator = DurationEstimator(velocities={"m1": 2.0}, point_overhead=0)
+    queue = [
+        scan_item(num=10, livetime=1, distance=10),
+        {"item_type": "instruction", "name": "queue_stop"},
+        scan_item(num=20, livetime=1, distance=10),
+    ]
+    running = scan_item(num=10, livetime=2, distance=0)
+    total = estimator.queue_duration(queue, running_item=running, elapsed=5)
+    assert total == pytest.approx((10 + 5) + (20 + 5) + (20 - 5))
+    # Running plans that overrun don't count against the queue
+    total = estimator.queue_duration(queue, running_item=running, elapsed=100)
+    assert total == pytest.approx(15 + 25)
+
+
+# -----------------------------------------------------------------------------
+# :author:    Mark Wolfman
+# :email:     wolfman@anl.gov
+# :copyright: Copyright © 2025, UChicago Argonne, LLC
+#
+# Distributed under the terms of the 3-Clause BSD License
+#
+# The full license is in the file LICENSE, distributed with this software.
+#
+# DISCLAIMER
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# -----------------------------------------------------------------------------
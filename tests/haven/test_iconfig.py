@@ -107,6 +107,22 @@ def test_logging_config():
     assert cfg.logging.version == 1
 
 
+def test_user_cache_per_user(monkeypatch, tmp_path):
+    """The APS user directory should not be cached in shared /tmp."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    uri = "https://dm.example.com"
+    cfg = iconfig.DataManagementConfig(
+        scheduling_uri=uri,
+        data_transfer_uri=uri,
+        workflow_uri=uri,
+        data_storage_uri=uri,
+        catalog_uri=uri,
+        beamline="25-ID",
+        station_name="25IDC",
+    )
+    assert cfg.user_cache_filepath == str(tmp_path / "haven" / "user_directory.npz")
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
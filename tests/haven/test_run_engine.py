@@ -1,15 +1,32 @@
+from importlib.metadata import EntryPoint
+from typing import Protocol, runtime_checkable
 from unittest import mock
 
+import pytest
 from bluesky import Msg, RunEngine
 from bluesky import plan_stubs as bps
 
 from haven import load_config, run_engine
+from haven.exceptions import InvalidConfiguration
 from haven.iconfig import (
     DataManagementConfig,
     HavenConfig,
     RunEngineConfig,
     RunEngineMetadata,
 )
+from haven.run_engine import RunEngineCommand
+
+
+@runtime_checkable
+class Tunable(Protocol):
+    async def tune(self, target: float): ...
+
+
+async def _tune(msg):
+    await msg.obj.tune(*msg.args, **msg.kwargs)
+
+
+tune_command = RunEngineCommand("tune", _tune, protocols=[Tunable])
 
 
 def test_run_engine_created():
@@ -90,6 +107,62 @@ def test_subscribe_tiled_writer(mocker):
     assert writer in callbacks
 
 
+def test_plugin_command():
+    device = mock.AsyncMock()
+    RE = run_engine(commands=[tune_command])
+    RE([Msg("tune", device, target=5)])
+    device.tune.assert_called_once_with(target=5)
+
+
+def test_plugin_protocol_checked():
+    RE = run_engine(commands=[tune_command])
+    with pytest.raises(TypeError):
+        RE([Msg("tune", object(), target=5)])
+
+
+def test_config_commands():
+    config = load_config()
+    config.run_engine.commands = [f"{__name__}:tune_command"]
+    RE = run_engine(config=config)
+    assert "tune" in RE.commands
+
+
+def test_entry_point_commands(mocker):
+    entry_point = EntryPoint(
+        name="tune", value=f"{__name__}:tune_command", group="haven.run_engine_commands"
+    )
+    mocker.patch("haven.run_engine.entry_points", return_value=[entry_point])
+    RE = run_engine()
+    assert "tune" in RE.commands
+
+
+def test_conflicting_commands():
+    # Two plugins with the same name
+    with pytest.raises(InvalidConfiguration):
+        run_engine(commands=[tune_command, RunEngineCommand("tune", _tune)])
+    # A plugin that would replace a built-in command
+    with pytest.raises(InvalidConfiguration):
+        run_engine(commands=[RunEngineCommand("set", _tune)])
+    with pytest.raises(InvalidConfiguration):
+        run_engine(commands=[RunEngineCommand("calibrate", _tune)])
+
+
+def test_invalid_commands():
+    def not_a_coroutine(msg): ...
+
+    class NotRuntime(Protocol):
+        def tune(self): ...
+
+    with pytest.raises(InvalidConfiguration):
+        run_engine(commands=[RunEngineCommand("tune", not_a_coroutine)])
+    with pytest.raises(InvalidConfiguration):
+        run_engine(commands=[RunEngineCommand("tune", _tune, protocols=[NotRuntime])])
+    config = load_config()
+    config.run_engine.commands = [f"{__name__}:_tune"]
+    with pytest.raises(InvalidConfiguration):
+        run_engine(config=config)
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
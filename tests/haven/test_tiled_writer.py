@@ -1,6 +1,21 @@
+import json
+import time
+
+import httpx
+import numpy as np
 import pytest
+from bluesky import RunEngine
+from bluesky import plans as bp
+from event_model import compose_run
+from ophyd_async import sim
+from ophyd_async.core import init_devices
+from tiled.catalog import in_memory
+from tiled.client import Context, from_context
+from tiled.queries import Key, SpecsQuery
+from tiled.server.app import build_app
 
 from haven import TiledWriter, tiled_writer
+from haven._tiled_writer import AdaptiveBatching, TiledSpool, md_to_specs
 from haven.iconfig import TiledConfig
 
 
@@ -30,7 +45,6 @@ def test_missing_backup_directory(mocker, tmp_path):
         writer = tiled_writer(config)
 
 
-@pytest.mark.skip(reason="need a new way to put custom Spec into the writer")
 def test_xas_spec(mocker):
     """Does the XASRun spec get added for valid XAS runs?"""
     client = mocker.MagicMock()
@@ -38,6 +52,7 @@ def test_xas_spec(mocker):
     writer = TiledWriter(client=client)
     start_doc = {
         "uid": "0",
+        "time": 0,
         "d_spacing": 3.1415926,
         "edge": "Ni-K",
     }
@@ -50,7 +65,6 @@ def test_xas_spec(mocker):
     assert specs[1].name == "BlueskyRun"
 
 
-@pytest.mark.skip(reason="need a new way to put custom Spec into the writer")
 def test_no_xas_spec(mocker):
     """Does the XASRun spec get skipped for invalid XAS runs?"""
     client = mocker.MagicMock()
@@ -58,9 +72,317 @@ def test_no_xas_spec(mocker):
     writer = TiledWriter(client=client)
     start_doc = {
         "uid": "0",
+        "time": 0,
     }
     writer("start", start_doc)
     assert client.create_container.called
     specs = client.create_container.call_args[1]["specs"]
     assert len(specs) == 1
     assert specs[0].name == "BlueskyRun"
+
+
+class FakeTiled:
+    """Stand-in for a Tiled server that can be taken down."""
+
+    def __init__(self):
+        self.runs = {}
+        self.down = False
+        self.fail_after = None
+
+    def __contains__(self, uid):
+        return uid in self.runs
+
+    def delete_contents(self, uid, recursive, external_only):
+        del self.runs[uid]
+
+
+class FakeWriter:
+    def __init__(self, server):
+        self.client = server
+        self._run_uid = None
+
+    def __call__(self, name, doc):
+        server = self.client
+        num_docs = sum(len(docs) for docs in server.runs.values())
+        if server.down or num_docs == server.fail_after:
+            raise httpx.ConnectError("Server not available")
+        if name == "start":
+            assert doc["uid"] not in server.runs, "Run written twice"
+            self._run_uid = doc["uid"]
+            server.runs[self._run_uid] = []
+        server.runs[self._run_uid].append((name, doc))
+
+
+def make_run(num_events: int):
+    run = compose_run()
+    docs = [("start", run.start_doc)]
+    stream = run.compose_descriptor(
+        name="primary",
+        data_keys={"det": {"source": "sim", "dtype": "number", "shape": []}},
+    )
+    docs.append(("descriptor", stream.descriptor_doc))
+    for idx in range(num_events):
+        event = stream.compose_event(
+            data={"det": np.float64(idx)},
+            timestamps={"det": time.time()},
+        )
+        docs.append(("event", event))
+    docs.append(("stop", run.compose_stop()))
+    # Documents come back from the spool as plain JSON
+    return docs, json.loads(json.dumps(docs, default=float))
+
+
+def test_spool_recovers_from_outage(tmp_path):
+    server = FakeTiled()
+    spool = TiledSpool(lambda: FakeWriter(server), tmp_path, retry_delay=0.01)
+    docs, expected = make_run(20)
+    for name, doc in docs[:10]:
+        spool(name, doc)
+    # Tiled server goes away mid-run
+    server.down = True
+    for name, doc in docs[10:15]:
+        spool(name, doc)
+    time.sleep(0.05)
+    server.down = False
+    for name, doc in docs[15:]:
+        spool(name, doc)
+    assert spool.flush(timeout=5)
+    spool.close()
+    # All documents written exactly once
+    (uid,) = server.runs.keys()
+    assert [list(doc) for doc in server.runs[uid]] == expected
+    assert spool.segments() == []
+
+
+def test_spool_replays_on_restart(tmp_path):
+    server = FakeTiled()
+    # Writing fails part-way through the run
+    server.fail_after = 5
+    spool = TiledSpool(lambda: FakeWriter(server), tmp_path, retry_delay=0.01)
+    docs, expected = make_run(10)
+    for name, doc in docs:
+        spool(name, doc)
+    assert not spool.flush(timeout=0.1)
+    spool.close(timeout=0)
+    (uid,) = server.runs.keys()
+    assert len(server.runs[uid]) == 5
+    assert len(spool.segments()) == 1
+    # Restarting should replay the run and replace the partial run
+    server.fail_after = None
+    spool = TiledSpool(lambda: FakeWriter(server), tmp_path, retry_delay=0.01)
+    assert spool.flush(timeout=5)
+    spool.close()
+    assert [list(doc) for doc in server.runs[uid]] == expected
+    assert spool.segments() == []
+    # New segments should sort after the replayed ones
+    assert spool._next_index == 1
+
+
+def test_load_spooled_writer(mocker, tmp_path):
+    mocker.patch("haven._tiled_writer.from_profile")
+    config = TiledConfig(
+        writer_profile="spam",
+        writer_spool_directory=str(tmp_path / "spool"),
+    )
+    spool = tiled_writer(config)
+    try:
+        assert isinstance(spool, TiledSpool)
+        assert spool.directory.exists()
+    finally:
+        spool.close()
+
+
+@pytest.fixture()
+def tiled_client(tmp_path):
+    tree = in_memory(
+        writable_storage=[
+            str(tmp_path / "data"),
+            f"sqlite:///{tmp_path / 'data.sqlite'}",
+        ]
+    )
+    app = build_app(tree)
+    with Context.from_app(app) as context:
+        yield from_context(context, structure_clients="numpy")
+
+
+@pytest.fixture()
+async def energy_scan_devices():
+    pattern_generator = sim.PatternGenerator()
+    async with init_devices(mock=False):
+        stage = sim.SimStage(pattern_generator)
+        detector = sim.SimPointDetector(pattern_generator)
+    stage.x.set_name("energy")
+    await stage.x.velocity.set(100000)
+    return stage.x, detector
+
+
+def test_md_to_specs():
+    assert [s.name for s in md_to_specs({"plan_name": "xafs_scan"})] == ["XASRun"]
+    assert [s.name for s in md_to_specs({"plan_name": "energy_scan"})] == ["XASRun"]
+    assert [s.name for s in md_to_specs({"plan_name": "fly_scan"})] == ["FlyScan"]
+    assert [s.name for s in md_to_specs({"plan_name": "grid_fly_scan"})] == ["FlyScan"]
+    assert md_to_specs({"plan_name": "scan"}) == []
+    # Other plans can still be XAS
+    xas_md = {"plan_name": "scan", "edge": "Ni_K", "d_spacing": 3.13}
+    assert [s.name for s in md_to_specs(xas_md)] == ["XASRun"]
+
+
+def test_run_summaries(tiled_client, energy_scan_devices):
+    energy, detector = energy_scan_devices
+    writer = TiledWriter(tiled_client, batch_size=1)
+    RE = RunEngine(call_returns_result=True)
+    RE.subscribe(writer)
+    # Collect some runs at different edges
+    ni_md = {"plan_name": "xafs_scan", "edge": "Ni-K", "E0": 8333, "d_spacing": 3.1}
+    (ni_uid,) = RE(bp.scan([detector], energy, 8300, 8400, 5, md=ni_md)).run_start_uids
+    cu_md = {"plan_name": "energy_scan", "edge": "Cu-K", "E0": 8979}
+    (cu_uid,) = RE(bp.scan([detector], energy, 8950, 9050, 7, md=cu_md)).run_start_uids
+    (other_uid,) = RE(bp.count([detector], num=3)).run_start_uids
+    # Check the specs
+    specs = [spec.name for spec in tiled_client[ni_uid].specs]
+    assert specs == ["XASRun", "BlueskyRun"]
+    assert [spec.name for spec in tiled_client[other_uid].specs] == ["BlueskyRun"]
+    # Check the summary
+    summary = tiled_client[ni_uid].metadata["summary"]
+    assert summary == {
+        "plan_name": "xafs_scan",
+        "edge": "Ni-K",
+        "E0": 8333,
+        "energy_min": 8300,
+        "energy_max": 8400,
+        "num_points": 5,
+    }
+    assert tiled_client[other_uid].metadata["summary"]["num_points"] == 3
+    assert "energy_min" not in tiled_client[other_uid].metadata["summary"]
+    # Search runs by their summaries
+    assert list(tiled_client.search(Key("summary.edge") == "Ni-K")) == [ni_uid]
+    assert list(tiled_client.search(Key("summary.energy_max") > 9000)) == [cu_uid]
+    # Runs that cover the Ni K-edge
+    covers_ni = tiled_client.search(Key("summary.energy_min") < 8333).search(
+        Key("summary.energy_max") > 8333
+    )
+    assert list(covers_ni) == [ni_uid]
+    assert list(tiled_client.search(SpecsQuery(include=["XASRun"]))) == [ni_uid, cu_uid]
+
+
+def test_adaptive_batching_bounds():
+    batching = AdaptiveBatching(
+        min_batch_size=2, max_batch_size=100, flush_interval=0.5
+    )
+    # No rate known yet
+    assert batching.batch_size == 2
+    # 10 Hz -> 5 events per flush
+    for idx in range(10):
+        batching.observe_event(idx * 0.1)
+    assert batching.event_rate == pytest.approx(10)
+    assert batching.batch_size == 5
+    # 5 kHz hits the upper bound
+    for idx in range(50):
+        batching.observe_event(1 + idx * 2e-4)
+    assert batching.batch_size == 100
+    # A slow server stretches the flush interval, up to the limit
+    batching.observe_write(rows=100, duration=0.5)
+    assert batching.flush_interval == pytest.approx(2.0)
+    batching.observe_write(rows=100, duration=1000)
+    assert batching.flush_interval == batching.max_flush_interval
+    assert batching.metrics["writes"] == 2
+    assert batching.metrics["rows_written"] == 200
+    with pytest.raises(ValueError):
+        AdaptiveBatching(min_batch_size=10, max_batch_size=5)
+
+
+def test_load_adaptive_writer(mocker, tmp_path):
+    mocker.patch("haven._tiled_writer.from_profile")
+    config = TiledConfig(
+        writer_profile="spam",
+        writer_batch_size="adaptive",
+        writer_batch_size_bounds=(5, 500),
+        writer_flush_interval=2.0,
+    )
+    writer = tiled_writer(config)
+    assert writer.batching.min_batch_size == 5
+    assert writer.batching.max_batch_size == 500
+    assert writer.batching.target_flush_interval == 2.0
+
+
+def stream_run(rate: float, num_events: int):
+    """Documents for a run with events arriving at *rate* Hz."""
+    run = compose_run(time=0)
+    yield "start", run.start_doc
+    stream = run.compose_descriptor(
+        name="primary",
+        data_keys={"det": {"source": "sim", "dtype": "number", "shape": []}},
+    )
+    yield "descriptor", stream.descriptor_doc
+    for idx in range(num_events):
+        timestamp = idx / rate
+        yield "event", stream.compose_event(
+            data={"det": float(idx)}, timestamps={"det": timestamp}, time=timestamp
+        )
+    yield "stop", run.compose_stop()
+
+
+@pytest.mark.parametrize("rate,num_events", [(10, 30), (5000, 2500)])
+def test_adaptive_batching(tiled_client, rate, num_events):
+    batching = AdaptiveBatching(max_batch_size=10000, flush_interval=0.5)
+    writer = TiledWriter(tiled_client, batching=batching)
+    start = time.monotonic()
+    for name, doc in stream_run(rate=rate, num_events=num_events):
+        writer(name, doc)
+        if name == "start":
+            uid = doc["uid"]
+    elapsed = time.monotonic() - start
+    run = tiled_client[uid]
+    np.testing.assert_array_equal(
+        run["primary"].read()["det"], np.arange(num_events, dtype=float)
+    )
+    metrics = run.metadata["writer_metrics"]
+    assert metrics["rows_written"] == num_events
+    assert metrics["event_rate"] == pytest.approx(rate)
+    # No event waits longer than the flush interval...
+    duration = num_events / rate
+    assert metrics["writes"] >= duration / metrics["flush_interval"]
+    # ...but fast streams are not written one event at a time (the
+    # flush timer runs on the clock, which may be slower than the run)
+    assert metrics["writes"] <= max(duration, elapsed) / 0.5 + 2
+
+
+def test_adaptive_flush_timer(tiled_client):
+    """Events from a stream that has gone quiet are still written."""
+    batching = AdaptiveBatching(min_batch_size=100, flush_interval=0.1)
+    writer = TiledWriter(tiled_client, batching=batching)
+    docs = list(make_run(num_events=3)[0])
+    uid = docs[0][1]["uid"]
+    for name, doc in docs[:-1]:
+        writer(name, doc)
+    # Wait for the timer to write the events (reading while it writes
+    # trips up the in-process server's sqlite database)
+    time.sleep(1)
+    np.testing.assert_array_equal(tiled_client[uid]["primary"].read()["det"], [0, 1, 2])
+    writer(*docs[-1])
+    assert tiled_client[uid].metadata["writer_metrics"]["rows_written"] == 3
+
+
+def test_adaptive_flush_on_descriptor(tiled_client):
+    """Cached events are written before a new stream starts."""
+    batching = AdaptiveBatching(min_batch_size=100, flush_interval=5)
+    writer = TiledWriter(tiled_client, batching=batching)
+    run = compose_run()
+    uid = run.start_doc["uid"]
+    writer("start", run.start_doc)
+    primary = run.compose_descriptor(
+        name="primary",
+        data_keys={"det": {"source": "sim", "dtype": "number", "shape": []}},
+    )
+    writer("descriptor", primary.descriptor_doc)
+    writer(
+        "event",
+        primary.compose_event(data={"det": 1.0}, timestamps={"det": time.time()}),
+    )
+    baseline = run.compose_descriptor(
+        name="baseline",
+        data_keys={"temp": {"source": "sim", "dtype": "number", "shape": []}},
+    )
+    writer("descriptor", baseline.descriptor_doc)
+    np.testing.assert_array_equal(tiled_client[uid]["primary"].read()["det"], [1.0])
+    writer("stop", run.compose_stop())
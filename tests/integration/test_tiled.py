@@ -1,10 +1,12 @@
 # Tests to check the integration of Haven with Tiled
 
+import numpy as np
 import pytest
 from ophyd_async import sim
 from ophyd_async.core import init_devices
 
 from haven import run_engine, tiled_writer
+from haven._tiled_writer import TiledSpool
 from haven.iconfig import TiledConfig
 from haven.plans import scan
 
@@ -43,6 +45,43 @@ def test_streams(tiled_server, writer):
     assert "primary" in writer.client[uid].keys()
 
 
+@pytest.mark.slow
+def test_spool_survives_restart(tiled_server, tmp_path):
+    """Does the spool write every event if Tiled restarts mid-run?"""
+    spool = tiled_writer(
+        TiledConfig(
+            writer_profile="tiled_writable",
+            writer_batch_size=1,
+            writer_spool_directory=str(tmp_path / "spool"),
+        )
+    )
+    spool.retry_delay = 0.1
+    assert isinstance(spool, TiledSpool)
+    RE = run_engine(tiled_writer=spool, call_returns_result=True)
+
+    # Kill the server part-way through the run, then bring it back
+    def restart_tiled(name, doc):
+        if name == "event" and doc["seq_num"] == 4:
+            tiled_server.stop()
+        elif name == "event" and doc["seq_num"] == 8:
+            tiled_server.start()
+
+    RE.subscribe(restart_tiled)
+    pattern_generator = sim.PatternGenerator()
+    with init_devices():
+        stage = sim.SimStage(pattern_generator)
+        pdet = sim.SimPointDetector(pattern_generator)
+    result = RE(scan([pdet], stage.x, -0.628318, 0.628318, 12))
+    assert spool.flush(timeout=60)
+    spool.close()
+    # Check that every point arrived exactly once
+    (uid,) = result.run_start_uids
+    client = spool.writer_factory().client
+    seq_nums = client[uid]["primary"].read()["seq_num"]
+    np.testing.assert_array_equal(np.sort(seq_nums), np.arange(1, 13))
+    assert spool.segments() == []
+
+
 # -----------------------------------------------------------------------------
 # :author:    Mark Wolfman
 # :email:     wolfman@anl.gov
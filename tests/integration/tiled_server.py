@@ -88,7 +88,7 @@ class TiledServerInfo:
             warnings.warn("Cannot stop server that was not started.")
             return
         tiled_process.stop()
-        tiled_process = None
+        self.executor = None
 
 
 def ensure_server_not_running(uri):